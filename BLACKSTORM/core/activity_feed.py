@@ -0,0 +1,214 @@
+"""Incremental log tailing and an indexed store of recent activity events.
+
+:class:`LogTailer` remembers the inode and read offset of a log file and only
+returns lines appended since the last call; rotation and truncation are
+detected and the file is followed from its new start. The first read only
+backfills the last few kilobytes, so a log of hundreds of megabytes is never
+read from the top.
+
+Parsed events land in an :class:`ActivityStore`: a bounded ring of the most
+recent events with a per-category index, so changing the dashboard's filters
+is a query rather than another pass over the logs.
+"""
+from __future__ import annotations
+
+import heapq
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import count
+
+DEFAULT_BACKFILL_BYTES = 64 * 1024
+DEFAULT_READ_LIMIT = 4 * 1024 * 1024
+CATEGORIES = ("System", "Application", "Kernel", "Error", "Warning", "Info")
+
+
+@dataclass
+class ActivityEvent:
+    """One parsed log line."""
+
+    category: str
+    message: str
+    timestamp: str
+    source: str
+    raw: str = ""
+    seq: int = field(default=0, compare=False)
+
+
+def parse_system_line(line):
+    """Parse a syslog line such as ``Jan  1 12:34:56 host process[pid]: message``.
+
+    Returns:
+        ActivityEvent: The event, or None if the line does not look like syslog.
+    """
+    parts = line.split(maxsplit=5)
+    if len(parts) < 6:
+        return None
+    process = parts[4].split('[')[0].lower()
+    category = "System"
+    if 'blackstorm' in process:
+        category = "Application"
+    elif 'kernel' in process:
+        category = "Kernel"
+    return ActivityEvent(category, parts[5], ' '.join(parts[:3]), 'system', line)
+
+
+def parse_app_line(line):
+    """Parse an application log line ``[timestamp] [LEVEL] message``.
+
+    Lines in any other format become Info events stamped with the current time.
+    """
+    if not line.strip():
+        return None
+    if line.startswith('[') and ']' in line:
+        timestamp_end = line.find(']')
+        level_end = line.find(']', timestamp_end + 1)
+        if level_end > timestamp_end:
+            level = line[timestamp_end + 2:level_end]
+            category = "Info"
+            if 'ERROR' in level:
+                category = "Error"
+            elif 'WARN' in level:
+                category = "Warning"
+            return ActivityEvent(category, line[level_end + 2:].strip(),
+                                 line[1:timestamp_end].strip(), 'app', line)
+        return None
+    return ActivityEvent("Info", line, datetime.now().strftime("%H:%M"), 'app', line)
+
+
+class LogTailer:
+    """Read only what was appended to a log file since the last call.
+
+    Args:
+        path (str): Log file to follow.
+        backfill_bytes (int): How much of the existing file to read the first time.
+        read_limit (int): Most bytes returned by one call; a burst larger than
+            this is skipped down to its newest part.
+    """
+
+    def __init__(self, path, backfill_bytes=DEFAULT_BACKFILL_BYTES, read_limit=DEFAULT_READ_LIMIT):
+        self.path = path
+        self.backfill_bytes = backfill_bytes
+        self.read_limit = read_limit
+        self.bytes_read = 0
+        self._identity = None
+        self._offset = None
+        self._partial = b""
+
+    def read_lines(self):
+        """Return the complete lines added since the previous call."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []
+        identity = (st.st_dev, st.st_ino)
+        skip_partial = False
+        if self._offset is None:
+            # First look: only the tail of what is already there
+            self._offset = max(0, st.st_size - self.backfill_bytes)
+            skip_partial = self._offset > 0
+        elif identity != self._identity or st.st_size < self._offset:
+            # Rotated or truncated: follow the new file from its start
+            self._offset = 0
+            self._partial = b""
+        self._identity = identity
+        if st.st_size - self._offset > self.read_limit:
+            self._offset = st.st_size - self.read_limit
+            self._partial = b""
+            skip_partial = True
+        if st.st_size == self._offset:
+            return []
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read(st.st_size - self._offset)
+        except OSError:
+            return []
+        self._offset += len(data)
+        self.bytes_read += len(data)
+        data = self._partial + data
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+        if skip_partial and lines:
+            lines.pop(0)  # started mid-line
+        return [text for text in (line.decode('utf-8', errors='ignore').strip() for line in lines) if text]
+
+
+class ActivityStore:
+    """Bounded, category-indexed store of the newest activity events.
+
+    Args:
+        maxlen (int): Events kept; the oldest are dropped first.
+    """
+
+    def __init__(self, maxlen=500):
+        self.maxlen = maxlen
+        self._events = deque()
+        self._by_category = {}
+        self._seq = count(1)
+
+    def __len__(self):
+        return len(self._events)
+
+    def add(self, events):
+        """Store ``events`` (oldest first), numbering them; returns them."""
+        added = []
+        for event in events:
+            event.seq = next(self._seq)
+            self._events.append(event)
+            self._by_category.setdefault(event.category, deque()).append(event)
+            added.append(event)
+            if len(self._events) > self.maxlen:
+                oldest = self._events.popleft()
+                # Insertion order is shared, so it is also its category's oldest
+                self._by_category[oldest.category].popleft()
+        return added
+
+    def query(self, categories=None, limit=None):
+        """Newest-first events of the given categories (all if None)."""
+        if categories is None:
+            events = reversed(self._events)
+        else:
+            streams = [reversed(self._by_category[c]) for c in categories if self._by_category.get(c)]
+            events = heapq.merge(*streams, key=lambda event: -event.seq)
+        result = []
+        for event in events:
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(event)
+        return result
+
+    def counts(self):
+        return {category: len(events) for category, events in self._by_category.items() if events}
+
+    def clear(self):
+        self._events.clear()
+        self._by_category.clear()
+
+
+class ActivityFeed:
+    """Tails a set of logs into one :class:`ActivityStore`.
+
+    Args:
+        sources (list): ``(path, parser)`` pairs; ``parser(line)`` returns an
+            :class:`ActivityEvent` or None.
+        maxlen (int): Capacity of the store.
+    """
+
+    def __init__(self, sources, maxlen=500):
+        self.tailers = [(LogTailer(path), parser) for path, parser in sources]
+        self.store = ActivityStore(maxlen)
+
+    def poll(self):
+        """Parse whatever was appended to the logs; returns the new events, oldest first."""
+        events = []
+        for tailer, parser in self.tailers:
+            for line in tailer.read_lines():
+                event = parser(line)
+                if event is not None:
+                    events.append(event)
+        return self.store.add(events)
+
+    def clear(self):
+        self.store.clear()
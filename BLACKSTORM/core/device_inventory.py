@@ -0,0 +1,433 @@
+"""Shared, event-driven inventory of attached storage devices.
+
+One watcher thread listens on the kernel uevent netlink socket for block
+devices appearing, disappearing or changing, and on the mount table for
+mounts and unmounts. After a short settle delay the inventory rescans the
+affected disks from ``/sys/block`` (parsing the mount table once per change)
+and hands an :class:`InventoryChange` with the added, removed and changed
+devices to every subscriber. Tabs therefore see hot-plug immediately and
+nothing rescans while the machine is idle.
+
+Where netlink is unavailable (not Linux, or sandboxed) the watcher falls back
+to a slow periodic rescan and still only reports real differences.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import select
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+
+SYS_BLOCK = "/sys/block"
+SYS_CLASS_BLOCK = "/sys/class/block"
+UDEV_DATA = "/run/udev/data"
+PROC_MOUNTS = "/proc/self/mounts"
+NETLINK_KOBJECT_UEVENT = 15
+VIRTUAL_PREFIXES = ("loop", "ram", "sr", "dm-", "zram", "md", "nbd", "fd")
+SETTLE_DELAY = 0.25
+FALLBACK_INTERVAL = 10.0
+
+logger = logging.getLogger(__name__)
+
+
+def _read(path, default=""):
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return default
+
+
+def _unescape(value):
+    # /proc/mounts escapes space, tab, newline and backslash as octal
+    return value.replace("\\040", " ").replace("\\011", "\t").replace("\\012", "\n").replace("\\134", "\\")
+
+
+def read_mounts(path=PROC_MOUNTS):
+    """Parse a mount table once.
+
+    Returns:
+        dict: ``{source device: (mountpoint, fstype)}`` for the first mount of each source.
+    """
+    mounts = {}
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3 and fields[0] not in mounts:
+                    mounts[fields[0]] = (_unescape(fields[1]), fields[2])
+    except OSError as exc:
+        logger.debug("Cannot read %s: %s", path, exc)
+    return mounts
+
+
+def udev_properties(name, sys_class_block=SYS_CLASS_BLOCK, udev_data=UDEV_DATA):
+    """Read udev's stored properties for a disk or partition without running ``udevadm``.
+
+    Returns:
+        dict: ``{KEY: value}``, e.g. ``ID_PART_TABLE_TYPE`` or ``ID_FS_TYPE``; empty if unknown.
+    """
+    dev = _read(os.path.join(sys_class_block, name, "dev"))
+    properties = {}
+    if not dev:
+        return properties
+    try:
+        with open(os.path.join(udev_data, f"b{dev}"), "r") as f:
+            for line in f:
+                if line.startswith("E:"):
+                    key, _, value = line[2:].rstrip("\n").partition("=")
+                    properties[key] = value
+    except (OSError, UnicodeDecodeError):
+        pass
+    return properties
+
+
+def is_virtual(name):
+    return name.startswith(VIRTUAL_PREFIXES)
+
+
+def scan_device(name, mounts, sys_block=SYS_BLOCK):
+    """Describe one whole disk from sysfs.
+
+    Args:
+        name (str): Kernel name, e.g. ``sda`` or ``nvme0n1``.
+        mounts (dict): Result of :func:`read_mounts`.
+        sys_block (str): sysfs block directory.
+
+    Returns:
+        dict: Device information, or None if the disk has gone away.
+    """
+    base = os.path.join(sys_block, name)
+    size_text = _read(os.path.join(base, "size"))
+    if not size_text:
+        return None
+    size = int(size_text) * 512  # sysfs sizes are in 512-byte sectors
+    try:
+        sys_path = os.path.realpath(base)
+    except OSError:
+        sys_path = base
+    if "/usb" in sys_path:
+        transport = "usb"
+    elif name.startswith("nvme"):
+        transport = "nvme"
+    else:
+        transport = "sata" if "/ata" in sys_path else ""
+
+    partitions = []
+    try:
+        entries = sorted(os.listdir(base))
+    except OSError:
+        entries = []
+    for item in entries:
+        if not item.startswith(name) or item == name:
+            continue
+        part_path = f"/dev/{item}"
+        mountpoint, fstype = mounts.get(part_path, ("", ""))
+        number = _read(os.path.join(base, item, "partition")) or item[len(name):].lstrip("p")
+        part_size = int(_read(os.path.join(base, item, "size"), "0") or 0) * 512
+        partitions.append({
+            "device": part_path,
+            "mountpoint": mountpoint,
+            "fstype": fstype,
+            "size": round(part_size / (1024 ** 3), 1),  # GB
+            "size_bytes": part_size,
+            "number": number,
+        })
+
+    mountpoint, fstype = mounts.get(f"/dev/{name}", ("", ""))
+    return {
+        "device": f"/dev/{name}",
+        "name": name,
+        "model": _read(os.path.join(base, "device", "model")) or "Unknown",
+        "vendor": _read(os.path.join(base, "device", "vendor")),
+        "serial": _read(os.path.join(base, "device", "serial")),
+        "size_bytes": size,
+        "size_gb": round(size / (1024 ** 3), 1),
+        "removable": _read(os.path.join(base, "removable")) == "1",
+        "rotational": _read(os.path.join(base, "queue", "rotational")) == "1",
+        "transport": transport,
+        "mountpoint": mountpoint,
+        "fstype": fstype,
+        "partitions": partitions,
+    }
+
+
+def scan_devices(sys_block=SYS_BLOCK, mounts_path=PROC_MOUNTS, names=None, mounts=None):
+    """Scan whole, non-virtual disks.
+
+    Args:
+        sys_block (str): sysfs block directory.
+        mounts_path (str): Mount table to read when ``mounts`` is not given.
+        names (iterable): Only scan these kernel names; defaults to all.
+        mounts (dict): Already parsed mount table.
+
+    Returns:
+        dict: ``{device path: info}``.
+    """
+    if mounts is None:
+        mounts = read_mounts(mounts_path)
+    if names is None:
+        try:
+            names = os.listdir(sys_block)
+        except OSError:
+            return {}
+    devices = {}
+    for name in sorted(names):
+        if is_virtual(name):
+            continue
+        try:
+            info = scan_device(name, mounts, sys_block)
+        except (OSError, ValueError) as exc:
+            logger.debug("Error scanning %s: %s", name, exc)
+            continue
+        if info is not None:
+            devices[info["device"]] = info
+    return devices
+
+
+def parse_uevent(data):
+    """Decode one kernel uevent datagram into its ``KEY=value`` properties.
+
+    Returns:
+        dict: The properties, or None for messages that are not kernel uevents.
+    """
+    if data.startswith(b"libudev"):
+        return None
+    fields = data.split(b"\0")
+    properties = {}
+    for item in fields[1:]:
+        key, sep, value = item.partition(b"=")
+        if sep:
+            properties[key.decode(errors="replace")] = value.decode(errors="replace")
+    return properties if "ACTION" in properties else None
+
+
+@dataclass
+class InventoryChange:
+    """Difference between two inventory snapshots."""
+
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    devices: list = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_devices(old, new):
+    """Compare two ``{path: info}`` snapshots.
+
+    Returns:
+        InventoryChange: Added and changed infos, removed paths, and every
+        device of ``new``.
+    """
+    return InventoryChange(
+        added=[info for path, info in new.items() if path not in old],
+        removed=[path for path in old if path not in new],
+        changed=[info for path, info in new.items() if path in old and old[path] != info],
+        devices=list(new.values()),
+    )
+
+
+class DeviceInventory:
+    """Current device snapshot plus a uevent/mount watcher that keeps it fresh.
+
+    Subscribers are called from the watcher thread with an
+    :class:`InventoryChange`; Qt code should hop to the GUI thread via a
+    queued signal.
+
+    Args:
+        sys_block (str): sysfs block directory.
+        mounts_path (str): Mount table to watch.
+    """
+
+    def __init__(self, sys_block=SYS_BLOCK, mounts_path=PROC_MOUNTS):
+        self.sys_block = sys_block
+        self.mounts_path = mounts_path
+        self.scans = 0
+        self._devices = {}
+        self._mounts = {}
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._loaded = False
+
+    def devices(self):
+        """Snapshot of every device, scanning on first use."""
+        with self._lock:
+            if not self._loaded:
+                self._rescan()
+            return list(self._devices.values())
+
+    def get(self, path):
+        with self._lock:
+            if not self._loaded:
+                self._rescan()
+            return self._devices.get(path)
+
+    def disk_for(self, path):
+        """The whole-disk info for a disk or partition path, or None."""
+        with self._lock:
+            if not self._loaded:
+                self._rescan()
+            if path in self._devices:
+                return self._devices[path]
+            for info in self._devices.values():
+                if any(part["device"] == path for part in info["partitions"]):
+                    return info
+            return None
+
+    def subscribe(self, callback):
+        """Call ``callback(change)`` after every change; starts the watcher."""
+        with self._lock:
+            self._subscribers.append(callback)
+        self.start()
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def refresh(self, names=None):
+        """Rescan now (all disks, or only ``names``) and notify subscribers of any difference.
+
+        Returns:
+            InventoryChange: What changed.
+        """
+        with self._lock:
+            change = self._rescan(names)
+            subscribers = list(self._subscribers)
+        if change:
+            for callback in subscribers:
+                try:
+                    callback(change)
+                except Exception:
+                    logger.exception("Device inventory subscriber failed")
+        return change
+
+    def _rescan(self, names=None):
+        self.scans += 1
+        self._mounts = read_mounts(self.mounts_path)
+        if names is None or not self._loaded:
+            devices = scan_devices(self.sys_block, mounts=self._mounts)
+        else:
+            devices = dict(self._devices)
+            for name in names:
+                devices.pop(f"/dev/{name}", None)
+            devices.update(scan_devices(self.sys_block, mounts=self._mounts,
+                                        names=[n for n in names if os.path.exists(os.path.join(self.sys_block, n))]))
+            devices = dict(sorted(devices.items()))
+        change = diff_devices(self._devices, devices)
+        self._devices = devices
+        self._loaded = True
+        return change
+
+    # ------------------------------------------------------------------
+    # Watcher thread
+    # ------------------------------------------------------------------
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="device-inventory", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _open_netlink(self):
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+            sock.bind((0, 1))  # multicast group 1: kernel uevents
+            return sock
+        except (AttributeError, OSError) as exc:
+            logger.info("Kernel uevents unavailable (%s); polling every %.0fs", exc, FALLBACK_INTERVAL)
+            return None
+
+    def _watch(self):
+        if not self._loaded:
+            self.refresh()
+        sock = self._open_netlink()
+        try:
+            mounts = open(self.mounts_path, "r")
+        except OSError:
+            mounts = None
+        poller = select.poll()
+        if sock is not None:
+            poller.register(sock, select.POLLIN)
+        if mounts is not None:
+            # The mount table reports changes as an exceptional condition
+            poller.register(mounts, select.POLLPRI | select.POLLERR)
+        try:
+            while not self._stop.is_set():
+                timeout = 500 if sock is not None else FALLBACK_INTERVAL * 1000
+                events = poller.poll(timeout)
+                if not events:
+                    if sock is None and not self._stop.is_set():
+                        self.refresh()
+                    continue
+                names, mounts_changed = self._collect(events, sock, mounts)
+                # Let udev finish creating nodes and the rest of a burst arrive
+                deadline = time.monotonic() + SETTLE_DELAY
+                while (remaining := deadline - time.monotonic()) > 0:
+                    more = poller.poll(remaining * 1000)
+                    if not more:
+                        break
+                    extra_names, extra_mounts = self._collect(more, sock, mounts)
+                    names |= extra_names
+                    mounts_changed |= extra_mounts
+                if mounts_changed or names:
+                    # A mount change can affect any disk, so rescan them all
+                    self.refresh(None if mounts_changed else names)
+        finally:
+            if sock is not None:
+                sock.close()
+            if mounts is not None:
+                mounts.close()
+
+    def _collect(self, events, sock, mounts):
+        names = set()
+        mounts_changed = False
+        for fd, _ in events:
+            if mounts is not None and fd == mounts.fileno():
+                mounts.seek(0)
+                mounts.read()
+                mounts_changed = True
+            elif sock is not None and fd == sock.fileno():
+                try:
+                    data = sock.recv(65536)
+                except OSError:
+                    continue
+                event = parse_uevent(data)
+                if event is None or event.get("SUBSYSTEM") != "block":
+                    continue
+                name = event.get("DEVNAME", os.path.basename(event.get("DEVPATH", "")))
+                if event.get("DEVTYPE") == "partition":
+                    # Partition events are folded into their disk
+                    name = os.path.basename(os.path.dirname(event.get("DEVPATH", ""))) or name
+                if name and not is_virtual(name):
+                    names.add(name)
+        return names, mounts_changed
+
+
+_inventory = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory():
+    """Return the process-wide :class:`DeviceInventory`."""
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            _inventory = DeviceInventory()
+        return _inventory
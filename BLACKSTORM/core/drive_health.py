@@ -0,0 +1,305 @@
+"""Background SMART health collection for every attached drive.
+
+:class:`DriveHealthService` probes drives with ``smartctl --json`` on a
+bounded thread pool, so a shelf of 24 drives is checked a handful at a time
+and never on the GUI thread. Reports are cached by drive serial number with
+an expiry: selecting a drive in a table is a dictionary lookup, and a disk
+swapped into the same ``/dev`` node is probed again rather than inheriting its
+predecessor's result.
+
+Each drive also keeps a short history of its wear and error counters
+(reallocated, pending and uncorrectable sectors, NVMe media errors, ...),
+recorded whenever they change, so growth between probes shows up as a
+warning even while the drive still reports an overall SMART "PASSED".
+"""
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+SMARTCTL = "smartctl"
+DEFAULT_TTL = 300.0
+DEFAULT_WORKERS = 6
+PROBE_TIMEOUT = 15
+HISTORY_LENGTH = 64
+
+# Counters whose growth means the medium is degrading
+WATCHED_ATTRIBUTES = (
+    "Reallocated_Sector_Ct",
+    "Reallocated_Event_Count",
+    "Current_Pending_Sector",
+    "Offline_Uncorrectable",
+    "Reported_Uncorrect",
+    "UDMA_CRC_Error_Count",
+    "media_errors",
+)
+
+# smartctl exit status bits 0 and 1: bad command line, device open failed
+_EXIT_NO_DEVICE = 0x03
+_EXIT_SMART_FAILING = 0x08
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HealthReport:
+    """Health of one drive as of ``timestamp``.
+
+    ``status`` is one of ``Good``, ``Warning``, ``Failed``, ``Unknown``,
+    ``N/A`` (smartctl not installed) or ``Timeout``.
+    """
+
+    device: str
+    status: str = "Unknown"
+    smart_capable: bool = False
+    passed: bool | None = None
+    model: str = ""
+    serial: str = ""
+    temperature: int | None = None
+    attributes: dict = field(default_factory=dict)
+    issues: list = field(default_factory=list)
+    growth: dict = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def watched(self):
+        """The subset of ``attributes`` tracked in the drive's history."""
+        return {name: self.attributes[name] for name in WATCHED_ATTRIBUTES if name in self.attributes}
+
+
+def parse_smart_json(data, device):
+    """Build a :class:`HealthReport` from parsed ``smartctl --json`` output.
+
+    Handles both ATA attribute tables and the NVMe health information log.
+    """
+    report = HealthReport(device=device,
+                          model=data.get("model_name", "") or "",
+                          serial=data.get("serial_number", "") or "")
+    exit_status = data.get("smartctl", {}).get("exit_status", 0)
+    if exit_status & _EXIT_NO_DEVICE and "smart_status" not in data:
+        for message in data.get("smartctl", {}).get("messages", []):
+            if message.get("severity") == "error":
+                report.issues.append(message.get("string", ""))
+        return report
+
+    support = data.get("smart_support", {})
+    nvme = data.get("nvme_smart_health_information_log")
+    report.smart_capable = bool(support.get("available") or nvme is not None or "smart_status" in data)
+    report.passed = data.get("smart_status", {}).get("passed")
+    report.temperature = data.get("temperature", {}).get("current")
+
+    for row in data.get("ata_smart_attributes", {}).get("table", []):
+        name = row.get("name") or str(row.get("id"))
+        report.attributes[name] = row.get("raw", {}).get("value", 0)
+        if row.get("when_failed"):
+            report.issues.append(f"{name} below threshold ({row['when_failed']})")
+    if nvme is not None:
+        for name, value in nvme.items():
+            if isinstance(value, int):
+                report.attributes[name] = value
+        if nvme.get("critical_warning"):
+            report.issues.append(f"NVMe critical warning 0x{nvme['critical_warning']:02x}")
+        spare, threshold = nvme.get("available_spare"), nvme.get("available_spare_threshold")
+        if spare is not None and threshold is not None and spare <= threshold:
+            report.issues.append(f"Available spare {spare}% at or below threshold {threshold}%")
+
+    for name in ("Reallocated_Sector_Ct", "Current_Pending_Sector", "Offline_Uncorrectable", "media_errors"):
+        if report.attributes.get(name):
+            report.issues.append(f"{name} = {report.attributes[name]}")
+
+    if report.passed is False or exit_status & _EXIT_SMART_FAILING:
+        report.status = "Failed"
+    elif report.issues:
+        report.status = "Warning"
+    elif report.passed:
+        report.status = "Good"
+    return report
+
+
+def probe_drive(device, timeout=PROBE_TIMEOUT):
+    """Run ``smartctl --json`` against ``device`` and parse the result.
+
+    Never raises for a missing tool, a hung drive or unparsable output; the
+    returned report's ``status`` says what went wrong.
+    """
+    cmd = [SMARTCTL, "--json", "-i", "-H", "-A", device]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except FileNotFoundError:
+        return HealthReport(device=device, status="N/A")
+    except subprocess.TimeoutExpired:
+        return HealthReport(device=device, status="Timeout")
+    try:
+        data = json.loads(result.stdout)
+    except (TypeError, ValueError):
+        report = HealthReport(device=device)
+        if result.stderr.strip():
+            report.issues.append(result.stderr.strip())
+        return report
+    return parse_smart_json(data, device)
+
+
+class DriveHealthService:
+    """Cached, concurrent SMART probing of many drives.
+
+    Reports are keyed by serial number where the drive has one and by device
+    path otherwise. Subscribers are called from a pool thread with each new
+    :class:`HealthReport`; Qt code should hop to the GUI thread via a queued
+    signal.
+
+    Args:
+        max_workers (int): Drives probed at once.
+        ttl (float): Seconds a report stays fresh.
+        history_length (int): Attribute snapshots kept per drive.
+        probe (callable): ``probe(device) -> HealthReport``.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, ttl=DEFAULT_TTL,
+                 history_length=HISTORY_LENGTH, probe=probe_drive):
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.history_length = history_length
+        self.probe = probe
+        self.probes = 0
+        self._reports = {}
+        self._keys = {}
+        self._history = {}
+        self._pending = {}
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self._executor = None
+
+    def _key(self, device, serial=None):
+        return serial or self._keys.get(device) or device
+
+    def cached(self, device, serial=None, fresh_only=False):
+        """The last report for ``device`` without probing, or None.
+
+        Args:
+            serial (str): The drive's serial, when known, so a different disk
+                at the same path is not mistaken for the cached one.
+            fresh_only (bool): Ignore reports older than ``ttl``.
+        """
+        with self._lock:
+            report = self._reports.get(self._key(device, serial))
+        if report is None or (fresh_only and time.time() - report.timestamp > self.ttl):
+            return None
+        return report
+
+    def request(self, device, serial=None, force=False):
+        """Probe ``device`` in the background unless a fresh report is cached.
+
+        Returns:
+            Future: Resolves to the :class:`HealthReport`; concurrent requests
+            for the same drive share one probe.
+        """
+        with self._lock:
+            if not force:
+                report = self.cached(device, serial, fresh_only=True)
+                if report is not None:
+                    future = Future()
+                    future.set_result(report)
+                    return future
+            future = self._pending.get(device)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="drive-health")
+                future = self._executor.submit(self._run, device, serial)
+                self._pending[device] = future
+            return future
+
+    def request_all(self, devices, force=False):
+        """Request every inventory ``{'device': ..., 'serial': ...}`` entry.
+
+        Returns:
+            dict: ``{device path: Future}``.
+        """
+        return {info["device"]: self.request(info["device"], info.get("serial") or None, force)
+                for info in devices}
+
+    def get(self, device, serial=None, timeout=None):
+        """Blocking :meth:`request`; for worker threads and terminal commands."""
+        return self.request(device, serial).result(timeout)
+
+    def history(self, device, serial=None):
+        """``[(timestamp, {attribute: raw value})]``, oldest first, one entry per change."""
+        with self._lock:
+            return list(self._history.get(self._key(device, serial), ()))
+
+    def invalidate(self, device=None):
+        """Forget cached reports for ``device`` (or all); history is kept."""
+        with self._lock:
+            if device is None:
+                self._reports.clear()
+            else:
+                self._reports.pop(self._key(device), None)
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, device, serial):
+        try:
+            report = self.probe(device)
+        except Exception as exc:
+            logger.exception("Health probe of %s failed", device)
+            report = HealthReport(device=device, issues=[str(exc)])
+        with self._lock:
+            self.probes += 1
+            self._store(report, serial)
+            self._pending.pop(device, None)
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(report)
+            except Exception:
+                logger.exception("Drive health subscriber failed")
+        return report
+
+    def _store(self, report, serial):
+        # Prefer the caller's serial: that is what later lookups will use
+        key = serial or report.serial or report.device
+        self._keys[report.device] = key
+        self._reports[key] = report
+        watched = report.watched
+        if not watched:
+            return
+        history = self._history.setdefault(key, deque(maxlen=self.history_length))
+        if not history or history[-1][1] != watched:
+            history.append((report.timestamp, watched))
+        first = history[0][1]
+        report.growth = {name: value - first[name] for name, value in watched.items()
+                         if name in first and value > first[name]}
+        report.issues.extend(f"{name} grew by {delta}" for name, delta in report.growth.items())
+        if report.growth and report.status == "Good":
+            report.status = "Warning"
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_health_service():
+    """Return the process-wide :class:`DriveHealthService`."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = DriveHealthService()
+        return _service
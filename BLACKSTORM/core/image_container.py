@@ -0,0 +1,565 @@
+"""Segmented, chunk-compressed forensic image container.
+
+An image is cut into fixed-size chunks that are compressed independently
+(zlib or lzma) and appended to segment files of bounded size. A separate
+index file records, for every chunk, where its compressed bytes live and the
+SHA-256 of its uncompressed contents. Any offset of the image can therefore be
+read by decompressing a single chunk, chunks can be verified in parallel, and
+compression runs on every core instead of in one gzip stream. All-zero chunks
+are stored as holes: they have an index entry but no bytes in any segment.
+
+Layout of ``<name>.bsi`` (the index)::
+
+    magic "BSIIDX01" | u32 header length | header JSON | chunk table
+
+Each chunk table entry is ``<IQIB32s``: segment number, offset in the
+segment, stored length, flags (compressed, zero) and SHA-256 of the
+uncompressed chunk. The segments ``<name>.bsi.001``, ``<name>.bsi.002`` ...
+start with an 8-byte magic followed by the stored chunks.
+
+zlib, lzma and hashlib all release the GIL while they work, so a thread pool
+gives real parallelism without copying every chunk into worker processes.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import lzma
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from BLACKSTORM.core.multi_hash import MultiHasher, hash_file
+
+INDEX_MAGIC = b"BSIIDX01"
+SEGMENT_MAGIC = b"BSISEG01"
+FORMAT_VERSION = 1
+INDEX_SUFFIX = ".bsi"
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_SEGMENT_SIZE = 2 * 1024 ** 3
+
+FLAG_COMPRESSED = 0x01
+FLAG_ZERO = 0x02
+
+_ENTRY = struct.Struct("<IQIB32s")
+_HEADER_LEN = struct.Struct("<I")
+
+CODECS = {
+    "zlib": (lambda data, level: zlib.compress(data, level), zlib.decompress),
+    "lzma": (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+
+
+class ImageFormatError(Exception):
+    """Raised when an index or segment is not a valid BLACKSTORM image."""
+
+
+@dataclass
+class ChunkEntry:
+    """Location and checksum of one chunk."""
+
+    segment: int
+    offset: int
+    length: int
+    flags: int
+    sha256: bytes
+
+    @property
+    def compressed(self):
+        return bool(self.flags & FLAG_COMPRESSED)
+
+    @property
+    def zero(self):
+        return bool(self.flags & FLAG_ZERO)
+
+
+@dataclass
+class ImageSummary:
+    """What :class:`ImageWriter` produced."""
+
+    index_path: str
+    segments: list
+    total_bytes: int
+    stored_bytes: int
+    chunk_count: int
+    hashes: dict = field(default_factory=dict)
+    duration: float = 0.0
+    sparse_bytes: int = 0
+
+    @property
+    def ratio(self):
+        return self.stored_bytes / self.total_bytes if self.total_bytes else 1.0
+
+
+def index_path_for(path):
+    """Return the index path for an image ``path`` (adds ``.bsi`` if missing)."""
+    return path if path.endswith(INDEX_SUFFIX) else path + INDEX_SUFFIX
+
+
+@lru_cache(maxsize=4)
+def _zero_digest(length):
+    return hashlib.sha256(bytes(length)).digest()
+
+
+def _compress_chunk(data, codec, level, zero=None):
+    if zero is not None and data == (zero if len(data) == len(zero) else bytes(len(data))):
+        return b"", FLAG_ZERO, _zero_digest(len(data))
+    digest = hashlib.sha256(data).digest()
+    packed = CODECS[codec][0](data, level)
+    if len(packed) < len(data):
+        return packed, FLAG_COMPRESSED, digest
+    # Incompressible (already compressed or encrypted): store as-is
+    return bytes(data), 0, digest
+
+
+class ImageWriter:
+    """Write a chunked, compressed image from a stream of bytes.
+
+    Args:
+        path (str): Image path; the index is ``path`` + ``.bsi``.
+        chunk_size (int): Uncompressed bytes per chunk.
+        codec (str): ``"zlib"`` or ``"lzma"``.
+        level (int): Compression level / preset.
+        segment_size (int): Maximum bytes per segment file, 0 for one segment.
+        workers (int): Compression threads (defaults to the CPU count).
+        hash_algorithms (list): Whole-image digests to compute while writing;
+            they always cover the zero bytes of holes too.
+        metadata (dict): Extra values stored in the index header.
+        sparse (bool): Store all-zero chunks as holes.
+    """
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE, codec="zlib", level=6,
+                 segment_size=DEFAULT_SEGMENT_SIZE, workers=None, hash_algorithms=(), metadata=None,
+                 sparse=True):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}")
+        self.index_path = index_path_for(path)
+        self.chunk_size = chunk_size
+        self.codec = codec
+        self.level = level
+        self.segment_size = segment_size
+        self.metadata = dict(metadata or {})
+        self.workers = workers or os.cpu_count() or 1
+        self.total_bytes = 0
+        self.stored_bytes = 0
+        self.sparse_bytes = 0
+        self._zero = bytes(chunk_size) if sparse else None
+        self._entries = []
+        self._segments = []
+        self._segment = None
+        self._segment_fill = 0
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bsi-compress")
+        self._hasher = MultiHasher(hash_algorithms) if hash_algorithms else None
+        self._started = time.monotonic()
+        self._closed = False
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+
+    def write(self, data):
+        """Append ``data`` to the image."""
+        if self._hasher is not None:
+            self._hasher.update(bytes(data))
+        self.total_bytes += len(data)
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_size:
+            self._submit(bytes(self._buffer[:self.chunk_size]))
+            del self._buffer[:self.chunk_size]
+
+    def write_zeros(self, length):
+        """Append ``length`` zero bytes, e.g. for a hole in a sparse source file."""
+        zero = self._zero or bytes(self.chunk_size)
+        while length > 0:
+            step = min(length, self.chunk_size - len(self._buffer))
+            self.write(zero[:step] if step < len(zero) else zero)
+            length -= step
+
+    def _submit(self, chunk):
+        self._pending.append(self._pool.submit(_compress_chunk, chunk, self.codec, self.level, self._zero))
+        # Bound memory: never keep more than two chunks per worker in flight
+        while len(self._pending) > 2 * self.workers:
+            self._store(self._pending.popleft().result())
+
+    def _open_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+        name = f"{os.path.basename(self.index_path)}.{len(self._segments) + 1:03d}"
+        self._segment = open(os.path.join(os.path.dirname(self.index_path), name), "wb")
+        self._segment.write(SEGMENT_MAGIC)
+        self._segment_fill = len(SEGMENT_MAGIC)
+        self._segments.append(name)
+
+    def _store(self, result):
+        payload, flags, digest = result
+        if flags & FLAG_ZERO:
+            # A hole: indexed, but nothing written
+            self._entries.append(ChunkEntry(0, 0, 0, flags, digest))
+            self.sparse_bytes += self.chunk_size
+            return
+        if self._segment is None or (self.segment_size and self._segment_fill > len(SEGMENT_MAGIC)
+                                     and self._segment_fill + len(payload) > self.segment_size):
+            self._open_segment()
+        self._entries.append(ChunkEntry(len(self._segments) - 1, self._segment_fill, len(payload), flags, digest))
+        self._segment.write(payload)
+        self._segment_fill += len(payload)
+        self.stored_bytes += len(payload)
+
+    def close(self):
+        """Flush the last chunk, write the index and return an :class:`ImageSummary`."""
+        if self._closed:
+            raise ValueError("Image already closed")
+        self._closed = True
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._store(self._pending.popleft().result())
+            if self._entries and self._entries[-1].zero:
+                # The last chunk may be short
+                self.sparse_bytes -= len(self._entries) * self.chunk_size - self.total_bytes
+            if self._segment is None:
+                self._open_segment()
+            self._segment.close()
+        finally:
+            self._pool.shutdown(wait=True)
+        hashes = self._hasher.hexdigests() if self._hasher is not None else {}
+        header = {
+            "version": FORMAT_VERSION,
+            "chunk_size": self.chunk_size,
+            "total_bytes": self.total_bytes,
+            "codec": self.codec,
+            "level": self.level,
+            "chunk_count": len(self._entries),
+            "sparse_bytes": self.sparse_bytes,
+            "segments": self._segments,
+            "hashes": hashes,
+            "created": time.time(),
+            "metadata": self.metadata,
+        }
+        header_bytes = json.dumps(header).encode()
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(INDEX_MAGIC + _HEADER_LEN.pack(len(header_bytes)) + header_bytes)
+            f.write(b"".join(_ENTRY.pack(e.segment, e.offset, e.length, e.flags, e.sha256)
+                             for e in self._entries))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+        return ImageSummary(self.index_path, list(self._segments), self.total_bytes, self.stored_bytes,
+                            len(self._entries), hashes, time.monotonic() - self._started, self.sparse_bytes)
+
+    def abort(self):
+        """Stop writing and leave no index behind (segments are kept for inspection)."""
+        self._closed = True
+        for future in self._pending:
+            future.cancel()
+        self._pool.shutdown(wait=True)
+        if self._hasher is not None:
+            self._hasher.close()
+        if self._segment is not None:
+            self._segment.close()
+
+
+class ImageReader:
+    """Random-access reader for images written by :class:`ImageWriter`.
+
+    Args:
+        path (str): Image or index path.
+        cache_chunks (int): Decompressed chunks kept in memory.
+    """
+
+    def __init__(self, path, cache_chunks=8):
+        self.index_path = index_path_for(path)
+        with open(self.index_path, "rb") as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ImageFormatError(f"{self.index_path} is not a BLACKSTORM image index")
+            (header_len,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+            self.header = json.loads(f.read(header_len))
+            table = f.read()
+        if self.header.get("version") != FORMAT_VERSION:
+            raise ImageFormatError(f"Unsupported image version {self.header.get('version')}")
+        if len(table) != self.header["chunk_count"] * _ENTRY.size:
+            raise ImageFormatError(f"Chunk table of {self.index_path} is truncated")
+        self.entries = [ChunkEntry(*fields) for fields in _ENTRY.iter_unpack(table)]
+        self.chunk_size = self.header["chunk_size"]
+        self.size = self.header["total_bytes"]
+        self.hashes = self.header.get("hashes", {})
+        self._decompress = CODECS[self.header["codec"]][1]
+        directory = os.path.dirname(self.index_path)
+        self._fds = []
+        for name in self.header["segments"]:
+            fd = os.open(os.path.join(directory, name), os.O_RDONLY)
+            self._fds.append(fd)
+            if os.pread(fd, len(SEGMENT_MAGIC), 0) != SEGMENT_MAGIC:
+                self.close()
+                raise ImageFormatError(f"{name} is not a BLACKSTORM image segment")
+        self._cache = OrderedDict()
+        self._cache_chunks = cache_chunks
+        self._cache_lock = threading.Lock()
+
+    @property
+    def chunk_count(self):
+        return len(self.entries)
+
+    def _chunk_length(self, index):
+        if index == len(self.entries) - 1:
+            return self.size - index * self.chunk_size
+        return self.chunk_size
+
+    def _load(self, index):
+        entry = self.entries[index]
+        if entry.zero:
+            return bytes(self._chunk_length(index))
+        data = os.pread(self._fds[entry.segment], entry.length, entry.offset)
+        if len(data) != entry.length:
+            raise ImageFormatError(f"Chunk {index} is truncated")
+        return self._decompress(data) if entry.compressed else data
+
+    def read_chunk(self, index):
+        """Return the uncompressed bytes of chunk ``index``."""
+        with self._cache_lock:
+            data = self._cache.get(index)
+            if data is not None:
+                self._cache.move_to_end(index)
+                return data
+        data = self._load(index)
+        with self._cache_lock:
+            self._cache[index] = data
+            while len(self._cache) > self._cache_chunks:
+                self._cache.popitem(last=False)
+        return data
+
+    def pread(self, size, offset):
+        """Read up to ``size`` bytes at ``offset``, decompressing only the chunks involved."""
+        end = min(self.size, offset + size)
+        parts = []
+        while offset < end:
+            index, start = divmod(offset, self.chunk_size)
+            chunk = self.read_chunk(index)
+            piece = chunk[start:start + end - offset]
+            if not piece:
+                raise ImageFormatError(f"Chunk {index} is shorter than expected")
+            parts.append(piece)
+            offset += len(piece)
+        return b"".join(parts)
+
+    def open(self):
+        """Return a seekable, read-only file object over the image contents."""
+        return io.BufferedReader(ImageStream(self), buffer_size=self.chunk_size)
+
+    def verify(self, workers=None, progress_callback=None, should_stop=None):
+        """Check every chunk against its stored SHA-256, in parallel.
+
+        Returns:
+            list: Indices of chunks that are unreadable or do not match.
+        """
+        bad = []
+        done = 0
+        lock = threading.Lock()
+
+        def check(index):
+            nonlocal done
+            if should_stop is not None and should_stop():
+                return
+            entry = self.entries[index]
+            try:
+                if entry.zero:
+                    ok = entry.sha256 == _zero_digest(self._chunk_length(index))
+                else:
+                    ok = hashlib.sha256(self._load(index)).digest() == entry.sha256
+            except (OSError, zlib.error, lzma.LZMAError, ImageFormatError):
+                ok = False
+            with lock:
+                if not ok:
+                    bad.append(index)
+                done += 1
+                if progress_callback is not None:
+                    progress_callback(done, self.chunk_count)
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            list(pool.map(check, range(self.chunk_count)))
+        return sorted(bad)
+
+    def close(self):
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ImageStream(io.RawIOBase):
+    """Seekable raw stream over an :class:`ImageReader`, for tools that expect a file."""
+
+    def __init__(self, reader):
+        super().__init__()
+        self._reader = reader
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._reader.size
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = offset
+        return self._pos
+
+    def readinto(self, buffer):
+        data = self._reader.pread(len(buffer), self._pos)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+def _data_extents(fd, start, end):
+    """Yield ``(offset, length, is_data)`` runs of a file, using SEEK_DATA/SEEK_HOLE.
+
+    Sources without hole information (block devices, other platforms) come
+    back as a single data run.
+    """
+    if not hasattr(os, "SEEK_DATA"):
+        yield start, end - start, True
+        return
+    offset = start
+    while offset < end:
+        try:
+            data = os.lseek(fd, offset, os.SEEK_DATA)
+        except OSError:
+            # ENXIO: nothing but a hole up to the end
+            data = end
+        data = min(data, end)
+        if data > offset:
+            yield offset, data - offset, False
+        if data >= end:
+            return
+        try:
+            hole = min(os.lseek(fd, data, os.SEEK_HOLE), end)
+        except OSError:
+            hole = end
+        yield data, hole - data, True
+        offset = hole
+
+
+def image_device(source, path, total_bytes=None, read_size=DEFAULT_CHUNK_SIZE, progress_callback=None,
+                 should_stop=None, progress_interval=0.5, **writer_options):
+    """Acquire ``source`` into a new image at ``path``.
+
+    Args:
+        source (str): Device or file to read.
+        path (str): Image path (the index gets a ``.bsi`` suffix).
+        total_bytes (int): Bytes to acquire; defaults to the size of ``source``.
+        read_size (int): Bytes per read from the source.
+        progress_callback (callable): Called as ``callback(bytes_done, total_bytes)``.
+        should_stop (callable): Polled between reads; returning True aborts the
+            acquisition and returns None.
+        **writer_options: Passed to :class:`ImageWriter`. With ``sparse``
+            (the default), holes in a sparse source file are not read at all.
+
+    Returns:
+        ImageSummary: The finished image, or None if stopped.
+
+    Raises:
+        EOFError: The source ended before ``total_bytes``; no index is
+            written for the partial image.
+    """
+    with open(source, "rb", buffering=0) as src:
+        if total_bytes is None:
+            total_bytes = os.lseek(src.fileno(), 0, os.SEEK_END)
+            os.lseek(src.fileno(), 0, os.SEEK_SET)
+        writer = ImageWriter(path, metadata={"source": source}, **writer_options)
+        if writer_options.get("sparse", True):
+            extents = _data_extents(src.fileno(), 0, total_bytes)
+        else:
+            extents = [(0, total_bytes, True)]
+        try:
+            done = 0
+            last_report = 0.0
+            for offset, length, is_data in extents:
+                if not is_data:
+                    writer.write_zeros(length)
+                    done += length
+                    continue
+                os.lseek(src.fileno(), offset, os.SEEK_SET)
+                end = offset + length
+                while done < end:
+                    if should_stop is not None and should_stop():
+                        writer.abort()
+                        return None
+                    data = src.read(min(read_size, end - done))
+                    if not data:
+                        # A truncated image must never be reported as a finished acquisition
+                        raise EOFError(f"{source} ended after {done} of {total_bytes} bytes")
+                    writer.write(data)
+                    done += len(data)
+                    now = time.monotonic()
+                    if progress_callback is not None and now - last_report >= progress_interval:
+                        last_report = now
+                        progress_callback(done, total_bytes)
+        except BaseException:
+            writer.abort()
+            raise
+        summary = writer.close()
+        if progress_callback is not None:
+            progress_callback(done, total_bytes)
+        return summary
+
+
+@dataclass
+class ImageCheck:
+    """Outcome of :func:`verify_image`."""
+
+    bad_chunks: list
+    image_hashes: dict
+    source_hashes: dict = field(default_factory=dict)
+
+    @property
+    def mismatched(self):
+        """Algorithms whose source digest differs from the digest recorded at acquisition."""
+        return [name for name, value in self.source_hashes.items() if self.image_hashes.get(name) != value]
+
+    @property
+    def passed(self):
+        return not self.bad_chunks and not self.mismatched
+
+
+def verify_image(path, source=None, workers=None, progress_callback=None, should_stop=None):
+    """Check an image's chunks and, optionally, re-hash its source alongside.
+
+    The chunk check and the source read run at the same time, so verifying
+    costs one pass over the source rather than a full decompress-then-hash.
+
+    Raises:
+        HashCancelled: If ``should_stop`` asked to stop while hashing the source.
+    """
+    with ImageReader(path) as reader, ThreadPoolExecutor(max_workers=1) as pool:
+        source_future = None
+        if source is not None and reader.hashes:
+            source_future = pool.submit(hash_file, source, list(reader.hashes), length=reader.size,
+                                        should_stop=should_stop)
+        bad = reader.verify(workers=workers, progress_callback=progress_callback, should_stop=should_stop)
+        source_hashes = source_future.result() if source_future is not None else {}
+        return ImageCheck(bad, dict(reader.hashes), source_hashes)
@@ -0,0 +1,175 @@
+"""Single-read, multi-digest hashing for acquisition and image verification.
+
+Data is read once in large chunks and every chunk is handed to one worker
+thread per digest algorithm. hashlib releases the GIL while it hashes large
+buffers, so MD5, SHA-1 and SHA-256 of the same stream run side by side and a
+verification costs one read of each file instead of one per algorithm.
+:class:`MultiHasher` can also be fed directly by code that is already reading
+the data, e.g. while an image is being written.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_QUEUE_DEPTH = 4
+
+
+class HashCancelled(Exception):
+    """Raised when hashing is stopped before the end of the data."""
+
+
+class MultiHasher:
+    """Compute several digests of one data stream in parallel.
+
+    Chunks passed to :meth:`update` are shared between the digest threads
+    without copying, so callers must not modify them afterwards (``bytes``
+    from ``read()`` are always safe).
+
+    Args:
+        algorithms (list): hashlib algorithm names, e.g. ``["md5", "sha256"]``.
+        queue_depth (int): Chunks buffered per digest before :meth:`update` blocks.
+    """
+
+    def __init__(self, algorithms, queue_depth=DEFAULT_QUEUE_DEPTH):
+        names = list(dict.fromkeys(name.lower() for name in algorithms))
+        if not names:
+            raise ValueError("At least one hash algorithm is required")
+        self.bytes_hashed = 0
+        self._digests = {name: hashlib.new(name) for name in names}
+        self._queues = {}
+        self._threads = []
+        self._errors = []
+        self._finished = False
+        # A single digest gains nothing from a thread hop
+        if len(names) > 1:
+            for name, digest in self._digests.items():
+                chunks = queue.Queue(maxsize=queue_depth)
+                thread = threading.Thread(target=self._consume, args=(digest, chunks),
+                                          name=f"hash-{name}", daemon=True)
+                self._queues[name] = chunks
+                self._threads.append(thread)
+                thread.start()
+
+    @property
+    def algorithms(self):
+        return list(self._digests)
+
+    def _consume(self, digest, chunks):
+        while True:
+            data = chunks.get()
+            if data is None:
+                return
+            try:
+                digest.update(data)
+            except Exception as exc:  # pragma: no cover - hashlib does not fail on bytes
+                self._errors.append(exc)
+
+    def update(self, data):
+        """Feed the next chunk of the stream to every digest."""
+        if self._finished:
+            raise ValueError("update() after hexdigests()")
+        self.bytes_hashed += len(data)
+        if not self._threads:
+            for digest in self._digests.values():
+                digest.update(data)
+            return
+        for chunks in self._queues.values():
+            chunks.put(data)
+
+    def close(self):
+        """Stop the digest threads once they have consumed everything queued."""
+        if self._finished:
+            return
+        self._finished = True
+        for chunks in self._queues.values():
+            chunks.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def hexdigests(self):
+        """Finish the stream and return ``{algorithm: hexdigest}``."""
+        self.close()
+        if self._errors:
+            raise self._errors[0]
+        return {name: digest.hexdigest() for name, digest in self._digests.items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def hash_file(path, algorithms, chunk_size=DEFAULT_CHUNK_SIZE, length=None,
+              progress_callback=None, should_stop=None, progress_interval=0.5):
+    """Hash a file or block device with every algorithm in a single read.
+
+    Args:
+        path (str): File or device to read.
+        algorithms (list): hashlib algorithm names.
+        chunk_size (int): Bytes per read.
+        length (int): Only hash the first ``length`` bytes; defaults to the whole file.
+        progress_callback (callable): Called as ``callback(bytes_done, total_bytes)``.
+        should_stop (callable): Polled between reads; returning True raises
+            :class:`HashCancelled`.
+        progress_interval (float): Minimum seconds between progress callbacks.
+
+    Returns:
+        dict: ``{algorithm: hexdigest}``.
+    """
+    with open(path, "rb", buffering=0) as f:
+        total = os.lseek(f.fileno(), 0, os.SEEK_END) if length is None else length
+        os.lseek(f.fileno(), 0, os.SEEK_SET)
+        with MultiHasher(algorithms) as hasher:
+            done = 0
+            last_report = 0.0
+            while done < total:
+                if should_stop is not None and should_stop():
+                    raise HashCancelled(f"Hashing of {path} cancelled")
+                data = f.read(min(chunk_size, total - done))
+                if not data:
+                    break
+                hasher.update(data)
+                done += len(data)
+                now = time.monotonic()
+                if progress_callback is not None and now - last_report >= progress_interval:
+                    last_report = now
+                    progress_callback(done, total)
+            if progress_callback is not None:
+                progress_callback(done, total)
+            return hasher.hexdigests()
+
+
+def hash_files(paths, algorithms, progress_callback=None, **kwargs):
+    """Hash several files concurrently, each with :func:`hash_file`.
+
+    Meant for comparing a source device with its image: both are read at the
+    same time, so the verification takes as long as the slower of the two.
+    ``progress_callback`` receives the combined ``(bytes_done, total_bytes)``.
+
+    Returns:
+        list: One ``{algorithm: hexdigest}`` dict per path, in order.
+    """
+    paths = list(paths)
+    done = [0] * len(paths)
+    totals = [0] * len(paths)
+    lock = threading.Lock()
+
+    def reporter(index):
+        def report(bytes_done, total_bytes):
+            with lock:
+                done[index], totals[index] = bytes_done, total_bytes
+                if progress_callback is not None:
+                    progress_callback(sum(done), sum(totals))
+        return report
+
+    with ThreadPoolExecutor(max_workers=max(1, len(paths))) as pool:
+        futures = [pool.submit(hash_file, path, algorithms, progress_callback=reporter(i), **kwargs)
+                   for i, path in enumerate(paths)]
+        return [future.result() for future in futures]
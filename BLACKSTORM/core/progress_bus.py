@@ -0,0 +1,183 @@
+"""Coalescing progress channel between wipe jobs and the UI thread.
+
+Workers publish typed :class:`ProgressEvent` snapshots as often as they like;
+the bus only keeps the newest event per job. The UI drains it on a timer, so
+the number of UI updates per tick is bounded by the number of jobs instead of
+by how chatty each job is. Every job's events can also be recorded, rate
+limited, to a JSONL timeline for later review.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+DEFAULT_TIMELINE_DIR = "/var/log/blackstorm/timelines"
+
+logger = logging.getLogger(__name__)
+
+
+def _format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024.0 or unit == "TB":
+            break
+        size /= 1024.0
+    return f"{size:.1f} {unit}"
+
+
+@dataclass
+class ProgressEvent:
+    """Progress of one job at one moment."""
+
+    job: str
+    phase: str
+    label: str
+    bytes_done: int
+    total_bytes: int
+    rate: float
+    pass_index: int = 0
+    pass_count: int = 1
+    eta: float = None
+    timestamp: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_pass_progress(cls, job, update):
+        """Build a wipe event from a :class:`~BLACKSTORM.core.wipe_engine.PassProgress`."""
+        return cls(job, "wipe", update.label, update.bytes_written, update.total_bytes, update.rate,
+                   update.pass_index, update.pass_count, update.eta)
+
+    @classmethod
+    def from_verify_progress(cls, job, update):
+        """Build a verify event from a :class:`~BLACKSTORM.core.wipe_verify.VerifyProgress`."""
+        remaining = update.bytes_to_check - update.bytes_checked
+        eta = remaining / update.rate if update.rate > 0 else None
+        return cls(job, "verify", "Verifying", update.bytes_checked, update.bytes_to_check,
+                   update.rate, eta=eta)
+
+    @property
+    def percent(self):
+        if not self.total_bytes:
+            return 100.0
+        return min(100.0, self.bytes_done * 100.0 / self.total_bytes)
+
+    @property
+    def overall_percent(self):
+        if not self.pass_count:
+            return 100.0
+        return min(100.0, (self.pass_index + self.percent / 100.0) * 100.0 / self.pass_count)
+
+    def describe(self):
+        """Human readable status line for this event."""
+        text = (f"{self.label} - {_format_bytes(self.bytes_done)} / {_format_bytes(self.total_bytes)} "
+                f"({int(self.percent)}%) @ {self.rate / 1024 / 1024:.1f} MB/s")
+        if self.phase == "wipe":
+            text = f"Pass {self.pass_index + 1}/{self.pass_count}: {text}"
+        if self.eta is not None:
+            text += f", ETA {int(self.eta // 60)}m {int(self.eta % 60)}s"
+        return text
+
+    def to_dict(self):
+        return asdict(self)
+
+
+class TimelineRecorder:
+    """Append one job's progress events to a JSONL file, at most once per ``interval``.
+
+    Args:
+        path (str): Timeline file to append to.
+        interval (float): Minimum seconds between recorded events.
+    """
+
+    def __init__(self, path, interval=1.0):
+        self.path = path
+        self.interval = interval
+        self._file = open(path, "a", buffering=1)
+        self._last = None
+        self._pending = None
+
+    def record(self, event):
+        if self._last is not None and event.timestamp - self._last < self.interval:
+            # Keep the newest skipped event so the final state is never lost
+            self._pending = event
+            return
+        self._write(event)
+
+    def _write(self, event):
+        self._file.write(json.dumps(event.to_dict()) + "\n")
+        self._last = event.timestamp
+        self._pending = None
+
+    def close(self):
+        if self._pending is not None:
+            self._write(self._pending)
+        self._file.close()
+
+
+class ProgressBus:
+    """Thread-safe, coalescing progress channel.
+
+    Args:
+        timeline_dir (str): Directory for per-job JSONL timelines, or None to
+            skip recording.
+        record_interval (float): Minimum seconds between recorded events per job.
+    """
+
+    def __init__(self, timeline_dir=None, record_interval=1.0):
+        self.timeline_dir = timeline_dir
+        self.record_interval = record_interval
+        self.published = 0
+        self._latest = {}
+        self._recorders = {}
+        self._lock = threading.Lock()
+
+    def timeline_path(self, job):
+        name = os.path.basename(job.rstrip("/")) or "job"
+        return os.path.join(self.timeline_dir, f"timeline_{name}_{int(time.time())}.jsonl")
+
+    def publish(self, event):
+        """Offer an event; only the newest one per job survives until the next drain."""
+        with self._lock:
+            self.published += 1
+            self._latest[event.job] = event
+            if self.timeline_dir is not None:
+                self._record(event)
+
+    def _record(self, event):
+        recorder = self._recorders.get(event.job)
+        if recorder is None:
+            if event.job in self._recorders:
+                return
+            try:
+                os.makedirs(self.timeline_dir, exist_ok=True)
+                recorder = TimelineRecorder(self.timeline_path(event.job), self.record_interval)
+            except OSError as exc:
+                logger.warning("Progress timeline disabled for %s: %s", event.job, exc)
+                recorder = None
+            self._recorders[event.job] = recorder
+            if recorder is None:
+                return
+        recorder.record(event)
+
+    def drain(self):
+        """Return the newest event of every job that reported since the last drain."""
+        with self._lock:
+            events = list(self._latest.values())
+            self._latest.clear()
+        return events
+
+    def close_job(self, job):
+        """Flush and close the timeline of a finished job."""
+        with self._lock:
+            recorder = self._recorders.pop(job, None)
+            if recorder is not None:
+                recorder.close()
+
+    def close(self):
+        with self._lock:
+            for recorder in self._recorders.values():
+                if recorder is not None:
+                    recorder.close()
+            self._recorders.clear()
@@ -0,0 +1,383 @@
+"""In-process retry of unreadable ranges from a ddrescue map.
+
+:class:`RescueMap` holds a ddrescue mapfile as a sorted partition of the
+device into disjoint ``[start, end)`` intervals, each with a ddrescue status
+character. Lookups and updates bisect the interval starts, neighbours with the
+same status are merged as ranges are resolved, and per-status byte totals are
+kept up to date, so statistics never require another pass over the file.
+
+:class:`SectorRescuer` re-reads the failed ranges of such a map from one open
+file descriptor: block size shrinks pass by pass (failed large blocks are
+split until single sectors are tried), alternate passes run backwards, every
+zone gets a time budget so one dying area cannot eat the whole session, and
+the map is written back periodically in ddrescue format so the session can be
+resumed by ddrescue or by another rescuer. The source is read with
+``O_DIRECT`` where possible so single sectors are really re-read from the
+drive and no readahead touches the failing area; otherwise readahead is
+turned off with ``POSIX_FADV_RANDOM``.
+"""
+from __future__ import annotations
+
+import errno
+import os
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+from BLACKSTORM.core.wipe_engine import aligned_buffer
+
+NON_TRIED = "?"
+NON_TRIMMED = "*"
+NON_SCRAPED = "/"
+BAD_SECTOR = "-"
+FINISHED = "+"
+STATUSES = (NON_TRIED, NON_TRIMMED, NON_SCRAPED, BAD_SECTOR, FINISHED)
+FAILED = (NON_TRIED, NON_TRIMMED, NON_SCRAPED, BAD_SECTOR)
+
+DEFAULT_BLOCK_SIZES = (64 * 1024, 4096, 512)
+
+
+class RescueMap:
+    """A device-sized partition into status intervals, as in a ddrescue mapfile.
+
+    Args:
+        size (int): Device size in bytes.
+        status (str): Initial status of the whole device.
+    """
+
+    def __init__(self, size, status=NON_TRIED):
+        self.size = size
+        self.current_pos = 0
+        self.current_status = NON_TRIED
+        self.current_pass = 1
+        self._starts = [0] if size else []
+        self._statuses = [status] if size else []
+        self._totals = dict.fromkeys(STATUSES, 0)
+        self._totals[status] = size
+
+    @classmethod
+    def parse(cls, text, size=None):
+        """Build a map from ddrescue mapfile text.
+
+        Args:
+            text (str): Mapfile contents.
+            size (int): Device size; gaps and the tail past the last block
+                are filled in as non-tried. Defaults to the end of the last block.
+
+        Returns:
+            RescueMap: The parsed map.
+        """
+        blocks = []
+        current = None
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split()
+            if len(parts) >= 3 and parts[1].startswith("0x"):
+                if parts[2] in STATUSES:
+                    blocks.append((int(parts[0], 16), int(parts[1], 16), parts[2]))
+            elif current is None and len(parts) >= 2:
+                # The status line: current_pos current_status [current_pass]
+                current = parts
+        end = max((pos + length for pos, length, _ in blocks), default=0)
+        rescue_map = cls(size if size is not None else end)
+        for pos, length, status in blocks:
+            if status != NON_TRIED:
+                rescue_map.set_status(pos, length, status)
+        if current is not None:
+            rescue_map.current_pos = int(current[0], 16)
+            rescue_map.current_status = current[1]
+            if len(current) > 2 and current[2].isdigit():
+                rescue_map.current_pass = int(current[2])
+        return rescue_map
+
+    @classmethod
+    def load(cls, path, size=None):
+        """Read a ddrescue mapfile; a missing file gives an all non-tried map."""
+        try:
+            with open(path, "r") as f:
+                return cls.parse(f.read(), size)
+        except FileNotFoundError:
+            if size is None:
+                raise
+            return cls(size)
+
+    def save(self, path):
+        """Write the map in ddrescue format, atomically."""
+        lines = [
+            "# Mapfile. Created by BLACKSTORM sector rescue",
+            "# current_pos  current_status  current_pass",
+            f"0x{self.current_pos:08X}     {self.current_status}               {self.current_pass}",
+            "#      pos        size  status",
+        ]
+        lines.extend(f"0x{start:08X}  0x{end - start:08X}  {status}" for start, end, status in self)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def __iter__(self):
+        for index, start in enumerate(self._starts):
+            yield start, self._end(index), self._statuses[index]
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _end(self, index):
+        return self._starts[index + 1] if index + 1 < len(self._starts) else self.size
+
+    def _split(self, pos):
+        """Make ``pos`` an interval boundary."""
+        if pos <= 0 or pos >= self.size:
+            return
+        index = bisect_right(self._starts, pos) - 1
+        if self._starts[index] != pos:
+            self._starts.insert(index + 1, pos)
+            self._statuses.insert(index + 1, self._statuses[index])
+
+    def status_at(self, pos):
+        """Status of the byte at ``pos``."""
+        if not 0 <= pos < self.size:
+            raise IndexError(f"Position {pos} outside the device")
+        return self._statuses[bisect_right(self._starts, pos) - 1]
+
+    def set_status(self, pos, length, status):
+        """Give ``[pos, pos + length)`` the status ``status``."""
+        end = min(pos + length, self.size)
+        pos = max(pos, 0)
+        if end <= pos:
+            return
+        self._split(pos)
+        self._split(end)
+        first = bisect_left(self._starts, pos)
+        last = bisect_left(self._starts, end)
+        for index in range(first, last):
+            self._totals[self._statuses[index]] -= self._end(index) - self._starts[index]
+        self._starts[first:last] = [pos]
+        self._statuses[first:last] = [status]
+        self._totals[status] += end - pos
+        # Merge with equal neighbours to keep the map small
+        if first + 1 < len(self._starts) and self._statuses[first + 1] == status:
+            del self._starts[first + 1], self._statuses[first + 1]
+        if first > 0 and self._statuses[first - 1] == status:
+            del self._starts[first], self._statuses[first]
+
+    def ranges(self, statuses=FAILED, reverse=False):
+        """Snapshot of the ``(start, end, status)`` intervals with one of ``statuses``."""
+        found = [interval for interval in self if interval[2] in statuses]
+        return found[::-1] if reverse else found
+
+    def bytes_with(self, *statuses):
+        """Total bytes currently in any of ``statuses``."""
+        return sum(self._totals[status] for status in statuses)
+
+    @property
+    def rescued_bytes(self):
+        return self._totals[FINISHED]
+
+    @property
+    def failed_bytes(self):
+        return self.bytes_with(*FAILED)
+
+
+@dataclass
+class RescueResult:
+    """Outcome of :meth:`SectorRescuer.run`."""
+
+    recovered_bytes: int
+    remaining_bytes: int
+    reads: int
+    read_errors: int
+    zones_timed_out: int
+    elapsed: float
+    stopped: bool = False
+
+
+class SectorRescuer:
+    """Retry the failed ranges of a :class:`RescueMap` in-process.
+
+    Every block-size pass reads the failed ranges block by block; a failed
+    block keeps a "non-scraped" status and is read again at the next, smaller
+    size, and a failed single sector becomes a bad sector. Retry passes then
+    re-read the bad sectors, alternating direction.
+
+    Args:
+        source (str): Device to read.
+        output (str): Raw image to patch in place (created if missing).
+        rescue_map (RescueMap): Map to work from; updated as ranges resolve.
+        map_path (str): Where to save the map; None keeps it in memory only.
+        sector_size (int): Smallest read.
+        block_sizes (tuple): Read sizes of the splitting passes, largest first.
+        retries (int): Extra sector-sized passes over bad sectors.
+        reverse (bool): Run every other pass from the end of the device.
+        zone_timeout (float): Seconds one failed range may take per pass
+            before it is left for the next pass; 0 disables the limit.
+        save_interval (float): Minimum seconds between map saves.
+        direct_io (bool): Read the source with ``O_DIRECT`` when supported.
+        progress_callback (callable): Called as ``callback(bytes_done, bytes_total)``
+            with the bytes processed in the current pass.
+        should_stop (callable): Polled between reads.
+    """
+
+    def __init__(self, source, output, rescue_map, map_path=None, sector_size=512,
+                 block_sizes=DEFAULT_BLOCK_SIZES, retries=1, reverse=True, zone_timeout=30.0,
+                 save_interval=5.0, direct_io=True, progress_callback=None, should_stop=None):
+        self.source = source
+        self.output = output
+        self.map = rescue_map
+        self.map_path = map_path
+        self.sector_size = sector_size
+        sizes = sorted({max(sector_size, size - size % sector_size) for size in block_sizes}, reverse=True)
+        if sizes[-1] != sector_size:
+            sizes.append(sector_size)
+        self.block_sizes = sizes
+        self.retries = retries
+        self.reverse = reverse
+        self.zone_timeout = zone_timeout
+        self.save_interval = save_interval
+        self.direct_io = direct_io
+        self.progress_callback = progress_callback
+        self.should_stop = should_stop
+        self.reads = 0
+        self.read_errors = 0
+        self.zones_timed_out = 0
+        self._src = None
+        self._dst = None
+        self._direct = False
+        self._buffer = None
+        self._last_save = 0.0
+
+    def _open_source(self):
+        direct_flag = getattr(os, "O_DIRECT", 0)
+        if self.direct_io and direct_flag:
+            try:
+                self._src = os.open(self.source, os.O_RDONLY | direct_flag)
+                self._direct = True
+                self._buffer = memoryview(aligned_buffer(self.block_sizes[0]))
+                return
+            except OSError as exc:
+                if exc.errno != errno.EINVAL:
+                    raise
+        self._src = os.open(self.source, os.O_RDONLY)
+        self._direct = False
+        self._no_readahead()
+
+    def _no_readahead(self):
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(self._src, 0, 0, os.POSIX_FADV_RANDOM)
+            except OSError:
+                pass
+
+    def _read(self, offset, size):
+        """Read ``size`` bytes at ``offset``; raises OSError on a read error."""
+        if self._direct:
+            try:
+                count = os.preadv(self._src, [self._buffer[:size]], offset)
+            except OSError as exc:
+                if exc.errno != errno.EINVAL:
+                    raise
+                # Reads smaller than the drive's logical sector: go buffered
+                os.close(self._src)
+                self._src = os.open(self.source, os.O_RDONLY)
+                self._direct = False
+                self._no_readahead()
+                return self._read(offset, size)
+            data = bytes(self._buffer[:count])
+        else:
+            data = os.pread(self._src, size, offset)
+        if len(data) != size:
+            raise OSError(f"Short read at {offset}")
+        return data
+
+    def _stopped(self):
+        return self.should_stop is not None and self.should_stop()
+
+    def _save(self, force=False):
+        now = time.monotonic()
+        if self.map_path and (force or now - self._last_save >= self.save_interval):
+            self._last_save = now
+            self.map.save(self.map_path)
+
+    def run(self):
+        """Run every pass and return a :class:`RescueResult`."""
+        started = time.monotonic()
+        before = self.map.rescued_bytes
+        passes = [(size, FAILED) for size in self.block_sizes]
+        passes += [(self.sector_size, (BAD_SECTOR,))] * self.retries
+        stopped = False
+        self._open_source()
+        try:
+            self._dst = os.open(self.output, os.O_WRONLY | os.O_CREAT, 0o644)
+            for number, (block_size, statuses) in enumerate(passes):
+                backwards = self.reverse and number % 2 == 1
+                self.map.current_pass = number + 1
+                self.map.current_status = NON_SCRAPED if statuses is FAILED else BAD_SECTOR
+                if not self._run_pass(block_size, statuses, backwards):
+                    stopped = True
+                    break
+                if not self.map.failed_bytes:
+                    break
+        finally:
+            os.close(self._src)
+            if self._dst is not None:
+                os.fsync(self._dst)
+                os.close(self._dst)
+            self._src = self._dst = None
+            if self._buffer is not None:
+                self._buffer.release()
+                self._buffer = None
+        if not stopped and not self.map.failed_bytes:
+            self.map.current_status = FINISHED
+        self._save(force=True)
+        return RescueResult(self.map.rescued_bytes - before, self.map.failed_bytes, self.reads,
+                            self.read_errors, self.zones_timed_out, time.monotonic() - started, stopped)
+
+    def _run_pass(self, block_size, statuses, backwards):
+        zones = self.map.ranges(statuses, reverse=backwards)
+        total = sum(end - start for start, end, _ in zones)
+        done = 0
+        for start, end, _ in zones:
+            deadline = time.monotonic() + self.zone_timeout if self.zone_timeout else None
+            for pos, size in self._blocks(start, end, block_size, backwards):
+                if self._stopped():
+                    self._save(force=True)
+                    return False
+                if deadline is not None and time.monotonic() > deadline:
+                    # Leave the rest of this zone for the next pass
+                    self.zones_timed_out += 1
+                    break
+                self.map.current_pos = pos
+                self.reads += 1
+                try:
+                    data = self._read(pos, size)
+                except OSError:
+                    self.read_errors += 1
+                    self.map.set_status(pos, size, BAD_SECTOR if size <= self.sector_size else NON_SCRAPED)
+                else:
+                    os.pwrite(self._dst, data, pos)
+                    self.map.set_status(pos, size, FINISHED)
+                done += size
+                if self.progress_callback is not None:
+                    self.progress_callback(done, total)
+                self._save()
+        return True
+
+    @staticmethod
+    def _blocks(start, end, block_size, backwards):
+        """Yield ``(pos, size)`` reads covering ``[start, end)``, aligned to ``block_size``."""
+        if backwards:
+            pos = end
+            while pos > start:
+                size = min(pos % block_size or block_size, pos - start)
+                pos -= size
+                yield pos, size
+        else:
+            pos = start
+            while pos < end:
+                size = min(block_size - pos % block_size, end - pos)
+                yield pos, size
+                pos += size
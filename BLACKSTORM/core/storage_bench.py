@@ -0,0 +1,390 @@
+"""Built-in storage benchmark with latency histograms.
+
+Each :class:`BenchSpec` describes one workload: sequential or random, read or
+write, block size, queue depth, thread count and duration. The engine runs it
+against a test file or a raw device with ``threads * queue_depth`` workers,
+each issuing synchronous positioned I/O (``preadv``/``pwritev`` release the
+GIL), so the device sees that many requests in flight. I/O uses ``O_DIRECT``
+with page-aligned buffers where the target supports it, so results come from
+the drive instead of the page cache, and every request's latency goes into a
+log-linear :class:`LatencyHistogram` for percentiles.
+
+Results can be appended to a JSONL history and compared with earlier runs of
+the same drive or with other drives.
+"""
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+DEFAULT_HISTORY_PATH = "/var/log/blackstorm/benchmarks.jsonl"
+PATTERNS = ("read", "write", "randread", "randwrite")
+SUB_BUCKET_BITS = 4  # 16 sub-buckets per power of two: < 6.25% relative error
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies in nanoseconds.
+
+    Values below ``2 ** SUB_BUCKET_BITS`` are counted exactly; above that each
+    power of two is split into ``2 ** SUB_BUCKET_BITS`` linear sub-buckets.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def bucket(value):
+        if value < (1 << SUB_BUCKET_BITS):
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        return ((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - (1 << SUB_BUCKET_BITS)
+
+    @staticmethod
+    def bucket_value(index):
+        """Upper bound of bucket ``index``."""
+        if index < (1 << SUB_BUCKET_BITS):
+            return index
+        shift = (index >> SUB_BUCKET_BITS) - 1
+        mantissa = (index & ((1 << SUB_BUCKET_BITS) - 1)) + (1 << SUB_BUCKET_BITS)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = self.bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percent):
+        """Latency (ns) at or below which ``percent`` of requests completed."""
+        if not self.count:
+            return 0
+        target = max(1, math.ceil(self.count * percent / 100.0))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self.bucket_value(index), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self):
+        return {"counts": {str(k): v for k, v in sorted(self.counts.items())}, "count": self.count,
+                "total": self.total, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.counts = {int(k): v for k, v in data.get("counts", {}).items()}
+        histogram.count = data.get("count", 0)
+        histogram.total = data.get("total", 0)
+        histogram.min = data.get("min")
+        histogram.max = data.get("max")
+        return histogram
+
+
+@dataclass
+class BenchSpec:
+    """One benchmark workload."""
+
+    name: str
+    pattern: str = "randread"
+    block_size: int = 4096
+    queue_depth: int = 1
+    threads: int = 1
+    duration: float = 10.0
+
+    def __post_init__(self):
+        if self.pattern not in PATTERNS:
+            raise ValueError(f"Unknown pattern {self.pattern!r}, expected one of {PATTERNS}")
+        if self.block_size <= 0 or self.block_size % 512:
+            raise ValueError("Block size must be a positive multiple of 512")
+
+    @property
+    def is_write(self):
+        return self.pattern in ("write", "randwrite")
+
+    @property
+    def is_random(self):
+        return self.pattern.startswith("rand")
+
+    @property
+    def workers(self):
+        return max(1, self.threads) * max(1, self.queue_depth)
+
+
+def default_suite(duration=10.0, writes=True):
+    """The standard qualification suite: sequential 1 MiB and random 4 KiB at QD1 and QD32."""
+    specs = [
+        BenchSpec("Sequential read 1M", "read", 1 << 20, 1, 1, duration),
+        BenchSpec("Random read 4K QD1", "randread", 4096, 1, 1, duration),
+        BenchSpec("Random read 4K QD32", "randread", 4096, 32, 1, duration),
+    ]
+    if writes:
+        specs += [
+            BenchSpec("Sequential write 1M", "write", 1 << 20, 1, 1, duration),
+            BenchSpec("Random write 4K QD1", "randwrite", 4096, 1, 1, duration),
+            BenchSpec("Random write 4K QD32", "randwrite", 4096, 32, 1, duration),
+        ]
+    return specs
+
+
+@dataclass
+class BenchResult:
+    """Outcome of one :class:`BenchSpec` run."""
+
+    spec: BenchSpec
+    target: str
+    bytes_done: int
+    ios: int
+    elapsed: float
+    histogram: LatencyHistogram
+    direct: bool
+    errors: int = 0
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def throughput(self):
+        """Bytes per second."""
+        return self.bytes_done / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def iops(self):
+        return self.ios / self.elapsed if self.elapsed else 0.0
+
+    def latency_us(self, percent):
+        return self.histogram.percentile(percent) / 1000.0
+
+    def describe(self):
+        return (f"{self.throughput / 1e6:8.1f} MB/s {self.iops:9.0f} IOPS  "
+                f"lat p50 {self.latency_us(50):.0f} / p99 {self.latency_us(99):.0f} / "
+                f"p99.9 {self.latency_us(99.9):.0f} us")
+
+    def to_dict(self):
+        return {
+            "spec": asdict(self.spec), "target": self.target, "bytes_done": self.bytes_done,
+            "ios": self.ios, "elapsed": self.elapsed, "direct": self.direct, "errors": self.errors,
+            "timestamp": self.timestamp, "throughput": self.throughput, "iops": self.iops,
+            "p50_us": self.latency_us(50), "p99_us": self.latency_us(99), "p999_us": self.latency_us(99.9),
+            "histogram": self.histogram.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(BenchSpec(**data["spec"]), data["target"], data["bytes_done"], data["ios"],
+                   data["elapsed"], LatencyHistogram.from_dict(data["histogram"]), data["direct"],
+                   data.get("errors", 0), data["timestamp"])
+
+
+def _open_target(path, write):
+    """Open ``path`` for direct I/O if possible; returns ``(fd, direct)``."""
+    flags = os.O_RDWR if write else os.O_RDONLY
+    direct = getattr(os, "O_DIRECT", 0)
+    if direct:
+        try:
+            return os.open(path, flags | direct), True
+        except OSError:
+            pass  # tmpfs and some filesystems refuse O_DIRECT
+    return os.open(path, flags), False
+
+
+def _target_size(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.lseek(fd, 0, os.SEEK_END)
+    finally:
+        os.close(fd)
+
+
+def prepare_test_file(path, size, chunk_size=1 << 20, should_stop=None):
+    """Create ``path`` filled with incompressible data so reads hit real extents."""
+    if os.path.exists(path) and os.path.getsize(path) >= size:
+        return
+    block = os.urandom(chunk_size)
+    with open(path, "wb") as f:
+        written = 0
+        while written < size:
+            if should_stop is not None and should_stop():
+                return
+            written += f.write(block[:min(chunk_size, size - written)])
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def run_spec(spec, target, size=None, should_stop=None, progress_callback=None):
+    """Run one workload against ``target`` (a file or block device).
+
+    Args:
+        spec (BenchSpec): Workload to run.
+        target (str): File or device; writes are destructive.
+        size (int): Bytes of the target to use; defaults to all of it.
+        should_stop (callable): Polled by the workers; stops the run early.
+        progress_callback (callable): Called about once a second with
+            ``(elapsed, duration)``.
+
+    Returns:
+        BenchResult: Throughput, IOPS and latency histogram.
+    """
+    size = size or _target_size(target)
+    blocks = size // spec.block_size
+    if blocks < 1:
+        raise ValueError(f"{target} is smaller than one {spec.block_size}-byte block")
+    fd, direct = _open_target(target, spec.is_write)
+    stop = threading.Event()
+    lock = threading.Lock()
+    histogram = LatencyHistogram()
+    totals = {"bytes": 0, "ios": 0, "errors": 0}
+    workers = spec.workers
+    # Sequential workers each stream through their own slice of the target
+    slice_blocks = max(1, blocks // workers)
+    payload = os.urandom(spec.block_size)
+
+    def worker(number):
+        local = LatencyHistogram()
+        done = ios = errors = 0
+        buffer = mmap.mmap(-1, spec.block_size)  # page aligned, as O_DIRECT requires
+        if spec.is_write:
+            buffer.write(payload)
+        rng = random.Random(number)
+        first = (number * slice_blocks) % blocks
+        block = first
+        clock = time.perf_counter_ns
+        try:
+            while not stop.is_set():
+                if spec.is_random:
+                    block = rng.randrange(blocks)
+                offset = block * spec.block_size
+                started = clock()
+                try:
+                    if spec.is_write:
+                        count = os.pwritev(fd, [buffer], offset)
+                    else:
+                        count = os.preadv(fd, [buffer], offset)
+                except OSError:
+                    errors += 1
+                    count = 0
+                local.record(clock() - started)
+                done += count
+                ios += 1
+                if not spec.is_random:
+                    block += 1
+                    if block >= blocks or block >= first + slice_blocks:
+                        block = first
+        finally:
+            buffer.close()
+            with lock:
+                histogram.merge(local)
+                totals["bytes"] += done
+                totals["ios"] += ios
+                totals["errors"] += errors
+
+    threads = [threading.Thread(target=worker, args=(n,), name=f"bench-{n}", daemon=True)
+               for n in range(workers)]
+    started = time.monotonic()
+    try:
+        for thread in threads:
+            thread.start()
+        deadline = started + spec.duration
+        while (now := time.monotonic()) < deadline:
+            if should_stop is not None and should_stop():
+                break
+            if progress_callback is not None:
+                progress_callback(now - started, spec.duration)
+            time.sleep(min(1.0, deadline - now))
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        if spec.is_write:
+            os.fsync(fd)
+        os.close(fd)
+    return BenchResult(spec, target, totals["bytes"], totals["ios"], elapsed, histogram, direct,
+                       totals["errors"])
+
+
+class BenchHistory:
+    """Benchmark results kept as JSON lines, one per workload run.
+
+    Args:
+        path (str): History file.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+
+    def append(self, result, device=None):
+        """Record ``result``; ``device`` (model, serial, ...) identifies the drive."""
+        record = result.to_dict()
+        record["device"] = dict(device or {})
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def records(self, name=None, serial=None, target=None):
+        """Earlier records, oldest first, optionally of one workload and drive."""
+        found = []
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if name is not None and record["spec"]["name"] != name:
+                        continue
+                    if serial is not None and record.get("device", {}).get("serial") != serial:
+                        continue
+                    if target is not None and record["target"] != target:
+                        continue
+                    found.append(record)
+        except FileNotFoundError:
+            pass
+        return found
+
+    def previous(self, result, device=None):
+        """The latest earlier record of the same workload on the same drive, or None."""
+        serial = (device or {}).get("serial") or None
+        records = self.records(result.spec.name, serial=serial,
+                               target=None if serial else result.target)
+        records = [r for r in records if r["timestamp"] < result.timestamp]
+        return records[-1] if records else None
+
+
+def compare(result, record):
+    """Relative change of ``result`` against an earlier history record.
+
+    Returns:
+        dict: Fractional change of throughput, IOPS and p99 latency.
+    """
+    def change(new, old):
+        return (new - old) / old if old else 0.0
+    return {
+        "throughput": change(result.throughput, record["throughput"]),
+        "iops": change(result.iops, record["iops"]),
+        "p99_us": change(result.latency_us(99), record["p99_us"]),
+    }
@@ -0,0 +1,127 @@
+"""Per-extent digests of what a wipe pass wrote.
+
+The final wipe pass is hashed while it is written: the device is divided into
+fixed-size extents, each extent gets its own SHA-256 leaf and the leaves are
+combined into a Merkle root that identifies the whole written surface. A
+single read-back pass can then confirm the device extent by extent, in
+parallel, without a separate hashing read.
+"""
+from __future__ import annotations
+
+import hashlib
+
+DEFAULT_EXTENT_SIZE = 64 * 1024 * 1024
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def merkle_root(leaves):
+    """Combine leaf digests into a single Merkle root (hex)."""
+    level = [hashlib.sha256(_LEAF_PREFIX + leaf).digest() for leaf in leaves]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(_NODE_PREFIX + level[i] + level[i + 1]).digest()
+                 for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+
+def _pattern_leaf(pattern, phase, length):
+    """Hash ``length`` bytes of ``pattern`` repeated from ``phase``."""
+    # A block that is a whole number of pattern periods keeps every block in phase
+    block_size = len(pattern) * max(1, (4 * 1024 * 1024) // len(pattern))
+    block = (pattern * (block_size // len(pattern) + 1))[phase:phase + block_size]
+    hasher = hashlib.sha256()
+    remaining = length
+    while remaining:
+        take = min(remaining, block_size)
+        hasher.update(memoryview(block)[:take])
+        remaining -= take
+    return hasher.digest()
+
+
+class ExtentDigest:
+    """SHA-256 leaves for every extent of a written pass.
+
+    Feed the pass sequentially with :meth:`update`, or build the digest for a
+    constant pattern directly with :meth:`for_pattern`.
+
+    Args:
+        total_bytes (int): Size of the device the pass covered.
+        extent_size (int): Bytes covered by each leaf.
+    """
+
+    def __init__(self, total_bytes, extent_size=DEFAULT_EXTENT_SIZE):
+        self.total_bytes = total_bytes
+        self.extent_size = extent_size
+        self.leaves = []
+        self._hasher = hashlib.sha256()
+        self._filled = 0
+
+    @property
+    def extent_count(self):
+        return -(-self.total_bytes // self.extent_size)
+
+    @property
+    def complete(self):
+        return len(self.leaves) == self.extent_count
+
+    def extent_range(self, index):
+        """Return the ``(start, end)`` byte range covered by leaf ``index``."""
+        start = index * self.extent_size
+        return start, min(start + self.extent_size, self.total_bytes)
+
+    def update(self, data):
+        """Feed the next bytes of the pass, in device order."""
+        view = memoryview(data)
+        while len(view):
+            start, end = self.extent_range(len(self.leaves))
+            take = min(len(view), (end - start) - self._filled)
+            self._hasher.update(view[:take])
+            self._filled += take
+            view = view[take:]
+            if self._filled == end - start:
+                self.leaves.append(self._hasher.digest())
+                self._hasher = hashlib.sha256()
+                self._filled = 0
+
+    @classmethod
+    def for_pattern(cls, total_bytes, pattern, extent_size=DEFAULT_EXTENT_SIZE):
+        """Build the digest of a constant-pattern pass without hashing every byte.
+
+        Extents that start at the same pattern phase and have the same length
+        hold identical bytes, so each distinct leaf is hashed only once.
+        """
+        digest = cls(total_bytes, extent_size)
+        pattern = bytes(pattern) or b"\x00"
+        cache = {}
+        for index in range(digest.extent_count):
+            start, end = digest.extent_range(index)
+            key = (start % len(pattern), end - start)
+            leaf = cache.get(key)
+            if leaf is None:
+                leaf = cache[key] = _pattern_leaf(pattern, *key)
+            digest.leaves.append(leaf)
+        return digest
+
+    @property
+    def root(self):
+        """Merkle root over all leaves (hex)."""
+        return merkle_root(self.leaves)
+
+    def to_dict(self):
+        return {
+            "total_bytes": self.total_bytes,
+            "extent_size": self.extent_size,
+            "leaves": [leaf.hex() for leaf in self.leaves],
+            "root": self.root,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        digest = cls(int(data["total_bytes"]), int(data["extent_size"]))
+        digest.leaves = [bytes.fromhex(leaf) for leaf in data["leaves"]]
+        return digest
@@ -0,0 +1,435 @@
+"""Native block-device wipe engine for BLACKSTORM.
+
+The engine writes wipe passes straight to a device from aligned, reusable
+buffers instead of shelling out to ``dd``/``shred``. Zero and fixed-pattern
+passes reuse a single pre-filled buffer; random passes are filled from a keyed
+keystream that is addressable by device offset, so the same bytes can be
+regenerated later for verification or resumption.
+"""
+from __future__ import annotations
+
+import errno
+import hashlib
+import math
+import mmap
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from BLACKSTORM.core.wipe_digest import DEFAULT_EXTENT_SIZE, ExtentDigest
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:  # pragma: no cover - optional dependency
+    Cipher = None
+
+ALIGNMENT = 4096
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_QUEUE_DEPTH = 4
+KEYSTREAM_SEGMENT = 64 * 1024
+
+_SIZE_SUFFIXES = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+GUTMANN_PATTERNS = [
+    None, None, None, None,
+    b"\x55", b"\xaa", b"\x92\x49\x24", b"\x49\x24\x92", b"\x24\x92\x49",
+    b"\x00", b"\x11", b"\x22", b"\x33", b"\x44", b"\x55", b"\x66", b"\x77",
+    b"\x88", b"\x99", b"\xaa", b"\xbb", b"\xcc", b"\xdd", b"\xee", b"\xff",
+    b"\x92\x49\x24", b"\x49\x24\x92", b"\x24\x92\x49",
+    b"\x6d\xb6\xdb", b"\xb6\xdb\x6d", b"\xdb\x6d\xb6",
+    None, None, None, None,
+]
+
+
+class WipeEngineError(Exception):
+    """Raised when the wipe engine cannot complete a pass."""
+
+
+def parse_size(value):
+    """Parse a dd-style size string such as ``4M`` into bytes.
+
+    Args:
+        value (str | int): Size in bytes or with a K/M/G suffix.
+
+    Returns:
+        int: Size in bytes.
+    """
+    if isinstance(value, int):
+        return value
+    text = str(value).strip().upper().rstrip("B")
+    suffix = text[-1:] if text[-1:] in _SIZE_SUFFIXES else ""
+    number = text[:-1] if suffix else text
+    return int(float(number) * _SIZE_SUFFIXES[suffix])
+
+
+class KeyStream:
+    """Keyed pseudo-random byte stream addressable by absolute offset.
+
+    AES-256-CTR is used when ``cryptography`` is installed; otherwise each
+    64 KiB segment is derived from SHAKE-256 over the key, stream and segment
+    index. Segment-aligned offsets are cheapest to :meth:`fill`, but any
+    offset is allowed.
+
+    ``stream`` selects an independent sequence under the same key (the high
+    half of the CTR counter block); every random pass of a run uses its own,
+    see :meth:`for_pass`.
+    """
+
+    def __init__(self, key=None, stream=0):
+        self.key = key or os.urandom(32)
+        self.stream = stream
+        self._zeros = b""
+
+    def for_pass(self, index):
+        """The keystream written by pass ``index`` of a run under this key."""
+        return KeyStream(self.key, index)
+
+    @property
+    def backend(self):
+        return "aes-ctr" if Cipher is not None else "shake256"
+
+    def fill(self, view, offset):
+        """Fill ``view`` with the keystream bytes starting at ``offset``."""
+        length = len(view)
+        if Cipher is not None:
+            skip = offset % 16
+            if len(self._zeros) < length + skip:
+                self._zeros = bytes(length + skip)
+            counter = ((self.stream << 64) | (offset // 16)).to_bytes(16, "big")
+            encryptor = Cipher(algorithms.AES(self.key), modes.CTR(counter)).encryptor()
+            data = encryptor.update(memoryview(self._zeros)[:length + skip])
+            view[:] = memoryview(data)[skip:] if skip else data
+            return
+        segment, skip = divmod(offset, KEYSTREAM_SEGMENT)
+        start = 0
+        while start < length:
+            end = min(start + KEYSTREAM_SEGMENT - skip, length)
+            digest = hashlib.shake_256(
+                self.key + self.stream.to_bytes(8, "little") + segment.to_bytes(8, "little")
+            )
+            view[start:end] = digest.digest(skip + end - start)[skip:]
+            start, skip = end, 0
+            segment += 1
+
+
+@dataclass
+class WipePass:
+    """A single overwrite pass: zeros, a repeating pattern or keystream data."""
+
+    kind: str
+    pattern: bytes = b""
+    label: str = ""
+
+    @classmethod
+    def zeros(cls, label="Writing zeros"):
+        return cls("pattern", b"\x00", label)
+
+    @classmethod
+    def fill(cls, pattern, label=None):
+        pattern = bytes(pattern)
+        return cls("pattern", pattern, label or f"Writing pattern {pattern.hex()}")
+
+    @classmethod
+    def random(cls, label="Writing random data"):
+        return cls("random", b"", label)
+
+
+@dataclass
+class PassProgress:
+    """Progress snapshot reported by the engine while a pass is running."""
+
+    pass_index: int
+    pass_count: int
+    label: str
+    bytes_written: int
+    total_bytes: int
+    elapsed: float
+    rate: float
+
+    @property
+    def percent(self):
+        if not self.total_bytes:
+            return 0.0
+        return min(100.0, self.bytes_written * 100.0 / self.total_bytes)
+
+    @property
+    def overall_percent(self):
+        return (self.pass_index + self.percent / 100.0) * 100.0 / max(1, self.pass_count)
+
+    @property
+    def eta(self):
+        if self.rate <= 0:
+            return None
+        return (self.total_bytes - self.bytes_written) / self.rate
+
+
+@dataclass
+class PassResult:
+    """Timing summary for a completed pass."""
+
+    index: int
+    label: str
+    bytes_written: int
+    duration: float
+    errors: int = 0
+
+    @property
+    def throughput(self):
+        return self.bytes_written / self.duration if self.duration > 0 else 0.0
+
+
+def gutmann_passes(final_zero=True):
+    """Return the 35 Gutmann passes, optionally followed by a zero pass."""
+    passes = []
+    for index, pattern in enumerate(GUTMANN_PATTERNS, 1):
+        label = f"Gutmann pass {index}/{len(GUTMANN_PATTERNS)}"
+        passes.append(WipePass.random(label) if pattern is None else WipePass.fill(pattern, label))
+    if final_zero:
+        passes.append(WipePass.zeros("Final zero pass"))
+    return passes
+
+
+def aligned_buffer(size):
+    """Allocate a page-aligned anonymous buffer suitable for O_DIRECT."""
+    return mmap.mmap(-1, max(size, ALIGNMENT))
+
+
+class BlockWipeEngine:
+    """Write wipe passes to a device with aligned buffers and queued I/O.
+
+    Args:
+        device (str): Path to the block device (or file) to overwrite.
+        block_size (int | str): Bytes per write request.
+        queue_depth (int): Number of writes kept in flight at once.
+        direct_io (bool): Open the target with ``O_DIRECT`` when supported.
+        sync_writes (bool): Open the target with ``O_DSYNC`` so every write
+            reaches the device before it completes.
+        ignore_errors (bool): Skip blocks that fail to write instead of aborting.
+        progress_interval (float): Minimum seconds between progress callbacks.
+        keystream (KeyStream): Key for random passes; pass ``i`` writes
+            ``keystream.for_pass(i)``. A fresh key is used when omitted.
+    """
+
+    def __init__(self, device, block_size=DEFAULT_BLOCK_SIZE, queue_depth=DEFAULT_QUEUE_DEPTH,
+                 direct_io=True, ignore_errors=False, progress_interval=0.5, keystream=None,
+                 sync_writes=False):
+        block_size = parse_size(block_size)
+        self.device = device
+        self.block_size = max(ALIGNMENT, block_size - block_size % ALIGNMENT)
+        self.queue_depth = max(1, int(queue_depth))
+        self.direct_io = direct_io
+        self.sync_writes = sync_writes
+        self.ignore_errors = ignore_errors
+        self.progress_interval = progress_interval
+        self.keystream = keystream or KeyStream()
+        self._stop_event = threading.Event()
+        self._fd = None
+        self._buffered_fd = None
+        self._direct = False
+        self.final_digest = None
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
+
+    def stop(self):
+        """Request the running pass to stop after in-flight writes finish."""
+        self._stop_event.set()
+
+    def device_size(self):
+        """Return the size of the target in bytes."""
+        fd = os.open(self.device, os.O_RDONLY)
+        try:
+            return os.lseek(fd, 0, os.SEEK_END)
+        finally:
+            os.close(fd)
+
+    def run(self, passes, progress_callback=None, digest_final=False, extent_size=DEFAULT_EXTENT_SIZE,
+            start_pass=0, start_offset=0, checkpoint_callback=None, checkpoint_interval=10.0):
+        """Run every pass in order.
+
+        Args:
+            passes (list[WipePass]): Passes to write.
+            progress_callback (callable): Receives :class:`PassProgress` updates.
+            digest_final (bool): Hash the final pass per extent while writing it;
+                the result is left in :attr:`final_digest`.
+            extent_size (int): Bytes covered by each digest leaf.
+            start_pass (int): Index of the first pass to write when resuming.
+            start_offset (int): Offset within ``start_pass`` to resume from; it
+                is rounded down to a block boundary.
+            checkpoint_callback (callable): Called as ``(pass_index, offset)``
+                once everything before ``offset`` has been flushed to the
+                device, at most every ``checkpoint_interval`` seconds, when a
+                pass completes (with the next pass and offset 0) and on stop.
+            checkpoint_interval (float): Minimum seconds between checkpoints.
+
+        Returns:
+            list[PassResult]: One result per completed pass, starting at
+            ``start_pass``. The list is shorter than expected when :meth:`stop`
+            was called.
+        """
+        total_bytes = self.device_size()
+        results = []
+        self._open()
+        try:
+            with ThreadPoolExecutor(max_workers=self.queue_depth) as executor:
+                for index, wipe_pass in enumerate(passes):
+                    if index < start_pass:
+                        continue
+                    if self.stopped:
+                        break
+                    resume_at = start_offset if index == start_pass else 0
+                    digest = None
+                    # A resumed random pass cannot be hashed: the bytes before the resume point are gone
+                    if digest_final and index == len(passes) - 1 and not (resume_at and wipe_pass.kind == "random"):
+                        digest = ExtentDigest(total_bytes, extent_size)
+                    result = self._run_pass(executor, index, len(passes), wipe_pass,
+                                            total_bytes, progress_callback, digest,
+                                            resume_at, checkpoint_callback, checkpoint_interval)
+                    if self.stopped:
+                        break
+                    results.append(result)
+        finally:
+            self._close()
+        return results
+
+    def _write_flags(self):
+        return os.O_WRONLY | (getattr(os, "O_DSYNC", 0) if self.sync_writes else 0)
+
+    def _open(self):
+        flags = self._write_flags()
+        direct_flag = getattr(os, "O_DIRECT", 0)
+        if self.direct_io and direct_flag:
+            try:
+                self._fd = os.open(self.device, flags | direct_flag)
+                self._direct = True
+                return
+            except OSError as exc:
+                if exc.errno != errno.EINVAL:
+                    raise
+        self._fd = os.open(self.device, flags)
+        self._direct = False
+
+    def _close(self):
+        for fd in (self._fd, self._buffered_fd):
+            if fd is not None:
+                os.close(fd)
+        self._fd = None
+        self._buffered_fd = None
+
+    def _pass_block_size(self, wipe_pass):
+        """Block size that keeps multi-byte patterns phase-aligned across writes."""
+        if wipe_pass.kind != "pattern" or len(wipe_pass.pattern) <= 1:
+            return self.block_size
+        period = ALIGNMENT * len(wipe_pass.pattern) // math.gcd(ALIGNMENT, len(wipe_pass.pattern))
+        return max(period, self.block_size - self.block_size % period)
+
+    def _write_all(self, view, offset):
+        """Write ``view`` at ``offset``, routing an unaligned tail around O_DIRECT."""
+        length = len(view)
+        direct_len = length - length % ALIGNMENT if self._direct else length
+        done = 0
+        while done < direct_len:
+            done += os.pwrite(self._fd, view[done:direct_len], offset + done)
+        if done < length:
+            if self._buffered_fd is None:
+                self._buffered_fd = os.open(self.device, self._write_flags())
+            while done < length:
+                done += os.pwrite(self._buffered_fd, view[done:length], offset + done)
+            os.fsync(self._buffered_fd)
+        return length
+
+    def _run_pass(self, executor, index, pass_count, wipe_pass, total_bytes, progress_callback,
+                  digest=None, start_offset=0, checkpoint_callback=None, checkpoint_interval=10.0):
+        block_size = self._pass_block_size(wipe_pass)
+        # Whole blocks keep multi-byte patterns in phase with a fresh run
+        start_offset = min(start_offset, total_bytes)
+        start_offset -= start_offset % block_size
+        random_pass = wipe_pass.kind == "random"
+        keystream = self.keystream.for_pass(index)
+        buffers = [aligned_buffer(block_size) for _ in range(self.queue_depth + 1 if random_pass else 1)]
+        views = [memoryview(buf) for buf in buffers]
+        if not random_pass:
+            pattern = wipe_pass.pattern or b"\x00"
+            views[0][:] = (pattern * (block_size // len(pattern) + 1))[:block_size]
+
+        inflight = deque()
+        written = start_offset
+        errors = 0
+        start = time.monotonic()
+        last_report = start
+        last_checkpoint = start
+
+        def report(force=False):
+            nonlocal last_report
+            now = time.monotonic()
+            if progress_callback is None or (not force and now - last_report < self.progress_interval):
+                return
+            last_report = now
+            elapsed = now - start
+            progress_callback(PassProgress(
+                index, pass_count, wipe_pass.label, written, total_bytes,
+                elapsed, (written - start_offset) / elapsed if elapsed > 0 else 0.0,
+            ))
+
+        def checkpoint():
+            nonlocal last_checkpoint
+            now = time.monotonic()
+            if checkpoint_callback is None or now - last_checkpoint < checkpoint_interval:
+                return
+            last_checkpoint = now
+            # Writes retire in order, so everything before ``written`` is done; make it durable
+            os.fdatasync(self._fd)
+            checkpoint_callback(index, written)
+
+        def retire():
+            nonlocal written, errors
+            future, offset, length = inflight.popleft()
+            try:
+                future.result()
+            except OSError as exc:
+                if not self.ignore_errors:
+                    raise WipeEngineError(
+                        f"{wipe_pass.label}: write failed at offset {offset}: {exc}"
+                    ) from exc
+                errors += 1
+            written = offset + length
+            report()
+            checkpoint()
+
+        try:
+            for block, offset in enumerate(range(start_offset, total_bytes, block_size)):
+                if self.stopped:
+                    break
+                if len(inflight) >= self.queue_depth:
+                    retire()
+                length = min(block_size, total_bytes - offset)
+                view = views[block % len(views)][:length]
+                if random_pass:
+                    keystream.fill(view, offset)
+                    if digest is not None:
+                        digest.update(view)
+                inflight.append((executor.submit(self._write_all, view, offset), offset, length))
+            while inflight:
+                retire()
+            os.fsync(self._fd)
+            if checkpoint_callback is not None:
+                if self.stopped:
+                    checkpoint_callback(index, written)
+                else:
+                    checkpoint_callback(index + 1, 0)
+        finally:
+            for future, _, _ in inflight:
+                future.cancel()
+
+        if digest is not None and not self.stopped:
+            if not random_pass:
+                # Constant passes repeat the same extent bytes; hash each distinct leaf once
+                digest = ExtentDigest.for_pattern(total_bytes, wipe_pass.pattern, digest.extent_size)
+            self.final_digest = digest
+
+        report(force=True)
+        return PassResult(index, wipe_pass.label, written - start_offset, time.monotonic() - start, errors)
@@ -0,0 +1,240 @@
+"""On-disk journal of running wipe jobs so interrupted wipes can resume.
+
+Each job is one small JSON file recording the device identity, the exact
+passes being written (including the keystream key for random passes), the
+worker's wipe options, the pass in progress and the last offset the engine
+confirmed as flushed to the device. The file is rewritten atomically on every checkpoint, so after a
+crash or power loss it always describes a consistent resume point.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+
+from BLACKSTORM.core.wipe_engine import WipePass
+
+JOURNAL_DIR = "/var/lib/blackstorm/jobs"
+
+STATUS_RUNNING = "running"
+STATUS_INTERRUPTED = "interrupted"
+
+# Settings never written to the plaintext job file
+UNSAVED_OPTIONS = ("lock_password",)
+
+
+def device_serial(device, sys_root="/sys"):
+    """Return a stable identifier for ``device`` (serial or WWID), or ``""``."""
+    name = os.path.basename(os.path.realpath(device))
+    block = os.path.join(sys_root, "block", name)
+    for relative in ("device/serial", "device/wwid", "wwid", "device/vpd_pg80"):
+        try:
+            with open(os.path.join(block, relative), "rb") as f:
+                value = f.read().decode("ascii", "ignore").strip("\x00\r\n\t ")
+        except OSError:
+            continue
+        if value:
+            return value
+    return ""
+
+
+def pass_to_dict(wipe_pass):
+    return {
+        "kind": wipe_pass.kind,
+        "pattern": wipe_pass.pattern.hex() if wipe_pass.pattern else "",
+        "label": wipe_pass.label,
+    }
+
+
+def pass_from_dict(data):
+    return WipePass(data["kind"], bytes.fromhex(data.get("pattern", "")), data.get("label", ""))
+
+
+@dataclass
+class WipeJob:
+    """Checkpointed state of one device wipe."""
+
+    device: str
+    serial: str
+    method: str
+    total_bytes: int
+    passes: list = field(default_factory=list)
+    key: str = ""
+    pass_index: int = 0
+    offset: int = 0
+    verify: bool = True
+    quick_erase: bool = False
+    options: dict = field(default_factory=dict)
+    status: str = STATUS_RUNNING
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    started: float = field(default_factory=time.time)
+    updated: float = field(default_factory=time.time)
+
+    @property
+    def pass_count(self):
+        return len(self.passes)
+
+    @property
+    def resumable(self):
+        return self.pass_index < self.pass_count
+
+    @property
+    def identified(self):
+        """True if the device can be recognised by serial/WWID rather than only its path."""
+        return bool(self.serial)
+
+    @property
+    def percent(self):
+        """Overall progress at the last checkpoint."""
+        if not self.pass_count or not self.total_bytes:
+            return 0.0
+        done = self.pass_index + min(self.offset, self.total_bytes) / self.total_bytes
+        return min(100.0, done * 100.0 / self.pass_count)
+
+    def wipe_passes(self):
+        return [pass_from_dict(data) for data in self.passes]
+
+    def matches(self, passes):
+        """Return True if ``passes`` are exactly the passes this job is writing."""
+        return [pass_to_dict(p) for p in passes] == self.passes
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: data[key] for key in cls.__dataclass_fields__ if key in data})
+
+
+class WipeJournal:
+    """Directory of checkpointed wipe jobs.
+
+    Args:
+        directory (str): Where job files are kept.
+    """
+
+    def __init__(self, directory=JOURNAL_DIR):
+        self.directory = directory
+
+    def _path(self, job):
+        return os.path.join(self.directory, f"{job.job_id}.json")
+
+    def create(self, device, method, passes, total_bytes, key=b"", verify=True, quick_erase=False,
+               options=None, sys_root="/sys"):
+        """Start journaling a new job and return it.
+
+        ``options`` are the worker's advanced settings (JSON-serialisable),
+        restored on resume so the job continues exactly as it started.
+        Secrets such as the lock password are left out (see ``UNSAVED_OPTIONS``).
+        """
+        job = WipeJob(
+            device=device,
+            serial=device_serial(device, sys_root),
+            method=method,
+            total_bytes=total_bytes,
+            passes=[pass_to_dict(p) for p in passes],
+            key=key.hex(),
+            verify=verify,
+            quick_erase=quick_erase,
+            options={k: v for k, v in (options or {}).items() if k not in UNSAVED_OPTIONS},
+        )
+        self.save(job)
+        return job
+
+    def save(self, job):
+        """Atomically write ``job`` to disk and flush it."""
+        os.makedirs(self.directory, exist_ok=True)
+        job.updated = time.time()
+        path = self._path(job)
+        tmp_path = path + ".tmp"
+        # Options may include a drive lock password; keep job files private
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            json.dump(job.to_dict(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        dir_fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def checkpoint(self, job, pass_index, offset):
+        """Record that everything before ``offset`` of ``pass_index`` is on the device."""
+        job.pass_index = pass_index
+        job.offset = offset
+        self.save(job)
+
+    def interrupt(self, job):
+        """Mark ``job`` as stopped before completion so it is offered for resume."""
+        job.status = STATUS_INTERRUPTED
+        self.save(job)
+
+    def remove(self, job):
+        """Forget a job that has finished."""
+        try:
+            os.remove(self._path(job))
+        except FileNotFoundError:
+            pass
+
+    def jobs(self):
+        """Return every readable job in the journal, oldest first."""
+        try:
+            names = sorted(os.listdir(self.directory))
+        except OSError:
+            return []
+        jobs = []
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    jobs.append(WipeJob.from_dict(json.load(f)))
+            except (OSError, ValueError, TypeError, KeyError):
+                continue
+        return sorted(jobs, key=lambda job: job.started)
+
+    def resumable(self, sys_root="/sys"):
+        """Return resumable jobs whose device is still attached with the same identity.
+
+        A job is matched by serial/WWID, so a disk that came back under a
+        different ``/dev`` name is still found. Jobs recorded without an
+        identifier are only returned if their path and size still match, and
+        are not ``identified``: the caller must have the user confirm the
+        device before resuming, as the path may now name another disk.
+        """
+        found = []
+        for job in self.jobs():
+            if not job.resumable:
+                continue
+            device = self._locate(job, sys_root)
+            if device is None:
+                continue
+            job.device = device
+            found.append(job)
+        return found
+
+    @staticmethod
+    def _locate(job, sys_root):
+        candidates = [job.device]
+        if job.serial:
+            try:
+                candidates += [f"/dev/{name}" for name in sorted(os.listdir(os.path.join(sys_root, "block")))]
+            except OSError:
+                pass
+        for device in candidates:
+            if job.serial and device_serial(device, sys_root) != job.serial:
+                continue
+            try:
+                fd = os.open(device, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                size = os.lseek(fd, 0, os.SEEK_END)
+            finally:
+                os.close(fd)
+            if size == job.total_bytes:
+                return device
+        return None
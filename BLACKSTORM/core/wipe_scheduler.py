@@ -0,0 +1,175 @@
+"""Concurrent wipe scheduling with shared-bus awareness.
+
+Devices are grouped by the controller, HBA or USB hub they hang off (read
+from the sysfs topology) so that a saturated shared bus is not handed more
+jobs than it can usefully sustain, while independent buses run in parallel.
+"""
+from __future__ import annotations
+
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Maximum concurrent jobs per bus group, keyed by bus kind.
+DEFAULT_BUS_LIMITS = {
+    "usb": 2,
+    "ata": 4,
+    "scsi": 8,
+    "nvme": 1,
+    "virtual": 1,
+    "unknown": 1,
+}
+
+_PCI_ADDR = re.compile(r"^[0-9a-f]{4}:[0-9a-f]{2}:[0-9a-f]{2}\.[0-7]$")
+_USB_DEVICE = re.compile(r"^\d+-[\d.]+$")
+_USB_ROOT = re.compile(r"^usb\d+$")
+
+
+@dataclass(frozen=True)
+class BusInfo:
+    """Shared bus a block device is attached through."""
+
+    key: str
+    kind: str
+
+
+def resolve_bus(device, sys_root="/sys"):
+    """Work out which controller, HBA or hub a block device sits behind.
+
+    Args:
+        device (str): Device path such as ``/dev/sda`` (symlinks are resolved).
+        sys_root (str): Root of the sysfs mount.
+
+    Returns:
+        BusInfo: Group key and bus kind for the device.
+    """
+    name = os.path.basename(os.path.realpath(device))
+    try:
+        parts = os.path.realpath(os.path.join(sys_root, "block", name)).split(os.sep)
+    except OSError:
+        return BusInfo(f"unknown:{name}", "unknown")
+
+    if "virtual" in parts:
+        return BusInfo(f"virtual:{name}", "virtual")
+
+    pci = [part for part in parts if _PCI_ADDR.match(part)]
+
+    usb_devices = [i for i, part in enumerate(parts) if _USB_DEVICE.match(part)]
+    if usb_devices:
+        # The hub is whatever the last USB device hangs off: another hub or the root port.
+        hub_index = usb_devices[-1] - 1
+        root = next((i for i, part in enumerate(parts) if _USB_ROOT.match(part)), hub_index)
+        hub_path = "/".join(parts[root:hub_index + 1])
+        return BusInfo(f"usb:{pci[-1] if pci else ''}/{hub_path}", "usb")
+
+    if "nvme" in parts:
+        return BusInfo(f"nvme:{pci[-1] if pci else name}", "nvme")
+
+    if pci:
+        kind = "ata" if any(part.startswith("ata") for part in parts) else "scsi"
+        return BusInfo(f"{kind}:{pci[-1]}", kind)
+
+    return BusInfo(f"unknown:{name}", "unknown")
+
+
+def group_by_bus(devices, sys_root="/sys"):
+    """Group device paths by shared bus.
+
+    Returns:
+        OrderedDict: Bus key -> list of devices, in first-seen order.
+    """
+    groups = OrderedDict()
+    for device in devices:
+        groups.setdefault(resolve_bus(device, sys_root).key, []).append(device)
+    return groups
+
+
+class WipeScheduler:
+    """Decide which queued devices may start given the jobs already running.
+
+    At most ``max_jobs`` wipes run at once, and each bus group is capped by the
+    limit for its kind. Devices on different buses are interleaved so a long
+    queue on one hub does not starve the others.
+
+    Args:
+        devices (list[str]): Devices to wipe, in the order they were selected.
+        max_jobs (int): Global cap on concurrent wipes.
+        bus_limits (dict): Per-kind overrides for :data:`DEFAULT_BUS_LIMITS`.
+        sys_root (str): Root of the sysfs mount.
+    """
+
+    def __init__(self, devices, max_jobs=4, bus_limits=None, sys_root="/sys"):
+        self.max_jobs = max(1, int(max_jobs))
+        self.bus_limits = dict(DEFAULT_BUS_LIMITS)
+        self.bus_limits.update(bus_limits or {})
+        self.buses = {device: resolve_bus(device, sys_root) for device in devices}
+        self.pending = list(devices)
+        self.running = []
+        self.results = OrderedDict()
+        self.rates = {}
+
+    @property
+    def done(self):
+        return not self.pending and not self.running
+
+    def bus_groups(self):
+        """Return bus key -> devices for every device in this run."""
+        groups = OrderedDict()
+        for device, bus in self.buses.items():
+            groups.setdefault(bus.key, []).append(device)
+        return groups
+
+    def _bus_load(self, key):
+        return sum(1 for device in self.running if self.buses[device].key == key)
+
+    def next_ready(self):
+        """Pop every pending device that may start now and mark it running."""
+        ready = []
+        while len(self.running) < self.max_jobs:
+            candidate = None
+            best_load = None
+            for device in self.pending:
+                bus = self.buses[device]
+                load = self._bus_load(bus.key)
+                if load >= self.bus_limits.get(bus.kind, 1):
+                    continue
+                if best_load is None or load < best_load:
+                    candidate, best_load = device, load
+                    if load == 0:
+                        break
+            if candidate is None:
+                break
+            self.pending.remove(candidate)
+            self.running.append(candidate)
+            ready.append(candidate)
+        return ready
+
+    def finish(self, device, success, message=""):
+        """Record a finished job and free its slot."""
+        if device in self.running:
+            self.running.remove(device)
+        self.rates.pop(device, None)
+        self.results[device] = (success, message)
+
+    def cancel_pending(self):
+        """Drop every device that has not started yet."""
+        cancelled, self.pending = self.pending, []
+        return cancelled
+
+    def update_rate(self, device, bytes_per_sec):
+        """Record the latest write rate reported for a running device."""
+        if device in self.running:
+            self.rates[device] = max(0.0, float(bytes_per_sec))
+
+    @property
+    def aggregate_rate(self):
+        return sum(self.rates.values())
+
+    def bus_rates(self):
+        """Return bus key -> combined write rate of its running jobs."""
+        totals = OrderedDict()
+        for device, rate in self.rates.items():
+            key = self.buses[device].key
+            totals[key] = totals.get(key, 0.0) + rate
+        return totals
@@ -0,0 +1,434 @@
+"""Streaming full-surface verification of wiped devices.
+
+The verifier reads the device (or an evenly spread fraction of it) in large
+sequential chunks into a reused aligned buffer and compares each chunk with
+the bytes the final wipe pass should have left behind. Chunks that match are
+accepted with a single vectorised comparison; mismatching chunks are narrowed
+down to sector-granular extents for the coverage map. When the final pass was
+hashed while it was written, :class:`ExtentHashVerifier` checks the device
+against that extent digest instead.
+"""
+from __future__ import annotations
+
+import errno
+import hashlib
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+
+from BLACKSTORM.core.wipe_engine import ALIGNMENT, KEYSTREAM_SEGMENT, WipePass, aligned_buffer
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_STRIPE_SIZE = 1024 * 1024 * 1024
+SECTOR_SIZE = 512
+
+
+@dataclass
+class VerifyProgress:
+    """Progress snapshot reported while verification is running."""
+
+    bytes_checked: int
+    bytes_to_check: int
+    mismatched_bytes: int
+    elapsed: float
+    rate: float
+
+    @property
+    def percent(self):
+        if not self.bytes_to_check:
+            return 100.0
+        return min(100.0, self.bytes_checked * 100.0 / self.bytes_to_check)
+
+
+@dataclass
+class VerifyResult:
+    """Outcome of a verification run with its coverage map."""
+
+    device: str
+    total_bytes: int
+    bytes_checked: int = 0
+    duration: float = 0.0
+    checked_extents: list = field(default_factory=list)
+    bad_extents: list = field(default_factory=list)
+    read_errors: list = field(default_factory=list)
+    completed: bool = False
+
+    @property
+    def passed(self):
+        return self.completed and not self.bad_extents and not self.read_errors
+
+    @property
+    def coverage(self):
+        return self.bytes_checked / self.total_bytes if self.total_bytes else 0.0
+
+    @property
+    def mismatched_bytes(self):
+        return sum(end - start for start, end in self.bad_extents)
+
+    def coverage_map(self):
+        """Return a JSON-serialisable description of what was checked and found."""
+        return {
+            "device": self.device,
+            "total_bytes": self.total_bytes,
+            "bytes_checked": self.bytes_checked,
+            "coverage": round(self.coverage, 6),
+            "passed": self.passed,
+            "checked_extents": [list(extent) for extent in self.checked_extents],
+            "bad_extents": [list(extent) for extent in self.bad_extents],
+            "read_errors": [list(extent) for extent in self.read_errors],
+            "duration": round(self.duration, 3),
+        }
+
+
+def _add_extent(extents, start, end):
+    """Append ``[start, end)`` to a sorted extent list, merging with the tail."""
+    if extents and extents[-1][1] >= start:
+        extents[-1] = (extents[-1][0], max(extents[-1][1], end))
+    else:
+        extents.append((start, end))
+
+
+def plan_ranges(total_bytes, fraction=1.0, stripe_size=DEFAULT_STRIPE_SIZE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Split the device into the byte ranges a verification pass should read.
+
+    With ``fraction`` below 1.0 the device is divided into stripes and the
+    leading part of every stripe is read, so the sample is spread evenly over
+    the whole surface instead of clustering at the start. The last chunk of
+    the device is always included so the end of the surface is covered too.
+
+    Returns:
+        list[tuple[int, int]]: Sorted ``(start, end)`` ranges.
+    """
+    if fraction >= 1.0 or total_bytes <= stripe_size:
+        return [(0, total_bytes)] if total_bytes else []
+    per_stripe = max(chunk_size, int(math.ceil(stripe_size * max(fraction, 0.0) / chunk_size)) * chunk_size)
+    ranges = []
+    for start in range(0, total_bytes, stripe_size):
+        ranges.append((start, min(total_bytes, start + per_stripe)))
+    tail_start = max(0, total_bytes - chunk_size)
+    # Keystream segments are the coarsest alignment any expected data needs
+    tail_start -= tail_start % KEYSTREAM_SEGMENT
+    if ranges[-1][1] < total_bytes:
+        if ranges[-1][1] >= tail_start:
+            ranges[-1] = (ranges[-1][0], total_bytes)
+        else:
+            ranges.append((tail_start, total_bytes))
+    return ranges
+
+
+class WipeVerifier:
+    """Verify that a device holds exactly what its final wipe pass wrote.
+
+    Args:
+        device (str): Path to the wiped device.
+        expected (WipePass): Final pass written to the device.
+        keystream (KeyStream): Keystream used by a random final pass.
+        fraction (float): Portion of the surface to read (1.0 = everything).
+        chunk_size (int): Bytes read per request.
+        stripe_size (int): Stripe size used to spread a partial read.
+        direct_io (bool): Bypass the page cache with ``O_DIRECT`` when supported.
+        progress_interval (float): Minimum seconds between progress callbacks.
+    """
+
+    def __init__(self, device, expected=None, keystream=None, fraction=1.0,
+                 chunk_size=DEFAULT_CHUNK_SIZE, stripe_size=DEFAULT_STRIPE_SIZE,
+                 direct_io=True, progress_interval=0.5):
+        self.device = device
+        self.expected = expected or WipePass.zeros()
+        if self.expected.kind == "random" and keystream is None:
+            raise ValueError("A keystream is required to verify a random pass")
+        self.keystream = keystream
+        self.fraction = fraction
+        self.chunk_size = max(ALIGNMENT, chunk_size - chunk_size % ALIGNMENT)
+        self.stripe_size = stripe_size
+        self.direct_io = direct_io
+        self.progress_interval = progress_interval
+        self._stop_event = threading.Event()
+        self._pattern_cache = {}
+        self._expected_buffer = None
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
+
+    def stop(self):
+        """Request verification to stop after the current chunk."""
+        self._stop_event.set()
+
+    def _open(self):
+        direct_flag = getattr(os, "O_DIRECT", 0)
+        if self.direct_io and direct_flag:
+            try:
+                return os.open(self.device, os.O_RDONLY | direct_flag), True
+            except OSError as exc:
+                if exc.errno != errno.EINVAL:
+                    raise
+        return os.open(self.device, os.O_RDONLY), False
+
+    def _expected_bytes(self, offset, length):
+        """Return the bytes the final pass wrote at ``offset``."""
+        if self.expected.kind == "random":
+            if self._expected_buffer is None or len(self._expected_buffer) < length:
+                self._expected_buffer = bytearray(self.chunk_size)
+            view = memoryview(self._expected_buffer)[:length]
+            self.keystream.fill(view, offset)
+            return view
+        pattern = self.expected.pattern or b"\x00"
+        phase = offset % len(pattern)
+        block = self._pattern_cache.get(phase)
+        if block is None:
+            repeated = pattern * (self.chunk_size // len(pattern) + 2)
+            block = repeated[phase:phase + self.chunk_size]
+            self._pattern_cache[phase] = block
+        return memoryview(block)[:length]
+
+    @staticmethod
+    def _mismatched_sectors(actual, expected):
+        """Return indices of sectors in ``actual`` that differ from ``expected``."""
+        length = len(actual)
+        if np is not None and length % SECTOR_SIZE == 0:
+            got = np.frombuffer(actual, dtype=np.uint64).reshape(-1, SECTOR_SIZE // 8)
+            want = np.frombuffer(expected, dtype=np.uint64).reshape(-1, SECTOR_SIZE // 8)
+            return np.flatnonzero((got != want).any(axis=1)).tolist()
+        bad = []
+        for index, start in enumerate(range(0, length, SECTOR_SIZE)):
+            end = min(start + SECTOR_SIZE, length)
+            if actual[start:end] != expected[start:end]:
+                bad.append(index)
+        return bad
+
+    @staticmethod
+    def _chunk_matches(actual, expected):
+        if np is not None:
+            return np.array_equal(np.frombuffer(actual, dtype=np.uint8),
+                                  np.frombuffer(expected, dtype=np.uint8))
+        return actual.tobytes() == expected.tobytes()
+
+    def run(self, progress_callback=None):
+        """Read the planned ranges and compare them with the expected pass.
+
+        Args:
+            progress_callback (callable): Receives :class:`VerifyProgress` updates.
+
+        Returns:
+            VerifyResult: Coverage and any non-conforming extents.
+        """
+        fd, direct = self._open()
+        try:
+            total_bytes = os.lseek(fd, 0, os.SEEK_END)
+            result = VerifyResult(self.device, total_bytes)
+            ranges = plan_ranges(total_bytes, self.fraction, self.stripe_size, self.chunk_size)
+            bytes_to_check = sum(end - start for start, end in ranges)
+            buffer = memoryview(aligned_buffer(self.chunk_size))
+            start_time = time.monotonic()
+            last_report = 0.0
+
+            for range_start, range_end in ranges:
+                for offset in range(range_start, range_end, self.chunk_size):
+                    if self.stopped:
+                        result.duration = time.monotonic() - start_time
+                        return result
+                    length = min(self.chunk_size, range_end - offset)
+                    view = buffer[:length]
+                    try:
+                        read = os.preadv(fd, [view], offset)
+                    except OSError as exc:
+                        if direct and exc.errno == errno.EINVAL:
+                            os.close(fd)
+                            fd, direct = os.open(self.device, os.O_RDONLY), False
+                            read = os.preadv(fd, [view], offset)
+                        else:
+                            _add_extent(result.read_errors, offset, offset + length)
+                            continue
+                    view = view[:read]
+                    expected = self._expected_bytes(offset, read)
+                    if not self._chunk_matches(view, expected):
+                        for sector in self._mismatched_sectors(view, expected):
+                            bad_start = offset + sector * SECTOR_SIZE
+                            _add_extent(result.bad_extents, bad_start,
+                                        min(bad_start + SECTOR_SIZE, offset + read))
+                    _add_extent(result.checked_extents, offset, offset + read)
+                    result.bytes_checked += read
+
+                    now = time.monotonic()
+                    if progress_callback is not None and now - last_report >= self.progress_interval:
+                        last_report = now
+                        elapsed = now - start_time
+                        progress_callback(VerifyProgress(
+                            result.bytes_checked, bytes_to_check, result.mismatched_bytes,
+                            elapsed, result.bytes_checked / elapsed if elapsed > 0 else 0.0,
+                        ))
+
+            result.duration = time.monotonic() - start_time
+            result.completed = True
+            if progress_callback is not None:
+                progress_callback(VerifyProgress(
+                    result.bytes_checked, bytes_to_check, result.mismatched_bytes, result.duration,
+                    result.bytes_checked / result.duration if result.duration > 0 else 0.0,
+                ))
+            return result
+        finally:
+            os.close(fd)
+
+
+def plan_extents(extent_count, fraction=1.0):
+    """Pick evenly spaced extent indices covering ``fraction`` of the device.
+
+    The last extent is always included so the end of the surface is checked.
+    """
+    if extent_count <= 0:
+        return []
+    if fraction >= 1.0:
+        return list(range(extent_count))
+    wanted = max(1, int(math.ceil(extent_count * max(fraction, 0.0))))
+    step = extent_count / wanted
+    indices = sorted({int(i * step) for i in range(wanted)} | {extent_count - 1})
+    return indices
+
+
+class ExtentHashVerifier:
+    """Verify a device against the extent digest recorded while it was wiped.
+
+    Each selected extent is read once and hashed; ``hashlib`` releases the GIL
+    while hashing, so several extents are read and hashed in parallel. A
+    mismatching extent is reported as a whole.
+
+    Args:
+        device (str): Path to the wiped device.
+        digest (ExtentDigest): Digest recorded for the final pass.
+        fraction (float): Portion of the extents to read (1.0 = everything).
+        threads (int): Extents read and hashed concurrently.
+        chunk_size (int): Bytes read per request within an extent.
+        direct_io (bool): Bypass the page cache with ``O_DIRECT`` when supported.
+        progress_interval (float): Minimum seconds between progress callbacks.
+    """
+
+    def __init__(self, device, digest, fraction=1.0, threads=4, chunk_size=DEFAULT_CHUNK_SIZE,
+                 direct_io=True, progress_interval=0.5):
+        if not digest.complete:
+            raise ValueError("The extent digest does not cover the whole device")
+        self.device = device
+        self.digest = digest
+        self.fraction = fraction
+        self.threads = max(1, int(threads))
+        self.chunk_size = max(ALIGNMENT, chunk_size - chunk_size % ALIGNMENT)
+        self.direct_io = direct_io
+        self.progress_interval = progress_interval
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
+
+    def stop(self):
+        """Request verification to stop after the extents in flight."""
+        self._stop_event.set()
+
+    def _open(self):
+        direct_flag = getattr(os, "O_DIRECT", 0)
+        if self.direct_io and direct_flag:
+            try:
+                return os.open(self.device, os.O_RDONLY | direct_flag), True
+            except OSError as exc:
+                if exc.errno != errno.EINVAL:
+                    raise
+        return os.open(self.device, os.O_RDONLY), False
+
+    def _hash_extent(self, index, counter):
+        """Read and hash one extent; returns ``(index, matched, read_error, bytes_read)``."""
+        start, end = self.digest.extent_range(index)
+        fd, direct = self._open()
+        try:
+            buffer = memoryview(aligned_buffer(self.chunk_size))
+            hasher = hashlib.sha256()
+            offset = start
+            while offset < end:
+                if self.stopped:
+                    return index, None, False, offset - start
+                view = buffer[:min(self.chunk_size, end - offset)]
+                try:
+                    read = os.preadv(fd, [view], offset)
+                except OSError as exc:
+                    if direct and exc.errno == errno.EINVAL:
+                        os.close(fd)
+                        fd, direct = os.open(self.device, os.O_RDONLY), False
+                        continue
+                    return index, False, True, offset - start
+                if not read:
+                    break
+                hasher.update(view[:read])
+                offset += read
+                with self._lock:
+                    counter[0] += read
+            return index, hasher.digest() == self.digest.leaves[index], False, offset - start
+        finally:
+            os.close(fd)
+
+    def run(self, progress_callback=None):
+        """Read the selected extents and compare their hashes with the digest.
+
+        Args:
+            progress_callback (callable): Receives :class:`VerifyProgress` updates.
+
+        Returns:
+            VerifyResult: Coverage and any non-conforming extents.
+        """
+        result = VerifyResult(self.device, self.digest.total_bytes)
+        indices = plan_extents(self.digest.extent_count, self.fraction)
+        bytes_to_check = sum(end - start for start, end in map(self.digest.extent_range, indices))
+        counter = [0]
+        start_time = time.monotonic()
+
+        def report():
+            elapsed = time.monotonic() - start_time
+            with self._lock:
+                checked = counter[0]
+            progress_callback(VerifyProgress(checked, bytes_to_check, result.mismatched_bytes,
+                                             elapsed, checked / elapsed if elapsed > 0 else 0.0))
+
+        outcomes = {}
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="verify") as executor:
+            futures = [executor.submit(self._hash_extent, index, counter) for index in indices]
+            last_report = 0.0
+            for future in futures:
+                while True:
+                    try:
+                        index, matched, read_error, read = future.result(timeout=self.progress_interval or None)
+                        break
+                    except FutureTimeout:
+                        if progress_callback is not None:
+                            report()
+                outcomes[index] = (matched, read_error, read)
+                now = time.monotonic()
+                if progress_callback is not None and now - last_report >= self.progress_interval:
+                    last_report = now
+                    report()
+
+        for index in indices:
+            matched, read_error, read = outcomes[index]
+            start, end = self.digest.extent_range(index)
+            if matched is None:
+                continue
+            if read_error:
+                _add_extent(result.read_errors, start, end)
+                continue
+            _add_extent(result.checked_extents, start, start + read)
+            result.bytes_checked += read
+            if not matched:
+                _add_extent(result.bad_extents, start, end)
+
+        result.duration = time.monotonic() - start_time
+        result.completed = not self.stopped
+        if progress_callback is not None:
+            report()
+        return result
@@ -24,6 +24,12 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import QTextCursor, QFont, QIcon
 
+from BLACKSTORM.core.device_inventory import get_inventory, udev_properties
+from BLACKSTORM.core.drive_health import PROBE_TIMEOUT, get_health_service
+from BLACKSTORM.core.storage_bench import (
+    BenchHistory, BenchSpec, compare, default_suite, prepare_test_file, run_spec
+)
+
 class AdvancedTab(QWidget):
     """Tab for advanced settings and tools."""
     
@@ -317,30 +323,19 @@ Type 'help' for available commands
             self.terminal_output.append(f"Error restarting application: {str(e)}")
             
     def _is_smart_capable(self, device):
-        """Check if a device supports SMART."""
+        """Check if a device supports SMART, from the shared health cache."""
+        disk = get_inventory().disk_for(device) or {'device': device, 'serial': ''}
         try:
-            # First check if smartctl is installed
-            subprocess.run(['which', 'smartctl'], check=True, 
-                         stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            
-            # Get device info
-            result = subprocess.run(
-                ['smartctl', '-i', device],
-                capture_output=True, text=True
-            )
-            
-            # Check for both traditional SMART and NVMe devices
-            return ('SMART support is:' in result.stdout or 
-                   'NVME' in result.stdout.upper() or
-                   'NVMe' in result.stdout or
-                   'SMART/Health' in result.stdout)
-                    
-        except subprocess.CalledProcessError as e:
-            self.terminal_output.append(f"  Warning: smartctl command failed: {e.stderr.strip()}")
-            return False
+            report = get_health_service().get(disk['device'], disk['serial'] or None,
+                                              timeout=PROBE_TIMEOUT + 5)
         except Exception as e:
             self.terminal_output.append(f"  Warning: {str(e)}")
             return False
+        if report.status == 'N/A':
+            self.terminal_output.append("  Warning: smartctl is not installed")
+        for issue in report.issues:
+            self.terminal_output.append(f"  Warning: {issue}")
+        return report.smart_capable
     
     def _get_device_info(self, device):
         """Get detailed information about a device or partition."""
@@ -355,45 +350,21 @@ Type 'help' for available commands
         }
         
         try:
-            # Get udev information
-            udev_info = subprocess.run(
-                ['udevadm', 'info', '--query=property', '--name=' + device],
-                capture_output=True, text=True
-            )
-            
-            if udev_info.returncode == 0:
-                for line in udev_info.stdout.split('\n'):
-                    if 'ID_MODEL=' in line:
-                        info['model'] = line.split('=')[1].replace('_', ' ').strip('"')
-                    elif 'ID_PART_TABLE_TYPE=' in line:
-                        info['table_type'] = line.split('=')[1].strip('"')
-            
-            # Get size
-            try:
-                size_bytes = int(subprocess.check_output(
-                    ['blockdev', '--getsize64', device]
-                ).decode().strip())
-                info['size'] = f"{size_bytes / (1024**3):.2f} GB"
-            except:
-                pass
-                
-            # Check mount status
-            mount_check = subprocess.run(
-                ['findmnt', '--source', device, '-n', '-o', 'TARGET'],
-                capture_output=True, text=True
-            )
-            
-            if mount_check.returncode == 0 and mount_check.stdout.strip():
+            # Everything comes from the inventory and udev's database; no subprocesses
+            disk = get_inventory().disk_for(device)
+            if disk is None:
+                return info
+            part = next((p for p in disk['partitions'] if p['device'] == device), disk)
+            info['type'] = 'disk' if part is disk else 'partition'
+            info['model'] = disk['model']
+            info['size'] = f"{part['size_bytes'] / (1024**3):.2f} GB"
+            if part['mountpoint']:
                 info['mounted'] = True
-                info['mount_points'] = [mp for mp in mount_check.stdout.strip().split('\n') if mp]
-                
-            # Check filesystem
-            blkid = subprocess.run(
-                ['blkid', '-o', 'value', '-s', 'TYPE', device],
-                capture_output=True, text=True
-            )
-            if blkid.returncode == 0 and blkid.stdout.strip():
-                info['filesystem'] = blkid.stdout.strip()
+                info['mount_points'] = [part['mountpoint']]
+            
+            udev = udev_properties(os.path.basename(device))
+            info['table_type'] = udev.get('ID_PART_TABLE_TYPE')
+            info['filesystem'] = part['fstype'] or udev.get('ID_FS_TYPE') or None
                 
         except Exception as e:
             self.terminal_output.append(f"  Warning: Could not get all device info: {str(e)}")
@@ -569,17 +540,26 @@ Type 'help' for available commands
         except Exception as e:
             self.terminal_output.append(f"  Error: {str(e)}")
     
-    def _run_benchmark(self, device):
-        """Run storage benchmark on the specified device in a separate thread."""
+    def _run_benchmark(self, target, args=()):
+        """Run storage benchmark on the specified device or directory in a separate thread."""
         # Check if benchmark is already running
         if hasattr(self, '_benchmark_thread') and self._benchmark_thread.is_alive():
             self.terminal_output.append("Benchmark is already running. Please wait...")
             return
+        
+        try:
+            options = self._parse_benchmark_args(args, target)
+        except ValueError as e:
+            self.terminal_output.append(f"Error: {str(e)}")
+            self.terminal_output.append("Usage: benchmark <device|directory> [--write] [--pattern read|write|randread|randwrite] "
+                                        "[--bs 4k] [--qd 32] [--threads 1] [--time 10] [--size 1G]")
+            return
             
         # Create a thread to run the benchmark
+        self._benchmark_stop = threading.Event()
         self._benchmark_thread = threading.Thread(
             target=self._run_benchmark_thread,
-            args=(device,),
+            args=(target, options),
             daemon=True
         )
         self._benchmark_thread.start()
@@ -754,90 +734,129 @@ Type 'help' for available commands
                     
             append_output("\nVerification completed.")
     
-    def _run_benchmark_thread(self, device):
+    @staticmethod
+    def _parse_benchmark_size(text):
+        """Parse a size such as '4k', '1M' or '2G' into bytes."""
+        match = re.fullmatch(r'(\d+)([kKmMgG]?)', text)
+        if not match:
+            raise ValueError(f"Invalid size: {text}")
+        return int(match.group(1)) * {'': 1, 'k': 1 << 10, 'm': 1 << 20, 'g': 1 << 30}[match.group(2).lower()]
+    
+    def _parse_benchmark_args(self, args, target=None):
+        """Parse benchmark command options into a dict.
+        
+        A write pattern against a device (anything but a directory) is
+        rejected unless ``--write`` was given explicitly.
+        """
+        options = {'write': False, 'duration': 10.0, 'size': 1 << 30, 'custom': {}}
+        args = list(args)
+        while args:
+            flag = args.pop(0)
+            if flag == '--write':
+                options['write'] = True
+                continue
+            if not args:
+                raise ValueError(f"Missing value for {flag}")
+            value = args.pop(0)
+            if flag == '--time':
+                options['duration'] = float(value)
+            elif flag == '--size':
+                options['size'] = self._parse_benchmark_size(value)
+            elif flag == '--pattern':
+                options['custom']['pattern'] = value
+            elif flag == '--bs':
+                options['custom']['block_size'] = self._parse_benchmark_size(value)
+            elif flag == '--qd':
+                options['custom']['queue_depth'] = int(value)
+            elif flag == '--threads':
+                options['custom']['threads'] = int(value)
+            else:
+                raise ValueError(f"Unknown option {flag}")
+        if options['custom']:
+            custom = dict(pattern='randread', block_size=4096, queue_depth=1, threads=1)
+            custom.update(options['custom'])
+            name = (f"{custom['pattern']} {custom['block_size'] // 1024}K "
+                    f"QD{custom['queue_depth']} x{custom['threads']}")
+            options['specs'] = [BenchSpec(name, duration=options['duration'], **custom)]
+            if options['specs'][0].is_write and not options['write'] and not (target and os.path.isdir(target)):
+                raise ValueError(f"--pattern {custom['pattern']} overwrites {target or 'the device'}; "
+                                 "add --write to allow destructive writes")
+        else:
+            options['specs'] = default_suite(options['duration'], writes=True)
+        return options
+    
+    def _run_benchmark_thread(self, target, options):
         """Thread function to run the benchmark."""
         def append_output(text):
             # Helper to safely update the UI from the thread
             self.terminal_output.append(text)
-            
-        append_output("\n=== Starting Storage Benchmark ===")
         
-        # Check if fio is installed
-        try:
-            subprocess.run(['which', 'fio'], check=True, capture_output=True)
-        except subprocess.CalledProcessError:
-            append_output("  Error: 'fio' (Flexible I/O Tester) is required but not installed.")
-            append_output("  Install it with: sudo apt-get install fio")
-            return
+        should_stop = self._benchmark_stop.is_set
+        specs = options['specs']
+        device = get_inventory().get(target) if target.startswith('/dev/') else None
+        test_file = None
         
-        # Create a temporary file for testing
-        test_file = f"/tmp/blackstorm_benchmark_{os.getpid()}.tmp"
-        test_size = "256M"  # Test with 256MB file
+        append_output("\n=== Starting Storage Benchmark ===")
         
         try:
-            # Sequential Read Test
-            append_output("\n[1/4] Sequential Read Test (30s)...")
-            result = subprocess.run(
-                ['fio', '--name=seqread', f'--filename={test_file}',
-                 '--rw=read', '--bs=1M', '--direct=1', '--ioengine=libaio',
-                 '--numjobs=1', '--time_based', '--runtime=30s',
-                 '--size=256M', '--group_reporting', '--output-format=json'],
-                capture_output=True, text=True, check=True
-            )
-            read_speed = self._parse_fio_output(result.stdout)
-            append_output(f"  Sequential Read: {read_speed} MB/s")
+            if os.path.isdir(target):
+                # Test file on the filesystem under test, large enough to defeat caching
+                test_file = os.path.join(target, f"blackstorm_benchmark_{os.getpid()}.tmp")
+                append_output(f"  Preparing {options['size'] // (1 << 20)} MB test file in {target}...")
+                prepare_test_file(test_file, options['size'], should_stop=should_stop)
+                bench_target, size = test_file, options['size']
+            else:
+                bench_target, size = target, None
+                if not options['write']:
+                    # Writes to a raw device destroy its contents
+                    specs = [spec for spec in specs if not spec.is_write]
+                    append_output("  Read-only run on the raw device (add --write for destructive write tests)")
             
-            # Sequential Write Test
-            append_output("\n[2/4] Sequential Write Test (30s)...")
-            result = subprocess.run(
-                ['fio', '--name=seqwrite', f'--filename={test_file}',
-                 '--rw=write', '--bs=1M', '--direct=1', '--ioengine=libaio',
-                 '--numjobs=1', '--time_based', '--runtime=30s',
-                 '--size=256M', '--group_reporting', '--output-format=json'],
-                capture_output=True, text=True, check=True
-            )
-            write_speed = self._parse_fio_output(result.stdout)
-            append_output(f"  Sequential Write: {write_speed} MB/s")
+            if device:
+                append_output(f"  Drive: {device.get('vendor', '')} {device['model']} "
+                              f"{device.get('serial', '')}".rstrip())
             
-            # Random Read Test
-            append_output("\n[3/4] Random 4K Read Test (30s)...")
-            result = subprocess.run(
-                ['fio', '--name=randread', f'--filename={test_file}',
-                 '--rw=randread', '--bs=4k', '--direct=1', '--ioengine=libaio',
-                 '--iodepth=64', '--numjobs=1', '--time_based', '--runtime=30s',
-                 '--size=256M', '--group_reporting', '--output-format=json'],
-                capture_output=True, text=True, check=True
-            )
-            rand_read_iops = self._parse_fio_output(result.stdout, iops=True)
-            append_output(f"  Random 4K Read: {rand_read_iops} IOPS")
-            
-            # Random Write Test
-            append_output("\n[4/4] Random 4K Write Test (30s)...")
-            result = subprocess.run(
-                ['fio', '--name=randwrite', f'--filename={test_file}',
-                 '--rw=randwrite', '--bs=4k', '--direct=1', '--ioengine=libaio',
-                 '--iodepth=64', '--numjobs=1', '--time_based', '--runtime=30s',
-                 '--size=256M', '--group_reporting', '--output-format=json'],
-                capture_output=True, text=True, check=True
-            )
-            rand_write_iops = self._parse_fio_output(result.stdout, iops=True)
-            append_output(f"  Random 4K Write: {rand_write_iops} IOPS")
+            history = BenchHistory()
+            results = []
+            for i, spec in enumerate(specs, 1):
+                if should_stop():
+                    append_output("\nBenchmark stopped.")
+                    break
+                append_output(f"\n[{i}/{len(specs)}] {spec.name} "
+                              f"(bs={spec.block_size // 1024}K, qd={spec.queue_depth}, "
+                              f"threads={spec.threads}, {spec.duration:.0f}s)...")
+                result = run_spec(spec, bench_target, size=size, should_stop=should_stop)
+                results.append(result)
+                append_output(f"  {result.describe()}")
+                if not result.direct:
+                    append_output("  Note: target does not support direct I/O, page cache may inflate results")
+                if result.errors:
+                    append_output(f"  Warning: {result.errors} I/O errors")
+                
+                try:
+                    previous = history.previous(result, device)
+                    history.append(result, device)
+                except OSError as e:
+                    previous = None
+                    append_output(f"  Warning: Could not save results: {str(e)}")
+                if previous:
+                    delta = compare(result, previous)
+                    when = datetime.fromtimestamp(previous['timestamp']).strftime('%Y-%m-%d %H:%M')
+                    append_output(f"  vs {when}: throughput {delta['throughput']:+.1%}, "
+                                  f"IOPS {delta['iops']:+.1%}, p99 latency {delta['p99_us']:+.1%}")
             
             # Summary
-            append_output("\n=== Benchmark Summary ===")
-            append_output(f"  Sequential Read:  {read_speed} MB/s")
-            append_output(f"  Sequential Write: {write_speed} MB/s")
-            append_output(f"  Random 4K Read:   {rand_read_iops} IOPS")
-            append_output(f"  Random 4K Write:  {rand_write_iops} IOPS")
-            append_output("\nBenchmark completed!")
+            if results:
+                append_output("\n=== Benchmark Summary ===")
+                for result in results:
+                    append_output(f"  {result.spec.name:<22} {result.describe()}")
+                append_output("\nBenchmark completed!")
             
-        except subprocess.CalledProcessError as e:
-            append_output(f"  Error running benchmark: {e.stderr}")
         except Exception as e:
-            append_output(f"  Unexpected error: {str(e)}")
+            append_output(f"  Error running benchmark: {str(e)}")
         finally:
             # Clean up
-            if os.path.exists(test_file):
+            if test_file and os.path.exists(test_file):
                 try:
                     os.remove(test_file)
                 except Exception as e:
@@ -869,20 +888,6 @@ Type 'help' for available commands
         
         return None
         
-    def _parse_fio_output(self, json_output, iops=False):
-        """Parse fio JSON output to extract speed or IOPS."""
-        try:
-            data = json.loads(json_output)
-            job = data['jobs'][0]
-            if iops:
-                return int(job['read']['iops'] + job['write']['iops'])
-            else:
-                # Convert from bytes to MB/s
-                return round((job['read']['bw'] + job['write']['bw']) / 1024, 2)
-        except (json.JSONDecodeError, KeyError, IndexError) as e:
-            self.terminal_output.append(f"  Error parsing benchmark results: {str(e)}")
-            return "N/A"
-    
     def _run_badblocks_test(self, device, read_only=True):
         """Check for bad blocks on the device."""
         try:
@@ -1025,7 +1030,7 @@ Storage Management:
 
 Diagnostics & Maintenance:
   test <device>     - Run diagnostics on a device
-  benchmark <device> - Benchmark a device's performance
+  benchmark <device|dir> - Benchmark a device's performance
   verify <device>   - Verify integrity of a device
   recover <device>  - Attempt data recovery
   logs              - View application logs
@@ -1061,7 +1066,10 @@ Security & Automation:
                 return
                 
             elif command.lower() == "stop":
-                if hasattr(self, '_verify_process') and self._verify_process and self._verify_process.poll() is None:
+                if hasattr(self, '_benchmark_thread') and self._benchmark_thread.is_alive():
+                    self.terminal_output.append("Stopping benchmark...")
+                    self._benchmark_stop.set()
+                elif hasattr(self, '_verify_process') and self._verify_process and self._verify_process.poll() is None:
                     self.terminal_output.append("Stopping verification...")
                     self.stop_verification()
                 else:
@@ -1884,18 +1892,18 @@ System Load:
                     self.terminal_output.append(f"Error during restore: {str(e)}")
                     
             elif command.lower().startswith("benchmark "):
-                # Format: benchmark <device>
+                # Format: benchmark <device|directory> [options]
                 parts = command.split()
                 if len(parts) < 2:
-                    self.terminal_output.append("Usage: benchmark <device>")
+                    self.terminal_output.append("Usage: benchmark <device|directory> [options]")
                     return
                     
-                device = self._resolve_device(parts[1])
-                if not device:
+                target = parts[1] if os.path.isdir(parts[1]) else self._resolve_device(parts[1])
+                if not target:
                     self.terminal_output.append(f"Error: Device {parts[1]} not found")
                     return
                     
-                self._run_benchmark(device)
+                self._run_benchmark(target, parts[2:])
                 
             elif command.lower().startswith("test "):
                 try:
@@ -1,15 +1,22 @@
 """
 Bulk Operations tab for BLACKSTORM - Perform operations on multiple devices.
 """
+import os
+
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QListWidget, QListWidgetItem, QGroupBox, QTextEdit,
     QFormLayout, QLineEdit, QFileDialog, QTabWidget, QProgressBar,
     QMessageBox, QComboBox, QCheckBox, QSplitter, QTableWidget,
-    QTableWidgetItem, QHeaderView, QTreeWidget, QTreeWidgetItem
+    QTableWidgetItem, QHeaderView, QTreeWidget, QTreeWidgetItem, QSpinBox
 )
 from PySide6.QtCore import Qt, Signal
 
+from BLACKSTORM.tabs.wipe_operations_tab import ConcurrentWipeRunner, WipeWorker
+from BLACKSTORM.ui.components.device_events import device_events
+
+WIPE_OPERATION = "Wipe All Selected Devices"
+
 class BulkOperationsTab(QWidget):
     """Tab for performing operations on multiple devices."""
     
@@ -66,26 +73,6 @@ class BulkOperationsTab(QWidget):
         self.device_tree.setHeaderLabels(["Device", "Size", "Type", "Status"])
         self.device_tree.setSelectionMode(QTreeWidget.SelectionMode.MultiSelection)
         
-        # Add some sample devices (in a real app, this would be populated from the system)
-        devices = [
-            {"name": "sda", "size": "500.1 GB", "type": "HDD", "status": "Ready"},
-            {"name": "sdb", "size": "1.0 TB", "type": "SSD", "status": "Ready"},
-            {"name": "sdc", "size": "32.0 GB", "type": "USB", "status": "Ready"},
-        ]
-        
-        for dev in devices:
-            item = QTreeWidgetItem([
-                dev["name"], 
-                dev["size"], 
-                dev["type"], 
-                dev["status"]
-            ])
-            self.device_tree.addTopLevelItem(item)
-        
-        # Set column widths
-        for i in range(self.device_tree.columnCount()):
-            self.device_tree.resizeColumnToContents(i)
-        
         device_layout.addWidget(self.device_tree)
         device_group.setLayout(device_layout)
         
@@ -95,13 +82,22 @@ class BulkOperationsTab(QWidget):
         
         self.op_combo = QComboBox()
         self.op_combo.addItems([
-            "Wipe All Selected Devices",
+            WIPE_OPERATION,
             "Image All Selected Devices",
             "Verify All Selected Devices",
             "Benchmark All Selected Devices"
         ])
         
         op_layout.addWidget(self.op_combo)
+        
+        # Concurrency for wipes
+        concurrency_layout = QHBoxLayout()
+        concurrency_layout.addWidget(QLabel("Concurrent jobs:"))
+        self.concurrent_jobs = QSpinBox()
+        self.concurrent_jobs.setRange(1, 32)
+        self.concurrent_jobs.setValue(8)
+        concurrency_layout.addWidget(self.concurrent_jobs)
+        op_layout.addLayout(concurrency_layout)
         op_group.setLayout(op_layout)
         
         # Add to left layout
@@ -118,11 +114,13 @@ class BulkOperationsTab(QWidget):
         
         self.op_status = QLabel("No operation in progress")
         self.op_progress = QProgressBar()
+        self.op_throughput = QLabel("")
         self.op_log = QTextEdit()
         self.op_log.setReadOnly(True)
         
         details_layout.addRow("Status:", self.op_status)
         details_layout.addRow("Progress:", self.op_progress)
+        details_layout.addRow("Throughput:", self.op_throughput)
         details_layout.addRow(self.op_log)
         
         # Action buttons
@@ -154,15 +152,48 @@ class BulkOperationsTab(QWidget):
         self.btn_start.clicked.connect(self.start_operation)
         self.btn_stop.clicked.connect(self.stop_operation)
         btn_refresh.clicked.connect(self.refresh_devices)
+        
+        self.wipe_runner = None
+        self.refresh_devices()
+        device_events().devices_changed.connect(self.refresh_devices)
     
-    def refresh_devices(self):
-        """Refresh the list of available devices."""
-        # In a real app, this would query the system for connected devices
+    def refresh_devices(self, change=None):
+        """Refresh the list of available devices from the shared device inventory."""
         self.op_log.append("Refreshing device list...")
         
-        # Simulate device refresh
-        # In a real app, you would update the device_tree with actual devices
-        self.op_log.append("Found 3 devices")
+        # Update the tree in place: items of running wipes must stay alive
+        items = {self.device_tree.topLevelItem(i).text(0): self.device_tree.topLevelItem(i)
+                 for i in range(self.device_tree.topLevelItemCount())}
+        busy = set(getattr(self, '_device_items', {})) if self.wipe_runner is not None else set()
+        attached = set()
+        for dev in device_events().devices():
+            attached.add(dev['name'])
+            if dev['transport'] == 'usb':
+                dev_type = "USB"
+            elif dev['name'].startswith('nvme'):
+                dev_type = "NVMe"
+            else:
+                dev_type = "HDD" if dev['rotational'] else "SSD"
+            item = items.get(dev['name'])
+            if item is None:
+                self.device_tree.addTopLevelItem(
+                    QTreeWidgetItem([dev['name'], f"{dev['size_gb']}G", dev_type, "Ready"]))
+            else:
+                item.setText(1, f"{dev['size_gb']}G")
+                item.setText(2, dev_type)
+        for name, item in items.items():
+            if name in attached:
+                continue
+            if f"/dev/{name}" in busy:
+                item.setText(3, "Disconnected")
+            else:
+                self.device_tree.takeTopLevelItem(self.device_tree.indexOfTopLevelItem(item))
+        
+        # Set column widths
+        for i in range(self.device_tree.columnCount()):
+            self.device_tree.resizeColumnToContents(i)
+        
+        self.op_log.append(f"Found {self.device_tree.topLevelItemCount()} devices")
         self.op_log.append("Device list updated")
     
     def start_operation(self):
@@ -175,6 +206,10 @@ class BulkOperationsTab(QWidget):
         op = self.op_combo.currentText()
         device_names = [item.text(0) for item in selected_items]
         
+        if op == WIPE_OPERATION:
+            self.start_bulk_wipe(selected_items)
+            return
+        
         self.op_status.setText(f"Starting {op} on {len(device_names)} devices...")
         self.op_log.append(f"Starting {op} on {', '.join(device_names)}")
         
@@ -188,8 +223,105 @@ class BulkOperationsTab(QWidget):
         # For now, just simulate progress
         self.simulate_progress()
     
+    def start_bulk_wipe(self, selected_items):
+        """Wipe the selected devices concurrently with a quick zero pass."""
+        if os.geteuid() != 0:
+            QMessageBox.critical(
+                self, "Permission Denied",
+                "Root privileges are required for disk wiping.\n\n"
+                "Please run this application with sudo or as root."
+            )
+            return
+        
+        devices = [f"/dev/{item.text(0)}" for item in selected_items]
+        confirm = QMessageBox.question(
+            self, "Confirm Bulk Wipe",
+            f"WARNING: This will PERMANENTLY DESTROY ALL DATA on {len(devices)} devices.\n\n"
+            f"Devices to wipe: {', '.join(devices)}\n\n"
+            f"Are you absolutely sure you want to continue?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            self.op_log.append("Bulk wipe cancelled by user")
+            return
+        
+        self._device_items = {f"/dev/{item.text(0)}": item for item in selected_items}
+        self._device_progress = {device: 0 for device in devices}
+        self.wipe_runner = ConcurrentWipeRunner(
+            devices,
+            lambda device: WipeWorker(device=device, method='quick', verify=False),
+            max_jobs=self.concurrent_jobs.value()
+        )
+        self.wipe_runner.job_started.connect(self._on_wipe_started)
+        self.wipe_runner.job_finished.connect(self._on_wipe_finished)
+        self.wipe_runner.progress_batch.connect(self._on_progress_batch)
+        self.wipe_runner.throughput_changed.connect(self._on_throughput_changed)
+        self.wipe_runner.all_finished.connect(self._on_bulk_wipe_finished)
+        
+        for bus, bus_devices in self.wipe_runner.bus_groups().items():
+            self.op_log.append(f"Bus {bus}: {', '.join(bus_devices)}")
+        
+        self.op_status.setText(f"Wiping {len(devices)} devices, up to {self.concurrent_jobs.value()} at once")
+        self.op_progress.setValue(0)
+        self.btn_start.setEnabled(False)
+        self.btn_stop.setEnabled(True)
+        self.wipe_runner.start()
+    
+    def _on_wipe_started(self, device, worker):
+        """Track a newly started wipe in the device tree."""
+        self._device_items[device].setText(3, "Wiping")
+        worker.progress.connect(self._on_wipe_progress)
+        worker.log_message.connect(self._on_wipe_log)
+    
+    def _on_wipe_log(self, message):
+        worker = self.sender()
+        self.op_log.append(f"[{os.path.basename(worker.device)}] {message}")
+    
+    def _on_wipe_progress(self, percent, message):
+        """Show a status update sent directly by a worker."""
+        self._show_device_progress(self.sender().device, percent, message)
+    
+    def _on_progress_batch(self, events):
+        """Show the newest progress of every running wipe, once per UI tick."""
+        for event in events:
+            self._show_device_progress(event.job, int(event.overall_percent), event.describe())
+    
+    def _show_device_progress(self, device, percent, message):
+        """Show per-device progress and throughput in the device tree."""
+        self._device_progress[device] = percent
+        self._device_items[device].setText(3, message)
+        self.op_progress.setValue(sum(self._device_progress.values()) // len(self._device_progress))
+    
+    def _on_wipe_finished(self, device, success, message):
+        self._device_progress[device] = 100
+        self._device_items[device].setText(3, "Wiped" if success else f"Failed: {message}")
+        self.op_log.append(f"Wipe {'completed' if success else 'failed'} on {device}: {message}")
+    
+    def _on_throughput_changed(self, rate, running):
+        if running:
+            self.op_throughput.setText(f"{rate / 1024 / 1024:.1f} MB/s across {running} running wipe(s)")
+        else:
+            self.op_throughput.setText("")
+    
+    def _on_bulk_wipe_finished(self, success, message):
+        self.op_status.setText(message)
+        self.op_log.append(message)
+        self.op_throughput.setText("")
+        self.wipe_runner.deleteLater()
+        self.wipe_runner = None
+        self.btn_start.setEnabled(True)
+        self.btn_stop.setEnabled(False)
+    
     def stop_operation(self):
         """Stop the current operation."""
+        if self.wipe_runner is not None:
+            self.op_status.setText("Stopping wipes...")
+            self.op_log.append("Stopping running wipes...")
+            self.btn_stop.setEnabled(False)
+            self.wipe_runner.stop()
+            return
+        
         self.op_status.setText("Operation stopped by user")
         self.op_log.append("Operation stopped by user")
         
@@ -1,18 +1,73 @@
 import os
 import time
 from datetime import datetime, timedelta
-from collections import deque
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QFrame, QGroupBox, QScrollArea, QStatusBar, QDialog,
-    QDialogButtonBox, QApplication, QMessageBox
+    QDialogButtonBox, QApplication, QMessageBox, QListView
 )
 from PySide6.QtGui import QFont, QIcon, QPainterPath, QPen, QBrush, QColor
-from PySide6.QtCore import QTimer, Qt, Signal
+from PySide6.QtCore import QTimer, Qt, Signal, QAbstractListModel, QModelIndex
 from typing import Tuple, List, Dict
 
+from BLACKSTORM.core.activity_feed import ActivityFeed, parse_app_line, parse_system_line
 from BLACKSTORM.ui.components.system_monitor import SystemMonitor
 
+ACTIVITY_ICONS = {
+    'System': '🔧',
+    'Application': '💻',
+    'Kernel': '⚙️',
+    'Error': '❌',
+    'Warning': '⚠️',
+    'Info': 'ℹ️'
+}
+MAX_ACTIVITY_ROWS = 500
+
+
+class ActivityModel(QAbstractListModel):
+    """Newest-first list model over activity events; new events are inserted, not rebuilt."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._events = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._events)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        event = self._events[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{ACTIVITY_ICONS.get(event.category, '🔹')}  {event.category}: {event.message}    {event.timestamp}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return event.raw
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if event.category == 'Error':
+                return QColor('#e74c3c')
+            if event.category == 'Warning':
+                return QColor('#f39c12')
+        return None
+    
+    def set_events(self, events):
+        """Replace all rows (used when the filters change)."""
+        self.beginResetModel()
+        self._events = list(events)[:MAX_ACTIVITY_ROWS]
+        self.endResetModel()
+    
+    def prepend(self, events):
+        """Insert newest-first ``events`` at the top, dropping rows past the limit."""
+        if not events:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(events) - 1)
+        self._events[0:0] = events
+        self.endInsertRows()
+        if len(self._events) > MAX_ACTIVITY_ROWS:
+            self.beginRemoveRows(QModelIndex(), MAX_ACTIVITY_ROWS, len(self._events) - 1)
+            del self._events[MAX_ACTIVITY_ROWS:]
+            self.endRemoveRows()
+
+
 class DashboardTab(QWidget):
     def __init__(self, parent=None, tab_widget=None):
         """Initialize the Dashboard tab with a reference to the parent and tab widget."""
@@ -63,10 +118,10 @@ class DashboardTab(QWidget):
         # Create the main content
         self.create_dashboard_tab()
         
-        # Set up the auto-refresh timer for activities
+        # Set up the auto-refresh timer for activities; each tick only reads new log bytes
         self.activities_timer = QTimer(self)
         self.activities_timer.timeout.connect(self.update_activities)
-        self.activities_timer.start(10000)  # Update every 10 seconds
+        self.activities_timer.start(2000)  # Update every 2 seconds
         
         print("Dashboard UI initialization complete")
         
@@ -115,8 +170,36 @@ class DashboardTab(QWidget):
         if hasattr(self, 'update_system_stats'):
             self.update_system_stats()
     
+    def _init_activity_feed(self):
+        """Create the activity feed that tails the system and application logs."""
+        # Define log directory in user's config folder
+        log_dir = os.path.expanduser('~/.config/blackstorm/logs')
+        app_log = os.path.join(log_dir, 'blackstorm.log')
+        
+        # Create log directory and an empty application log if they don't exist
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            os.chmod(log_dir, 0o755)  # Ensure it's readable
+            if not os.path.exists(app_log):
+                with open(app_log, 'a'):
+                    pass
+                os.chmod(app_log, 0o644)
+        except Exception as e:
+            print(f"Error creating log file {app_log}: {e}")
+        
+        self.activity_feed = ActivityFeed([
+            ('/var/log/syslog', parse_system_line),  # System logs
+            (app_log, parse_app_line)  # Application logs
+        ], maxlen=MAX_ACTIVITY_ROWS)
+    
+    def _visible_categories(self):
+        """Categories whose filter button is checked (all of them if none is)."""
+        visible = [category for category, btn in getattr(self, 'filter_buttons', {}).items()
+                   if self._is_widget_valid(btn) and btn.isChecked()]
+        return visible or list(getattr(self, 'filter_buttons', {}).keys()) or None
+    
     def update_activities(self):
-        """Update the Recent Activities section with latest system and application events.
+        """Add events appended to the system and application logs since the last update.
 
         Also updates the status bar via _update_status_bar().
         """
@@ -124,323 +207,28 @@ class DashboardTab(QWidget):
             # Update status bar
             self._update_status_bar()
 
-            # Skip if the activities layout doesn't exist yet
-            if not hasattr(self, 'activities_layout') or not self.activities_layout:
+            # Skip if the activities view doesn't exist yet
+            if not hasattr(self, 'activity_model'):
                 return
-                
-            # Store current filter states if they exist
-            current_filters = {}
-            if hasattr(self, 'filter_buttons'):
-                for category, btn in list(self.filter_buttons.items()):  # Create a copy with list()
-                    try:
-                        if self._is_widget_valid(btn):
-                            current_filters[category] = btn.isChecked()
-                    except Exception as e:
-                        print(f"Error getting filter state for {category}: {e}")
-                        continue
             
-            # Clear existing activities if layout exists and is valid
-            if hasattr(self, 'activities_layout') and self.activities_layout:
-                try:
-                    # Store the layout in a local variable before clearing
-                    layout = self.activities_layout
-                    if self._is_widget_valid(layout):
-                        # Clear the layout
-                        while layout.count() > 0:
-                            item = layout.takeAt(0)
-                            if item is None:
-                                continue
-                                
-                            widget = item.widget()
-                            if widget is not None and self._is_widget_valid(widget):
-                                try:
-                                    widget.deleteLater()
-                                except RuntimeError:
-                                    pass  # Widget already deleted
-                except Exception as e:
-                    print(f"Error clearing activities layout: {e}")
+            new_events = self.activity_feed.poll()
+            if new_events:
+                visible = self._visible_categories()
+                self.activity_model.prepend(
+                    [event for event in reversed(new_events) if visible is None or event.category in visible])
             
-            # Initialize activity items list if it doesn't exist
-            if not hasattr(self, 'all_activity_items'):
-                self.all_activity_items = []
+            # If no events found, show a helpful message
+            if self.activity_model.rowCount() == 0:
+                self.activities_placeholder.setText(
+                    "No recent activities found in logs. This could be because log files are empty or not accessible.")
+                self.activities_placeholder.setVisible(True)
             else:
-                # Clear existing items safely
-                try:
-                    self.all_activity_items.clear()
-                except (AttributeError, RuntimeError) as e:
-                    print(f"Error clearing activity items: {e}")
-                    self.all_activity_items = []
-                
-            # Reapply filter states if they existed
-            if hasattr(self, 'filter_buttons'):
-                for category, btn in list(self.filter_buttons.items()):  # Create a copy with list()
-                    try:
-                        if category in current_filters and self._is_widget_valid(btn):
-                            btn.setChecked(current_filters[category])
-                    except Exception as e:
-                        print(f"Error setting filter state for {category}: {e}")
-                        continue
-                
-                # Apply filters if we have any
-                try:
-                    if hasattr(self, 'filter_buttons') and self.filter_buttons:
-                        self._apply_filters()
-                except Exception as e:
-                    print(f"Error applying filters: {e}")
-            
-            # Define log directory in user's config folder
-            log_dir = os.path.expanduser('~/.config/blackstorm/logs')
-            app_log = os.path.join(log_dir, 'blackstorm.log')
-            
-            # Create log directory if it doesn't exist
-            try:
-                os.makedirs(log_dir, exist_ok=True)
-                os.chmod(log_dir, 0o755)  # Ensure it's readable
-            except Exception as e:
-                print(f"Error creating log directory {log_dir}: {e}")
-            
-            # Get system logs and application logs
-            log_files = [
-                ('/var/log/syslog', 'system'),  # System logs
-                (app_log, 'app')  # Application logs
-            ]
-            
-            # Check if log files exist and are readable
-            for log_file, source in log_files[:]:
-                if not os.path.exists(log_file):
-                    print(f"Log file not found: {log_file}")
-                    if source == 'app':
-                        # Create an empty log file if it doesn't exist
-                        try:
-                            with open(log_file, 'a'):
-                                os.utime(log_file, None)
-                            os.chmod(log_file, 0o644)
-                            print(f"Created empty log file: {log_file}")
-                        except Exception as e:
-                            print(f"Error creating log file {log_file}: {e}")
-                            log_files.remove((log_file, source))
-            
-            all_events = []
-            for log_file, source in log_files:
-                try:
-                    if not os.path.exists(log_file):
-                        print(f"Log file not found: {log_file}")
-                        continue
-                        
-                    print(f"Reading log file: {log_file} (exists: {os.path.exists(log_file)})")
-                    logs = self._read_log_file(log_file, max_lines=50)
-                    print(f"Found {len(logs)} log entries in {log_file}")
-                    
-                    if source == 'system':
-                        all_events.extend(self._parse_system_logs(logs))
-                    else:
-                        all_events.extend(self._parse_app_logs(logs))
-                        
-                except Exception as e:
-                    print(f"Error processing {log_file}: {e}")
-            
-            # If no events found, add a helpful message
-            if not all_events:
-                self._add_activity_item(
-                    "Info",
-                    "No recent activities found in logs. This could be because log files are empty or not accessible.",
-                    datetime.now().strftime("%H:%M"),
-                    "app"
-                )
-                return
-            
-            # Sort events by timestamp (newest first)
-            all_events.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-            
-            # Get active filters
-            active_filters = {}
-            if hasattr(self, 'filter_buttons'):
-                active_filters = {cat: btn.isChecked() for cat, btn in self.filter_buttons.items()}
-            
-            # Add filtered events to the layout
-            for event in all_events:
-                category = event.get('category', 'Info')
-                # If no filters are active or the event's category is checked, show it
-                if not active_filters or active_filters.get(category, True):
-                    self._add_activity_item(
-                        category,
-                        event.get('message', 'No message'),
-                        event.get('timestamp', datetime.now().strftime("%H:%M")),
-                        event.get('source', 'app')
-                    )
-                
-            # Create button container
-            button_container = QWidget()
-            button_layout = QHBoxLayout(button_container)
-            button_layout.setContentsMargins(0, 10, 0, 0)
-            button_layout.setSpacing(5)
-            
-            # Add refresh button
-            refresh_btn = QPushButton("Refresh")
-            refresh_btn.setStyleSheet("""
-                QPushButton {
-                    background: #2d3436;
-                    color: #b1b1b1;
-                    border: 1px solid #3c3f41;
-                    border-radius: 3px;
-                    padding: 5px 10px;
-                }
-                QPushButton:hover {
-                    background: #3c3f41;
-                }
-            """)
-            refresh_btn.clicked.connect(self.update_activities)
-            
-            # Add delete logs button
-            delete_btn = QPushButton("Delete Logs")
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background: #6c2e2e;
-                    color: #ff9999;
-                    border: 1px solid #8b3a3a;
-                    border-radius: 3px;
-                    padding: 5px 10px;
-                }
-                QPushButton:hover {
-                    background: #8b3a3a;
-                }
-            """)
-            delete_btn.clicked.connect(self._delete_all_logs)
-            
-            # Add buttons to layout
-            button_layout.addWidget(refresh_btn)
-            button_layout.addWidget(delete_btn)
-            button_layout.addStretch()
-            
-            # Get the button widget and clear existing buttons
-            button_widget = self.activities_button_container.findChild(QWidget)
-            if button_widget:
-                button_layout = button_widget.layout()
-                # Clear existing buttons
-                while button_layout.count() > 0:
-                    item = button_layout.takeAt(0)
-                    if item.widget():
-                        item.widget().deleteLater()
-                
-                # Create new buttons
-                refresh_btn = QPushButton("Refresh")
-                refresh_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #2d3436;
-                        color: #b1b1b1;
-                        border: 1px solid #3c3f41;
-                        border-radius: 3px;
-                        padding: 5px 10px;
-                    }
-                    QPushButton:hover {
-                        border: 1px solid #5d6062;
-                    }
-                """)
-                refresh_btn.clicked.connect(self.update_activities)
-                
-                delete_btn = QPushButton("Delete Logs")
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #6d2727;
-                        color: #ffb3b3;
-                        border: 1px solid #8b3a3a;
-                        border-radius: 3px;
-                        padding: 5px 10px;
-                    }
-                    QPushButton:hover {
-                        background: #8b3a3a;
-                    }
-                """)
-                delete_btn.clicked.connect(self._delete_all_logs)
-                
-                # Add buttons to the layout
-                button_layout.addWidget(refresh_btn)
-                button_layout.addWidget(delete_btn)
+                self.activities_placeholder.setVisible(False)
                 
         except Exception as e:
             print(f"Error updating activities: {e}")
-            error_label = QLabel("Error loading activities")
-            error_label.setStyleSheet("color: #e74c3c; font-style: italic;")
-            self.activities_layout.addWidget(error_label)
-    
-    def _parse_system_logs(self, logs):
-        """Parse system log entries."""
-        events = []
-        for log in logs:
-            try:
-                # Example syslog format: "Jan  1 12:34:56 hostname process[pid]: message"
-                parts = log.split(maxsplit=5)
-                if len(parts) >= 6:
-                    timestamp = ' '.join(parts[:3])
-                    process = parts[4].split('[')[0]
-                    message = parts[5]
-                    
-                    # Categorize by process
-                    category = "System"
-                    if 'blackstorm' in process.lower():
-                        category = "Application"
-                    elif 'kernel' in process.lower():
-                        category = "Kernel"
-                    elif 'dbus' in process.lower() or 'systemd' in process.lower():
-                        category = "System"
-                    
-                    events.append({
-                        'timestamp': timestamp,
-                        'category': category,
-                        'message': message,
-                        'raw': log,
-                        'source': 'system'
-                    })
-            except Exception as e:
-                print(f"Error parsing system log entry: {e}")
-        return events
-    
-    def _parse_app_logs(self, logs):
-        """Parse application log entries."""
-        events = []
-        for log in logs:
-            try:
-                if not log.strip():
-                    continue
-                    
-                # Try to parse as [timestamp] [LEVEL] message
-                if log.startswith('[') and ']' in log:
-                    timestamp_end = log.find(']')
-                    level_end = log.find(']', timestamp_end + 1)
-                    
-                    if level_end > timestamp_end:
-                        timestamp = log[1:timestamp_end].strip()
-                        level = log[timestamp_end+2:level_end].strip()
-                        message = log[level_end+2:].strip()
-                        
-                        # Map log levels to categories
-                        category = "Info"
-                        if 'ERROR' in level:
-                            category = "Error"
-                        elif 'WARN' in level:
-                            category = "Warning"
-                        
-                        events.append({
-                            'timestamp': timestamp,
-                            'category': category,
-                            'message': message,
-                            'raw': log,
-                            'source': 'app'
-                        })
-                else:
-                    # Fallback: treat as a simple message
-                    events.append({
-                        'timestamp': datetime.now().strftime("%H:%M"),
-                        'category': "Info",
-                        'message': log,
-                        'raw': log,
-                        'source': 'app'
-                    })
-            except Exception as e:
-                print(f"Error parsing application log entry: {e}")
-                continue
-                
-        return events
+            self.activities_placeholder.setText("Error loading activities")
+            self.activities_placeholder.setVisible(True)
     
     def _create_filter_buttons(self):
         """Create filter buttons for the activity log."""
@@ -511,35 +299,12 @@ class DashboardTab(QWidget):
         return filter_container
     
     def _apply_filters(self):
-        """Apply the selected filters to show/hide activity items safely."""
+        """Show only activities of the checked categories, queried from the activity store."""
         try:
-            # Get checked categories safely
-            visible_categories = []
-            if hasattr(self, 'filter_buttons'):
-                for category, btn in list(self.filter_buttons.items()):
-                    try:
-                        if btn and hasattr(btn, 'isChecked') and btn.isChecked():
-                            visible_categories.append(category)
-                    except Exception as e:
-                        print(f"Error checking filter button {category}: {e}")
-                        continue
-                        
-            # If no filters are checked, show all
-            if not visible_categories and hasattr(self, 'filter_buttons'):
-                visible_categories = list(self.filter_buttons.keys())
-                
-            # Apply visibility
-            if not hasattr(self, 'all_activity_items'):
+            if not hasattr(self, 'activity_model'):
                 return
-                
-            for item, category in list(self.all_activity_items):
-                try:
-                    if item and hasattr(item, 'setVisible'):
-                        item.setVisible(category in visible_categories)
-                except Exception as e:
-                    print(f"Error applying filter to item {category}: {e}")
-                    continue
-                    
+            self.activity_model.set_events(
+                self.activity_feed.store.query(self._visible_categories(), limit=MAX_ACTIVITY_ROWS))
         except Exception as e:
             print(f"Error in _apply_filters: {e}")
     
@@ -572,14 +337,9 @@ class DashboardTab(QWidget):
         Note: System logs in /var/log/syslog cannot be deleted without root permissions.
         """
         # Clear in-memory activities first
-        if hasattr(self, 'all_activity_items'):
-            self.all_activity_items.clear()
-        
-        # Clear the activities layout
-        while self.activities_layout.count() > 0:
-            item = self.activities_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        if hasattr(self, 'activity_model'):
+            self.activity_feed.clear()
+            self.activity_model.set_events([])
         
         # Delete log files from the application log directory
         log_dir = '/var/log/blackstorm'
@@ -640,90 +400,6 @@ class DashboardTab(QWidget):
                 f"Failed to delete log files: {str(e)}"
             )
 
-    def _add_activity_item(self, category, message, timestamp, source):
-        """Add a single activity item to the layout."""
-        # Create the activity item widget
-        item = QWidget()
-        item.setStyleSheet("""
-            QWidget {
-                background: rgba(255, 255, 255, 0.05);
-                border-radius: 6px;
-                padding: 8px;
-            }
-            QWidget:hover {
-                background: rgba(255, 255, 255, 0.08);
-            }
-        """)
-        
-        layout = QHBoxLayout(item)
-        layout.setContentsMargins(8, 6, 8, 6)
-        layout.setSpacing(10)
-        
-        # Category icon
-        icon_map = {
-            'System': '🔧',
-            'Application': '💻',
-            'Kernel': '⚙️',
-            'Error': '❌',
-            'Warning': '⚠️',
-            'Info': 'ℹ️'
-        }
-        icon = QLabel(icon_map.get(category, '🔹'))
-        icon.setStyleSheet("font-size: 16px;")
-        
-        # Content
-        content = QLabel(f"<b>{category}:</b> {message}")
-        content.setWordWrap(True)
-        content.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-        content.setStyleSheet("""
-            QLabel {
-                color: #e0e0e0;
-                font-size: 12px;
-                padding: 0;
-                margin: 0;
-            }
-        """)
-        
-        # Timestamp
-        time_label = QLabel(timestamp)
-        time_label.setStyleSheet("""
-            QLabel {
-                color: #7f8c8d;
-                font-size: 10px;
-                padding: 2px 6px;
-                background: rgba(0, 0, 0, 0.2);
-                border-radius: 3px;
-                min-width: 70px;
-                text-align: center;
-            }
-        """)
-        
-        # Add widgets to layout
-        layout.addWidget(icon, 0, Qt.AlignmentFlag.AlignTop)
-        layout.addWidget(content, 1)
-        layout.addWidget(time_label, 0, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignRight)
-        
-        # Add to activities layout and track for filtering
-        self.activities_layout.addWidget(item)
-        
-        # Track this item for filtering if we have the filter system initialized
-        if hasattr(self, 'all_activity_items'):
-            self.all_activity_items.append((item, category))
-    
-    def _read_log_file(self, file_path, max_lines=50):
-        """Read the last n lines from a log file."""
-        try:
-            if not os.path.exists(file_path):
-                return []
-                
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                # Read last max_lines from file efficiently
-                lines = deque(f, max_lines)
-                return [line.strip() for line in lines if line.strip()]
-        except Exception as e:
-            print(f"Error reading log file {file_path}: {e}")
-            return []
-    
     def _is_widget_valid(self, widget):
         """Check if a widget is still valid (not deleted)."""
         try:
@@ -1271,33 +947,39 @@ class DashboardTab(QWidget):
         # Add filter container to layout
         activities_layout.addWidget(filter_container)
         
-        # Create scroll area for activities
-        activities_scroll = QScrollArea()
-        activities_scroll.setWidgetResizable(True)
-        activities_scroll.setStyleSheet("""
-            QScrollArea {
+        # Model-backed list of activities: new log lines become inserted rows
+        if not hasattr(self, 'activity_feed'):
+            self._init_activity_feed()
+        self.activity_model = ActivityModel(self)
+        self.activities_view = QListView()
+        self.activities_view.setModel(self.activity_model)
+        self.activities_view.setWordWrap(True)
+        self.activities_view.setUniformItemSizes(False)
+        self.activities_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.activities_view.setStyleSheet("""
+            QListView {
                 border: none;
                 background: transparent;
+                color: #e0e0e0;
+                font-size: 12px;
             }
-            QWidget#activities_content {
-                background: transparent;
+            QListView::item {
+                background: rgba(255, 255, 255, 0.05);
+                border-radius: 6px;
+                padding: 8px;
+                margin-bottom: 8px;
+            }
+            QListView::item:hover {
+                background: rgba(255, 255, 255, 0.08);
             }
         """)
         
-        # Container widget for activities
-        activities_content = QWidget()
-        activities_content.setObjectName("activities_content")
-        self.activities_layout = QVBoxLayout(activities_content)
-        self.activities_layout.setContentsMargins(0, 0, 0, 0)
-        self.activities_layout.setSpacing(8)
-        
-        # Add loading message
-        loading = QLabel("Loading activities...")
-        loading.setStyleSheet("color: #7f8c8d; font-style: italic;")
-        self.activities_layout.addWidget(loading)
-        
-        activities_scroll.setWidget(activities_content)
-        activities_layout.addWidget(activities_scroll, 1)  # Add stretch factor to make it take available space
+        # Placeholder shown while there is nothing to list
+        self.activities_placeholder = QLabel("Loading activities...")
+        self.activities_placeholder.setWordWrap(True)
+        self.activities_placeholder.setStyleSheet("color: #7f8c8d; font-style: italic;")
+        activities_layout.addWidget(self.activities_placeholder)
+        activities_layout.addWidget(self.activities_view, 1)  # Add stretch factor to make it take available space
         
         # Create a container for the buttons with centered layout
         self.activities_button_container = QWidget()
@@ -1313,6 +995,39 @@ class DashboardTab(QWidget):
         button_layout.setContentsMargins(0, 0, 0, 0)
         button_layout.setSpacing(10)  # Add some spacing between buttons
         
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.setStyleSheet("""
+            QPushButton {
+                background: #2d3436;
+                color: #b1b1b1;
+                border: 1px solid #3c3f41;
+                border-radius: 3px;
+                padding: 5px 10px;
+            }
+            QPushButton:hover {
+                border: 1px solid #5d6062;
+            }
+        """)
+        refresh_btn.clicked.connect(self.update_activities)
+        
+        delete_btn = QPushButton("Delete Logs")
+        delete_btn.setStyleSheet("""
+            QPushButton {
+                background: #6d2727;
+                color: #ffb3b3;
+                border: 1px solid #8b3a3a;
+                border-radius: 3px;
+                padding: 5px 10px;
+            }
+            QPushButton:hover {
+                background: #8b3a3a;
+            }
+        """)
+        delete_btn.clicked.connect(self._delete_all_logs)
+        
+        button_layout.addWidget(refresh_btn)
+        button_layout.addWidget(delete_btn)
+        
         # Add the button widget to the outer layout
         button_outer_layout.addWidget(button_widget)
         button_outer_layout.addStretch()
@@ -1320,17 +1035,10 @@ class DashboardTab(QWidget):
         # Add the container to the activities layout
         activities_layout.addWidget(self.activities_button_container)
         
-        # Initialize activities list and timer
-        self.recent_activities = []
-        self.last_activity_update = 0
-        
-        # Update activities immediately and then every 10 seconds
+        # Show what the feed already holds and load the recent backlog;
+        # the timer set up in _init_ui follows the logs from here on
+        self._apply_filters()
         self.update_activities()
-        self.activities_timer = QTimer()
-        self.activities_timer.timeout.connect(self.update_activities)
-        self.activities_timer.start(10000)  # Update every 10 seconds
-        
-        activities_layout.addStretch()
         
         # Configure content row proportions
         content_row.addWidget(actions_group, 1)
@@ -10,22 +10,32 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QColor
-import psutil
-import subprocess
 import os
 
+from BLACKSTORM.ui.components.device_events import device_events
+from BLACKSTORM.ui.components.health_events import health_events
+
+HEALTH_COLORS = {
+    "Good": "#2ECC71",     # Green
+    "Warning": "#F39C12",  # Orange
+    "Failed": "#E74C3C",   # Red
+    "Unknown": "#3498DB",  # Blue
+}
+
 class DeviceManagementTab(QWidget):
     """Tab for managing storage devices."""
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.device_events = device_events()
+        self.health_events = health_events()
         self.setup_ui()
         self.refresh_devices()
         
-        # Set up auto-refresh
-        self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.refresh_devices)
-        self.refresh_timer.start(5000)  # Refresh every 5 seconds
+        # Follow hot-plug and mount changes instead of polling
+        self.device_events.devices_changed.connect(self.refresh_devices)
+        # SMART probes run in the background and fill in the Health column
+        self.health_events.report_ready.connect(self._on_health_report)
     
     def setup_ui(self):
         """Set up the user interface."""
@@ -184,82 +194,73 @@ class DeviceManagementTab(QWidget):
         # Disable buttons initially
         self.update_button_states()
     
-    def refresh_devices(self):
-        """Refresh the list of storage devices."""
+    def refresh_devices(self, change=None):
+        """Refresh the list of storage devices from the shared inventory."""
         # Save selection
         current_row = self.device_table.currentRow()
         current_device = None
         if current_row >= 0:
             current_device = self.device_table.item(current_row, 0).text()
         
-        # Clear table
+        # Clear table; sorting is suspended so rows stay where they are inserted
+        self.device_table.setSortingEnabled(False)
         self.device_table.setRowCount(0)
         
-        # Get disk partitions
+        # One row per partition, or per disk if it has none
         try:
-            partitions = psutil.disk_partitions(all=True)
-            devices = {}
-            
-            # Get disk usage for each partition
-            for part in partitions:
-                try:
-                    usage = psutil.disk_usage(part.mountpoint)
-                except Exception:
-                    usage = None
-                
-                device = part.device.split('/')[-1]
-                if device not in devices:
-                    devices[device] = {
-                        'model': 'Unknown',
-                        'size': 'Unknown',
-                        'type': part.fstype or 'Unknown',
-                        'mountpoint': part.mountpoint,
-                        'usage': usage
-                    }
+            disks = self.device_events.devices()
+            rows = []
+            for disk in disks:
+                for part in disk['partitions'] or [disk]:
+                    rows.append((os.path.basename(part['device']), disk, part))
             
             # Add devices to table
-            for i, (device, info) in enumerate(devices.items()):
+            for i, (device, disk, part) in enumerate(rows):
                 self.device_table.insertRow(i)
                 
                 # Device
                 item = QTableWidgetItem(device)
+                item.setData(Qt.ItemDataRole.UserRole, disk['device'])
                 self.device_table.setItem(i, 0, item)
 
-                # Model - detect using lsblk or udevadm
-                model = self._get_device_model(device)
-                self.device_table.setItem(i, 1, QTableWidgetItem(model))
+                # Model
+                self.device_table.setItem(i, 1, QTableWidgetItem(disk['model']))
 
                 # Size
-                size = "Unknown"
-                if info['usage']:
-                    size = f"{info['usage'].total / (1024**3):.1f} GB"
+                size = f"{part['size_bytes'] / (1024**3):.1f} GB"
                 self.device_table.setItem(i, 2, QTableWidgetItem(size))
 
                 # Type
-                self.device_table.setItem(i, 3, QTableWidgetItem(info['type']))
+                fstype = part['fstype'] or 'Unknown'
+                self.device_table.setItem(i, 3, QTableWidgetItem(fstype))
 
                 # Filesystem
-                self.device_table.setItem(i, 4, QTableWidgetItem(info['type']))
+                self.device_table.setItem(i, 4, QTableWidgetItem(fstype))
 
                 # Mounted
-                mounted = "Yes" if info['mountpoint'] else "No"
+                mounted = "Yes" if part['mountpoint'] else "No"
                 self.device_table.setItem(i, 5, QTableWidgetItem(mounted))
 
-                # Health - detect using SMART data
-                health, health_color = self._get_device_health(device)
-                health_item = QTableWidgetItem(health)
-                health_item.setForeground(QColor(health_color))
-                self.device_table.setItem(i, 6, health_item)
-                
-                # Restore selection if possible
-                if device == current_device:
+                # Health - last SMART report for the drive, if any yet
+                report = self.health_events.cached(disk['device'], disk['serial'] or None)
+                self.device_table.setItem(i, 6, self._health_item(report))
+            
+            self.device_table.setSortingEnabled(True)
+            
+            # Restore selection if possible
+            for i in range(self.device_table.rowCount()):
+                if self.device_table.item(i, 0).text() == current_device:
                     self.device_table.selectRow(i)
             
             # If no selection, select first row if available
             if self.device_table.rowCount() > 0 and not current_device:
                 self.device_table.selectRow(0)
+            
+            # Probe every drive concurrently; fresh cached reports are reused
+            self.health_events.request_all(disks)
                 
         except Exception as e:
+            self.device_table.setSortingEnabled(True)
             QMessageBox.critical(self, "Error", f"Failed to refresh devices: {str(e)}")
     
     def update_device_details(self):
@@ -312,85 +313,27 @@ class DeviceManagementTab(QWidget):
         self.btn_smart.setEnabled(has_selection)
         self.btn_benchmark.setEnabled(has_selection)
 
-    def _get_device_model(self, device):
-        """Get the device model name using system tools."""
-        # Remove partition number to get base device
-        base_device = ''.join(c for c in device if not c.isdigit()) or device
-
-        # Try lsblk first
-        try:
-            result = subprocess.run(
-                ['lsblk', '-no', 'MODEL', f'/dev/{base_device}'],
-                capture_output=True, text=True, timeout=5
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                return result.stdout.strip()
-        except Exception:
-            pass
-
-        # Try udevadm as fallback
-        try:
-            result = subprocess.run(
-                ['udevadm', 'info', '--query=property', f'--name=/dev/{base_device}'],
-                capture_output=True, text=True, timeout=5
-            )
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if line.startswith('ID_MODEL='):
-                        model = line.split('=', 1)[1].replace('_', ' ')
-                        return model
-        except Exception:
-            pass
-
-        # Try reading from sysfs
-        try:
-            model_path = f'/sys/block/{base_device}/device/model'
-            if os.path.exists(model_path):
-                with open(model_path, 'r') as f:
-                    return f.read().strip()
-        except Exception:
-            pass
-
-        return "Unknown"
-
-    def _get_device_health(self, device):
-        """Get the device health status using SMART data."""
-        # Remove partition number to get base device
-        base_device = ''.join(c for c in device if not c.isdigit()) or device
-
-        # Try smartctl
-        try:
-            result = subprocess.run(
-                ['smartctl', '-H', f'/dev/{base_device}'],
-                capture_output=True, text=True, timeout=10
-            )
-
-            output = result.stdout.lower()
-
-            # Check for PASSED/FAILED status
-            if 'passed' in output:
-                return ("Good", "#2ECC71")  # Green
-            elif 'failed' in output:
-                return ("Failed", "#E74C3C")  # Red
-            elif 'unknown' in output or result.returncode != 0:
-                # Check for warning signs even if status is unknown
-                if any(word in output for word in ['warning', 'pre-fail', 'old_age']):
-                    return ("Warning", "#F39C12")  # Orange
-                return ("Unknown", "#3498DB")  # Blue
-
-        except FileNotFoundError:
-            # smartctl not installed
-            return ("N/A", "#95A5A6")  # Gray
-        except subprocess.TimeoutExpired:
-            return ("Timeout", "#95A5A6")  # Gray
-        except Exception:
-            pass
+    def _health_item(self, report):
+        """Build the Health cell for a :class:`HealthReport` (None while probing)."""
+        if report is None:
+            item = QTableWidgetItem("Checking...")
+            item.setForeground(QColor("#95A5A6"))  # Gray
+            return item
+        item = QTableWidgetItem(report.status)
+        item.setForeground(QColor(HEALTH_COLORS.get(report.status, "#95A5A6")))
+        tooltip = []
+        if report.temperature is not None:
+            tooltip.append(f"Temperature: {report.temperature}°C")
+        tooltip.extend(report.issues)
+        if tooltip:
+            item.setToolTip("\n".join(tooltip))
+        return item
 
-        # Fallback: check if device is responsive
-        try:
-            if os.path.exists(f'/dev/{base_device}'):
-                return ("OK", "#2ECC71")  # Green - device exists
-        except Exception:
-            pass
-
-        return ("Unknown", "#3498DB")  # Blue
+    def _on_health_report(self, report):
+        """Update the Health cells of the drive a finished probe belongs to."""
+        self.device_table.setSortingEnabled(False)
+        for row in range(self.device_table.rowCount()):
+            if self.device_table.item(row, 0).data(Qt.ItemDataRole.UserRole) == report.device:
+                self.device_table.setItem(row, 6, self._health_item(report))
+        self.device_table.setSortingEnabled(True)
+        self.update_device_details()
@@ -8,7 +8,6 @@ import sys
 import json
 import time
 import re
-import hashlib
 import subprocess
 from datetime import datetime, timedelta
 from PySide6.QtWidgets import (
@@ -19,6 +18,11 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QThread, Signal
 
+from BLACKSTORM.core.image_container import image_device, index_path_for, verify_image
+from BLACKSTORM.core.multi_hash import HashCancelled, hash_file, hash_files
+from BLACKSTORM.core.sector_rescue import RescueMap, SectorRescuer
+from BLACKSTORM.ui.components.device_events import device_events
+
 class DiskImagingWorker(QThread):
     """Worker thread for performing disk imaging operations."""
     progress = Signal(int, str)  # progress percentage, status message
@@ -26,7 +30,7 @@ class DiskImagingWorker(QThread):
     log_message = Signal(str)    # log message
     
     def __init__(self, source_device, output_path, verify=True, compress=False, 
-                 split_size=0, hash_algorithm='sha256'):
+                 split_size=0, hash_algorithm='sha256', sparse=True):
         super().__init__()
         self.source_device = source_device
         self.output_path = output_path
@@ -34,7 +38,9 @@ class DiskImagingWorker(QThread):
         self.compress = compress
         self.split_size = split_size  # in GB, 0 means no splitting
         self.hash_algorithm = hash_algorithm
+        self.sparse = sparse  # skip writing all-zero blocks
         self._is_running = True
+        self.image_summary = None
         self.log_file = '/var/log/blackstorm/imaging.log'
         
         # Create log directory if it doesn't exist
@@ -59,11 +65,15 @@ class DiskImagingWorker(QThread):
             if device_size == 0:
                 raise ValueError(f"Could not determine size of device {self.source_device}")
             
-            # Prepare imaging command
-            cmd = self._prepare_imaging_command(device_size)
-            
-            # Start the imaging process
-            self._execute_imaging(cmd, device_size)
+            if self.compress:
+                # Chunked, compressed image written in-process
+                self._image_to_container(device_size)
+            else:
+                # Prepare imaging command
+                cmd = self._prepare_imaging_command(device_size)
+                
+                # Start the imaging process
+                self._execute_imaging(cmd, device_size)
             
             # Verify the image if requested
             if self.verify and self._is_running:
@@ -106,11 +116,7 @@ class DiskImagingWorker(QThread):
         cmd.extend(['if=' + self.source_device])
         
         # Add output file
-        if self.compress:
-            # Use gzip for compression
-            cmd.extend(['|', 'gzip', '>', self.output_path + '.gz'])
-        else:
-            cmd.extend(['of=' + self.output_path])
+        cmd.extend(['of=' + self.output_path])
         
         # Add block size for better performance
         cmd.extend(['bs=4M'])
@@ -118,6 +124,10 @@ class DiskImagingWorker(QThread):
         # Add status=progress for progress tracking
         cmd.extend(['status=progress'])
         
+        # Seek over all-zero blocks instead of writing them
+        if self.sparse:
+            cmd.extend(['conv=sparse'])
+        
         return ' '.join(cmd)
     
     def _execute_imaging(self, cmd, device_size):
@@ -161,35 +171,79 @@ class DiskImagingWorker(QThread):
         if process.returncode != 0:
             raise Exception(f"dd command failed with return code {process.returncode}")
     
+    def _image_to_container(self, device_size):
+        """Image the source into a segmented, chunk-compressed container."""
+        segment_size = self.split_size * 1024 ** 3 if self.split_size else 0
+        self.log_message.emit(f"Writing compressed image {index_path_for(self.output_path)}")
+        
+        def report(bytes_done, total_bytes):
+            percent = bytes_done * 100 / total_bytes if total_bytes else 100
+            self.progress.emit(int(percent), f"Imaging: {percent:.1f}%")
+        
+        summary = image_device(
+            self.source_device, self.output_path, total_bytes=device_size,
+            segment_size=segment_size, hash_algorithms=[self.hash_algorithm], sparse=self.sparse,
+            progress_callback=report, should_stop=lambda: not self._is_running)
+        if summary is None:
+            raise Exception("Imaging cancelled by user")
+        self.image_summary = summary
+        self.log_message.emit(
+            f"Image written: {summary.chunk_count} chunks in {len(summary.segments)} segment(s), "
+            f"{summary.ratio * 100:.1f}% of original size")
+        if summary.sparse_bytes:
+            self.log_message.emit(f"Skipped {summary.sparse_bytes / 1024 ** 2:.1f} MB of zero blocks")
+        self.log_message.emit(f"{self.hash_algorithm.upper()}: {summary.hashes[self.hash_algorithm]}")
+    
     def _verify_image(self):
         """Verify the integrity of the created image."""
         self.log_message.emit("Verifying image integrity...")
         self.progress.emit(0, "Verifying image")
         
-        # Get hashes of source and destination
-        source_hash = self._calculate_hash(self.source_device)
-        dest_hash = self._calculate_hash(self.output_path + ('.gz' if self.compress else ''))
+        if self.image_summary is not None:
+            self._verify_container()
+            return
+        
+        # Hash source and destination concurrently, one read each
+        paths = [self.source_device, self.output_path]
+        try:
+            source_hashes, dest_hashes = hash_files(
+                paths, [self.hash_algorithm],
+                progress_callback=self._on_verify_progress,
+                should_stop=lambda: not self._is_running)
+        except HashCancelled:
+            return
+        except Exception as e:
+            raise Exception(f"Failed to calculate {self.hash_algorithm} hash: {str(e)}")
         
-        if source_hash == dest_hash:
+        if source_hashes == dest_hashes:
             self.log_message.emit("Image verification successful")
         else:
             raise Exception("Image verification failed: hashes do not match")
     
+    def _verify_container(self):
+        """Check every chunk of a compressed image while re-hashing the source."""
+        try:
+            check = verify_image(self.image_summary.index_path, source=self.source_device,
+                                 progress_callback=self._on_verify_progress,
+                                 should_stop=lambda: not self._is_running)
+        except HashCancelled:
+            return
+        if check.bad_chunks:
+            raise Exception(f"Image verification failed: {len(check.bad_chunks)} corrupted chunk(s)")
+        if check.mismatched:
+            raise Exception("Image verification failed: hashes do not match")
+        self.log_message.emit("Image verification successful")
+    
+    def _on_verify_progress(self, bytes_done, total_bytes):
+        """Report combined source/image hashing progress."""
+        percent = int(bytes_done * 100 / total_bytes) if total_bytes else 100
+        self.progress.emit(percent, f"Verifying image: {percent}%")
+    
     def _calculate_hash(self, file_path):
         """Calculate hash of a file or device."""
-        hash_obj = hashlib.new(self.hash_algorithm)
-        block_size = 65536  # 64KB chunks
-        
         try:
-            with open(file_path, 'rb') as f:
-                while self._is_running:
-                    data = f.read(block_size)
-                    if not data:
-                        break
-                    hash_obj.update(data)
-            
-            return hash_obj.hexdigest()
-            
+            return hash_file(file_path, [self.hash_algorithm],
+                             should_stop=lambda: not self._is_running)[self.hash_algorithm]
         except Exception as e:
             raise Exception(f"Failed to calculate {self.hash_algorithm} hash: {str(e)}")
     
@@ -225,6 +279,9 @@ class UnifiedAcquisitionWorker(QThread):
         self.output_path = output_path
         self.options = options
         self._is_running = True
+        self.image_summary = None
+        self._rescue_map = None
+        self._rescue_map_key = None
         
         # Initialize recovery state
         self.current_mode = options['starting_mode']
@@ -436,23 +493,18 @@ class UnifiedAcquisitionWorker(QThread):
         """Perform standard acquisition (healthy drive)."""
         self._log_message("Using standard acquisition mode (healthy drive)")
         
+        # Add compression if requested
+        if self.options['compress']:
+            return self._compressed_acquisition()
+        
         # Configure dd command
         block_size = "4M"  # Efficient for healthy drives
         cmd = [
             'dd', f'if={self.source_device}', f'of={self.output_path}',
-            f'bs={block_size}', 'status=progress', 'conv=noerror,sync'
+            f'bs={block_size}', 'status=progress',
+            'conv=noerror,sync,sparse' if self.options.get('sparse') else 'conv=noerror,sync'
         ]
-        
-        # Add compression if requested
-        if self.options['compress']:
-            output_gz = f"{self.output_path}.gz"
-            cmd = [
-                'dd', f'if={self.source_device}', 'bs=4M', 'status=progress',
-                '|', 'gzip', f'> {output_gz}'
-            ]
-            cmd = ' '.join(cmd)
-        else:
-            cmd = ' '.join(cmd)
+        cmd = ' '.join(cmd)
         
         self._log_message(f"Command: {cmd}")
         
@@ -508,6 +560,45 @@ class UnifiedAcquisitionWorker(QThread):
             self._log_message(f"Error in standard acquisition: {str(e)}")
             return False
     
+    def _compressed_acquisition(self):
+        """Acquire a healthy drive into a segmented, chunk-compressed image."""
+        total_size = self.stats['total_size']
+        self._log_message(f"Writing compressed image {index_path_for(self.output_path)}")
+        
+        def report(bytes_done, total_bytes):
+            self.stats['recovered'] = bytes_done
+            self._update_stats()
+            percent = min(99, int((bytes_done / total_bytes) * 100))
+            self.progress.emit(percent, f"Acquiring: {percent}%")
+        
+        try:
+            summary = image_device(
+                self.source_device, self.output_path, total_bytes=total_size,
+                hash_algorithms=self.options['hash_algorithms'],
+                sparse=self.options.get('sparse', True),
+                progress_callback=report, should_stop=lambda: not self._is_running)
+        except Exception as e:
+            self._log_message(f"Error in compressed acquisition: {str(e)}")
+            return False
+        
+        if summary is None:
+            self._log_message("Acquisition stopped by user")
+            return False
+        
+        self.image_summary = summary
+        if summary.sparse_bytes:
+            self._log_message(f"Skipped {summary.sparse_bytes / 1024 ** 2:.1f} MB of zero blocks")
+        self._log_message(
+            f"Image written: {summary.chunk_count} chunks in {len(summary.segments)} segment(s), "
+            f"{summary.ratio * 100:.1f}% of original size")
+        for hash_algo, hash_value in summary.hashes.items():
+            self._log_message(f"{hash_algo.upper()} hash: {hash_value}")
+        
+        self.stats['recovered'] = total_size
+        self.stats['recovery_rate'] = 100.0
+        self._update_stats()
+        return True
+    
     def _light_recovery(self):
         """Perform light recovery for drives with minor issues."""
         self._log_message("Using light recovery mode")
@@ -696,22 +787,21 @@ class UnifiedAcquisitionWorker(QThread):
                 if not self._run_ddrescue(cmd, output_map):
                     return False
         
-        # Final attempt with custom DC3DD for any remaining sectors
+        # Final in-process retry of any remaining sectors
         if self.stats['recovery_rate'] < 99.0 and self._is_running:
-            self._log_message("Attempting final recovery with DC3DD for remaining sectors")
-            
-            # Extract bad sector list from ddrescue map
-            bad_sectors = self._extract_bad_sectors_from_map(output_map)
+            self._log_message("Attempting final targeted recovery of remaining sectors")
             
-            if bad_sectors and len(bad_sectors) > 0:
-                # Targeted recovery of specific sectors
-                return self._targeted_sector_recovery(bad_sectors)
+            if self._load_rescue_map(output_map).failed_bytes:
+                return self._targeted_sector_recovery(output_map)
         
         # Return success even with partial recovery
         return True
     
     def _run_ddrescue(self, cmd, map_file):
         """Run ddrescue command and parse output for progress and stats."""
+        if self.options.get('sparse') and '-S' not in cmd:
+            # Sparse output: zero blocks are skipped rather than written
+            cmd = [cmd[0], '-S'] + cmd[1:]
         try:
             self._log_message(f"Running: {' '.join(cmd)}")
             
@@ -795,53 +885,37 @@ class UnifiedAcquisitionWorker(QThread):
         else:
             return int(value)
     
+    def _load_rescue_map(self, map_file):
+        """Return the rescue map of ``map_file``, re-reading it only after it changed."""
+        st = os.stat(map_file)
+        key = (map_file, st.st_mtime_ns, st.st_size)
+        if key != self._rescue_map_key:
+            self._rescue_map = RescueMap.load(map_file, size=self.stats['total_size'] or None)
+            self._rescue_map_key = key
+        return self._rescue_map
+    
+    def _apply_rescue_map(self, rescue_map):
+        """Update recovery statistics from a rescue map."""
+        self.stats['recovered'] = rescue_map.rescued_bytes
+        self.stats['bad_sectors'] = rescue_map.failed_bytes // 512
+        self._update_stats()
+    
     def _parse_ddrescue_map(self, map_file):
         """Parse ddrescue map file to update statistics."""
         try:
-            with open(map_file, 'r') as f:
-                content = f.read()
-                
-            # Look for the summary line
-            summary_match = re.search(r'rescued:\s+(\d+)B.*errsize:\s+(\d+)B', content)
-            if summary_match:
-                rescued = self._parse_size(summary_match.group(1))
-                errors = self._parse_size(summary_match.group(2))
-                
-                self.stats['recovered'] = rescued
-                self.stats['bad_sectors'] = errors // 512
-                self._update_stats()
-                
-                # Log bad sectors if needed
-                if self.options['log_bad_sectors'] and self.stats['bad_sectors'] > 0:
-                    self._extract_bad_sectors_from_map(map_file, save_to_file=True)
+            self._apply_rescue_map(self._load_rescue_map(map_file))
+            
+            # Log bad sectors if needed
+            if self.options['log_bad_sectors'] and self.stats['bad_sectors'] > 0:
+                self._extract_bad_sectors_from_map(map_file, save_to_file=True)
         except Exception as e:
             self._log_message(f"Error parsing ddrescue map: {str(e)}")
     
     def _extract_bad_sectors_from_map(self, map_file, save_to_file=False):
         """Extract list of bad sectors from ddrescue map file."""
-        bad_sectors = []
-        
         try:
-            with open(map_file, 'r') as f:
-                lines = f.readlines()
-                
-            # Skip header lines
-            data_lines = [l for l in lines if not l.startswith('#')]
-            
-            # Parse sector information
-            for line in data_lines:
-                parts = line.strip().split()
-                if len(parts) >= 3 and parts[2] in ['?', '*', '/']:
-                    # This is a bad/unreadable sector
-                    pos = int(parts[0], 16)  # Position is in hex
-                    size = int(parts[1], 16)  # Size is in hex
-                    
-                    # Convert to sector numbers (assuming 512-byte sectors)
-                    start_sector = pos // 512
-                    end_sector = (pos + size - 1) // 512
-                    
-                    # Add range to list
-                    bad_sectors.append((start_sector, end_sector))
+            bad_sectors = [(start // 512, (end - 1) // 512)
+                           for start, end, _ in self._load_rescue_map(map_file).ranges()]
             
             # Save to file if requested
             if save_to_file and bad_sectors:
@@ -861,55 +935,40 @@ class UnifiedAcquisitionWorker(QThread):
             self._log_message(f"Error extracting bad sectors: {str(e)}")
             return []
     
-    def _targeted_sector_recovery(self, bad_sectors):
-        """Perform targeted recovery of specific bad sectors."""
+    def _targeted_sector_recovery(self, map_file):
+        """Retry the failed ranges of a ddrescue map in-process, updating the map as it goes."""
         try:
-            recovered_sectors = 0
-            total_sectors = sum(end - start + 1 for start, end in bad_sectors)
+            rescue_map = self._load_rescue_map(map_file)
+            total_sectors = rescue_map.failed_bytes // 512
+            self._log_message(f"Attempting targeted recovery of {total_sectors} sectors "
+                              f"in {len(rescue_map.ranges())} ranges")
             
-            self._log_message(f"Attempting targeted recovery of {total_sectors} sectors")
-            
-            for i, (start, end) in enumerate(bad_sectors):
-                if not self._is_running:
-                    return False
-                    
-                # Update progress
-                percent = min(99, int((i / len(bad_sectors)) * 100))
+            def report(bytes_done, bytes_total):
+                percent = min(99, int(bytes_done * 100 / bytes_total)) if bytes_total else 99
                 self.progress.emit(percent, f"Targeted recovery: {percent}%")
-                
-                # Calculate offset and size
-                offset = start * 512
-                size = (end - start + 1) * 512
-                
-                # Try dc3dd for this sector range
-                cmd = [
-                    'dc3dd', f'if={self.source_device}', f'of={self.output_path}',
-                    f'bs=512', f'count={end-start+1}', f'skip={start}', f'seek={start}',
-                    'mlog=-', 'hlog=-', 'verb=on', 'noerror'
-                ]
-                
-                self._log_message(f"Recovering sectors {start}-{end}")
-                
-                result = subprocess.run(
-                    cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                    universal_newlines=True
-                )
-                
-                # Check if sectors were recovered
-                if "errors=0" in result.stdout:
-                    recovered_sectors += (end - start + 1)
-                    self._log_message(f"Successfully recovered sectors {start}-{end}")
-                
-                # Update stats
-                self.stats['retry_sectors'] += (end - start + 1)
-                
-                # Recalculate recovery rate
-                if total_sectors > 0:
-                    recovery_improvement = (recovered_sectors / total_sectors) * (self.stats['bad_sectors'] / (self.stats['total_size'] / 512))
-                    self.stats['recovery_rate'] = min(100.0, 100.0 - ((self.stats['bad_sectors'] - recovered_sectors) / (self.stats['total_size'] / 512)) * 100)
-                    self._update_stats()
-            
-            self._log_message(f"Targeted recovery complete: {recovered_sectors}/{total_sectors} sectors recovered")
+                self.stats['retry_sectors'] = rescuer.reads
+                self._apply_rescue_map(rescue_map)
+            
+            # Start at the bad-area skip size and split down to single sectors
+            skip_size = self._parse_size(self.options.get('skip_size', '64K').replace('K', 'k'))
+            rescuer = SectorRescuer(
+                self.source_device, self.output_path, rescue_map, map_path=map_file,
+                block_sizes=(skip_size, self.options.get('block_size', 4096), 512), retries=2,
+                reverse=self.options.get('reverse_direction', True),
+                zone_timeout=self.options.get('timeout', 30),
+                progress_callback=report, should_stop=lambda: not self._is_running)
+            result = rescuer.run()
+            # The map on disk is ours now; don't re-read it
+            st = os.stat(map_file)
+            self._rescue_map_key = (map_file, st.st_mtime_ns, st.st_size)
+            self._apply_rescue_map(rescue_map)
+            
+            if result.stopped:
+                self._log_message("Recovery stopped by user")
+                return False
+            self._log_message(
+                f"Targeted recovery complete: {result.recovered_bytes // 512}/{total_sectors} sectors recovered "
+                f"({result.read_errors} read errors, {result.zones_timed_out} zones timed out)")
             return True
             
         except Exception as e:
@@ -943,35 +1002,27 @@ class UnifiedAcquisitionWorker(QThread):
         self.progress.emit(99, "Verifying image")
         
         try:
-            # Skip verification for compressed images
-            if self.options['compress'] and self.output_path.endswith('.gz'):
-                self._log_message("Skipping verification for compressed image")
-                return True
+            # Compressed images carry per-chunk hashes and the acquisition digests
+            if self.image_summary is not None:
+                return self._verify_container()
                 
+            algorithms = self.options['hash_algorithms']
+            should_stop = lambda: not self._is_running
+            
             # Calculate hash for readable portions only
             if self.stats['bad_sectors'] > 0:
                 self._log_message("Image contains bad sectors, verifying readable portions only")
                 
-                # Use hash algorithms specified in options
-                for hash_algo in self.options['hash_algorithms']:
-                    # Calculate hash
-                    cmd = f"md5sum {self.output_path}"
-                    if hash_algo == 'sha1':
-                        cmd = f"sha1sum {self.output_path}"
-                    elif hash_algo == 'sha256':
-                        cmd = f"sha256sum {self.output_path}"
-                        
-                    result = subprocess.run(
-                        cmd, shell=True, capture_output=True, text=True
-                    )
+                # Every requested digest from a single read of the image
+                hashes = hash_file(self.output_path, algorithms,
+                                   progress_callback=self._on_verify_progress,
+                                   should_stop=should_stop)
+                for hash_algo, hash_value in hashes.items():
+                    self._log_message(f"{hash_algo.upper()} hash: {hash_value}")
                     
-                    if result.returncode == 0:
-                        hash_value = result.stdout.split()[0]
-                        self._log_message(f"{hash_algo.upper()} hash: {hash_value}")
-                        
-                        # Write hash to file
-                        with open(f"{self.output_path}.{hash_algo}", 'w') as f:
-                            f.write(hash_value)
+                    # Write hash to file
+                    with open(f"{self.output_path}.{hash_algo}", 'w') as f:
+                        f.write(hash_value)
                 
                 # For partial images, use file size as basic verification
                 expected_size = self.stats['total_size'] - (self.stats['bad_sectors'] * 512)
@@ -986,50 +1037,61 @@ class UnifiedAcquisitionWorker(QThread):
             else:
                 # For complete images, compare with source
                 self._log_message("Performing full verification")
+                self._log_message(f"Calculating {', '.join(a.upper() for a in algorithms)} hashes")
                 
-                # Calculate and save hash
-                for hash_algo in self.options['hash_algorithms']:
-                    self._log_message(f"Calculating {hash_algo.upper()} hash")
-                    
-                    hash_cmd = f"md5sum"
-                    if hash_algo == 'sha1':
-                        hash_cmd = f"sha1sum"
-                    elif hash_algo == 'sha256':
-                        hash_cmd = f"sha256sum"
-                    
-                    # Source hash
-                    src_result = subprocess.run(
-                        f"{hash_cmd} {self.source_device}",
-                        shell=True, capture_output=True, text=True
-                    )
+                # Source and image are read concurrently, each exactly once
+                src_hashes, dst_hashes = hash_files(
+                    [self.source_device, self.output_path], algorithms,
+                    progress_callback=self._on_verify_progress,
+                    should_stop=should_stop)
+                
+                for hash_algo, dst_hash in dst_hashes.items():
+                    src_hash = src_hashes[hash_algo]
+                    self._log_message(f"Source {hash_algo.upper()}: {src_hash}")
+                    self._log_message(f"Image {hash_algo.upper()}: {dst_hash}")
                     
-                    # Destination hash
-                    dst_result = subprocess.run(
-                        f"{hash_cmd} {self.output_path}",
-                        shell=True, capture_output=True, text=True
-                    )
+                    # Write hash to file
+                    with open(f"{self.output_path}.{hash_algo}", 'w') as f:
+                        f.write(dst_hash)
                     
-                    if src_result.returncode == 0 and dst_result.returncode == 0:
-                        src_hash = src_result.stdout.split()[0]
-                        dst_hash = dst_result.stdout.split()[0]
-                        
-                        self._log_message(f"Source {hash_algo.upper()}: {src_hash}")
-                        self._log_message(f"Image {hash_algo.upper()}: {dst_hash}")
-                        
-                        # Write hash to file
-                        with open(f"{self.output_path}.{hash_algo}", 'w') as f:
-                            f.write(dst_hash)
-                        
-                        if src_hash != dst_hash:
-                            self._log_message(f"Warning: {hash_algo.upper()} hash mismatch")
-                            return False
+                    if src_hash != dst_hash:
+                        self._log_message(f"Warning: {hash_algo.upper()} hash mismatch")
+                        return False
                 
                 return True
                 
+        except HashCancelled:
+            self._log_message("Verification stopped by user")
+            return False
         except Exception as e:
             self._log_message(f"Error during verification: {str(e)}")
             return False
     
+    def _verify_container(self):
+        """Verify a compressed image's chunks and re-hash the source alongside."""
+        self._log_message("Verifying image chunks and re-hashing source")
+        check = verify_image(self.image_summary.index_path, source=self.source_device,
+                             progress_callback=self._on_verify_progress,
+                             should_stop=lambda: not self._is_running)
+        
+        for hash_algo, hash_value in check.image_hashes.items():
+            self._log_message(f"Source {hash_algo.upper()}: {check.source_hashes.get(hash_algo)}")
+            self._log_message(f"Image {hash_algo.upper()}: {hash_value}")
+            with open(f"{self.image_summary.index_path}.{hash_algo}", 'w') as f:
+                f.write(hash_value)
+        
+        if check.bad_chunks:
+            self._log_message(f"Warning: {len(check.bad_chunks)} corrupted chunk(s): {check.bad_chunks[:10]}")
+            return False
+        for hash_algo in check.mismatched:
+            self._log_message(f"Warning: {hash_algo.upper()} hash mismatch")
+        return check.passed
+    
+    def _on_verify_progress(self, bytes_done, total_bytes):
+        """Report hashing progress during verification."""
+        percent = int(bytes_done * 100 / total_bytes) if total_bytes else 100
+        self.progress.emit(99, f"Verifying image: {percent}%")
+    
     def stop(self):
         """Stop the acquisition process."""
         self._is_running = False
@@ -1365,6 +1427,7 @@ class ForensicToolsTab(QWidget):
             'phase_retry': self.phase_retry.isChecked(),
             'verify': self.verify_check.isChecked(),
             'compress': self.compress_check.isChecked(),
+            'sparse': self.sparse_check.isChecked(),
             'hash_algorithms': hash_algorithms,
         }
         
@@ -1840,12 +1903,16 @@ class ForensicToolsTab(QWidget):
         self.verify_check = QCheckBox("Verify after acquisition")
         self.verify_check.setChecked(True)
         
+        self.sparse_check = QCheckBox("Sparse image (skip zero blocks)")
+        self.sparse_check.setChecked(True)
+        
         # Add basic options
         basic_layout.addWidget(QLabel("Hash Algorithms:"), 0, 0)
         basic_layout.addWidget(self.hash_md5, 0, 1)
         basic_layout.addWidget(self.hash_sha1, 0, 2)
         basic_layout.addWidget(self.hash_sha256, 0, 3)
         basic_layout.addWidget(self.verify_check, 1, 0, 1, 4)
+        basic_layout.addWidget(self.sparse_check, 2, 0, 1, 4)
         basic_tab.setLayout(basic_layout)
         
         # Recovery Options Tab
@@ -2042,70 +2109,58 @@ class ForensicToolsTab(QWidget):
         tab.addTab(memory_tab, "Memory Analysis")
         tab.addTab(artifacts_tab, "Artifact Analysis")
         
-        # Initial device refresh
+        # Initial device refresh, then follow hot-plug events
         self.refresh_devices()
+        device_events().devices_changed.connect(self.refresh_devices)
         
         return tab
 
     def _get_available_devices(self):
-        """Get a list of available storage devices."""
+        """Get a list of available storage devices from the shared device inventory."""
         devices = []
         
-        try:
-            # Use lsblk to get device information in JSON format
-            result = subprocess.run(
-                ['lsblk', '-d', '-o', 'NAME,PATH,SIZE,MODEL', '--json'],
-                capture_output=True, text=True, check=True
-            )
-            
-            # Parse the JSON output
-            data = json.loads(result.stdout)
+        for device in device_events().devices():
+            name = device['name']
+            path = device['device']
+            size = f"{device['size_gb']}G"
+            model = device['model'] if device['model'] != 'Unknown' else 'Unknown Model'
             
-            for device in data.get('blockdevices', []):
-                # Skip loop devices and RAM disks
-                if device['name'].startswith(('loop', 'ram')):
-                    continue
-                    
-                name = device['name']
-                path = device['path']
-                size = device.get('size', 'Unknown')
-                model = device.get('model', '').strip() or 'Unknown Model'
-                
-                device_info = f"{name} - {size} {model}"
-                devices.append((name, path, device_info))
-                
-                # Log device for debugging
-                if hasattr(self, 'acquisition_log'):
-                    self.acquisition_log.append(f"Found device: {path} ({size} {model})")
-                    
-        except Exception as e:
-            if hasattr(self, 'acquisition_log'):
-                self.acquisition_log.append(f"Error detecting devices: {str(e)}")
-            else:
-                print(f"Error detecting devices: {str(e)}")
+            device_info = f"{name} - {size} {model}"
+            devices.append((name, path, device_info))
         
         return devices
 
     def _populate_device_list(self, list_widget, devices, selectable=True):
         """Populate a QListWidget with detected devices."""
+        current = list_widget.currentItem()
+        current_path = current.data(Qt.ItemDataRole.UserRole) if current is not None else None
+        
         # Clear the list first
         list_widget.clear()
         
-        # Add devices to the list
+        # Add devices to the list, keeping the previous selection
         for _, path, info in devices:
             item = QListWidgetItem(info)
             item.setData(Qt.ItemDataRole.UserRole, path)
             list_widget.addItem(item)
+            if path == current_path:
+                list_widget.setCurrentItem(item)
         
         # Make the first item selected if there are any items
-        if list_widget.count() > 0 and selectable:
+        if list_widget.count() > 0 and selectable and list_widget.currentItem() is None:
             list_widget.setCurrentRow(0)
 
-    def refresh_devices(self):
+    def refresh_devices(self, change=None):
         """Refresh the list of available storage devices."""
         # Log action
         if hasattr(self, 'acquisition_log'):
-            self.acquisition_log.append("Scanning for storage devices...")
+            if change:
+                for info in change.added:
+                    self.acquisition_log.append(f"Device connected: {info['device']}")
+                for path in change.removed:
+                    self.acquisition_log.append(f"Device removed: {path}")
+            else:
+                self.acquisition_log.append("Scanning for storage devices...")
         
         # Reset health indicator
         if hasattr(self, 'health_indicator'):
@@ -8,13 +8,15 @@ Disk Wiping Module - Main UI class for wipe operations
 import os
 import json
 import subprocess
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QGroupBox, QHBoxLayout, QListWidget, 
                             QListWidgetItem, QRadioButton, QButtonGroup, QCheckBox, QTextEdit, 
                             QPushButton, QFormLayout, QMessageBox, QSpinBox, QDoubleSpinBox, 
                             QComboBox, QProgressBar, QTabWidget, QLabel, QScrollArea, QLineEdit, QFrame)
 from PySide6.QtGui import QFont
 
+from BLACKSTORM.ui.components.device_events import device_events
+
 def format_size(size_bytes):
     """Format size in bytes to human-readable format (B, KB, MB, GB, TB).
     
@@ -64,13 +66,17 @@ class WipeOperationsTab(QWidget):
         self.tab_widget.addTab(advanced_wipe_tab, "Advanced Wipe")
         self.tab_widget.addTab(wipe_profiles_tab, "Wipe Profiles")
         
-        # Initialize device lists
+        # Initialize device lists and follow hot-plug events
         self.refresh_devices()
+        device_events().devices_changed.connect(self.refresh_devices)
         
         # Initialize worker reference
         self.wipe_worker = None
+        
+        # Offer to pick up wipes that were interrupted last time
+        QTimer.singleShot(0, self._offer_resume_jobs)
 
-    def refresh_devices(self):
+    def refresh_devices(self, change=None):
         """Refresh the device lists in both standard and advanced tabs."""
         devices = self._get_available_devices()
         
@@ -133,14 +139,25 @@ class WipeOperationsTab(QWidget):
         
         self.quick_erase = QCheckBox("Quick erase (skip bad blocks)")
         
+        self.concurrent_jobs = QSpinBox()
+        self.concurrent_jobs.setRange(1, 32)
+        self.concurrent_jobs.setValue(4)
+        self.concurrent_jobs.setToolTip(
+            "Maximum number of devices wiped at once. Devices sharing a USB hub "
+            "or controller are limited further so the shared bus is not thrashed."
+        )
+        
         options_layout.addRow("Verification:", self.verify_wipe)
         options_layout.addRow("Performance:", self.quick_erase)
+        options_layout.addRow("Concurrent wipes:", self.concurrent_jobs)
         options_group.setLayout(options_layout)
         
         # Status and Log
         self.wipe_status = QLabel("Ready to wipe")
         self.wipe_status.setStyleSheet("font-weight: bold; color: #89b4fa;")
         
+        self.wipe_throughput = QLabel("")
+        
         self.wipe_log = QTextEdit()
         self.wipe_log.setReadOnly(True)
         self.wipe_log.setMaximumHeight(100)
@@ -164,6 +181,7 @@ class WipeOperationsTab(QWidget):
         layout.addWidget(method_group)
         layout.addWidget(options_group)
         layout.addWidget(self.wipe_status)
+        layout.addWidget(self.wipe_throughput)
         layout.addWidget(QLabel("Activity Log:"))
         layout.addWidget(self.wipe_log, 1)
         layout.addLayout(button_layout)
@@ -254,6 +272,12 @@ class WipeOperationsTab(QWidget):
         basic_layout.addRow("Block size:", self.block_size)
         basic_layout.addRow("", self.direct_io)
         basic_layout.addRow("", self.sync_writes)
+        
+        # Concurrent jobs
+        self.adv_concurrent_jobs = QSpinBox()
+        self.adv_concurrent_jobs.setRange(1, 32)
+        self.adv_concurrent_jobs.setValue(4)
+        basic_layout.addRow("Concurrent wipes:", self.adv_concurrent_jobs)
         basic_tab.setLayout(basic_layout)
         
         # Security Features Tab
@@ -306,7 +330,10 @@ class WipeOperationsTab(QWidget):
         verification_layout = QVBoxLayout()
         
         self.verification_combo = QComboBox()
-        self.verification_combo.addItems(["Basic", "Entropy"])
+        self.verification_combo.addItems(["Basic", "Full", "Entropy"])
+        self.verification_combo.setToolTip(
+            "Basic reads an evenly spread 10% of the surface; Full reads every byte."
+        )
         
         entropy_layout = QHBoxLayout()
         entropy_layout.addWidget(QLabel("Entropy threshold:"))
@@ -383,6 +410,7 @@ class WipeOperationsTab(QWidget):
         status_layout = QVBoxLayout()
         
         self.adv_wipe_status = QLabel("Ready")
+        self.adv_wipe_throughput = QLabel("")
         self.adv_wipe_log = QTextEdit()
         self.adv_wipe_log.setReadOnly(True)
         self.adv_wipe_log.setMaximumHeight(150)
@@ -393,6 +421,7 @@ class WipeOperationsTab(QWidget):
         self.adv_progress.setValue(0)
         
         status_layout.addWidget(self.adv_wipe_status)
+        status_layout.addWidget(self.adv_wipe_throughput)
         status_layout.addWidget(self.adv_wipe_log)
         status_layout.addWidget(self.adv_progress)
         status_group.setLayout(status_layout)
@@ -787,61 +816,38 @@ class WipeOperationsTab(QWidget):
             )
 
     def _get_available_devices(self):
-        """Get list of available storage devices."""
-        try:
-            # Get block devices using lsblk
-            result = subprocess.run(
-                ['lsblk', '-d', '-n', '-o', 'NAME,SIZE,MODEL,VENDOR,TYPE', '--json'],
-                capture_output=True, text=True, check=True
-            )
-            
-            devices = json.loads(result.stdout)['blockdevices']
-            valid_devices = []
-            
-            for dev in devices:
-                # Skip non-disk devices and loop devices
-                if dev['type'] != 'disk' or dev['name'].startswith('loop'):
-                    continue
-                    
-                # Get device path and info
-                dev_path = f"/dev/{dev['name']}"
-                
-                # Safely get and clean model and vendor, handling None values
-                model = str(dev.get('model', '')).strip()
-                vendor = str(dev.get('vendor', '')).strip()
-                size = str(dev.get('size', '0')).strip()
-                
-                # Skip if we couldn't get a valid device path
-                if not dev_path or not os.path.exists(dev_path):
-                    continue
-                
-                # Create display text
-                display_text = f"{dev_path} - {size}"
-                if vendor:
-                    display_text += f" - {vendor}"
-                if model:
-                    display_text += f" {model}"
-                
-                # Add to list
-                valid_devices.append((dev_path, display_text))
+        """Get list of available storage devices from the shared device inventory."""
+        valid_devices = []
+        for dev in device_events().devices():
+            dev_path = dev['device']
+            if not os.path.exists(dev_path):
+                continue
             
-            return valid_devices
+            size, unit = format_size(dev['size_bytes'])
+            display_text = f"{dev_path} - {size:.1f} {unit}"
+            if dev['vendor']:
+                display_text += f" - {dev['vendor']}"
+            if dev['model'] and dev['model'] != 'Unknown':
+                display_text += f" {dev['model']}"
             
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if e.stderr else "Unknown error"
-            return []
-        except (json.JSONDecodeError, KeyError, AttributeError) as e:
-            return []
+            valid_devices.append((dev_path, display_text))
+        
+        return valid_devices
     
     def _populate_device_list(self, list_widget, devices, selectable=True):
-        """Populate a QListWidget with device information."""
+        """Populate a QListWidget with device information, keeping checked devices checked."""
+        checked = {
+            list_widget.item(i).data(Qt.ItemDataRole.UserRole)
+            for i in range(list_widget.count())
+            if list_widget.item(i).checkState() == Qt.CheckState.Checked
+        }
         list_widget.clear()
         for dev_path, display_text in devices:
             item = QListWidgetItem(display_text)
             item.setData(Qt.ItemDataRole.UserRole, dev_path)
             if selectable:
                 item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                item.setCheckState(Qt.CheckState.Unchecked)
+                item.setCheckState(Qt.CheckState.Checked if dev_path in checked else Qt.CheckState.Unchecked)
             else:
                 item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsUserCheckable)
             list_widget.addItem(item)
@@ -912,74 +918,171 @@ class WipeOperationsTab(QWidget):
             'current_device_index': 0,
             'method': method,
             'verify': self.verify_wipe.isChecked() if hasattr(self, 'verify_wipe') else False,
-            'quick_erase': self.quick_erase.isChecked() if hasattr(self, 'quick_erase') else False
+            'quick_erase': self.quick_erase.isChecked() if hasattr(self, 'quick_erase') else False,
+            'max_jobs': self.concurrent_jobs.value() if hasattr(self, 'concurrent_jobs') else 1
         }
         
-        # Start wiping the first device
-        self._start_next_wipe()
+        # Start wiping the queued devices
+        self._start_wipe_runner()
     
-    def _start_next_wipe(self):
-        """Start wiping the next device in the queue."""
+    def _start_wipe_runner(self):
+        """Start wiping the queued devices concurrently, scheduled per shared bus."""
         if not hasattr(self, 'current_wipe'):
             return
-            
-        if self.current_wipe['current_device_index'] >= len(self.current_wipe['devices']):
-            # All devices wiped
-            self._wipe_completed(True, "All devices wiped successfully")
-            return
-            
-        # Get current device
-        device = self.current_wipe['devices'][self.current_wipe['current_device_index']]
         
-        # Update status
-        self.wipe_status.setText(f"Wiping {device} ({self.current_wipe['current_device_index'] + 1}/{len(self.current_wipe['devices'])})")
+        wipe = self.current_wipe
+        self._clear_progress_card()
+        
+        def make_worker(device):
+            job = wipe.get('resume_jobs', {}).get(device)
+            if job is None:
+                return WipeWorker(
+                    device=device,
+                    method=wipe['method'],
+                    verify=wipe['verify'],
+                    quick_erase=wipe['quick_erase']
+                )
+            worker = WipeWorker(
+                device=device,
+                method=job.method,
+                verify=job.verify,
+                quick_erase=job.quick_erase
+            )
+            # Custom pattern, passes, block size etc. as the job was started with
+            worker.advanced_settings.update(job.options)
+            if job.options.get('post_erase_lock') and hasattr(self, 'lock_password_edit'):
+                # The lock password is not kept in the journal
+                worker.advanced_settings['lock_password'] = self.lock_password_edit.text() or 'BRICK'
+            worker.resume_job = job
+            return worker
+        
+        self.wipe_runner = ConcurrentWipeRunner(wipe['devices'], make_worker, max_jobs=wipe['max_jobs'])
+        self.wipe_runner.job_started.connect(self._on_wipe_started)
+        self.wipe_runner.job_finished.connect(self._on_wipe_finished)
+        self.wipe_runner.progress_batch.connect(self._on_progress_batch)
+        self.wipe_runner.throughput_changed.connect(self._update_wipe_throughput)
+        self.wipe_runner.all_finished.connect(self._wipe_completed)
+        
+        for bus, devices in self.wipe_runner.bus_groups().items():
+            self.wipe_log.append(f"Bus {bus}: {', '.join(devices)}")
+        
+        self.wipe_status.setText(f"Wiping {len(wipe['devices'])} device(s), up to {wipe['max_jobs']} at once")
         self.wipe_status.setStyleSheet("color: #a6e3a1;")
-        self.wipe_log.append(f"Starting wipe on {device}...")
+        self.wipe_runner.start()
+    
+    def _offer_resume_jobs(self):
+        """Offer to resume wipes left unfinished by a crash, power loss or stop."""
+        if os.geteuid() != 0 or hasattr(self, 'wipe_runner'):
+            return
         
-        # Create and start worker thread
-        self.wipe_worker = WipeWorker(
-            device=device,
-            method=self.current_wipe['method'],
-            verify=self.current_wipe['verify'],
-            quick_erase=self.current_wipe['quick_erase']
+        journal = WipeJournal()
+        jobs = journal.resumable()
+        if not jobs:
+            return
+        
+        lines = [
+            f"{job.device} ({job.serial or 'no serial'}): {job.method}, "
+            f"pass {job.pass_index + 1}/{job.pass_count}, {job.percent:.1f}% done"
+            for job in jobs
+        ]
+        answer = QMessageBox.question(
+            self, "Resume Interrupted Wipes",
+            "The following wipes did not finish:\n\n" + "\n".join(lines) +
+            "\n\nResume them from their last checkpoint?\n"
+            "Choose Discard to forget the saved progress.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Discard,
+            QMessageBox.StandardButton.Yes
         )
         
-        # Connect signals
-        self.wipe_worker.log_message.connect(self.wipe_log.append)
-        self.wipe_worker.finished.connect(self._on_wipe_finished)
-        self.wipe_worker.progress.connect(self._update_progress)
-        self.wipe_worker.progress_card_shown.connect(self._show_progress_card)
+        if answer == QMessageBox.StandardButton.Discard:
+            for job in jobs:
+                journal.remove(job)
+            self.wipe_log.append(f"Discarded {len(jobs)} interrupted wipe job(s)")
+            return
+        if answer != QMessageBox.StandardButton.Yes:
+            return
         
-        # Start the worker
-        self.wipe_worker.start()
-    
-    def _on_wipe_finished(self, success, message):
-        """Handle completion of a wipe operation."""
-        if not hasattr(self, 'current_wipe'):
+        # Without a serial/WWID the old /dev path may now name another disk
+        # of the same size, so each of those needs an explicit confirmation
+        confirmed = []
+        for job in jobs:
+            if not job.identified:
+                check = QMessageBox.warning(
+                    self, "Confirm Device",
+                    f"No serial number was recorded for the interrupted {job.method} wipe of "
+                    f"{job.device}, so it cannot be confirmed to be the same disk.\n\n"
+                    f"Device names can change between boots. Resume wiping {job.device} "
+                    f"({job.total_bytes / (1024 ** 3):.1f} GB) anyway?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                    QMessageBox.StandardButton.No
+                )
+                if check != QMessageBox.StandardButton.Yes:
+                    self.wipe_log.append(f"Not resuming unidentified device {job.device}")
+                    continue
+            confirmed.append(job)
+        jobs = confirmed
+        if not jobs:
             return
-            
-        # Log the result
-        status = "completed" if success else "failed"
-        device = self.current_wipe['devices'][self.current_wipe['current_device_index']]
-        self.wipe_log.append(f"Wipe {status} on {device}: {message}")
         
-        # Move to next device
-        self.current_wipe['current_device_index'] += 1
+        self.start_wipe_btn.setEnabled(False)
+        self.stop_wipe_btn.setEnabled(True)
+        self.device_list.setEnabled(False)
         
-        if success:
-            # Start next wipe or finish
-            self._start_next_wipe()
-        else:
-            # Stop on error
-            self._wipe_completed(False, f"Wipe failed: {message}")
+        self.current_wipe = {
+            'devices': [job.device for job in jobs],
+            'current_device_index': 0,
+            'method': jobs[0].method,
+            'verify': jobs[0].verify,
+            'quick_erase': jobs[0].quick_erase,
+            'max_jobs': self.concurrent_jobs.value() if hasattr(self, 'concurrent_jobs') else 1,
+            'resume_jobs': {job.device: job for job in jobs}
+        }
+        self._start_wipe_runner()
+    
+    def _on_wipe_started(self, device, worker):
+        """Connect a newly scheduled worker to the standard wipe UI."""
+        self.wipe_log.append(f"Starting wipe on {device}...")
+        self.wipe_worker = worker
+        worker.log_message.connect(self._append_worker_log)
+        worker.progress.connect(self._update_progress)
+        worker.progress_card_shown.connect(self._show_progress_card)
+    
+    def _tag_worker_message(self, message):
+        """Prefix a message with the device of the worker that sent it."""
+        worker = self.sender()
+        if isinstance(worker, WipeWorker):
+            return f"[{os.path.basename(worker.device)}] {message}"
+        return message
+    
+    def _append_worker_log(self, message):
+        """Append a standard wipe worker log line, tagged with its device."""
+        self.wipe_log.append(self._tag_worker_message(message))
+    
+    def _on_wipe_finished(self, device, success, message):
+        """Handle completion of a single device wipe."""
+        status = "completed" if success else "failed"
+        self.wipe_log.append(f"Wipe {status} on {device}: {message}")
+    
+    @staticmethod
+    def _format_throughput(rate, running):
+        """Format the aggregate throughput line shown under the wipe status."""
+        if not running:
+            return ""
+        return f"Aggregate: {rate / 1024 / 1024:.1f} MB/s across {running} running wipe(s)"
+    
+    def _update_wipe_throughput(self, rate, running):
+        """Show aggregate throughput across all running standard wipes."""
+        self.wipe_throughput.setText(self._format_throughput(rate, running))
     
     def _wipe_completed(self, success, message):
         """Handle completion of all wipe operations."""
         # Clean up
-        if hasattr(self, 'wipe_worker'):
-            self.wipe_worker.quit()
-            self.wipe_worker.wait()
-            del self.wipe_worker
+        if hasattr(self, 'wipe_runner'):
+            self.wipe_runner.deleteLater()
+            del self.wipe_runner
+        self.wipe_worker = None
+        if hasattr(self, 'wipe_throughput'):
+            self.wipe_throughput.setText("")
         
         # Update UI
         if hasattr(self, 'start_wipe_btn'):
@@ -992,7 +1095,7 @@ class WipeOperationsTab(QWidget):
         # Show status
         if hasattr(self, 'wipe_status'):
             if success:
-                self.wipe_status.setText("All wipes completed successfully")
+                self.wipe_status.setText(message)
                 self.wipe_status.setStyleSheet("color: #a6e3a1;")
             else:
                 self.wipe_status.setText(message)
@@ -1003,10 +1106,7 @@ class WipeOperationsTab(QWidget):
             del self.current_wipe
     
     def _show_progress_card(self, card):
-        """Show the progress card in the UI."""
-        # Clear existing card if any
-        self._clear_progress_card()
-        
+        """Show a worker's progress card in the UI (one card per running wipe)."""
         # Add the new card
         self.progress_card_layout.addWidget(card)
         self.progress_card_container.setVisible(True)
@@ -1020,8 +1120,21 @@ class WipeOperationsTab(QWidget):
                 item.widget().deleteLater()
         self.progress_card_container.setVisible(False)
     
+    def _on_progress_batch(self, events):
+        """Apply the newest progress of each running standard wipe."""
+        workers = self.wipe_runner.workers if hasattr(self, 'wipe_runner') else {}
+        for event in events:
+            self._show_progress(workers.get(event.job), int(event.overall_percent), event.describe())
+    
     def _update_progress(self, percent, message):
-        """Update progress display."""
+        """Update progress display for the worker that sent the update."""
+        worker = self.sender() if isinstance(self.sender(), WipeWorker) else self.wipe_worker
+        self._show_progress(worker, percent, message)
+    
+    def _show_progress(self, worker, percent, message):
+        """Show a progress update for ``worker`` in the status bar and its progress card."""
+        if worker is not None:
+            message = f"{os.path.basename(worker.device)}: {message}"
         # Update status bar if it exists
         if hasattr(self, 'wipe_status'):
             # Only update if the message doesn't already contain the percentage
@@ -1036,15 +1149,15 @@ class WipeOperationsTab(QWidget):
             self.wipe_progress.setValue(percent)
         
         # Also update the progress card if it exists
-        if hasattr(self, 'wipe_worker') and hasattr(self.wipe_worker, 'progress_bar'):
-            self.wipe_worker.progress_bar.setValue(percent)
-            if hasattr(self.wipe_worker, 'progress_text'):
+        if worker is not None and hasattr(worker, 'progress_bar'):
+            worker.progress_bar.setValue(percent)
+            if hasattr(worker, 'progress_text'):
                 # Only update the progress text if it doesn't already contain the percentage
                 # to avoid duplicate percentages
                 if f"({percent}%)" not in message:
-                    self.wipe_worker.progress_text.setText(f"{message} ({percent}%)")
+                    worker.progress_text.setText(f"{message} ({percent}%)")
                 else:
-                    self.wipe_worker.progress_text.setText(message)
+                    worker.progress_text.setText(message)
     
     def start_advanced_wipe(self):
         """Start the advanced wipe process with selected options."""
@@ -1102,6 +1215,7 @@ class WipeOperationsTab(QWidget):
             'pattern': pattern_text,
             'passes': self.passes_spin.value(),
             'verify': self.verify_check.isChecked(),
+            'max_jobs': self.adv_concurrent_jobs.value(),
             'options': {
                 'sector_size': int(self.sector_size.currentText()),
                 'block_size': self.block_size.currentText(),
@@ -1127,64 +1241,78 @@ class WipeOperationsTab(QWidget):
         self.adv_wipe_status.setText("Initializing...")
         self.adv_wipe_status.setStyleSheet("color: #a6e3a1;")
 
-        # Start wiping the first device
-        self._start_next_advanced_wipe()
+        # Start wiping the queued devices
+        self._start_advanced_wipe_runner()
 
-    def _start_next_advanced_wipe(self):
-        """Start wiping the next device in the advanced wipe queue."""
+    def _start_advanced_wipe_runner(self):
+        """Start the advanced wipe queue concurrently, scheduled per shared bus."""
         if not hasattr(self, 'advanced_wipe'):
             return
-
-        if self.advanced_wipe['current_device_index'] >= len(self.advanced_wipe['devices']):
-            # All devices wiped
-            self._advanced_wipe_completed(True, "All devices wiped successfully")
-            return
-
-        device = self.advanced_wipe['devices'][self.advanced_wipe['current_device_index']]
-
-        # Update status
-        self.adv_wipe_status.setText(f"Wiping {device} ({self.advanced_wipe['current_device_index'] + 1}/{len(self.advanced_wipe['devices'])})")
+        
+        wipe = self.advanced_wipe
+        pattern = self._parse_pattern(wipe['pattern'])
+        
+        def make_worker(device):
+            # Create WipeWorker with custom method
+            worker = WipeWorker(
+                device=device,
+                method='custom',
+                verify=wipe['verify'],
+                quick_erase=False
+            )
+            
+            # Configure advanced options from stored settings
+            opts = wipe['options']
+            worker.set_advanced_options(
+                pattern=pattern,
+                passes=wipe['passes'],
+                sector_size=opts['sector_size'],
+                block_size=opts['block_size'],
+                direct_io=opts['direct_io'],
+                sync_writes=opts['sync_writes'],
+                key_wipe=opts['key_wipe'],
+                bootloader_wipe=opts['bootloader_wipe'],
+                volatile_memory=opts['volatile_memory'],
+                thermal_stress=opts['thermal_stress'],
+                verification_mode=opts['verification_mode'],
+                tamper_log=opts['tamper_log'],
+                entropy_threshold=opts['entropy_threshold'],
+                stress_duration=opts['stress_duration'],
+                stress_temp=opts['stress_temp'],
+                post_erase_lock=opts['post_erase_lock'],
+                force_brick=opts['force_brick'],
+                lock_password=opts['lock_password']
+            )
+            return worker
+        
+        self.adv_wipe_runner = ConcurrentWipeRunner(wipe['devices'], make_worker, max_jobs=wipe['max_jobs'])
+        self.adv_wipe_runner.job_started.connect(self._on_advanced_wipe_started)
+        self.adv_wipe_runner.job_finished.connect(self._on_advanced_wipe_finished)
+        self.adv_wipe_runner.progress_batch.connect(self._on_adv_progress_batch)
+        self.adv_wipe_runner.throughput_changed.connect(self._update_adv_throughput)
+        self.adv_wipe_runner.all_finished.connect(self._advanced_wipe_completed)
+        
+        for bus, devices in self.adv_wipe_runner.bus_groups().items():
+            self.adv_wipe_log.append(f"Bus {bus}: {', '.join(devices)}")
+        
+        self.adv_wipe_status.setText(f"Wiping {len(wipe['devices'])} device(s), up to {wipe['max_jobs']} at once")
+        self.adv_wipe_runner.start()
+    
+    def _on_advanced_wipe_started(self, device, worker):
+        """Connect a newly scheduled worker to the advanced wipe UI."""
         self.adv_wipe_log.append(f"Starting advanced wipe on {device}...")
-
-        # Create WipeWorker with custom method
-        self.adv_wipe_worker = WipeWorker(
-            device=device,
-            method='custom',
-            verify=self.advanced_wipe['verify'],
-            quick_erase=False
-        )
-
-        # Configure advanced options from stored settings
-        opts = self.advanced_wipe['options']
-        self.adv_wipe_worker.set_advanced_options(
-            pattern=self._parse_pattern(self.advanced_wipe['pattern']),
-            passes=self.advanced_wipe['passes'],
-            sector_size=opts['sector_size'],
-            block_size=opts['block_size'],
-            direct_io=opts['direct_io'],
-            sync_writes=opts['sync_writes'],
-            key_wipe=opts['key_wipe'],
-            bootloader_wipe=opts['bootloader_wipe'],
-            volatile_memory=opts['volatile_memory'],
-            thermal_stress=opts['thermal_stress'],
-            verification_mode=opts['verification_mode'],
-            tamper_log=opts['tamper_log'],
-            entropy_threshold=opts['entropy_threshold'],
-            stress_duration=opts['stress_duration'],
-            stress_temp=opts['stress_temp'],
-            post_erase_lock=opts['post_erase_lock'],
-            force_brick=opts['force_brick'],
-            lock_password=opts['lock_password']
-        )
-
-        # Connect signals
-        self.adv_wipe_worker.progress.connect(self._update_adv_progress)
-        self.adv_wipe_worker.log_message.connect(self.adv_wipe_log.append)
-        self.adv_wipe_worker.finished.connect(self._on_advanced_wipe_finished)
-        self.adv_wipe_worker.progress_card_shown.connect(self._show_adv_progress_card)
-
-        # Start the worker
-        self.adv_wipe_worker.start()
+        self.adv_wipe_worker = worker
+        worker.progress.connect(self._update_adv_progress)
+        worker.log_message.connect(self._append_adv_worker_log)
+        worker.progress_card_shown.connect(self._show_adv_progress_card)
+    
+    def _append_adv_worker_log(self, message):
+        """Append an advanced wipe worker log line, tagged with its device."""
+        self.adv_wipe_log.append(self._tag_worker_message(message))
+    
+    def _update_adv_throughput(self, rate, running):
+        """Show aggregate throughput across all running advanced wipes."""
+        self.adv_wipe_throughput.setText(self._format_throughput(rate, running))
 
     def _parse_pattern(self, pattern_text):
         """Parse pattern text into bytes list for WipeWorker."""
@@ -1210,8 +1338,18 @@ class WipeOperationsTab(QWidget):
 
         return patterns if patterns else None
 
+    def _on_adv_progress_batch(self, events):
+        """Apply the newest progress of each running advanced wipe."""
+        for event in events:
+            self._show_adv_progress(int(event.overall_percent),
+                                    f"[{os.path.basename(event.job)}] {event.describe()}")
+    
     def _update_adv_progress(self, percent, message):
         """Update advanced wipe progress display."""
+        self._show_adv_progress(percent, self._tag_worker_message(message))
+    
+    def _show_adv_progress(self, percent, message):
+        """Show an advanced wipe progress line and bar value."""
         if hasattr(self, 'adv_wipe_status'):
             if percent >= 0:
                 self.adv_wipe_status.setText(f"{message} ({percent}%)")
@@ -1224,39 +1362,22 @@ class WipeOperationsTab(QWidget):
     def _show_adv_progress_card(self, card):
         """Show the progress card in the advanced wipe UI."""
         if hasattr(self, 'adv_progress_layout'):
-            # Clear existing card if any
-            while self.adv_progress_layout.count():
-                item = self.adv_progress_layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
             self.adv_progress_layout.addWidget(card)
 
-    def _on_advanced_wipe_finished(self, success, message):
-        """Handle completion of an advanced wipe operation."""
-        if not hasattr(self, 'advanced_wipe'):
-            return
-
+    def _on_advanced_wipe_finished(self, device, success, message):
+        """Handle completion of a single advanced wipe."""
         status = "completed" if success else "failed"
-        device = self.advanced_wipe['devices'][self.advanced_wipe['current_device_index']]
         self.adv_wipe_log.append(f"Wipe {status} on {device}: {message}")
 
-        # Move to next device
-        self.advanced_wipe['current_device_index'] += 1
-
-        if success:
-            # Start next wipe or finish
-            self._start_next_advanced_wipe()
-        else:
-            # Stop on failure
-            self._advanced_wipe_completed(False, f"Wipe failed: {message}")
-
     def _advanced_wipe_completed(self, success, message):
         """Handle completion of all advanced wipe operations."""
-        # Clean up worker
+        # Clean up runner
+        if hasattr(self, 'adv_wipe_runner'):
+            self.adv_wipe_runner.deleteLater()
+            del self.adv_wipe_runner
         if hasattr(self, 'adv_wipe_worker'):
-            self.adv_wipe_worker.quit()
-            self.adv_wipe_worker.wait()
             del self.adv_wipe_worker
+        self.adv_wipe_throughput.setText("")
 
         # Re-enable UI elements
         self.adv_start_btn.setEnabled(True)
@@ -1265,7 +1386,7 @@ class WipeOperationsTab(QWidget):
 
         # Update status
         if success:
-            self.adv_wipe_status.setText("All wipes completed successfully")
+            self.adv_wipe_status.setText(message)
             self.adv_wipe_status.setStyleSheet("color: #a6e3a1;")
             self.adv_wipe_log.append("✓ Advanced wipe completed successfully")
         else:
@@ -1304,9 +1425,13 @@ class WipeOperationsTab(QWidget):
             self.lock_password_edit.setEnabled(checked)
     
     def stop_wipe(self):
-        """Stop the current wipe operation."""
-        if hasattr(self, 'wipe_worker') and self.wipe_worker.isRunning():
-            self.wipe_worker.stop()
+        """Stop the current wipe operations."""
+        if hasattr(self, 'adv_wipe_runner') and self.adv_wipe_runner.is_running():
+            self.adv_wipe_runner.stop()
+            self.adv_wipe_log.append("Stopping running advanced wipes...")
+            self.adv_stop_btn.setEnabled(False)
+        if hasattr(self, 'wipe_runner') and self.wipe_runner.is_running():
+            self.wipe_runner.stop()
             if hasattr(self, 'wipe_log'):
                 self.wipe_log.append("Stopping current wipe operation...")
             if hasattr(self, 'wipe_status'):
@@ -1508,7 +1633,19 @@ import shlex
 from pathlib import Path
 from datetime import datetime, timezone
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+
+from BLACKSTORM.core.wipe_engine import (
+    BlockWipeEngine,
+    KeyStream,
+    WipeEngineError,
+    WipePass,
+    gutmann_passes,
+)
+from BLACKSTORM.core.wipe_journal import WipeJournal
+from BLACKSTORM.core.progress_bus import DEFAULT_TIMELINE_DIR, ProgressBus, ProgressEvent
+from BLACKSTORM.core.wipe_scheduler import WipeScheduler
+from BLACKSTORM.core.wipe_verify import ExtentHashVerifier, WipeVerifier
 
 class WipeWorker(QThread):
     """Worker thread for performing disk wiping operations."""
@@ -1518,6 +1655,7 @@ class WipeWorker(QThread):
     log_message = Signal(str)    # log message
     location_updated = Signal(dict)  # signal for location updates
     progress_card_shown = Signal(object)  # Signal to show progress card
+    throughput_updated = Signal(float)  # current write rate in bytes/sec
     
     def __init__(self, device, method, verify=True, quick_erase=False, enable_location=True):
         super().__init__()
@@ -1527,6 +1665,15 @@ class WipeWorker(QThread):
         self.quick_erase = quick_erase
         self.enable_location = enable_location
         self._is_running = True
+        self._engine = None
+        self._verifier = None
+        self._final_pass = None
+        self._final_keystream = None
+        self._final_digest = None
+        self.resume_job = None  # WipeJob to continue instead of starting from pass 1
+        self._job = None
+        self.journal = WipeJournal()
+        self.progress_bus = None  # ProgressBus to publish to instead of emitting progress signals
         self.log_file = '/var/log/blackstorm/tamper.log'
         self.location = None
         
@@ -1557,7 +1704,9 @@ class WipeWorker(QThread):
             'bootloader_wipe': False, # Wipe bootloader
             'volatile_memory': False, # Wipe volatile memory (RAM)
             'thermal_stress': False,  # Perform thermal stress test
-            'verification_mode': 'basic', # Verification mode: 'none', 'basic', 'entropy'
+            'verification_mode': 'basic', # Verification mode: 'none', 'basic', 'full', 'entropy'
+            'verify_fraction': 0.1,   # Share of the surface read by 'basic' verification
+            'verify_threads': 4,      # Extents read and hashed in parallel during verification
             'tamper_log': True,    # Enable tamper logging
             'location_logging': enable_location,  # Enable location logging
             
@@ -1575,7 +1724,7 @@ class WipeWorker(QThread):
                            block_size='4M', direct_io=True, sync_writes=False,
                            key_wipe=False, bootloader_wipe=False, volatile_memory=False,
                            thermal_stress=False, verification_mode='basic', tamper_log=True,
-                           entropy_threshold=7.9, stress_duration=300, stress_temp=70,
+                           verify_fraction=0.1, verify_threads=4, entropy_threshold=7.9, stress_duration=300, stress_temp=70,
                            post_erase_lock=False, force_brick=False, lock_password='BRICK'):
         """Set advanced wipe options with all security features."""
         self.advanced_settings.update({
@@ -1593,6 +1742,8 @@ class WipeWorker(QThread):
             'volatile_memory': bool(volatile_memory),
             'thermal_stress': bool(thermal_stress),
             'verification_mode': str(verification_mode),
+            'verify_fraction': min(1.0, max(0.0, float(verify_fraction))),
+            'verify_threads': max(1, int(verify_threads)),
             'tamper_log': bool(tamper_log),
             
             # Advanced options
@@ -1608,38 +1759,6 @@ class WipeWorker(QThread):
         if self.advanced_settings['tamper_log']:
             self._log_tamper_event('config_update', f"Advanced options updated for {self.device}")
     
-    def _get_dd_command(self, pattern=None, oflags=None):
-        """Generate dd command with current settings."""
-        cmd = ['dd']
-        
-        # Add direct I/O flag if enabled
-        if self.advanced_settings['direct_io']:
-            cmd.extend(['iflag=direct', 'oflag=direct'])
-            
-        # Add sync flag if enabled
-        if self.advanced_settings['sync_writes']:
-            cmd.append('conv=fsync')
-            
-        # Add block size
-        cmd.append(f'bs={self.advanced_settings["block_size"]}')
-        
-        # Add input file (pattern or /dev/zero/urandom)
-        if pattern is None:
-            cmd.append('if=/dev/zero')
-        else:
-            # Use a temporary file with the pattern
-            pattern_str = ''.join(f'\\x{byte:02x}' for byte in pattern)
-            cmd.append(f'if=<(printf "{pattern_str}")')
-            
-        # Add output file
-        cmd.append(f'of={self.device}')
-        
-        # Add additional flags if specified
-        if oflags:
-            cmd.extend(oflags)
-            
-        return ' '.join(cmd)
-    
     def _log_tamper_event(self, event_type, message):
         """Log security events for tamper evidence with optional location data."""
         try:
@@ -1842,31 +1961,16 @@ class WipeWorker(QThread):
             
             self.log_message.emit(f"Starting custom wipe with {passes} passes")
             
+            # Alternate between pattern and random data
+            wipe_passes = []
             for i in range(passes):
-                if not self._is_running:
-                    return False
-                    
-                # Alternate between pattern and random data
                 if pattern and i % 2 == 0:
-                    self.log_message.emit(f"Pass {i+1}/{passes}: Writing pattern...")
-                    cmd = self._get_dd_command(pattern=pattern)
+                    wipe_passes.append(WipePass.fill(pattern, "Writing pattern"))
                 else:
-                    self.log_message.emit(f"Pass {i+1}/{passes}: Writing random data...")
-                    cmd = 'dd if=/dev/urandom ' + self._get_dd_command().split(' ', 1)[1]
-                
-                # Execute the command
-                result = subprocess.run(
-                    cmd, shell=True, executable='/bin/bash',
-                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-                )
-                
-                if result.returncode != 0:
-                    self.log_message.emit(f"Error in pass {i+1}: {result.stderr}")
-                    return False
-                    
-                # Update progress
-                progress = int(((i + 1) / passes) * 100)
-                self.progress.emit(progress, f"Pass {i+1}/{passes} complete")
+                    wipe_passes.append(WipePass.random("Writing random data"))
+            
+            if not self._run_engine_passes(wipe_passes):
+                return False
             
             return True
             
@@ -1952,75 +2056,6 @@ class WipeWorker(QThread):
                 message = "Wipe completed successfully" if success else "Wipe failed"
             self.finished.emit(success, message)
 
-    def _run_command_with_progress(self, command, total_bytes, error_msg):
-        """Run a command with progress tracking using pv."""
-        if not self._is_running:
-            return False
-            
-        try:
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=True,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                executable='/bin/bash'
-            )
-            
-            # Read output in real-time
-            last_update = time.time()
-            bytes_processed = 0
-            
-            while True:
-                if not self._is_running:
-                    process.terminate()
-                    return False
-                
-                # Read from stderr (where pv outputs progress)
-                line = process.stderr.readline()
-                
-                # Check if process has finished
-                if line == '' and process.poll() is not None:
-                    break
-                    
-                if line:
-                    line = line.strip()
-                    self.log_message.emit(line)
-                    
-                    # Parse pv progress output
-                    if '%' in line and '[' in line and ']' in line:
-                        try:
-                            # Extract percentage
-                            percent_str = line.split('%')[0].split()[-1]
-                            percent = float(percent_str)
-                            
-                            # Update progress
-                            self.progress.emit(int(percent), f"Wiping: {int(percent)}%")
-                            
-                            # Update bytes processed
-                            if 'B ' in line and '/' in line:
-                                processed = line.split('B ')[1].split('/')[0].strip()
-                                self.log_message.emit(f"Processed: {processed}")
-                                
-                        except Exception as e:
-                            self.log_message.emit(f"Progress parse error: {str(e)}")
-            
-            # Check the return code
-            if process.returncode != 0:
-                # Read any remaining error output
-                remaining_error = process.stderr.read()
-                if remaining_error.strip():
-                    self.log_message.emit(f"{error_msg}: {remaining_error.strip()}")
-                return False
-                
-            return True
-            
-        except Exception as e:
-            self.log_message.emit(f"Command with progress error: {str(e)}")
-            return False
-    
     def _run_command(self, command, error_msg, fail_on_error=True):
         """
         Run a shell command and handle output/errors.
@@ -2121,7 +2156,8 @@ class WipeWorker(QThread):
                 self.log_message.emit("Warning: Could not unmount all partitions. Continuing anyway...")
             
             # Wipe the partition table
-            if not self._run_command(f"sudo wipefs -a {self.device}", "Failed to wipe partition table", fail_on_error=False):
+            # A resumed job already overwrote the partition table
+            if self.resume_job is None and not self._run_command(f"sudo wipefs -a {self.device}", "Failed to wipe partition table", fail_on_error=False):
                 self.log_message.emit("Warning: Failed to wipe partition table, continuing with zero-fill...")
             
             # Get device size for progress reporting
@@ -2154,82 +2190,17 @@ class WipeWorker(QThread):
                 return False
             
             # Try to use blkdiscard to optimize the process if available
-            if 'nvme' in self.device or 'sd' in self.device:
+            # Discarding would throw away the passes a resumed job already wrote
+            if self.resume_job is None and ('nvme' in self.device or 'sd' in self.device):
                 self.log_message.emit("Attempting to optimize with discard...")
                 cmd = f"sudo blkdiscard -f {self.device}"
                 self._run_command(cmd, "blkdiscard warning", fail_on_error=False)
             
-            # Initialize progress tracking
-            self.last_update = time.time()
-            self.last_bytes = 0
-            
-            # Build the dd command with status=progress
-            block_size = "1M"
-            dd_cmd = f"sudo dd if=/dev/zero of={self.device} bs={block_size} status=progress"
-            if self.quick_erase:
-                dd_cmd += " conv=noerror"
-            
-            # Start the process
-            process = subprocess.Popen(
-                dd_cmd,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-            
-            # Initialize progress tracking
-            last_update = time.time()
-            last_bytes = 0
-            
-            # Stream and parse output in real-time
-            while True:
-                if not self._is_running:
-                    process.terminate()
-                    return False
-                    
-                line = process.stdout.readline()
-                if line == '' and process.poll() is not None:
-                    break
-                    
-                if line:
-                    # Parse the progress
-                    bytes_written, speed, percent = self._parse_dd_progress(line, total_bytes)
-                    
-                    # Update progress if we have valid data
-                    if bytes_written is not None and speed is not None and percent is not None:
-                        # Calculate current speed
-                        current_time = time.time()
-                        if last_bytes > 0 and current_time > last_update:
-                            bytes_sec = (bytes_written - last_bytes) / (current_time - last_update)
-                            speed = f"{bytes_sec/1024/1024:.1f} MB/s"
-                        last_bytes = bytes_written
-                        last_update = current_time
-                        
-                        # Emit progress update with formatted sizes
-                        if total_bytes:
-                            written_val, written_unit = format_size(bytes_written)
-                            total_val, total_unit = format_size(total_bytes)
-                            status = f"{written_val:.1f} {written_unit} / {total_val:.1f} {total_unit} ({percent}%) @ {speed}"
-                        else:
-                            written_val, written_unit = format_size(bytes_written)
-                            status = f"{written_val:.1f} {written_unit} @ {speed}"
-                        
-                        # Update progress bar and status
-                        self.progress.emit(percent, status)
-            
-            result = (process.returncode == 0)
-            
-            # Ensure all data is written to disk
-            if result:
-                self.log_message.emit("Finalizing write operations...")
-                sync_cmd = "sudo sync"
-                self._run_command(sync_cmd, "Sync failed", fail_on_error=False)
-                self.log_message.emit("Quick wipe completed successfully.")
+            if not self._run_engine_passes([WipePass.zeros("Writing zeros")]):
+                return False
             
-            return result
+            self.log_message.emit("Quick wipe completed successfully.")
+            return True
             
         except Exception as e:
             self.log_message.emit(f"Error in quick wipe: {str(e)}")
@@ -2243,7 +2214,8 @@ class WipeWorker(QThread):
                 self.log_message.emit("Warning: Could not unmount all partitions. Continuing anyway...")
             
             # Wipe the partition table
-            if not self._run_command(f"sudo wipefs -a {self.device}", "Failed to wipe partition table", fail_on_error=False):
+            # A resumed job already overwrote the partition table
+            if self.resume_job is None and not self._run_command(f"sudo wipefs -a {self.device}", "Failed to wipe partition table", fail_on_error=False):
                 self.log_message.emit("Warning: Failed to wipe partition table, continuing with DoD wipe...")
             
             # Get device size for progress reporting
@@ -2276,107 +2248,22 @@ class WipeWorker(QThread):
                 return False
             
             # Try to use blkdiscard to optimize the process if available
-            if 'nvme' in self.device or 'sd' in self.device:
+            # Discarding would throw away the passes a resumed job already wrote
+            if self.resume_job is None and ('nvme' in self.device or 'sd' in self.device):
                 self.log_message.emit("Attempting to optimize with discard...")
                 cmd = f"sudo blkdiscard -f {self.device}"
                 self._run_command(cmd, "blkdiscard warning", fail_on_error=False)
             
-            # Initialize progress tracking
-            self.last_update = time.time()
-            self.last_bytes = 0
-            
             # Define the three passes
             passes = [
-                {
-                    'name': 'Pass 1/3: Writing zeros',
-                    'cmd': f"sudo dd if=/dev/zero of={self.device} bs=1M status=progress"
-                },
-                {
-                    'name': 'Pass 2/3: Writing ones',
-                    'cmd': f"sudo dd if=/dev/zero iflag=fullblock of={self.device} bs=1M count=$(blockdev --getsize64 {self.device} 2>/dev/null || echo 0) status=progress"
-                },
-                {
-                    'name': 'Pass 3/3: Writing random data',
-                    'cmd': f"sudo dd if=/dev/urandom of={self.device} bs=1M status=progress"
-                }
+                WipePass.zeros('Writing zeros'),
+                WipePass.fill(b'\xff', 'Writing ones'),
+                WipePass.random('Writing random data'),
             ]
             
-            # Add quick_erase option if needed
-            if self.quick_erase:
-                for p in passes:
-                    p['cmd'] += " conv=noerror"
-            
-            # Track total progress across all passes
-            total_progress = 0
-            
-            for i, pass_info in enumerate(passes, 1):
-                if not self._is_running:
-                    return False
-                
-                self.log_message.emit(pass_info['name'])
-                
-                # Start the process
-                process = subprocess.Popen(
-                    pass_info['cmd'],
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True
-                )
-                
-                # Initialize progress tracking for this pass
-                last_update = time.time()
-                last_bytes = 0
-                
-                # Stream and parse output in real-time
-                while True:
-                    if not self._is_running:
-                        process.terminate()
-                        return False
-                        
-                    line = process.stdout.readline()
-                    if line == '' and process.poll() is not None:
-                        break
-                        
-                    if line:
-                        # Parse the progress for this pass
-                        bytes_written, speed, percent = self._parse_dd_progress(line, total_bytes)
-                        
-                        # Calculate overall progress (0-100% across all passes)
-                        if percent is not None:
-                            # Each pass is 1/3 of the total progress
-                            overall_percent = ((i-1) * 33.33) + (percent / 3)
-                            
-                            # Update progress if we have valid data
-                            if bytes_written is not None and speed is not None:
-                                # Calculate current speed
-                                current_time = time.time()
-                                if last_bytes > 0 and current_time > last_update:
-                                    bytes_sec = (bytes_written - last_bytes) / (current_time - last_update)
-                                    speed = f"{bytes_sec/1024/1024:.1f} MB/s"
-                                last_bytes = bytes_written
-                                last_update = current_time
-                                
-                                # Format status with pass info
-                                written_val, written_unit = format_size(bytes_written)
-                                total_val, total_unit = format_size(total_bytes)
-                                status = (f"{pass_info['name']} - {written_val:.1f} {written_unit} / "
-                                         f"{total_val:.1f} {total_unit} ({percent}%) @ {speed}")
-                                
-                                # Update progress bar and status
-                                self.progress.emit(int(overall_percent), status)
-                
-                # Check if this pass failed
-                if process.returncode != 0:
-                    self.log_message.emit(f"DoD pass {i} failed with code {process.returncode}")
-                    return False
-                
-                # Ensure data is written to disk after each pass
-                self.log_message.emit(f"Finalizing {pass_info['name'].lower()}...")
-                sync_cmd = "sudo sync"
-                self._run_command(sync_cmd, "Sync failed", fail_on_error=False)
+            if not self._run_engine_passes(passes):
+                self.log_message.emit("DoD wipe failed or was stopped")
+                return False
             
             self.log_message.emit("DoD 3-pass wipe completed successfully.")
             return True
@@ -2385,6 +2272,137 @@ class WipeWorker(QThread):
             self.log_message.emit(f"Error in DoD wipe: {str(e)}")
             return False
     
+    def _run_engine_passes(self, passes):
+        """Write ``passes`` to the device with the native block engine.
+        
+        Progress, throughput and per-pass timing are reported straight from
+        the engine rather than scraped from dd/shred output.
+        
+        Args:
+            passes (list[WipePass]): Passes to write, in order.
+            
+        Returns:
+            bool: True if every pass completed, False on error or stop
+        """
+        job = self.resume_job
+        if job is not None and not job.matches(passes):
+            # The journal records exactly what was being written; finish that
+            self.log_message.emit(
+                f"Resuming the journaled {job.pass_count}-pass list instead of a fresh {len(passes)}-pass one"
+            )
+            passes = job.wipe_passes()
+        keystream = KeyStream(bytes.fromhex(job.key)) if job is not None and job.key else None
+        engine = BlockWipeEngine(
+            self.device,
+            block_size=self.advanced_settings['block_size'],
+            direct_io=self.advanced_settings['direct_io'],
+            ignore_errors=self.quick_erase,
+            keystream=keystream,
+            sync_writes=self.advanced_settings['sync_writes'],
+        )
+        self._engine = engine
+        if not self._is_running:
+            return False
+        
+        # Remember what the final pass wrote so verification can check for it
+        self._final_pass = passes[-1] if passes else None
+        self._final_keystream = engine.keystream.for_pass(len(passes) - 1)
+        self._final_digest = None
+        
+        start_pass, start_offset = 0, 0
+        if job is not None:
+            start_pass, start_offset = job.pass_index, job.offset
+            job.status = 'running'
+            self.log_message.emit(
+                f"Resuming {job.method} wipe at pass {start_pass + 1}/{job.pass_count}, "
+                f"offset {start_offset} ({job.percent:.1f}% already done)"
+            )
+        else:
+            try:
+                job = self.journal.create(self.device, self.method, passes, engine.device_size(),
+                                          engine.keystream.key, self.verify, self.quick_erase,
+                                          options=self.advanced_settings)
+            except OSError as e:
+                self.log_message.emit(f"Warning: wipe will not be resumable, journal unavailable: {str(e)}")
+        self._job = job
+        
+        try:
+            # Hash the final pass as it is written so verification is a single read-back
+            results = engine.run(passes, progress_callback=self._on_engine_progress,
+                                 digest_final=self.verify,
+                                 start_pass=start_pass, start_offset=start_offset,
+                                 checkpoint_callback=self._checkpoint_job if job is not None else None)
+        except (OSError, WipeEngineError) as e:
+            self.log_message.emit(f"Wipe engine error: {str(e)}")
+            self._interrupt_job(job)
+            self._job = None
+            return False
+        finally:
+            self._engine = None
+        
+        for result in results:
+            written_val, written_unit = format_size(result.bytes_written)
+            summary = (f"{result.label}: {written_val:.1f} {written_unit} in {result.duration:.1f}s "
+                       f"@ {result.throughput / 1024 / 1024:.1f} MB/s")
+            if result.errors:
+                summary += f" ({result.errors} blocks skipped after write errors)"
+            self.log_message.emit(summary)
+        
+        if engine.final_digest is not None and engine.final_digest.complete:
+            self._final_digest = engine.final_digest
+            self.log_message.emit(f"Final pass digest (Merkle root): {self._final_digest.root}")
+            self._log_tamper_event('wipe_digest',
+                                   f"{self.device} final pass root {self._final_digest.root} "
+                                   f"over {self._final_digest.extent_count} extents")
+        
+        completed = self._is_running and len(results) == len(passes) - start_pass
+        if job is not None:
+            if completed:
+                self.journal.remove(job)
+            else:
+                self._interrupt_job(job)
+        self.resume_job = None
+        self._job = None
+        return completed
+    
+    def _checkpoint_job(self, pass_index, offset):
+        """Record a flushed resume point for the running job."""
+        if self._job is None:
+            return
+        try:
+            self.journal.checkpoint(self._job, pass_index, offset)
+        except OSError as e:
+            self.log_message.emit(f"Warning: could not write wipe checkpoint: {str(e)}")
+    
+    def _interrupt_job(self, job):
+        """Keep an unfinished job in the journal so it can be resumed later."""
+        if job is None:
+            return
+        try:
+            self.journal.interrupt(job)
+            self.log_message.emit(
+                f"Progress saved at pass {job.pass_index + 1}/{job.pass_count}; the wipe can be resumed"
+            )
+        except OSError as e:
+            self.log_message.emit(f"Warning: could not save wipe progress: {str(e)}")
+    
+    def _on_engine_progress(self, update):
+        """Forward a wipe engine progress snapshot to the UI."""
+        self._publish_progress(ProgressEvent.from_pass_progress(self.device, update))
+    
+    def _publish_progress(self, event):
+        """Hand a progress event to the bus, or signal it directly when there is none.
+        
+        With a bus the UI drains coalesced events on its own timer, so the
+        number of cross-thread updates does not grow with the report rate.
+        """
+        if self.progress_bus is not None:
+            self.progress_bus.publish(event)
+            return
+        self.progress.emit(int(event.overall_percent), event.describe())
+        if event.phase == 'wipe':
+            self.throughput_updated.emit(event.rate)
+    
     def _unmount_partitions(self, device):
         """Unmount all partitions of the given device."""
         try:
@@ -2428,54 +2446,6 @@ class WipeWorker(QThread):
             self.log_message.emit(f"Error unmounting partitions: {str(e)}")
             return False
 
-    def _parse_dd_progress(self, line, total_bytes):
-        """Parse dd progress output and return (bytes_written, speed, percent)"""
-        try:
-            # Example: '1234567890 bytes (1.2 GB, 1.1 GiB) copied, 23 s, 53.6 MB/s'
-            if "bytes" in line and "copied" in line:
-                parts = line.split()
-                if len(parts) >= 8:
-                    # Get bytes written
-                    bytes_written = int(parts[0])
-                    
-                    # Get speed
-                    speed = parts[-2] + " " + parts[-1]  # e.g., "100 MB/s"
-                    
-                    # Calculate percent if we have total_bytes
-                    percent = 0
-                    if total_bytes and total_bytes > 0:
-                        percent = min(100, int((bytes_written / total_bytes) * 100))
-                        
-                        # Update speed calculation
-                        current_time = time.time()
-                        if hasattr(self, 'last_update') and hasattr(self, 'last_bytes'):
-                            time_elapsed = current_time - self.last_update
-                            bytes_elapsed = bytes_written - self.last_bytes
-                            if time_elapsed > 0 and bytes_elapsed > 0:
-                                speed_mb = (bytes_elapsed / (1024 * 1024)) / time_elapsed
-                                speed = f"{speed_mb:.1f} MB/s"
-                            self.last_update = current_time
-                            self.last_bytes = bytes_written
-                    
-                    # Update progress card if it exists
-                    if hasattr(self, 'progress_bar') and hasattr(self, 'progress_text') and total_bytes:
-                        self.progress_bar.setValue(percent)
-                        
-                        # Format each value with its most appropriate unit
-                        written_val, written_unit = format_size(bytes_written)
-                        total_val, total_unit = format_size(total_bytes)
-                        
-                        self.progress_text.setText(
-                            f"{written_val:.1f} {written_unit} / {total_val:.1f} {total_unit} "
-                            f"({percent}%) @ {speed}"
-                        )
-                    
-                    return bytes_written, speed, percent
-        except Exception as e:
-            self.log_message.emit(f"Progress parse error: {str(e)}")
-        
-        return None, None, None
-
     def _create_progress_card(self, total_mb):
         """Create a progress card UI element"""
         from PySide6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar
@@ -2555,7 +2525,8 @@ class WipeWorker(QThread):
             return False
             
         # Wipe the partition table
-        if not self._run_command(f"sudo wipefs -a {self.device}", "Failed to wipe partition table", fail_on_error=False):
+        # A resumed job already overwrote the partition table
+        if self.resume_job is None and not self._run_command(f"sudo wipefs -a {self.device}", "Failed to wipe partition table", fail_on_error=False):
             self.log_message.emit("Warning: Failed to wipe partition table, continuing with zero-fill...")
         
         # Get device size for progress reporting
@@ -2594,94 +2565,30 @@ class WipeWorker(QThread):
         self.log_message.emit("Starting secure zero-fill operation (this may take a while)...")
         
         # First, try to use blkdiscard to optimize the process if available
-        if 'nvme' in self.device or 'sd' in self.device:
+        # Discarding would throw away the passes a resumed job already wrote
+        if self.resume_job is None and ('nvme' in self.device or 'sd' in self.device):
             self.log_message.emit("Attempting to optimize with discard...")
             cmd = f"sudo blkdiscard -f {self.device}"
             self._run_command(cmd, "blkdiscard warning", fail_on_error=False)
             
-        # Initialize progress tracking
-        self.last_update = time.time()
-        self.last_bytes = 0
-        
-        # Use a block size of 1M for better performance
-        block_size = "1M"
-        
-        # Build the dd command
-        dd_cmd = f"sudo dd if=/dev/zero of={self.device} bs={block_size} status=progress"
-        if self.quick_erase:
-            dd_cmd += " conv=noerror"
-        
-        # Start the process
-        process = subprocess.Popen(
-            dd_cmd,
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
-        
-        # Initialize progress tracking
-        last_update = time.time()
-        last_bytes = 0
-        
-        # Stream and parse output in real-time
-        while True:
-            if not self._is_running:
-                process.terminate()
-                return False
-                
-            line = process.stdout.readline()
-            if line == '' and process.poll() is not None:
-                break
-                
-            if line:
-                # Parse the progress
-                bytes_written, speed, percent = self._parse_dd_progress(line, total_bytes)
-                
-                # Update progress if we have valid data
-                if bytes_written is not None and speed is not None and percent is not None:
-                    # Calculate current speed
-                    current_time = time.time()
-                    if last_bytes > 0 and current_time > last_update:
-                        bytes_sec = (bytes_written - last_bytes) / (current_time - last_update)
-                        speed = f"{bytes_sec/1024/1024:.1f} MB/s"
-                    last_bytes = bytes_written
-                    last_update = current_time
-                    
-                    # Emit progress update with formatted sizes
-                    if total_bytes:
-                        written_val, written_unit = format_size(bytes_written)
-                        total_val, total_unit = format_size(total_bytes)
-                        status = f"{written_val:.1f} {written_unit} / {total_val:.1f} {total_unit} ({percent}%) @ {speed}"
-                    else:
-                        written_val, written_unit = format_size(bytes_written)
-                        status = f"{written_val:.1f} {written_unit} @ {speed}"
-                    
-                    # Update progress bar and status
-                    self.progress.emit(percent, status)
-        
-        result = (process.returncode == 0)
-        
-        # Ensure all data is written to disk
-        if result:
-            self.log_message.emit("Finalizing write operations...")
-            sync_cmd = "sudo sync"
-            self._run_command(sync_cmd, "Sync failed", fail_on_error=False)
-            self.log_message.emit("Zero-fill completed successfully.")
+        if not self._run_engine_passes([WipePass.zeros("Zero-fill")]):
+            return False
         
-        return result
+        self.log_message.emit("Zero-fill completed successfully.")
+        return True
     
     def _gutmann_wipe(self):
         """Perform Gutmann 35-pass secure wipe with unified progress tracking."""
+        # Gutmann's 35 patterns followed by a final zero pass (as shred -z did)
+        passes = gutmann_passes(final_zero=True)
         try:
             # First, unmount all partitions on the device
             if not self._unmount_partitions(self.device):
                 self.log_message.emit("Warning: Could not unmount all partitions. Continuing anyway...")
             
             # Wipe the partition table
-            if not self._run_command(f"sudo wipefs -a {self.device}", "Failed to wipe partition table", fail_on_error=False):
+            # A resumed job already overwrote the partition table
+            if self.resume_job is None and not self._run_command(f"sudo wipefs -a {self.device}", "Failed to wipe partition table", fail_on_error=False):
                 self.log_message.emit("Warning: Failed to wipe partition table, continuing with Gutmann wipe...")
             
             # Get device size for progress reporting
@@ -2704,13 +2611,13 @@ class WipeWorker(QThread):
                 total_mb = total_bytes // (1024 * 1024)  # Keep MB for progress card
                 self.log_message.emit(f"Device size: {total_val:.1f} {total_unit}")
                 
-                # Create and show progress card (35x size for 35 passes)
-                progress_card = self._create_progress_card(total_mb * 35)
+                # Create and show progress card (one device size per pass)
+                progress_card = self._create_progress_card(total_mb * len(passes))
                 self.progress_card_shown.emit(progress_card)
                 
                 # Store progress tracking variables
                 self._total_mb = total_mb
-                self._total_passes = 35
+                self._total_passes = len(passes)
                 
             except Exception as e:
                 error_msg = f"Error getting device size: {str(e)}"
@@ -2718,139 +2625,21 @@ class WipeWorker(QThread):
                 return False
             
             # Try to use blkdiscard to optimize the process if available
-            if 'nvme' in self.device or 'sd' in self.device:
+            # Discarding would throw away the passes a resumed job already wrote
+            if self.resume_job is None and ('nvme' in self.device or 'sd' in self.device):
                 self.log_message.emit("Attempting to optimize with discard...")
                 cmd = f"sudo blkdiscard -f {self.device}"
                 self._run_command(cmd, "blkdiscard warning", fail_on_error=False)
             
-            # Initialize progress tracking
-            self.last_update = time.time()
-            self.last_bytes = 0
-            self.start_time = time.time()
-            
-            # Build the shred command with verbose output
-            shred_cmd = ["sudo", "shred", "-n", "35", "-v", "-z"]
-            if self.quick_erase:
-                shred_cmd.append("-f")
-            shred_cmd.append(self.device)
-            
-            # Start the shred process
-            process = subprocess.Popen(
-                shred_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-            
-            # Initialize progress tracking
-            current_pass = 0
-            last_line = ""
-            
-            # Parse shred's verbose output
-            while True:
-                if not self._is_running:
-                    process.terminate()
-                    return False
-                    
-                line = process.stdout.readline()
-                if line == '' and process.poll() is not None:
-                    break
-                    
-                if line:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # Check for pass completion
-                    if "pass " in line.lower() and "/" in line:
-                        try:
-                            # Extract current pass from line like "shred: /dev/sdX: pass 1/35 (random)..."
-                            parts = line.split()
-                            for i, part in enumerate(parts):
-                                if part == "pass" and i + 1 < len(parts):
-                                    pass_info = parts[i + 1]
-                                    current_pass = int(pass_info.split('/')[0])
-                                    self.log_message.emit(f"Starting pass {current_pass}/{self._total_passes}")
-                                    break
-                        except (ValueError, IndexError) as e:
-                            self.log_message.emit(f"Error parsing pass info: {e}")
-                            continue
-                    
-                    # Look for progress percentage in the output
-                    elif "%" in line and "shred" in line.lower():
-                        try:
-                            # Extract percentage from line like "shred: /dev/sdX: 25%"
-                            percent_str = line.split("shred: ")[-1].split("%")[0].strip()
-                            current_percent = float(percent_str)
-                            
-                            # Calculate overall progress (0-100% across all passes)
-                            overall_percent = ((current_pass - 1) / self._total_passes * 100) + (current_percent / self._total_passes)
-                            
-                            # Calculate speed and format values
-                            current_time = time.time()
-                            if hasattr(self, '_last_update') and hasattr(self, '_last_bytes'):
-                                if current_time > self._last_update:
-                                    bytes_written = (current_percent / 100) * self._total_bytes
-                                    bytes_sec = (bytes_written - self._last_bytes) / (current_time - self._last_update)
-                                    speed = f"{bytes_sec/1024/1024:.1f} MB/s"
-                                    
-                                    # Format status with pass info in the exact format: Pass X/35 1.5 KB / 244.0 GB (0.0%) @ 120.5 MB/s
-                                    written_val, written_unit = format_size(bytes_written)
-                                    total_val, total_unit = format_size(self._total_bytes)
-                                    status = (f"Pass {current_pass}/{self._total_passes} {written_val:.1f} {written_unit} / "
-                                            f"{total_val:.1f} {total_unit} ({current_percent:.1f}%) @ {speed}")
-                                    
-                                    # For the status bar, show a simpler message
-                                    status_bar_msg = f"Wiping {os.path.basename(self.device)} - Pass {current_pass}/{self._total_passes} ({current_percent:.1f}%)"
-                                    
-                                    # Emit progress update for the main UI
-                                    # This will update the status bar and progress bar
-                                    self.progress.emit(int(overall_percent), status_bar_msg)
-                                    
-                                    # Emit a signal to update the progress card text
-                                    # Use the exact format we want: "Pass X/35 1.5 KB / 244.0 GB (0.0%) @ 120.5 MB/s"
-                                    if hasattr(self, 'progress_text'):
-                                        self.progress_text.setText(status)
-                                    
-                                    # Also log the detailed status
-                                    self.log_message.emit(f"Progress: {status}")
-                                    
-                                    # Force UI update
-                                    from PySide6.QtCore import QCoreApplication
-                                    QCoreApplication.processEvents()
-                                
-                                # Update tracking variables
-                                self._last_bytes = bytes_written
-                                self._last_update = current_time
-                            else:
-                                # First update, just initialize tracking variables
-                                self._last_bytes = (current_percent / 100) * self._total_bytes
-                                self._last_update = current_time
-                            
-                        except (ValueError, IndexError) as e:
-                            self.log_message.emit(f"Error parsing progress: {e}")
-                            continue
-                    
-                    # Log other output lines
-                    if line != last_line and not line.startswith("shred: "):
-                        self.log_message.emit(line)
-                        last_line = line
-            
-            # Check if the process completed successfully
-            if process.returncode != 0:
-                self.log_message.emit(f"Gutmann wipe failed with code {process.returncode}")
+            if not self._run_engine_passes(passes):
+                self.log_message.emit("Gutmann wipe failed or was stopped")
                 return False
             
-            # Final sync
-            self.log_message.emit("Finalizing Gutmann wipe...")
-            sync_cmd = "sudo sync"
-            self._run_command(sync_cmd, "Sync failed", fail_on_error=False)
-            
             # Final progress update
             self.progress.emit(100, f"Gutmann wipe completed - {self._total_mb * self._total_passes:.1f} MB processed")
-            self.log_message.emit("Gutmann 35-pass wipe completed successfully.")
+            self.log_message.emit(
+                f"Gutmann wipe completed successfully ({len(passes)} passes: 35 patterns and a final zero pass)."
+            )
             return True
             
         except Exception as e:
@@ -2860,28 +2649,23 @@ class WipeWorker(QThread):
             return False
     
     def _get_device_hash(self, sample_size_mb=4):
-        """Calculate a hash of the first few MB of the device."""
+        """Calculate a hash of the first few MB of the device, read in-process."""
         try:
             self.log_message.emit(f"Calculating hash of first {sample_size_mb}MB...")
-            cmd = f"sudo dd if={self.device} bs=1M count={sample_size_mb} status=none | sha256sum"
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            if result.returncode == 0:
-                device_hash = result.stdout.split()[0]
-                self.log_message.emit(f"Device hash: {device_hash}")
-                return device_hash
-            else:
-                self.log_message.emit(f"Failed to calculate device hash: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            self.log_message.emit("Hash calculation timed out")
+            hasher = hashlib.sha256()
+            remaining = sample_size_mb * 1024 * 1024
+            with open(self.device, 'rb', buffering=0) as f:
+                while remaining:
+                    chunk = f.read(min(remaining, 1024 * 1024))
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    remaining -= len(chunk)
+            device_hash = hasher.hexdigest()
+            self.log_message.emit(f"Device hash: {device_hash}")
+            return device_hash
+        except OSError as e:
+            self.log_message.emit(f"Failed to calculate device hash: {str(e)}")
             return None
         except Exception as e:
             self.log_message.emit(f"Error calculating device hash: {str(e)}")
@@ -3176,10 +2960,13 @@ class WipeWorker(QThread):
 
     def _verify_wipe(self):
         """
-        Verify that the device has been properly wiped by checking for non-zero data.
+        Verify that the device holds exactly what the final wipe pass wrote.
+        
+        The surface (or an evenly spread fraction of it in 'basic' mode) is read
+        sequentially and compared against the expected zeros, pattern or keystream.
         
         Returns:
-            bool: True if verification passed, False if non-zero data is found or on error
+            bool: True if verification passed, False if residual data is found or on error
         """
         self.log_message.emit("Starting verification of wiped device...")
         
@@ -3211,89 +2998,191 @@ class WipeWorker(QThread):
                 if sanitize_status.returncode == 0:
                     self.log_message.emit(f"Sanitize status: {sanitize_status.stdout.strip()}")
         
-        # For all device types, check for non-zero data
-        self.log_message.emit("Scanning for residual data (this may take a while)...")
-        
-        # Method 1: Check first 1MB for any non-zero data (faster)
-        hexdump_cmd = 'hexdump -e ' + "'" + '"%08.8_ax: " 16/1 "%02x" "\n"' + "'"
-        cmd = f"sudo dd if={self.device} bs=1M count=1 status=none | {hexdump_cmd} | grep -v '00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00'"
+        # For all device types, stream the surface and compare it with the final pass
+        expected = self._final_pass or WipePass.zeros()
+        fraction = 1.0 if self.advanced_settings['verification_mode'] == 'full' else self.advanced_settings['verify_fraction']
+        self.log_message.emit(
+            f"Verifying {fraction * 100:.0f}% of the surface against: {expected.label or expected.kind}"
+        )
         
         try:
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
-            
-            if result.returncode == 0:  # grep found non-zero data
-                # Get some context around the non-zero data for the log
-                context_cmd = f"sudo dd if={self.device} bs=1M count=1 status=none | hexdump -C | head -20"
-                context = subprocess.run(
-                    context_cmd,
-                    shell=True,
-                    capture_output=True,
-                    text=True
+            if self._final_digest is not None:
+                # Read each extent once and check it against the digest recorded while writing
+                self.log_message.emit(
+                    f"Checking extents against final pass root {self._final_digest.root[:16]}..."
                 )
-                
-                self.log_message.emit("=== VERIFICATION FAILED ===")
-                self.log_message.emit("Non-zero data detected in the first 1MB of the device:")
-                if context.returncode == 0:
-                    self.log_message.emit(context.stdout)
-                else:
-                    self.log_message.emit("Could not get data context")
-                return False
-                
-            # If we get here, first 1MB is all zeros
-            self.log_message.emit("First 1MB verification passed (all zeros)")
-            
-            # Method 2: Sample random blocks throughout the device (more thorough)
-            device_size = int(subprocess.check_output(f"blockdev --getsize64 {self.device}", shell=True).decode().strip())
-            sample_points = min(100, device_size // (1024*1024))  # Sample up to 100 points, 1 per MB
-            
-            if sample_points > 0:
-                self.log_message.emit(f"Sampling {sample_points} random locations for verification...")
-                
-                for i in range(sample_points):
-                    if not self._is_running:
-                        return False
-                        
-                    # Sample a random block
-                    offset = random.randint(0, device_size - 4096)  # 4K block
-                    hexdump_cmd = 'hexdump -e ' + "'" + '"%08.8_ax: " 16/1 "%02x" "\n"' + "'"
-                    cmd = f"sudo dd if={self.device} bs=4096 skip={offset//4096} count=1 status=none | {hexdump_cmd} | grep -v '00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00'"
-                    
-                    result = subprocess.run(
-                        cmd,
-                        shell=True,
-                        capture_output=True,
-                        text=True,
-                        timeout=30
-                    )
-                    
-                    if result.returncode == 0:  # Found non-zero data
-                        self.log_message.emit(f"=== VERIFICATION FAILED ===")
-                        self.log_message.emit(f"Non-zero data detected at offset {offset}")
-                        return False
-                        
-                    # Update progress
-                    if i % 10 == 0 or i == sample_points - 1:
-                        self.progress.emit(int((i + 1) * 100 / sample_points), 
-                                         f"Verifying: {i+1}/{sample_points} samples checked")
-            
-            self.log_message.emit("=== VERIFICATION PASSED ===")
-            self.log_message.emit("No residual data detected in sampled locations")
-            return True
-            
-        except subprocess.TimeoutExpired:
-            self.log_message.emit("Verification timed out")
-            return False
-        except Exception as e:
+                self._verifier = ExtentHashVerifier(
+                    self.device,
+                    self._final_digest,
+                    fraction=fraction,
+                    threads=self.advanced_settings['verify_threads'],
+                    direct_io=self.advanced_settings['direct_io'],
+                )
+            else:
+                self._verifier = WipeVerifier(
+                    self.device,
+                    expected,
+                    keystream=self._final_keystream,
+                    fraction=fraction,
+                    direct_io=self.advanced_settings['direct_io'],
+                )
+            result = self._verifier.run(progress_callback=self._on_verify_progress)
+        except (OSError, ValueError) as e:
             self.log_message.emit(f"Verification error: {str(e)}")
             return False
+        finally:
+            self._verifier = None
+        
+        self._save_coverage_map(result)
+        
+        if not result.completed:
+            self.log_message.emit("Verification stopped before completion")
+            return False
+        
+        checked_val, checked_unit = format_size(result.bytes_checked)
+        rate = result.bytes_checked / result.duration if result.duration > 0 else 0.0
+        self.log_message.emit(
+            f"Checked {checked_val:.1f} {checked_unit} ({result.coverage * 100:.1f}% coverage) "
+            f"in {result.duration:.1f}s @ {rate / 1024 / 1024:.1f} MB/s"
+        )
+        
+        if result.passed:
+            self.log_message.emit("=== VERIFICATION PASSED ===")
+            self.log_message.emit("No residual data detected in verified extents")
+            return True
+        
+        self.log_message.emit("=== VERIFICATION FAILED ===")
+        if result.read_errors:
+            self.log_message.emit(f"{len(result.read_errors)} extent(s) could not be read")
+        if result.bad_extents:
+            bad_val, bad_unit = format_size(result.mismatched_bytes)
+            self.log_message.emit(
+                f"{len(result.bad_extents)} non-conforming extent(s), {bad_val:.1f} {bad_unit} in total"
+            )
+            for start, end in result.bad_extents[:10]:
+                self.log_message.emit(f"  offset {start}-{end}")
+        return False
+    
+    def _on_verify_progress(self, update):
+        """Forward a verification progress snapshot to the UI."""
+        self._publish_progress(ProgressEvent.from_verify_progress(self.device, update))
+    
+    def _save_coverage_map(self, result):
+        """Write the verification coverage map next to the tamper log."""
+        path = os.path.join(
+            os.path.dirname(self.log_file),
+            f"verify_{os.path.basename(self.device)}_{int(time.time())}.json"
+        )
+        try:
+            with open(path, 'w') as f:
+                json.dump(result.coverage_map(), f, indent=2)
+            self.log_message.emit(f"Coverage map saved to {path}")
+        except OSError as e:
+            self.log_message.emit(f"Warning: Could not save coverage map: {str(e)}")
     
     def stop(self):
         """Stop the wipe operation."""
         self._is_running = False
+        if self._engine is not None:
+            self._engine.stop()
+        if self._verifier is not None:
+            self._verifier.stop()
         self.log_message.emit("Stopping wipe operation...")
+
+
+class ConcurrentWipeRunner(QObject):
+    """Run several WipeWorker jobs at once, scheduled per shared bus.
+    
+    Workers publish progress to a shared :class:`ProgressBus`; the runner
+    drains it every ``ui_interval_ms`` and emits one ``progress_batch`` with
+    the newest event per job, so UI cost stays flat as jobs are added.
+    """
+    job_started = Signal(str, object)   # device, worker
+    job_finished = Signal(str, bool, str)  # device, success, message
+    progress_batch = Signal(list)  # newest ProgressEvent per job since the last batch
+    throughput_changed = Signal(float, int)  # aggregate bytes/sec, running jobs
+    all_finished = Signal(bool, str)  # overall success, summary message
+    
+    def __init__(self, devices, worker_factory, max_jobs=4, bus_limits=None,
+                 timeline_dir=DEFAULT_TIMELINE_DIR, ui_interval_ms=250):
+        super().__init__()
+        self.scheduler = WipeScheduler(devices, max_jobs=max_jobs, bus_limits=bus_limits)
+        self.worker_factory = worker_factory
+        self.workers = {}
+        self.progress_bus = ProgressBus(timeline_dir)
+        self._ui_timer = QTimer(self)
+        self._ui_timer.setInterval(ui_interval_ms)
+        self._ui_timer.timeout.connect(self._flush_progress)
+        self._stopping = False
+    
+    def bus_groups(self):
+        """Return bus key -> devices for the queued run."""
+        return self.scheduler.bus_groups()
+    
+    def start(self):
+        """Start as many jobs as the scheduler allows."""
+        self._ui_timer.start()
+        self._launch_ready()
+    
+    def stop(self):
+        """Cancel queued devices and stop every running job."""
+        self._stopping = True
+        for device in self.scheduler.cancel_pending():
+            self.scheduler.finish(device, False, "Cancelled")
+            self.job_finished.emit(device, False, "Cancelled")
+        for worker in list(self.workers.values()):
+            worker.stop()
+        self._check_done()
+    
+    def is_running(self):
+        return not self.scheduler.done
+    
+    def _launch_ready(self):
+        for device in self.scheduler.next_ready():
+            worker = self.worker_factory(device)
+            worker.progress_bus = self.progress_bus
+            self.workers[device] = worker
+            # Bound slots (not lambdas) so the calls are queued onto this thread
+            worker.finished.connect(self._on_worker_finished)
+            self.job_started.emit(device, worker)
+            worker.start()
+    
+    def _flush_progress(self):
+        """Deliver the newest progress of every job that reported since the last tick."""
+        events = self.progress_bus.drain()
+        if not events:
+            return
+        for event in events:
+            if event.phase == 'wipe':
+                self.scheduler.update_rate(event.job, event.rate)
+        self.progress_batch.emit(events)
+        self.throughput_changed.emit(self.scheduler.aggregate_rate, len(self.scheduler.running))
+    
+    def _on_worker_finished(self, success, message):
+        device = self.sender().device
+        if device not in self.workers:
+            # Some wipe paths emit finished more than once; only the first counts
+            return
+        self._flush_progress()
+        self.progress_bus.close_job(device)
+        worker = self.workers.pop(device)
+        worker.wait()
+        worker.deleteLater()
+        self.scheduler.finish(device, success, message)
+        self.job_finished.emit(device, success, message)
+        self.throughput_changed.emit(self.scheduler.aggregate_rate, len(self.scheduler.running))
+        if not self._stopping:
+            self._launch_ready()
+        self._check_done()
+    
+    def _check_done(self):
+        if not self.scheduler.done:
+            return
+        self._ui_timer.stop()
+        self.progress_bus.close()
+        failed = [device for device, (success, _) in self.scheduler.results.items() if not success]
+        total = len(self.scheduler.results)
+        if failed:
+            self.all_finished.emit(False, f"{len(failed)}/{total} wipes failed: {', '.join(failed)}")
+        else:
+            self.all_finished.emit(True, f"All {total} devices wiped successfully")
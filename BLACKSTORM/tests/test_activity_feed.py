@@ -0,0 +1,38 @@
+import os
+
+from BLACKSTORM.core.activity_feed import ActivityEvent, ActivityStore, LogTailer, parse_app_line
+
+
+def test_tailer_reads_only_appended_lines(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("".join(f"old line {i}\n" for i in range(1000)))
+    tailer = LogTailer(str(log), backfill_bytes=64)
+
+    backlog = tailer.read_lines()
+    assert backlog and backlog[-1] == "old line 999" and len(backlog) < 10
+    assert tailer.read_lines() == []
+
+    with open(log, "a") as f:
+        f.write("new 1\nnew")
+    assert tailer.read_lines() == ["new 1"]
+    with open(log, "a") as f:
+        f.write(" 2\n")
+    assert tailer.read_lines() == ["new 2"]
+
+    log.write_text("after truncate\n")
+    assert tailer.read_lines() == ["after truncate"]
+
+    os.rename(log, tmp_path / "app.log.1")
+    log.write_text("rotated\n")
+    assert tailer.read_lines() == ["rotated"]
+
+
+def test_store_evicts_oldest_and_queries_by_category():
+    store = ActivityStore(maxlen=4)
+    store.add([ActivityEvent("Error" if i % 2 else "Info", str(i), "", "app") for i in range(6)])
+
+    assert [e.message for e in store.query()] == ["5", "4", "3", "2"]
+    assert [e.message for e in store.query(["Error"])] == ["5", "3"]
+    assert [e.message for e in store.query(["Info", "Error"], limit=3)] == ["5", "4", "3"]
+    assert store.counts() == {"Error": 2, "Info": 2}
+    assert parse_app_line("[2024-01-01 10:00] [ERROR] disk gone").category == "Error"
@@ -0,0 +1,49 @@
+from BLACKSTORM.core.device_inventory import DeviceInventory, parse_uevent
+
+
+def _disk(sys_block, name, sectors, partitions=(), model="Disk"):
+    base = sys_block / name
+    (base / "device").mkdir(parents=True)
+    (base / "queue").mkdir()
+    (base / "size").write_text(f"{sectors}\n")
+    (base / "removable").write_text("0\n")
+    (base / "queue" / "rotational").write_text("1\n")
+    (base / "device" / "model").write_text(f"{model}\n")
+    for number, part in enumerate(partitions, 1):
+        (base / part).mkdir()
+        (base / part / "size").write_text(f"{sectors // 2}\n")
+        (base / part / "partition").write_text(f"{number}\n")
+
+
+def test_inventory_scans_sysfs_and_reports_diffs(tmp_path):
+    sys_block = tmp_path / "block"
+    mounts = tmp_path / "mounts"
+    _disk(sys_block, "sda", 4194304, ["sda1"])
+    _disk(sys_block, "loop0", 2048)
+    mounts.write_text("/dev/sda1 /mnt/evidence\\040A ext4 rw 0 0\nproc /proc proc rw 0 0\n")
+    inventory = DeviceInventory(str(sys_block), str(mounts))
+    changes = []
+    inventory._subscribers.append(changes.append)
+
+    [sda] = inventory.devices()
+    assert sda["device"] == "/dev/sda" and sda["size_gb"] == 2.0 and sda["rotational"]
+    assert sda["partitions"][0]["mountpoint"] == "/mnt/evidence A"
+    assert inventory.disk_for("/dev/sda1") is sda and inventory.disk_for("/dev/sdz") is None
+
+    _disk(sys_block, "sdb", 2097152, model="Bay 7")
+    inventory.refresh(["sdb"])
+    mounts.write_text("")
+    inventory.refresh()
+    assert not inventory.refresh()
+
+    added, unmounted = changes
+    assert [info["model"] for info in added.added] == ["Bay 7"]
+    assert [info["device"] for info in unmounted.changed] == ["/dev/sda"]
+    assert len(unmounted.devices) == 2 and inventory.scans == 4
+
+
+def test_parse_uevent_reads_kernel_messages_only():
+    message = b"add@/devices/pci0000:00/ata1/host0/block/sdc\0ACTION=add\0SUBSYSTEM=block\0DEVNAME=sdc\0DEVTYPE=disk\0"
+    event = parse_uevent(message)
+    assert event["ACTION"] == "add" and event["DEVNAME"] == "sdc"
+    assert parse_uevent(b"libudev\0\xfe\xed") is None
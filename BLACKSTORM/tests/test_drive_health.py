@@ -0,0 +1,76 @@
+import threading
+
+from BLACKSTORM.core.drive_health import DriveHealthService, parse_smart_json
+
+
+def _ata(serial, reallocated=0, passed=True):
+    return {
+        "smartctl": {"exit_status": 0},
+        "model_name": "Bay Disk",
+        "serial_number": serial,
+        "smart_support": {"available": True, "enabled": True},
+        "smart_status": {"passed": passed},
+        "temperature": {"current": 34},
+        "ata_smart_attributes": {"table": [
+            {"id": 5, "name": "Reallocated_Sector_Ct", "raw": {"value": reallocated}, "when_failed": ""},
+            {"id": 9, "name": "Power_On_Hours", "raw": {"value": 1200}, "when_failed": ""},
+        ]},
+    }
+
+
+def test_parse_smart_json_ata_nvme_and_missing_device():
+    report = parse_smart_json(_ata("S1"), "/dev/sda")
+    assert report.status == "Good" and report.smart_capable and report.temperature == 34
+    assert report.attributes["Power_On_Hours"] == 1200 and report.watched == {"Reallocated_Sector_Ct": 0}
+
+    assert parse_smart_json(_ata("S1", passed=False), "/dev/sda").status == "Failed"
+
+    nvme = parse_smart_json({
+        "smartctl": {"exit_status": 0},
+        "smart_status": {"passed": True},
+        "nvme_smart_health_information_log": {
+            "critical_warning": 0, "available_spare": 3, "available_spare_threshold": 10, "media_errors": 0,
+        },
+    }, "/dev/nvme0n1")
+    assert nvme.status == "Warning" and nvme.smart_capable and nvme.attributes["media_errors"] == 0
+
+    missing = parse_smart_json({"smartctl": {"exit_status": 2, "messages": [
+        {"string": "Smartctl open device: /dev/sdz failed", "severity": "error"}]}}, "/dev/sdz")
+    assert missing.status == "Unknown" and not missing.smart_capable and missing.issues
+
+
+def test_service_caches_by_serial_and_tracks_growth():
+    drives = {"/dev/sda": _ata("S1"), "/dev/sdb": _ata("S2")}
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def probe(device):
+        with lock:
+            running.append(device)
+            peak.append(len(running))
+        try:
+            return parse_smart_json(drives[device], device)
+        finally:
+            with lock:
+                running.remove(device)
+
+    service = DriveHealthService(max_workers=2, probe=probe)
+    futures = service.request_all([{"device": "/dev/sda", "serial": "S1"}, {"device": "/dev/sdb", "serial": ""}])
+    assert {path: f.result(5).status for path, f in futures.items()} == {"/dev/sda": "Good", "/dev/sdb": "Good"}
+    assert max(peak) <= 2
+
+    # Fresh reports are served from the cache, including by the serial smartctl reported
+    assert service.get("/dev/sda", "S1").serial == "S1" and service.get("/dev/sdb").serial == "S2"
+    assert service.probes == 2
+
+    # A different drive in the same slot is probed rather than served stale
+    drives["/dev/sda"] = _ata("S9")
+    assert service.cached("/dev/sda", "S9") is None
+    assert service.get("/dev/sda", "S9").serial == "S9" and service.probes == 3
+
+    drives["/dev/sdb"] = _ata("S2", reallocated=8)
+    grown = service.request("/dev/sdb", force=True).result(5)
+    assert grown.status == "Warning" and grown.growth == {"Reallocated_Sector_Ct": 8}
+    assert [values["Reallocated_Sector_Ct"] for _, values in service.history("/dev/sdb")] == [0, 8]
+    service.shutdown()
@@ -0,0 +1,86 @@
+import hashlib
+import os
+
+import pytest
+
+from BLACKSTORM.core.image_container import ImageReader, ImageWriter, image_device, index_path_for
+
+KIB = 1024
+
+
+def _sample(size):
+    # Mix of compressible and incompressible regions
+    return (b"evidence" * (size // 16) + os.urandom(size))[:size]
+
+
+def test_image_round_trip_with_random_access(tmp_path):
+    source = tmp_path / "disk.raw"
+    data = _sample(300 * KIB + 123)
+    source.write_bytes(data)
+
+    summary = image_device(str(source), str(tmp_path / "case" / "disk"), read_size=50 * KIB,
+                           chunk_size=64 * KIB, segment_size=128 * KIB, workers=3,
+                           hash_algorithms=["md5", "sha256"])
+
+    assert summary.chunk_count == 5
+    assert len(summary.segments) > 1
+    assert summary.hashes["sha256"] == hashlib.sha256(data).hexdigest()
+    with ImageReader(summary.index_path) as reader:
+        assert reader.size == len(data)
+        assert reader.pread(100 * KIB, 60 * KIB) == data[60 * KIB:160 * KIB]
+        assert reader.pread(KIB, len(data) - 10) == data[-10:]
+        with reader.open() as image:
+            image.seek(200 * KIB)
+            assert image.read(KIB) == data[200 * KIB:201 * KIB]
+            image.seek(0)
+            assert image.read() == data
+        assert reader.verify(workers=2) == []
+
+
+def test_sparse_image_stores_zero_chunks_as_holes(tmp_path):
+    source = tmp_path / "sparse.raw"
+    payload = os.urandom(40 * KIB)
+    with open(source, "wb") as f:
+        f.write(payload)
+        f.seek(1024 * KIB)  # leaves a hole the imager does not read
+        f.write(payload)
+        f.write(bytes(10 * KIB))
+    data = source.read_bytes()
+
+    summary = image_device(str(source), str(tmp_path / "img"), chunk_size=64 * KIB,
+                           hash_algorithms=["sha256"])
+
+    assert summary.sparse_bytes >= 900 * KIB
+    assert summary.stored_bytes < 2 * len(payload) + 8 * KIB
+    assert summary.hashes["sha256"] == hashlib.sha256(data).hexdigest()
+    with ImageReader(summary.index_path) as reader:
+        assert reader.pread(len(data), 0) == data
+        assert reader.verify() == []
+
+
+def test_verify_reports_corrupted_chunk(tmp_path):
+    writer = ImageWriter(str(tmp_path / "img"), chunk_size=32 * KIB, codec="lzma", level=1,
+                         sparse=False)
+    writer.write(b"\x00" * (96 * KIB))
+    summary = writer.close()
+
+    with ImageReader(summary.index_path) as reader:
+        entry = reader.entries[1]
+    segment = tmp_path / summary.segments[entry.segment]
+    with open(segment, "r+b") as f:
+        f.seek(entry.offset + entry.length // 2)
+        f.write(b"\xff\xff")
+
+    with ImageReader(summary.index_path) as reader:
+        assert reader.verify() == [1]
+
+
+def test_short_source_is_not_a_finished_image(tmp_path):
+    source = tmp_path / "disk.raw"
+    source.write_bytes(_sample(100 * KIB))
+
+    with pytest.raises(EOFError):
+        image_device(str(source), str(tmp_path / "img"), total_bytes=200 * KIB,
+                     chunk_size=64 * KIB, sparse=False)
+
+    assert not os.path.exists(index_path_for(str(tmp_path / "img")))
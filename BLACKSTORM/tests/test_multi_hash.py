@@ -0,0 +1,35 @@
+import hashlib
+
+import pytest
+
+from BLACKSTORM.core.multi_hash import HashCancelled, MultiHasher, hash_file, hash_files
+
+MIB = 1024 * 1024
+
+
+def test_single_read_matches_hashlib(tmp_path):
+    data = bytes(range(256)) * (3 * MIB // 256) + b"tail"
+    image = tmp_path / "image.dd"
+    image.write_bytes(data)
+    progress = []
+
+    hashes = hash_file(str(image), ["md5", "sha1", "SHA256", "md5"], chunk_size=MIB,
+                       progress_callback=lambda done, total: progress.append((done, total)))
+
+    assert hashes == {name: hashlib.new(name, data).hexdigest() for name in ("md5", "sha1", "sha256")}
+    assert progress[-1] == (len(data), len(data))
+    with MultiHasher(["sha256"]) as hasher:
+        hasher.update(data)
+    assert hasher.hexdigests()["sha256"] == hashes["sha256"]
+
+
+def test_hash_files_compares_source_and_image(tmp_path):
+    source, image = tmp_path / "source", tmp_path / "image"
+    source.write_bytes(b"\x00" * (2 * MIB))
+    image.write_bytes(b"\x00" * (2 * MIB - 1) + b"\x01")
+
+    src, dst = hash_files([str(source), str(image)], ["md5", "sha1"], chunk_size=MIB // 2)
+
+    assert src["md5"] != dst["md5"] and src["sha1"] != dst["sha1"]
+    with pytest.raises(HashCancelled):
+        hash_file(str(source), ["md5", "sha1"], should_stop=lambda: True)
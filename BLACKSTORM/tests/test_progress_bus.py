@@ -0,0 +1,34 @@
+import json
+
+from BLACKSTORM.core.progress_bus import ProgressBus, ProgressEvent
+
+
+def _event(job, done, timestamp):
+    return ProgressEvent(job, "wipe", "Writing zeros", done, 1000, 10.0,
+                         pass_index=1, pass_count=2, timestamp=timestamp)
+
+
+def test_bus_coalesces_to_latest_event_per_job():
+    bus = ProgressBus()
+    for done in range(0, 1000, 10):
+        bus.publish(_event("/dev/sda", done, done))
+    bus.publish(_event("/dev/sdb", 500, 0))
+
+    events = {event.job: event for event in bus.drain()}
+
+    assert bus.published == 101
+    assert events["/dev/sda"].bytes_done == 990
+    assert events["/dev/sdb"].overall_percent == 75.0
+    assert bus.drain() == []
+
+
+def test_bus_records_rate_limited_timeline(tmp_path):
+    bus = ProgressBus(str(tmp_path), record_interval=1.0)
+    for step in range(10):
+        bus.publish(_event("/dev/sda", step * 100, step * 0.25))
+    bus.close_job("/dev/sda")
+
+    [timeline] = tmp_path.glob("timeline_sda_*.jsonl")
+    records = [json.loads(line) for line in timeline.read_text().splitlines()]
+    assert [r["bytes_done"] for r in records] == [0, 400, 800, 900]
+    assert records[-1]["pass_index"] == 1
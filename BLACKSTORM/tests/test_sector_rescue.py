@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from BLACKSTORM.core.sector_rescue import BAD_SECTOR, FINISHED, NON_SCRAPED, RescueMap, SectorRescuer
+
+MAP_TEXT = """# Mapfile. Created by GNU ddrescue
+# current_pos  current_status  current_pass
+0x00002000     ?               1
+#      pos        size  status
+0x00000000  0x00002000  +
+0x00002000  0x00002000  *
+0x00004000  0x00004000  +
+"""
+
+
+class FlakySource(SectorRescuer):
+    """Rescuer whose source fails every read touching ``bad`` byte offsets."""
+
+    def __init__(self, *args, bad=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bad = bad
+
+    def _read(self, offset, size):
+        if any(offset <= pos < offset + size for pos in self.bad):
+            raise OSError(5, "Input/output error")
+        return super()._read(offset, size)
+
+
+def test_rescue_map_parses_merges_and_saves(tmp_path):
+    rescue_map = RescueMap.parse(MAP_TEXT, size=0x10000)
+    assert rescue_map.current_pos == 0x2000
+    assert rescue_map.failed_bytes == 0x2000 + 0x8000  # non-trimmed block plus the non-tried tail
+    rescue_map.set_status(0x2000, 0x2000, FINISHED)
+    assert list(rescue_map)[0] == (0, 0x8000, FINISHED)
+    rescue_map.set_status(0x3000, 0x200, BAD_SECTOR)
+    assert rescue_map.status_at(0x3100) == BAD_SECTOR
+    assert rescue_map.ranges(reverse=True)[-1] == (0x3000, 0x3200, BAD_SECTOR)
+
+    path = str(tmp_path / "disk.map")
+    rescue_map.save(path)
+    assert list(RescueMap.load(path)) == list(rescue_map)
+
+
+def test_rescuer_splits_failed_blocks_down_to_bad_sectors(tmp_path):
+    data = os.urandom(0x10000)
+    source = tmp_path / "disk.raw"
+    source.write_bytes(data)
+    output = tmp_path / "image.raw"
+    output.write_bytes(data[:0x2000] + bytes(0xE000))
+    rescue_map = RescueMap(0x10000)
+    rescue_map.set_status(0, 0x2000, FINISHED)
+
+    rescuer = FlakySource(str(source), str(output), rescue_map, map_path=str(tmp_path / "disk.map"),
+                          block_sizes=(0x4000, 0x1000), retries=1, bad=(0x9000, 0x9400))
+    result = rescuer.run()
+
+    assert rescue_map.ranges() == [(0x9000, 0x9200, BAD_SECTOR), (0x9400, 0x9600, BAD_SECTOR)]
+    assert result.remaining_bytes == 0x400
+    assert result.recovered_bytes == 0xE000 - 0x400
+    image = output.read_bytes()
+    assert image[:0x9000] == data[:0x9000]
+    assert image[0x9200:0x9400] == data[0x9200:0x9400]
+    assert RescueMap.load(str(tmp_path / "disk.map")).failed_bytes == 0x400
+    assert NON_SCRAPED not in {status for _, _, status in rescue_map}
+
+
+@pytest.mark.parametrize("direct_io", [True, False])
+def test_rescuer_reads_unaligned_sectors_with_and_without_direct_io(tmp_path, direct_io):
+    data = os.urandom(0x3000)
+    source = tmp_path / "disk.raw"
+    source.write_bytes(data)
+    rescue_map = RescueMap(0x3000, NON_SCRAPED)
+
+    result = SectorRescuer(str(source), str(tmp_path / "image.raw"), rescue_map,
+                           block_sizes=(0x600,), direct_io=direct_io).run()
+
+    assert result.remaining_bytes == 0
+    assert (tmp_path / "image.raw").read_bytes() == data
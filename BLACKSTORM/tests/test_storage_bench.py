@@ -0,0 +1,41 @@
+from BLACKSTORM.core.storage_bench import (
+    BenchHistory, BenchSpec, LatencyHistogram, compare, prepare_test_file, run_spec
+)
+
+
+def test_histogram_percentiles_within_bucket_error():
+    histogram = LatencyHistogram()
+    for value in range(1, 10001):
+        histogram.record(value * 1000)
+
+    for percent in (50, 99, 99.9):
+        exact = percent * 10000 * 10
+        assert abs(histogram.percentile(percent) - exact) / exact < 0.0625
+    assert histogram.percentile(100) == histogram.max == 10_000_000
+
+    merged = LatencyHistogram.from_dict(histogram.to_dict())
+    merged.merge(histogram)
+    assert merged.count == 20000 and merged.percentile(50) == histogram.percentile(50)
+
+
+def test_run_spec_and_history_comparison(tmp_path):
+    target = str(tmp_path / "bench.dat")
+    prepare_test_file(target, 4 << 20)
+    history = BenchHistory(str(tmp_path / "history.jsonl"))
+    device = {"model": "Test", "serial": "S1"}
+
+    results = []
+    for spec in (BenchSpec("rand", "randread", 4096, queue_depth=4, duration=0.2),
+                 BenchSpec("seq", "write", 64 * 1024, duration=0.2)):
+        result = run_spec(spec, target)
+        assert result.ios > 0 and result.errors == 0
+        assert result.histogram.count == result.ios
+        assert result.bytes_done == result.ios * spec.block_size
+        history.append(result, device)
+        results.append(result)
+
+    again = run_spec(results[0].spec, target)
+    previous = history.previous(again, device)
+    assert previous["spec"]["name"] == "rand"
+    assert set(compare(again, previous)) == {"throughput", "iops", "p99_us"}
+    assert len(history.records(serial="S1")) == 2
@@ -24,3 +24,16 @@ def test_tab_imports():
     assert hasattr(security_compliance_tab, "SecurityComplianceTab")
     assert hasattr(settings_tab, "SettingsTab")
     assert hasattr(wipe_operations_tab, "WipeOperationsTab")
+
+
+def test_benchmark_write_pattern_needs_explicit_write(tmp_path):
+    from BLACKSTORM.tabs.advanced_tab import AdvancedTab
+
+    tab = AdvancedTab.__new__(AdvancedTab)
+    with pytest.raises(ValueError, match="--write"):
+        tab._parse_benchmark_args(["--pattern", "randwrite"], "/dev/sdX")
+
+    assert not tab._parse_benchmark_args(["--pattern", "randread"], "/dev/sdX")["write"]
+    assert tab._parse_benchmark_args(["--pattern", "randwrite", "--write"], "/dev/sdX")["write"]
+    # A directory is benchmarked through a scratch file, so writes are harmless there
+    assert not tab._parse_benchmark_args(["--pattern", "randwrite"], str(tmp_path))["write"]
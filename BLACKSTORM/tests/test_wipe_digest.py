@@ -0,0 +1,46 @@
+from BLACKSTORM.core.wipe_digest import ExtentDigest
+from BLACKSTORM.core.wipe_engine import BlockWipeEngine, WipePass
+from BLACKSTORM.core.wipe_verify import ExtentHashVerifier
+
+MIB = 1024 * 1024
+
+
+def _wipe_with_digest(tmp_path, passes, size=5 * MIB + 4096):
+    target = tmp_path / "disk.img"
+    target.write_bytes(b"\x5a" * size)
+    engine = BlockWipeEngine(str(target), block_size="1M")
+    engine.run(passes, digest_final=True, extent_size=MIB)
+    return target, engine.final_digest
+
+
+def test_pattern_digest_matches_streamed_digest():
+    size = 3 * MIB + 100
+    pattern = b"\x92\x49\x24"
+    streamed = ExtentDigest(size, MIB)
+    streamed.update((pattern * (size // 3 + 1))[:size])
+
+    assert streamed.complete
+    assert ExtentDigest.for_pattern(size, pattern, MIB).root == streamed.root
+    assert ExtentDigest.from_dict(streamed.to_dict()).root == streamed.root
+
+
+def test_extent_verifier_accepts_random_final_pass(tmp_path):
+    target, digest = _wipe_with_digest(tmp_path, [WipePass.zeros(), WipePass.random()])
+
+    result = ExtentHashVerifier(str(target), digest, threads=3).run()
+
+    assert digest.extent_count == 6
+    assert result.passed
+    assert result.coverage == 1.0
+
+
+def test_extent_verifier_reports_tampered_extent(tmp_path):
+    target, digest = _wipe_with_digest(tmp_path, [WipePass.zeros()])
+    with open(target, "r+b") as f:
+        f.seek(2 * MIB + 10)
+        f.write(b"residual")
+
+    result = ExtentHashVerifier(str(target), digest).run()
+
+    assert not result.passed
+    assert result.bad_extents == [(2 * MIB, 3 * MIB)]
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from BLACKSTORM.core.wipe_engine import BlockWipeEngine, KeyStream, WipePass, parse_size
+
+
+def _make_target(tmp_path, size):
+    target = tmp_path / "disk.img"
+    target.write_bytes(b"\x5a" * size)
+    return target
+
+
+def test_parse_size():
+    assert parse_size("4M") == 4 * 1024 * 1024
+    assert parse_size("512") == 512
+    assert parse_size(8192) == 8192
+
+
+def test_pattern_passes_cover_device(tmp_path):
+    size = 3 * 1024 * 1024 + 1000
+    target = _make_target(tmp_path, size)
+    updates = []
+
+    engine = BlockWipeEngine(str(target), block_size="1M", progress_interval=0)
+    results = engine.run([WipePass.zeros(), WipePass.fill(b"\x92\x49\x24")], updates.append)
+
+    assert [r.bytes_written for r in results] == [size, size]
+    assert updates[-1].overall_percent == 100.0
+    assert target.read_bytes() == (b"\x92\x49\x24" * (size // 3 + 1))[:size]
+
+
+def test_random_pass_matches_keystream(tmp_path):
+    size = 2 * 1024 * 1024
+    target = _make_target(tmp_path, size)
+    keystream = KeyStream(b"k" * 32)
+
+    BlockWipeEngine(str(target), block_size="256K", keystream=keystream).run([WipePass.random()])
+
+    expected = bytearray(size)
+    keystream.fill(memoryview(expected), 0)
+    assert target.read_bytes() == bytes(expected)
+
+
+def test_resume_continues_from_checkpoint(tmp_path):
+    size = 3 * 1024 * 1024
+    target = _make_target(tmp_path, size)
+    keystream = KeyStream(b"r" * 32)
+    passes = [WipePass.fill(b"\xff"), WipePass.random()]
+    checkpoints = []
+
+    engine = BlockWipeEngine(str(target), block_size="1M", keystream=keystream)
+    results = engine.run(passes, start_pass=1, start_offset=1024 * 1024 + 10,
+                         checkpoint_callback=lambda *point: checkpoints.append(point))
+
+    assert [r.bytes_written for r in results] == [2 * 1024 * 1024]
+    assert checkpoints[-1] == (2, 0)
+    expected = bytearray(size)
+    keystream.for_pass(1).fill(memoryview(expected), 0)
+    data = target.read_bytes()
+    assert data[:1024 * 1024] == b"\x5a" * (1024 * 1024)
+    assert data[1024 * 1024:] == bytes(expected[1024 * 1024:])
+
+
+def test_random_passes_write_distinct_streams(tmp_path):
+    size = 256 * 1024
+    target = _make_target(tmp_path, size)
+    keystream = KeyStream(b"g" * 32)
+
+    engine = BlockWipeEngine(str(target), block_size="64K", keystream=keystream)
+    engine.run([WipePass.random(), WipePass.random()], digest_final=True)
+
+    first, second = bytearray(size), bytearray(size)
+    keystream.for_pass(0).fill(memoryview(first), 0)
+    keystream.for_pass(1).fill(memoryview(second), 0)
+    assert first != second
+    assert target.read_bytes() == bytes(second)
+
+
+@pytest.mark.skipif(not hasattr(os, "O_DSYNC"), reason="needs O_DSYNC")
+def test_sync_writes_open_the_target_with_o_dsync(tmp_path, monkeypatch):
+    size = 64 * 1024 + 100
+    target = _make_target(tmp_path, size)
+    write_flags = []
+    real_open = os.open
+
+    def recording_open(path, flags, *args):
+        if flags & os.O_WRONLY:
+            write_flags.append(flags)
+        return real_open(path, flags, *args)
+
+    monkeypatch.setattr(os, "open", recording_open)
+    BlockWipeEngine(str(target), block_size="64K", sync_writes=True).run([WipePass.zeros()])
+
+    assert write_flags and all(flags & os.O_DSYNC for flags in write_flags)
+    assert target.read_bytes() == bytes(size)
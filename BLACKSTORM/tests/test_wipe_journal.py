@@ -0,0 +1,77 @@
+import os
+
+from BLACKSTORM.core.wipe_engine import WipePass
+from BLACKSTORM.core.wipe_journal import STATUS_INTERRUPTED, WipeJournal
+
+
+def test_journal_round_trip_and_resume_lookup(tmp_path):
+    target = tmp_path / "disk.img"
+    target.write_bytes(b"\x00" * 8192)
+    journal = WipeJournal(str(tmp_path / "jobs"))
+    passes = [WipePass.zeros(), WipePass.fill(b"\xff"), WipePass.random()]
+
+    job = journal.create(str(target), "dod", passes, 8192, key=b"k" * 32, sys_root=str(tmp_path))
+    journal.checkpoint(job, 1, 4096)
+    journal.interrupt(job)
+
+    [loaded] = journal.resumable(sys_root=str(tmp_path))
+    assert loaded.status == STATUS_INTERRUPTED
+    assert (loaded.pass_index, loaded.offset) == (1, 4096)
+    assert loaded.matches(passes)
+    assert loaded.wipe_passes()[2].kind == "random"
+    assert bytes.fromhex(loaded.key) == b"k" * 32
+    assert loaded.percent == 50.0
+
+    journal.remove(loaded)
+    assert journal.jobs() == []
+
+
+def test_resumable_skips_resized_device(tmp_path):
+    target = tmp_path / "disk.img"
+    target.write_bytes(b"\x00" * 8192)
+    journal = WipeJournal(str(tmp_path / "jobs"))
+    journal.create(str(target), "quick", [WipePass.zeros()], 4096, sys_root=str(tmp_path))
+
+    assert journal.resumable(sys_root=str(tmp_path)) == []
+
+
+def test_job_keeps_wipe_options(tmp_path):
+    target = tmp_path / "disk.img"
+    target.write_bytes(b"\x00" * 4096)
+    journal = WipeJournal(str(tmp_path / "jobs"))
+    options = {"pattern": [0x55, 0xAA], "passes": 3, "block_size": "1M"}
+    passes = [WipePass.fill([0x55, 0xAA]), WipePass.random(), WipePass.fill([0x55, 0xAA])]
+
+    journal.create(str(target), "custom", passes, 4096, options=options, sys_root=str(tmp_path))
+
+    [loaded] = journal.jobs()
+    assert loaded.options == options
+    assert loaded.wipe_passes() == passes
+    assert os.stat(journal._path(loaded)).st_mode & 0o777 == 0o600
+
+
+def test_resume_requires_matching_serial_and_drops_secrets(tmp_path):
+    (tmp_path / "block" / "sdb" / "device").mkdir(parents=True)
+    (tmp_path / "block" / "sdb" / "device" / "serial").write_text("WD-OLD\n")
+    target = tmp_path / "sdb"
+    target.write_bytes(b"\x00" * 4096)
+    journal = WipeJournal(str(tmp_path / "jobs"))
+
+    job = journal.create(str(target), "quick", [WipePass.zeros()], 4096,
+                         options={"lock_password": "secret", "block_size": "1M"}, sys_root=str(tmp_path))
+    assert job.identified
+    assert "secret" not in (tmp_path / "jobs" / f"{job.job_id}.json").read_text()
+
+    # Same path and size, but another disk
+    (tmp_path / "block" / "sdb" / "device" / "serial").write_text("WD-NEW\n")
+    assert journal.resumable(sys_root=str(tmp_path)) == []
+
+
+def test_unidentified_job_is_flagged(tmp_path):
+    target = tmp_path / "disk.img"
+    target.write_bytes(b"\x00" * 4096)
+    journal = WipeJournal(str(tmp_path / "jobs"))
+    journal.create(str(target), "quick", [WipePass.zeros()], 4096, sys_root=str(tmp_path))
+
+    [loaded] = journal.resumable(sys_root=str(tmp_path))
+    assert not loaded.identified
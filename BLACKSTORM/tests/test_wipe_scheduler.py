@@ -0,0 +1,48 @@
+import os
+
+from BLACKSTORM.core.wipe_scheduler import WipeScheduler, resolve_bus
+
+TOPOLOGY = {
+    "sda": "devices/pci0000:00/0000:00:17.0/ata1/host0/target0:0:0/0:0:0:0/block/sda",
+    "sdb": "devices/pci0000:00/0000:00:17.0/ata2/host1/target1:0:0/1:0:0:0/block/sdb",
+    "sdc": "devices/pci0000:00/0000:00:14.0/usb2/2-1/2-1.1/2-1.1:1.0/host6/target6:0:0/6:0:0:0/block/sdc",
+    "sdd": "devices/pci0000:00/0000:00:14.0/usb2/2-1/2-1.2/2-1.2:1.0/host7/target7:0:0/7:0:0:0/block/sdd",
+    "sde": "devices/pci0000:00/0000:00:14.0/usb2/2-1/2-1.3/2-1.3:1.0/host8/target8:0:0/8:0:0:0/block/sde",
+    "nvme0n1": "devices/pci0000:00/0000:00:1d.0/0000:3d:00.0/nvme/nvme0/nvme0n1",
+}
+
+
+def _make_sysfs(tmp_path):
+    (tmp_path / "block").mkdir()
+    for name, target in TOPOLOGY.items():
+        (tmp_path / target).mkdir(parents=True)
+        os.symlink(tmp_path / target, tmp_path / "block" / name)
+    return str(tmp_path)
+
+
+def test_resolve_bus_groups_by_controller_and_hub(tmp_path):
+    sys_root = _make_sysfs(tmp_path)
+
+    assert resolve_bus("/dev/sda", sys_root) == resolve_bus("/dev/sdb", sys_root)
+    assert resolve_bus("/dev/sda", sys_root).kind == "ata"
+    assert resolve_bus("/dev/sdc", sys_root).key == resolve_bus("/dev/sde", sys_root).key
+    assert resolve_bus("/dev/sdc", sys_root).kind == "usb"
+    assert resolve_bus("/dev/nvme0n1", sys_root).key == "nvme:0000:3d:00.0"
+
+
+def test_scheduler_respects_bus_limits(tmp_path):
+    sys_root = _make_sysfs(tmp_path)
+    devices = ["/dev/sdc", "/dev/sdd", "/dev/sde", "/dev/sda", "/dev/nvme0n1"]
+    scheduler = WipeScheduler(devices, max_jobs=8, bus_limits={"usb": 2}, sys_root=sys_root)
+
+    started = scheduler.next_ready()
+    assert "/dev/sde" not in started
+    assert set(started) == {"/dev/sdc", "/dev/sdd", "/dev/sda", "/dev/nvme0n1"}
+
+    scheduler.update_rate("/dev/sdc", 100.0)
+    scheduler.update_rate("/dev/sdd", 50.0)
+    assert scheduler.aggregate_rate == 150.0
+
+    scheduler.finish("/dev/sdc", True)
+    assert scheduler.next_ready() == ["/dev/sde"]
+    assert scheduler.aggregate_rate == 50.0
@@ -0,0 +1,64 @@
+from BLACKSTORM.core.wipe_engine import KEYSTREAM_SEGMENT, BlockWipeEngine, KeyStream, WipePass
+from BLACKSTORM.core.wipe_verify import WipeVerifier, plan_ranges
+
+MIB = 1024 * 1024
+
+
+def _wiped_target(tmp_path, wipe_pass, size=4 * MIB + 4096):
+    target = tmp_path / "disk.img"
+    target.write_bytes(b"\x5a" * size)
+    engine = BlockWipeEngine(str(target), block_size="1M")
+    engine.run([wipe_pass])
+    return target, engine.keystream
+
+
+def test_verifier_accepts_random_pass(tmp_path):
+    target, keystream = _wiped_target(tmp_path, WipePass.random())
+
+    result = WipeVerifier(str(target), WipePass.random(), keystream, chunk_size=MIB).run()
+
+    assert result.passed
+    assert result.coverage == 1.0
+
+
+def test_verifier_reports_bad_extents(tmp_path):
+    target, _ = _wiped_target(tmp_path, WipePass.fill(b"\x92\x49\x24"))
+    with open(target, "r+b") as f:
+        f.seek(MIB + 700)
+        f.write(b"residual" * 100)
+
+    result = WipeVerifier(str(target), WipePass.fill(b"\x92\x49\x24"), chunk_size=MIB).run()
+
+    assert not result.passed
+    assert result.bad_extents == [(MIB + 512, MIB + 1536)]
+
+
+def test_plan_ranges_spreads_partial_reads():
+    ranges = plan_ranges(8 * 1024 * MIB, fraction=0.1, chunk_size=8 * MIB)
+
+    assert len(ranges) == 9
+    assert ranges[0] == (0, 104 * MIB)
+    assert ranges[-1][1] == 8 * 1024 * MIB
+
+
+def test_keystream_fill_at_unaligned_offsets():
+    keystream = KeyStream(b"u" * 32, stream=3)
+    whole = bytearray(3 * KEYSTREAM_SEGMENT)
+    keystream.fill(memoryview(whole), 0)
+
+    for offset, length in ((4096, 100000), (KEYSTREAM_SEGMENT - 7, 20), (12345, KEYSTREAM_SEGMENT)):
+        part = bytearray(length)
+        keystream.fill(memoryview(part), offset)
+        assert part == whole[offset:offset + length]
+
+
+def test_partial_verify_of_random_pass(tmp_path):
+    size = 7 * MIB + 12 * 4096
+    target, keystream = _wiped_target(tmp_path, WipePass.random(), size=size)
+    assert plan_ranges(size, 0.1, 4 * MIB, MIB)[-1] == (6 * MIB, size)
+
+    result = WipeVerifier(str(target), WipePass.random(), keystream, fraction=0.1,
+                          chunk_size=MIB, stripe_size=4 * MIB).run()
+
+    assert result.passed
+    assert result.checked_extents[-1][1] == size
@@ -0,0 +1,35 @@
+"""Qt bridge for the shared device inventory."""
+from __future__ import annotations
+
+from PySide6.QtCore import QObject, Signal
+
+from BLACKSTORM.core.device_inventory import get_inventory
+
+
+class DeviceEvents(QObject):
+    """Re-emits inventory changes as a signal, delivered on the GUI thread.
+
+    The inventory calls back from its watcher thread; emitting from there
+    queues the signal to receivers living in the GUI thread.
+    """
+
+    devices_changed = Signal(object)  # InventoryChange
+
+    def __init__(self):
+        super().__init__()
+        self.inventory = get_inventory()
+        self.inventory.subscribe(self.devices_changed.emit)
+
+    def devices(self):
+        return self.inventory.devices()
+
+
+_events = None
+
+
+def device_events():
+    """Return the application-wide :class:`DeviceEvents` (create it on the GUI thread)."""
+    global _events
+    if _events is None:
+        _events = DeviceEvents()
+    return _events
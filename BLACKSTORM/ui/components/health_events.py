@@ -0,0 +1,38 @@
+"""Qt bridge for the shared drive health service."""
+from __future__ import annotations
+
+from PySide6.QtCore import QObject, Signal
+
+from BLACKSTORM.core.drive_health import get_health_service
+
+
+class HealthEvents(QObject):
+    """Re-emits finished health probes as a signal, delivered on the GUI thread.
+
+    The service calls back from its pool threads; emitting from there queues
+    the signal to receivers living in the GUI thread.
+    """
+
+    report_ready = Signal(object)  # HealthReport
+
+    def __init__(self):
+        super().__init__()
+        self.service = get_health_service()
+        self.service.subscribe(self.report_ready.emit)
+
+    def cached(self, device, serial=None):
+        return self.service.cached(device, serial)
+
+    def request_all(self, devices, force=False):
+        return self.service.request_all(devices, force)
+
+
+_events = None
+
+
+def health_events():
+    """Return the application-wide :class:`HealthEvents` (create it on the GUI thread)."""
+    global _events
+    if _events is None:
+        _events = HealthEvents()
+    return _events
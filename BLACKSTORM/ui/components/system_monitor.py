@@ -8,12 +8,10 @@ from typing import Dict, List, Optional, Tuple
 
 import psutil
 
+from BLACKSTORM.core.device_inventory import get_inventory
+
 logger = logging.getLogger(__name__)
 
-# Cache configuration for device detection
-_device_cache: Optional[List[Dict]] = None
-_device_cache_timestamp: float = 0.0
-DEVICE_CACHE_TTL: float = 30.0  # Cache TTL in seconds
 from PySide6.QtCore import Qt, QTimer, QRectF
 from PySide6.QtGui import QPainter, QColor
 from PySide6.QtWidgets import (
@@ -179,163 +177,33 @@ class SystemMonitor:
         """
         Get a list of connected physical storage devices with their partitions.
 
-        Uses caching to avoid rescanning on every call. Results are cached for
-        DEVICE_CACHE_TTL seconds (default 30s).
+        Reads the shared device inventory, which is kept current by kernel
+        uevents and mount table changes instead of being rescanned on a timer.
 
         Args:
-            force_refresh: If True, bypass the cache and rescan devices.
+            force_refresh: If True, rescan devices before returning.
 
         Returns:
             List[Dict[str, any]]: List of dictionaries containing device and partition information
         """
-        global _device_cache, _device_cache_timestamp
-
-        # Check cache validity
-        current_time = time.time()
-        if not force_refresh and _device_cache is not None:
-            cache_age = current_time - _device_cache_timestamp
-            if cache_age < DEVICE_CACHE_TTL:
-                logger.debug("Using cached device list (age: %.1fs)", cache_age)
-                return _device_cache
-
-        logger.debug("Starting device detection (cache expired or forced refresh)")
+        inventory = get_inventory()
+        if force_refresh:
+            inventory.refresh()
         devices = []
-        try:
-            # First, get all physical block devices
-            if not os.path.exists('/sys/block'):
-                logger.debug("/sys/block does not exist")
-                return []
-
-            logger.debug("Found devices in /sys/block: %s", os.listdir('/sys/block'))
-
-            for dev in os.listdir('/sys/block'):
-                logger.debug("Checking device: %s", dev)
-
-                # Skip virtual and non-physical devices
-                skip_prefixes = ['loop', 'ram', 'sr', 'dm-', 'zram', 'md', 'nbd', 'fd']
-                if any(dev.startswith(x) for x in skip_prefixes):
-                    logger.debug("  - Skipping %s (virtual/ignored device type)", dev)
-                    continue
-
-                # Check if it's a partition (for non-NVMe devices)
-                # NVMe devices have names like nvme0n1 (whole disk) and nvme0n1p1 (partition)
-                is_nvme = dev.startswith('nvme')
-                if is_nvme:
-                    # For NVMe, check if it's a partition (ends with pX where X is a number)
-                    if any(dev.endswith(f'p{i}') for i in range(10)):
-                        logger.debug("  - Skipping (NVMe partition: %s)", dev)
-                        continue
-                else:
-                    # For non-NVMe (sda, hda, etc.), check if it ends with a number
-                    if any(dev[-1] == str(i) for i in range(10)):
-                        logger.debug("  - Skipping (partition: %s)", dev)
-                        continue
-
-                dev_path = f"/dev/{dev}"
-                logger.debug("  - Found potential storage device: %s", dev_path)
-
-                try:
-                    # Get device information
-                    size = 0
-                    size_path = f'/sys/block/{dev}/size'
-                    if os.path.exists(size_path):
-                        with open(size_path, 'r') as f:
-                            # Size is in 512-byte sectors
-                            size = int(f.read().strip()) * 512
-
-                    # Skip very small devices (likely virtual)
-                    if size < 100 * 1024 * 1024:  # Less than 100MB
-                        continue
-
-                    # Get model and vendor
-                    model = 'Unknown'
-                    model_path = f'/sys/block/{dev}/device/model'
-                    if os.path.exists(model_path):
-                        with open(model_path, 'r') as f:
-                            model = f.read().strip()
-
-                    vendor = ''
-                    vendor_path = f'/sys/block/{dev}/device/vendor'
-                    if os.path.exists(vendor_path):
-                        with open(vendor_path, 'r') as f:
-                            vendor = f.read().strip()
-
-                    # Skip RAM disks and other non-physical devices
-                    if any(x in model.lower() for x in ['ram', 'virtual', 'nbd']):
-                        continue
-
-                    # Check if it's removable
-                    is_removable = False
-                    removable_path = f'/sys/block/{dev}/removable'
-                    if os.path.exists(removable_path):
-                        with open(removable_path, 'r') as f:
-                            is_removable = f.read().strip() == '1'
-
-                    # Get partitions for this device
-                    partitions = []
-                    if os.path.exists(f'/sys/block/{dev}'):
-                        for item in os.listdir(f'/sys/block/{dev}'):
-                            if item.startswith(dev) and item != dev:
-                                part_path = f'/dev/{item}'
-                                part_info = {
-                                    'device': part_path,
-                                    'mountpoint': '',
-                                    'fstype': '',
-                                    'size': 0,
-                                    'number': item[len(dev):] if not is_nvme else item[len(dev)+1:]
-                                }
-
-                                # Get partition info from /proc/mounts
-                                with open('/proc/mounts', 'r') as f:
-                                    for line in f:
-                                        fields = line.split()
-                                        if fields[0] == part_path:
-                                            part_info['mountpoint'] = fields[1]
-                                            part_info['fstype'] = fields[2]
-                                            break
-
-                                # Get partition size
-                                part_size_path = f'/sys/block/{dev}/{item}/size'
-                                if os.path.exists(part_size_path):
-                                    with open(part_size_path, 'r') as f:
-                                        part_size = int(f.read().strip()) * 512  # 512-byte sectors
-                                        part_info['size'] = round(part_size / (1024 ** 3), 1)  # Convert to GB
-
-                                partitions.append(part_info)
-
-                    # Create device info
-                    device_info = {
-                        'device': dev_path,
-                        'model': model,
-                        'vendor': vendor,
-                        'size_gb': round(size / (1024 ** 3), 1),  # Convert to GB
-                        'removable': is_removable,
-                        'partitions': partitions
-                    }
-
-                    # Add to devices list
-                    devices.append(device_info)
-
-                except (PermissionError, OSError, ValueError) as e:
-                    logger.debug("Error processing device %s: %s", dev_path, e)
-                    continue
-
-        except Exception as e:
-            logger.debug("Error getting connected devices: %s", e)
-
-        # Update cache
-        _device_cache = devices
-        _device_cache_timestamp = current_time
-        logger.debug("Device detection complete, found %d devices (cached)", len(devices))
-
+        for device in inventory.devices():
+            # Skip very small devices (likely virtual) and RAM/virtual disks
+            if device['size_bytes'] < 100 * 1024 * 1024:
+                continue
+            if any(x in device['model'].lower() for x in ['ram', 'virtual', 'nbd']):
+                continue
+            devices.append(device)
         return devices
 
     @staticmethod
     def get_connected_devices_count() -> int:
         """Get the count of connected storage devices.
 
-        Uses the cached device list from get_connected_devices() to avoid
-        repeated scans.
+        Uses the shared device inventory, so no devices are rescanned.
         """
         try:
             return len(SystemMonitor.get_connected_devices())
@@ -15,6 +15,7 @@ import urllib.request
 
 from .config import IS_WINDOWS
 from ..dependencies import check_and_install_android_dependencies, check_and_install_scrcpy
+from ..core import utils as core_utils
 from ..utils.qt_dispatcher import emit_ui, get_ui_dispatcher
 from ..ui.icon_utils import get_status_icon
 
@@ -38,6 +39,7 @@ from ..features.automation import AutomationMixin
 from ..features.forensics import ForensicsMixin
 from ..features.andriller_native import AndrillerNativeMixin
 from ..features.acquisition import AcquisitionMixin
+from ..features.fleet import FleetMixin
 
 
 class AndroidToolsModule(
@@ -58,6 +60,7 @@ class AndroidToolsModule(
     ForensicsMixin,
     AndrillerNativeMixin,
     AcquisitionMixin,
+    FleetMixin,
     QtWidgets.QWidget
 ):
     """Main Android Tools Module that combines all feature mixins."""
@@ -421,37 +424,17 @@ class AndroidToolsModule(
         Returns:
             tuple: (success, output)
         """
-        try:
-            # Use stored adb path or default to 'adb' in PATH
-            adb_cmd = self.adb_path if self.adb_path else 'adb'
-
-            # Construct full command
-            cmd = [adb_cmd]
-
-            # Add device serial if specified
-            if device_serial:
-                cmd.extend(['-s', device_serial])
-
-            # Add the actual command
-            cmd.extend(command)
-
-            self.log_message(f"Running: {' '.join(cmd)}")
-
-            # Run the command
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=timeout
-            )
-
-            if result.returncode == 0:
-                return True, result.stdout.strip()
-            else:
-                return False, result.stderr.strip()
-
-        except subprocess.TimeoutExpired:
-            return False, "Command timed out"
-        except Exception as e:
-            return False, str(e)
+        # Use stored adb path or default to 'adb' in PATH
+        adb_cmd = self.adb_path if self.adb_path else 'adb'
+
+        cmd = [adb_cmd]
+        if device_serial:
+            cmd.extend(['-s', device_serial])
+        cmd.extend(command)
+        self.log_message(f"Running: {' '.join(cmd)}")
+
+        # Shell commands go straight to the adb server; the rest run adb
+        success, stdout, stderr = core_utils.run_adb_command(command, device_serial, timeout, adb_cmd)
+        if success:
+            return True, stdout.strip()
+        return False, (stderr or stdout).strip()
@@ -1,8 +1,14 @@
 """Core utilities and base classes for DROIDCOM."""
 
+from .adb_client import AdbClient, AdbError, get_adb_client
 from .base import BaseModule
+from .device_profile import DeviceProfile, get_profile_cache
+from .file_transfer import FileTransfer, TransferStats
+from .fleet import FleetExecutor, FleetRun, get_fleet_executor
+from .shell_batch import CommandResult, ShellBatch, run_batch
 from .utils import (
     check_platform_tools,
+    ensure_adb_server,
     ensure_directory,
     find_adb_path,
     format_bytes,
@@ -20,20 +26,34 @@ from .utils import (
 )
 
 __all__ = [
+    "AdbClient",
+    "AdbError",
     "BaseModule",
+    "CommandResult",
+    "DeviceProfile",
+    "FileTransfer",
+    "FleetExecutor",
+    "FleetRun",
+    "ShellBatch",
+    "TransferStats",
     "check_platform_tools",
+    "ensure_adb_server",
     "ensure_directory",
     "find_adb_path",
     "format_bytes",
     "format_size",
+    "get_adb_client",
     "get_backups_directory",
     "get_connected_devices",
+    "get_fleet_executor",
     "get_home_directory",
     "get_nest_directory",
+    "get_profile_cache",
     "get_screenshots_directory",
     "is_valid_package_name",
     "parse_key_value_output",
     "run_adb_command",
+    "run_batch",
     "run_in_thread",
     "truncate_string",
 ]
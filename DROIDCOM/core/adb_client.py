@@ -0,0 +1,502 @@
+"""
+DROIDCOM - Native ADB host-protocol client.
+
+Speaks the adb server's smart-socket protocol on localhost:5037 directly
+instead of forking an ``adb`` client process per command. Each request is a
+4-hex-digit length followed by the service name; the server answers
+``OKAY`` or ``FAIL`` plus a length-prefixed message.
+
+Supported services: ``host:version``, ``host:devices-l``,
+``host:track-devices``, ``host:transport:<serial>`` followed by ``shell:``
+(shell protocol v2, with a legacy fallback), ``exec:`` and ``sync:``.
+
+Shell and exec services consume their socket (the server closes it when the
+command exits), so those open a fresh localhost connection per call, which
+costs microseconds rather than a process spawn. Sync sessions stay open for
+any number of requests and are pooled per device.
+
+This module has no Qt/UI dependency so it can be unit tested in isolation.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import socket
+import stat as stat_module
+import struct
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from ..app.config import DEFAULT_ADB_TIMEOUT
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5037
+DEFAULT_POOL_SIZE = 4
+SYNC_DATA_MAX = 64 * 1024
+
+# Shell protocol v2 packet ids
+_SHELL_STDOUT = 1
+_SHELL_STDERR = 2
+_SHELL_EXIT = 3
+
+logger = logging.getLogger(__name__)
+
+
+class AdbError(Exception):
+    """Raised when the adb server refuses a request or the connection breaks."""
+
+
+class AdbServerUnavailable(AdbError):
+    """Raised when nothing is listening on the adb server port."""
+
+
+@dataclass
+class ShellResult:
+    """Outcome of one shell command."""
+
+    exit_code: int
+    stdout: bytes = b""
+    stderr: bytes = b""
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
+
+@dataclass
+class SyncStat:
+    """File metadata as reported by the sync protocol (STAT/DENT)."""
+
+    mode: int
+    size: int
+    mtime: int
+    name: str = ""
+
+    @property
+    def exists(self) -> bool:
+        return self.mode != 0
+
+    @property
+    def is_dir(self) -> bool:
+        return stat_module.S_ISDIR(self.mode)
+
+    @property
+    def is_file(self) -> bool:
+        return stat_module.S_ISREG(self.mode)
+
+
+class AdbConnection:
+    """One smart-socket connection to the adb server."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: Optional[float] = None):
+        try:
+            self.sock = socket.create_connection((host, port), timeout=timeout)
+        except OSError as exc:
+            raise AdbServerUnavailable(f"Cannot reach adb server at {host}:{port}: {exc}") from exc
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def settimeout(self, timeout: Optional[float]):
+        self.sock.settimeout(timeout)
+
+    def send_request(self, service: str):
+        """Send a service request and wait for the server's OKAY."""
+        payload = service.encode("utf-8")
+        self.sock.sendall(b"%04x" % len(payload) + payload)
+        self.read_status()
+
+    def read_status(self):
+        status = self.read_exact(4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            raise AdbError(self.read_hex_string())
+        raise AdbError(f"Unexpected adb server response {status!r}")
+
+    def read_hex_string(self) -> str:
+        length = int(self.read_exact(4), 16)
+        return self.read_exact(length).decode("utf-8", errors="replace")
+
+    def read_exact(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise AdbError("adb server closed the connection")
+            data += chunk
+        return bytes(data)
+
+    def read_all(self) -> bytes:
+        chunks = []
+        while True:
+            chunk = self.sock.recv(SYNC_DATA_MAX)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+    def sendall(self, data: bytes):
+        self.sock.sendall(data)
+
+
+class SyncConnection:
+    """A ``sync:`` session on one device: STAT, LIST, RECV and SEND requests.
+
+    The session stays usable after each request, so it can be pooled.
+    """
+
+    def __init__(self, connection: AdbConnection, serial: Optional[str] = None):
+        self.connection = connection
+        self.serial = serial
+        self.broken = False
+
+    def _request(self, command: bytes, path: str):
+        data = path.encode("utf-8")
+        self.connection.sendall(command + struct.pack("<I", len(data)) + data)
+
+    def _fail(self, length_bytes: bytes):
+        (length,) = struct.unpack("<I", length_bytes)
+        raise AdbError(self.connection.read_exact(length).decode("utf-8", errors="replace"))
+
+    def stat(self, path: str) -> SyncStat:
+        """Metadata of ``path``; ``exists`` is False if it is missing."""
+        self._request(b"STAT", path)
+        reply = self.connection.read_exact(16)
+        if reply[:4] != b"STAT":
+            self.broken = True
+            raise AdbError(f"Unexpected sync response {reply[:4]!r}")
+        mode, size, mtime = struct.unpack("<III", reply[4:])
+        return SyncStat(mode, size, mtime, os.path.basename(path.rstrip("/")))
+
+    def list(self, path: str) -> list:
+        """Entries of directory ``path`` (without ``.`` and ``..``)."""
+        self._request(b"LIST", path)
+        entries = []
+        while True:
+            header = self.connection.read_exact(20)
+            tag = header[:4]
+            if tag == b"DONE":
+                return entries
+            if tag == b"FAIL":
+                self._fail(header[4:8])
+            if tag != b"DENT":
+                self.broken = True
+                raise AdbError(f"Unexpected sync response {tag!r}")
+            mode, size, mtime, name_length = struct.unpack("<IIII", header[4:])
+            name = self.connection.read_exact(name_length).decode("utf-8", errors="surrogateescape")
+            if name not in (".", ".."):
+                entries.append(SyncStat(mode, size, mtime, name))
+
+    def recv(self, path: str, write, progress=None) -> int:
+        """Stream the device file ``path`` into ``write(chunk)``.
+
+        Returns:
+            int: Bytes received.
+        """
+        self._request(b"RECV", path)
+        total = 0
+        while True:
+            header = self.connection.read_exact(8)
+            tag = header[:4]
+            (length,) = struct.unpack("<I", header[4:])
+            if tag == b"DONE":
+                return total
+            if tag == b"FAIL":
+                raise AdbError(self.connection.read_exact(length).decode("utf-8", errors="replace"))
+            if tag != b"DATA":
+                self.broken = True
+                raise AdbError(f"Unexpected sync response {tag!r}")
+            chunk = self.connection.read_exact(length)
+            write(chunk)
+            total += length
+            if progress:
+                progress(length)
+
+    def send(self, path: str, read, mode: int = 0o644, mtime: Optional[int] = None, progress=None) -> int:
+        """Write ``read(n)`` chunks to the device file ``path`` until it returns b"".
+
+        Returns:
+            int: Bytes sent.
+        """
+        self._request(b"SEND", f"{path},{mode | stat_module.S_IFREG}")
+        total = 0
+        try:
+            while True:
+                chunk = read(SYNC_DATA_MAX)
+                if not chunk:
+                    break
+                self.connection.sendall(b"DATA" + struct.pack("<I", len(chunk)) + chunk)
+                total += len(chunk)
+                if progress:
+                    progress(len(chunk))
+        except Exception:
+            # The server is waiting for more data; the session is unusable now
+            self.broken = True
+            raise
+        self.connection.sendall(b"DONE" + struct.pack("<I", int(time.time() if mtime is None else mtime)))
+        header = self.connection.read_exact(8)
+        if header[:4] == b"FAIL":
+            self._fail(header[4:])
+        if header[:4] != b"OKAY":
+            self.broken = True
+            raise AdbError(f"Unexpected sync response {header[:4]!r}")
+        return total
+
+    def close(self):
+        try:
+            if not self.broken:
+                self.connection.sendall(b"QUIT" + struct.pack("<I", 0))
+        except OSError:
+            pass
+        self.connection.close()
+
+
+class AdbClient:
+    """Client for a local adb server, with a per-device pool of sync sessions.
+
+    Args:
+        host (str): adb server address.
+        port (int): adb server port.
+        pool_size (int): Idle sync sessions kept per device.
+        timeout (float): Default socket timeout in seconds.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_ADB_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def connect(self, timeout: Optional[float] = None) -> AdbConnection:
+        return AdbConnection(self.host, self.port, self.timeout if timeout is None else timeout)
+
+    # -- host services ----------------------------------------------------
+
+    def host_query(self, service: str, timeout: Optional[float] = None) -> str:
+        """Run a ``host:`` service that answers with one length-prefixed string."""
+        with self.connect(timeout) as conn:
+            conn.send_request(service)
+            return conn.read_hex_string()
+
+    def server_version(self) -> int:
+        return int(self.host_query("host:version"), 16)
+
+    def is_available(self) -> bool:
+        """True if an adb server is listening."""
+        try:
+            self.server_version()
+            return True
+        except (AdbError, OSError, ValueError):
+            return False
+
+    def devices(self) -> list:
+        """Connected devices as ``(serial, state, details)`` tuples, like ``adb devices -l``."""
+        return parse_devices(self.host_query("host:devices-l"))
+
+    def track_devices(self, stop_event: Optional[threading.Event] = None):
+        """Yield the device list every time it changes (``host:track-devices``).
+
+        The first list is yielded immediately. Stops when ``stop_event`` is set
+        or the server goes away.
+        """
+        with self.connect(timeout=None) as conn:
+            conn.send_request("host:track-devices")
+            while stop_event is None or not stop_event.is_set():
+                # Wait in select so a stop request never interrupts a half-read message
+                readable, _, _ = select.select([conn.sock], [], [], 0.5)
+                if not readable:
+                    continue
+                try:
+                    text = conn.read_hex_string()
+                except (AdbError, OSError):
+                    return
+                yield parse_devices(text)
+
+    # -- device services --------------------------------------------------
+
+    def transport(self, serial: Optional[str], timeout: Optional[float] = None) -> AdbConnection:
+        """A connection switched to ``serial`` (or the only device), ready for one service."""
+        conn = self.connect(timeout)
+        try:
+            conn.send_request(f"host:transport:{serial}" if serial else "host:transport-any")
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def shell(self, serial: Optional[str], command: str, timeout: Optional[float] = None) -> ShellResult:
+        """Run ``command`` in the device shell and collect stdout, stderr and exit status."""
+        conn = self.transport(serial, timeout)
+        try:
+            try:
+                conn.send_request(f"shell,v2,raw:{command}")
+            except AdbError:
+                # Pre-Nougat devices only speak the legacy shell service
+                conn.close()
+                return self._legacy_shell(serial, command, timeout)
+            stdout, stderr = bytearray(), bytearray()
+            exit_code = None
+            while exit_code is None:
+                try:
+                    header = conn.read_exact(5)
+                except AdbError:
+                    break
+                packet_id, length = struct.unpack("<BI", header)
+                data = conn.read_exact(length)
+                if packet_id == _SHELL_STDOUT:
+                    stdout += data
+                elif packet_id == _SHELL_STDERR:
+                    stderr += data
+                elif packet_id == _SHELL_EXIT:
+                    exit_code = data[0] if data else 0
+            return ShellResult(255 if exit_code is None else exit_code, bytes(stdout), bytes(stderr))
+        finally:
+            conn.close()
+
+    def _legacy_shell(self, serial, command, timeout):
+        marker = "__DROIDCOM_RC__"
+        with self.transport(serial, timeout) as conn:
+            conn.send_request(f"shell:{command}; echo {marker}$?")
+            output = conn.read_all()
+        body, sep, tail = output.rpartition(marker.encode())
+        if not sep:
+            return ShellResult(255, output)
+        try:
+            exit_code = int(tail.strip() or 0)
+        except ValueError:
+            exit_code = 255
+        return ShellResult(exit_code, body)
+
+    def open_shell(self, serial: Optional[str], command: str = "", timeout: Optional[float] = None) -> AdbConnection:
+        """An interactive legacy ``shell:`` stream; the caller reads, writes and closes it."""
+        conn = self.transport(serial, timeout)
+        try:
+            conn.send_request(f"shell:{command}")
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def open_exec(self, serial: Optional[str], command: str, timeout: Optional[float] = None) -> AdbConnection:
+        """A raw ``exec:`` stream (binary-safe stdout); the caller reads and closes it."""
+        conn = self.transport(serial, timeout)
+        try:
+            conn.send_request(f"exec:{command}")
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def exec_out(self, serial: Optional[str], command: str, timeout: Optional[float] = None) -> bytes:
+        """Run ``command`` via ``exec:`` and return its raw stdout."""
+        with self.open_exec(serial, command, timeout) as conn:
+            return conn.read_all()
+
+    # -- sync sessions ----------------------------------------------------
+
+    def open_sync(self, serial: Optional[str], timeout: Optional[float] = None) -> SyncConnection:
+        """A new, unpooled sync session."""
+        conn = self.transport(serial, timeout)
+        try:
+            conn.send_request("sync:")
+        except BaseException:
+            conn.close()
+            raise
+        return SyncConnection(conn, serial)
+
+    @contextmanager
+    def sync(self, serial: Optional[str], timeout: Optional[float] = None):
+        """Borrow a pooled sync session for ``serial``; it is returned on exit."""
+        with self._lock:
+            pool = self._pools.setdefault(serial, deque())
+            session = pool.pop() if pool else None
+        if session is None:
+            session = self.open_sync(serial, timeout)
+        else:
+            session.connection.settimeout(self.timeout if timeout is None else timeout)
+        try:
+            yield session
+        except BaseException:
+            session.broken = True
+            raise
+        finally:
+            self._release(serial, session)
+
+    def _release(self, serial, session):
+        if not session.broken:
+            with self._lock:
+                pool = self._pools.setdefault(serial, deque())
+                if len(pool) < self.pool_size:
+                    pool.append(session)
+                    return
+        session.close()
+
+    def close(self, serial: Optional[str] = None):
+        """Close pooled sync sessions for ``serial`` (or every device)."""
+        with self._lock:
+            if serial is None:
+                pools, self._pools = list(self._pools.values()), {}
+            else:
+                pools = [self._pools.pop(serial, deque())]
+        for pool in pools:
+            for session in pool:
+                session.close()
+
+
+def parse_devices(text: str) -> list:
+    """Parse ``host:devices-l``/``host:track-devices`` output into ``(serial, state, details)``."""
+    devices = []
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) >= 2:
+            devices.append((parts[0], parts[1], " ".join(parts[2:])))
+    return devices
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_adb_client() -> AdbClient:
+    """Return the process-wide :class:`AdbClient`.
+
+    Honours ``ANDROID_ADB_SERVER_PORT`` like the adb command-line client.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            port = int(os.environ.get("ANDROID_ADB_SERVER_PORT", DEFAULT_PORT) or DEFAULT_PORT)
+            _client = AdbClient(port=port)
+        return _client
+
+
+__all__ = [
+    "AdbClient",
+    "AdbConnection",
+    "AdbError",
+    "AdbServerUnavailable",
+    "ShellResult",
+    "SyncConnection",
+    "SyncStat",
+    "get_adb_client",
+    "parse_devices",
+]
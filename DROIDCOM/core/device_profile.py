@@ -0,0 +1,346 @@
+"""
+DROIDCOM - Batched device property snapshots.
+
+Gathers everything the device info views need in one ``adb shell``
+invocation: a full ``getprop`` dump plus the ``/proc``, ``dumpsys``, ``df``
+and ``wm`` sections, each introduced by a delimiter line so the output can be
+split back into sections. The parsed result is a typed :class:`DeviceProfile`
+cached per serial.
+
+Every profile field belongs to one snapshot section and has its own time to
+live: build properties practically never change while a device is attached,
+battery level changes by the minute. A refresh only re-runs the sections
+whose requested fields have expired, still in a single round trip.
+
+This module has no Qt/UI dependency so it can be unit tested in isolation.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from ..app.config import SHORT_ADB_TIMEOUT
+from .utils import run_adb_command
+
+SECTION_MARKER = "@@DROIDCOM_SECTION@@"
+
+# Section name -> device shell command
+SNAPSHOT_SECTIONS = {
+    "getprop": "getprop",
+    "battery": "dumpsys battery",
+    "capacity": "cat /sys/class/power_supply/battery/capacity",
+    "storage": "df /storage/emulated/0",
+    "meminfo": "cat /proc/meminfo",
+    "display": "wm size",
+    "kernel": "uname -r",
+    "android_id": "settings get secure android_id",
+}
+
+# Profile field -> (section it is parsed from, time to live in seconds)
+FIELD_SOURCES = {
+    "model": ("getprop", 3600),
+    "manufacturer": ("getprop", 3600),
+    "android_version": ("getprop", 3600),
+    "sdk": ("getprop", 3600),
+    "build_number": ("getprop", 3600),
+    "build_id": ("getprop", 3600),
+    "security_patch": ("getprop", 3600),
+    "cpu_abi": ("getprop", 3600),
+    "bootloader_locked": ("getprop", 3600),
+    "verified_boot_state": ("getprop", 3600),
+    "properties": ("getprop", 3600),
+    "battery_level": ("battery", 30),
+    "battery_status": ("battery", 30),
+    "battery_temperature": ("battery", 30),
+    "storage_total": ("storage", 60),
+    "storage_used": ("storage", 60),
+    "ram_total": ("meminfo", 3600),
+    "resolution": ("display", 600),
+    "kernel": ("kernel", 3600),
+    "android_id": ("android_id", 3600),
+}
+
+_GETPROP_LINE = re.compile(r"^\[(?P<key>[^\]]+)\]: \[(?P<value>.*)$")
+
+_BATTERY_STATUS = {"1": "Unknown", "2": "Charging", "3": "Discharging", "4": "Not charging", "5": "Full"}
+
+
+def build_snapshot_script(sections) -> str:
+    """Shell script that prints each section's output after a delimiter line."""
+    parts = []
+    for name in sections:
+        # Leading newline: the previous section's output may not end in one
+        parts.append(f"printf '\\n%s\\n' '{SECTION_MARKER}{name}'")
+        parts.append(f"{SNAPSHOT_SECTIONS[name]} 2>/dev/null")
+    return "; ".join(parts)
+
+
+def split_snapshot(output: str) -> dict:
+    """Split snapshot output back into ``{section: text}``."""
+    sections = {}
+    current = None
+    lines = []
+    for line in output.splitlines():
+        if line.startswith(SECTION_MARKER):
+            if current is not None:
+                sections[current] = "\n".join(lines).strip()
+            current = line[len(SECTION_MARKER):].strip()
+            lines = []
+        elif current is not None:
+            lines.append(line.rstrip("\r"))
+    if current is not None:
+        sections[current] = "\n".join(lines).strip()
+    return sections
+
+
+def parse_getprop(text: str) -> dict:
+    """Parse ``getprop`` output (``[key]: [value]``, values may span lines)."""
+    props = {}
+    key = None
+    value_lines = []
+    for line in text.splitlines():
+        match = _GETPROP_LINE.match(line) if key is None else None
+        if match:
+            key, rest = match.group("key"), match.group("value")
+            value_lines = [rest]
+        elif key is not None:
+            value_lines.append(line)
+        else:
+            continue
+        if value_lines[-1].endswith("]"):
+            value_lines[-1] = value_lines[-1][:-1]
+            props[key] = "\n".join(value_lines)
+            key = None
+    return props
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class DeviceProfile:
+    """Typed view of a device snapshot; ``None``/empty means not reported."""
+
+    serial: str
+    model: str = ""
+    manufacturer: str = ""
+    android_version: str = ""
+    sdk: Optional[int] = None
+    build_number: str = ""
+    build_id: str = ""
+    security_patch: str = ""
+    cpu_abi: str = ""
+    bootloader_locked: Optional[bool] = None
+    verified_boot_state: str = ""
+    battery_level: Optional[int] = None
+    battery_status: str = ""
+    battery_temperature: Optional[float] = None
+    storage_total: Optional[int] = None
+    storage_used: Optional[int] = None
+    ram_total: Optional[int] = None
+    resolution: str = ""
+    kernel: str = ""
+    android_id: str = ""
+    properties: dict = field(default_factory=dict)
+    updated: dict = field(default_factory=dict)
+
+    def apply(self, sections: dict, now: Optional[float] = None):
+        """Parse the given snapshot sections into this profile."""
+        now = time.time() if now is None else now
+        if "getprop" in sections:
+            self._apply_getprop(parse_getprop(sections["getprop"]))
+        if "battery" in sections or "capacity" in sections:
+            self._apply_battery(sections.get("battery", ""), sections.get("capacity", ""))
+        if "storage" in sections:
+            self._apply_storage(sections["storage"])
+        if "meminfo" in sections:
+            match = re.search(r"^MemTotal:\s+(\d+)", sections["meminfo"], re.MULTILINE)
+            self.ram_total = int(match.group(1)) * 1024 if match else None
+        if "display" in sections:
+            sizes = re.findall(r"size:\s*(\S+)", sections["display"])
+            # "Override size" follows "Physical size" when set; it is what is shown
+            self.resolution = sizes[-1] if sizes else ""
+        if "kernel" in sections:
+            self.kernel = sections["kernel"].strip()
+        if "android_id" in sections:
+            value = sections["android_id"].strip()
+            self.android_id = value if len(value) > 8 and value != "null" else ""
+        for name, (section, _) in FIELD_SOURCES.items():
+            if section in sections:
+                self.updated[name] = now
+
+    def _apply_getprop(self, props):
+        self.properties = props
+        self.model = props.get("ro.product.model", "")
+        self.manufacturer = props.get("ro.product.manufacturer", "")
+        self.android_version = props.get("ro.build.version.release", "")
+        self.sdk = _int(props.get("ro.build.version.sdk"))
+        self.build_number = props.get("ro.build.display.id", "")
+        self.build_id = props.get("ro.build.id", "")
+        self.security_patch = props.get("ro.build.version.security_patch", "")
+        self.cpu_abi = props.get("ro.product.cpu.abi", "")
+        locked = props.get("ro.boot.flash.locked")
+        self.bootloader_locked = None if locked not in ("0", "1") else locked == "1"
+        self.verified_boot_state = props.get("ro.boot.verifiedbootstate", "")
+
+    def _apply_battery(self, battery, capacity):
+        values = {}
+        for line in battery.splitlines():
+            key, sep, value = line.partition(":")
+            if sep:
+                values[key.strip()] = value.strip()
+        self.battery_level = _int(values.get("level"))
+        if self.battery_level is None:
+            self.battery_level = _int(capacity)
+        self.battery_status = _BATTERY_STATUS.get(values.get("status", ""), "")
+        temperature = _int(values.get("temperature"))
+        self.battery_temperature = temperature / 10 if temperature is not None else None
+
+    def _apply_storage(self, text):
+        self.storage_total = self.storage_used = None
+        lines = text.splitlines()
+        if len(lines) >= 2:
+            parts = lines[-1].split()
+            if len(parts) >= 4:
+                # toybox df reports 1K blocks
+                total, used = _int(parts[1]), _int(parts[2])
+                if total is not None and used is not None:
+                    self.storage_total, self.storage_used = total * 1024, used * 1024
+
+    def stale_sections(self, fields=None, now: Optional[float] = None) -> list:
+        """Sections that must be re-read to refresh ``fields`` (default: all)."""
+        now = time.time() if now is None else now
+        sections = []
+        for name in fields or FIELD_SOURCES:
+            section, ttl = FIELD_SOURCES[name]
+            if now - self.updated.get(name, float("-inf")) > ttl and section not in sections:
+                sections.append(section)
+        # The battery capacity file is the fallback for devices without dumpsys battery
+        if "battery" in sections:
+            sections.append("capacity")
+        return sections
+
+    def to_device_info(self) -> dict:
+        """The legacy ``device_info`` dict shown by the device info tab."""
+        info = {"serial": self.serial}
+        for key, value in (
+            ("model", self.model),
+            ("manufacturer", self.manufacturer),
+            ("android_version", self.android_version),
+            ("cpu", self.cpu_abi),
+            ("resolution", self.resolution),
+            ("kernel", self.kernel),
+            ("build_number", self.build_number),
+            ("security_patch", self.security_patch),
+        ):
+            if value:
+                info[key] = value
+        if self.battery_level is not None:
+            info["battery"] = f"{self.battery_level}%"
+        if self.storage_total is not None:
+            gb = 1024 ** 3
+            info["storage"] = f"{self.storage_used / gb:.1f} GB used / {self.storage_total / gb:.1f} GB total"
+        if self.ram_total is not None:
+            info["ram"] = f"{self.ram_total / 1024 ** 3:.1f} GB"
+        if self.bootloader_locked is not None:
+            info["bootloader_status"] = "Locked" if self.bootloader_locked else "Unlocked"
+            if self.verified_boot_state:
+                info["bootloader_status"] += f" ({self.verified_boot_state})"
+        if self.android_id:
+            info["device_id"] = self.android_id
+        return info
+
+
+class DeviceProfileCache:
+    """Per-serial :class:`DeviceProfile` cache refreshed by batched snapshots.
+
+    Args:
+        runner: ``runner(serial, script, adb_path) -> (success, stdout)``
+            executing one shell command on the device.
+    """
+
+    def __init__(self, runner: Optional[Callable] = None):
+        self.runner = runner or _run_snapshot
+        self.round_trips = 0
+        self._profiles = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def cached(self, serial: str) -> Optional[DeviceProfile]:
+        """The profile as last fetched, without touching the device."""
+        with self._lock:
+            return self._profiles.get(serial)
+
+    def get(self, serial: str, fields=None, force: bool = False, adb_path: Optional[str] = None) -> DeviceProfile:
+        """Return the profile for ``serial``, refreshing expired ``fields`` in one round trip.
+
+        Args:
+            fields: Profile field names the caller needs; defaults to all.
+            force: Re-read every requested field regardless of age.
+            adb_path: adb executable for the fallback when no adb server is running.
+        """
+        with self._lock:
+            profile = self._profiles.setdefault(serial, DeviceProfile(serial))
+            serial_lock = self._locks.setdefault(serial, threading.Lock())
+        # One snapshot per device at a time; concurrent callers reuse its result
+        with serial_lock:
+            if force:
+                sections = list(dict.fromkeys(FIELD_SOURCES[name][0] for name in fields or FIELD_SOURCES))
+                if "battery" in sections:
+                    sections.append("capacity")
+            else:
+                sections = profile.stale_sections(fields)
+            if sections:
+                success, output = self.runner(serial, build_snapshot_script(sections), adb_path)
+                self.round_trips += 1
+                if not success:
+                    raise RuntimeError(output or f"Snapshot of {serial} failed")
+                profile.apply(split_snapshot(output))
+        return profile
+
+    def invalidate(self, serial: Optional[str] = None):
+        """Drop cached profiles for ``serial`` (or every device)."""
+        with self._lock:
+            if serial is None:
+                self._profiles.clear()
+            else:
+                self._profiles.pop(serial, None)
+
+
+def _run_snapshot(serial, script, adb_path=None):
+    success, stdout, stderr = run_adb_command(["shell", script], serial, SHORT_ADB_TIMEOUT * 3, adb_path)
+    # The script always ends in a section command that may fail harmlessly
+    return (success or SECTION_MARKER in stdout), (stdout if SECTION_MARKER in stdout else stderr)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_profile_cache() -> DeviceProfileCache:
+    """Return the process-wide :class:`DeviceProfileCache`."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DeviceProfileCache()
+        return _cache
+
+
+__all__ = [
+    "DeviceProfile",
+    "DeviceProfileCache",
+    "FIELD_SOURCES",
+    "SNAPSHOT_SECTIONS",
+    "build_snapshot_script",
+    "get_profile_cache",
+    "parse_getprop",
+    "split_snapshot",
+]
@@ -11,12 +11,20 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+import threading
 import time
 import uuid
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 
 GENESIS_HASH = "0" * 64
 
@@ -30,25 +38,52 @@ class EvidenceLog:
 
     Each entry's hash is computed over its own content plus the previous
     entry's hash, so any edit, reorder, or deletion of a prior line breaks
-    the chain. ``verify()`` walks the whole file and recomputes the chain
-    to detect tampering.
+    the chain. ``verify()`` recomputes the chain to detect tampering.
+
+    Appends are O(1): the tail hash is kept in memory and only the bytes
+    other processes appended since the last call are read. An exclusive
+    lock on ``<log>.lock`` serialises appends across processes.
+
+    A sidecar index (``<log>.idx``, JSON lines, append-only) records each
+    entry's byte offset, hash, action and image path, plus checkpoints
+    written by ``verify()`` every ``CHECKPOINT_INTERVAL`` verified entries.
+    ``find()``/``latest()`` seek straight to matching entries, and
+    ``verify()`` resumes from the last checkpoint that still matches the
+    log. ``verify(full=True)`` rechecks the chain from the first entry.
+    The index is derived data: it is rebuilt from the log whenever the two
+    disagree.
     """
 
+    CHECKPOINT_INTERVAL = 1000
+
     def __init__(self, path: Path):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
         if not self.path.exists():
             self.path.touch()
-
-    def _last_hash(self) -> str:
-        last = GENESIS_HASH
-        if self.path.exists() and self.path.stat().st_size:
-            with open(self.path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        last = json.loads(line)["entry_hash"]
-        return last
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._thread_lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._loaded = False
+        self._size = 0
+        self._index_size = 0
+        self._tail = GENESIS_HASH
+        self._spans = []
+        self._hashes = []
+        self._keys = {}
+        self._checkpoints = []
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock, open(self.lock_path, "a+b") as handle:
+            _lock_file(handle)
+            try:
+                yield
+            finally:
+                _unlock_file(handle)
 
     @staticmethod
     def _hash_entry(prev_hash: str, timestamp: str, action: str, details: dict) -> str:
@@ -58,23 +93,149 @@ class EvidenceLog:
         ).encode("utf-8")
         return hashlib.sha256(payload).hexdigest()
 
+    # -- index maintenance (call with the lock held) ----------------------
+
+    def _sync(self):
+        """Bring the in-memory tail and index up to date with the files on disk."""
+        if not self._loaded:
+            self._load_index()
+        elif self.index_path.exists() and self.index_path.stat().st_size > self._index_size:
+            # Another process appended; pick up its index lines
+            try:
+                self._read_index(self._index_size)
+            except (ValueError, KeyError, TypeError):
+                self._rebuild()
+
+        size = self.path.stat().st_size
+        if size < self._size or not self._at_line_boundary(self._size):
+            # The log shrank or was rewritten under us; start over from its contents
+            self._rebuild()
+        elif size > self._size:
+            self._ingest_log(size)
+
+    def _load_index(self):
+        self._loaded = True
+        if self.index_path.exists():
+            try:
+                self._read_index(0)
+                return
+            except (ValueError, KeyError, TypeError):
+                pass
+        self._rebuild()
+
+    def _read_index(self, start):
+        with open(self.index_path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        for raw in data[:end].splitlines():
+            if not raw.strip():
+                continue
+            record = json.loads(raw)
+            if "checkpoint" in record:
+                self._checkpoints.append((record["checkpoint"], record["offset"], record["entry_hash"]))
+                continue
+            if record["n"] != len(self._spans) or record["offset"] < self._size:
+                raise ValueError("evidence index out of step with the log")
+            self._add(record["offset"], record["length"], record["entry_hash"],
+                      record.get("action"), record.get("image_path"))
+        self._index_size = start + end
+        if self._size > self.path.stat().st_size:
+            raise ValueError("evidence index describes entries the log does not have")
+
+    def _rebuild(self):
+        self._reset()
+        self._loaded = True
+        self.index_path.write_bytes(b"")
+        self._ingest_log(self.path.stat().st_size)
+
+    def _at_line_boundary(self, offset):
+        if offset == 0:
+            return True
+        with open(self.path, "rb") as f:
+            f.seek(offset - 1)
+            return f.read(1) == b"\n"
+
+    def _ingest_log(self, size):
+        """Index log lines between the indexed size and ``size`` (e.g. written by a crashed process)."""
+        with open(self.path, "rb") as f:
+            f.seek(self._size)
+            data = f.read(size - self._size)
+        end = data.rfind(b"\n") + 1
+        offset = self._size
+        records = []
+        for raw in data[:end].splitlines(keepends=True):
+            if raw.strip():
+                try:
+                    entry = json.loads(raw)
+                    details = entry.get("details") or {}
+                    entry_hash, action = entry["entry_hash"], entry["action"]
+                    image_path = details.get("image_path") if isinstance(details, dict) else None
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    entry_hash = action = image_path = None
+                records.append(self._add(offset, len(raw), entry_hash, action, image_path))
+            else:
+                self._size += len(raw)
+            offset += len(raw)
+        self._append_index(records)
+
+    def _add(self, offset, length, entry_hash, action, image_path):
+        number = len(self._spans)
+        self._spans.append((offset, length))
+        self._hashes.append(entry_hash)
+        if entry_hash:
+            self._tail = entry_hash
+        for key in (("action", action), ("image_path", image_path)):
+            if key[1]:
+                self._keys.setdefault(key, []).append(number)
+        self._size = offset + length
+        record = {"n": number, "offset": offset, "length": length, "entry_hash": entry_hash, "action": action}
+        if image_path:
+            record["image_path"] = image_path
+        return record
+
+    def _append_index(self, records):
+        if not records:
+            return
+        data = "".join(json.dumps(record, sort_keys=True) + "\n" for record in records).encode("utf-8")
+        with open(self.index_path, "ab") as f:
+            f.write(data)
+        self._index_size += len(data)
+
+    # -- public API -------------------------------------------------------
+
     def record(self, action: str, details: Optional[dict] = None) -> dict:
         """Append a new immutable entry and return it."""
         details = details or {}
-        prev_hash = self._last_hash()
-        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S%z")
-        entry_hash = self._hash_entry(prev_hash, timestamp, action, details)
-        entry = {
-            "timestamp": timestamp,
-            "action": action,
-            "details": details,
-            "prev_hash": prev_hash,
-            "entry_hash": entry_hash,
-        }
-        with open(self.path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, sort_keys=True) + "\n")
+        with self._locked():
+            self._sync()
+            prev_hash = self._tail
+            timestamp = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+            entry_hash = self._hash_entry(prev_hash, timestamp, action, details)
+            entry = {
+                "timestamp": timestamp,
+                "action": action,
+                "details": details,
+                "prev_hash": prev_hash,
+                "entry_hash": entry_hash,
+            }
+            line = (json.dumps(entry, sort_keys=True) + "\n").encode("utf-8")
+            with open(self.path, "ab") as f:
+                f.write(line)
+            self._append_index([self._add(self._size, len(line), entry_hash, action, details.get("image_path"))])
         return entry
 
+    @property
+    def last_hash(self) -> str:
+        with self._locked():
+            self._sync()
+            return self._tail
+
+    def __len__(self) -> int:
+        with self._locked():
+            self._sync()
+            return len(self._spans)
+
     def entries(self) -> list:
         out = []
         if self.path.exists():
@@ -85,19 +246,119 @@ class EvidenceLog:
                         out.append(json.loads(line))
         return out
 
-    def verify(self) -> tuple:
-        """Recompute the hash chain. Returns (is_intact, first_break_index_or_None)."""
-        prev_hash = GENESIS_HASH
-        for idx, entry in enumerate(self.entries()):
-            if entry["prev_hash"] != prev_hash:
-                return False, idx
-            expected = self._hash_entry(
-                entry["prev_hash"], entry["timestamp"], entry["action"], entry["details"]
-            )
-            if expected != entry["entry_hash"]:
-                return False, idx
-            prev_hash = entry["entry_hash"]
-        return True, None
+    def find(self, action: Optional[str] = None, image_path: Optional[str] = None) -> list:
+        """Entries with the given action and/or ``details["image_path"]``, oldest first."""
+        with self._locked():
+            self._sync()
+            keys = [key for key in (("action", action), ("image_path", image_path)) if key[1] is not None]
+            if not keys:
+                return self.entries()
+            candidates = [set(self._keys.get(key, ())) for key in keys]
+            numbers = sorted(set.intersection(*candidates))
+            spans = [self._spans[number] for number in numbers]
+        out = []
+        with open(self.path, "rb") as f:
+            for offset, length in spans:
+                f.seek(offset)
+                out.append(json.loads(f.read(length)))
+        return out
+
+    def latest(self, action: str, image_path: Optional[str] = None) -> Optional[dict]:
+        """The most recent entry matching :meth:`find`, or None."""
+        matches = self.find(action, image_path)
+        return matches[-1] if matches else None
+
+    def verify(self, full: bool = False) -> tuple:
+        """Recompute the hash chain. Returns (is_intact, first_break_index_or_None).
+
+        Resumes from the last checkpoint that still matches the log unless
+        ``full`` is set.
+        """
+        with self._locked():
+            self._sync()
+            number, offset, prev_hash = 0, 0, GENESIS_HASH
+            last_checkpoint = max((cp[0] for cp in self._checkpoints), default=0)
+            if not full:
+                for checkpoint in sorted(self._checkpoints, reverse=True):
+                    if self._checkpoint_holds(*checkpoint):
+                        number, offset, prev_hash = checkpoint
+                        break
+
+            checkpoints = []
+            try:
+                with open(self.path, "rb") as f:
+                    f.seek(offset)
+                    for raw in f:
+                        offset += len(raw)
+                        line = raw.strip()
+                        if not line:
+                            continue
+                        try:
+                            entry = json.loads(line)
+                            intact = entry["prev_hash"] == prev_hash and entry["entry_hash"] == self._hash_entry(
+                                entry["prev_hash"], entry["timestamp"], entry["action"], entry["details"]
+                            )
+                        except (ValueError, KeyError, TypeError):
+                            intact = False
+                        if not intact:
+                            return False, number
+                        prev_hash = entry["entry_hash"]
+                        number += 1
+                        if number % self.CHECKPOINT_INTERVAL == 0 and number > last_checkpoint:
+                            checkpoints.append((number, offset, prev_hash))
+                if number > max(last_checkpoint, checkpoints[-1][0] if checkpoints else 0):
+                    checkpoints.append((number, offset, prev_hash))
+            finally:
+                self._save_checkpoints(checkpoints)
+            return True, None
+
+    def _checkpoint_holds(self, number, offset, entry_hash) -> bool:
+        """True if entry ``number - 1`` still ends at ``offset`` with hash ``entry_hash``."""
+        if not 0 < number <= len(self._spans):
+            return False
+        start, length = self._spans[number - 1]
+        if start + length != offset or self._hashes[number - 1] != entry_hash:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            try:
+                return json.loads(f.read(length)).get("entry_hash") == entry_hash
+            except ValueError:
+                return False
+
+    def _save_checkpoints(self, checkpoints):
+        if not checkpoints:
+            return
+        self._checkpoints.extend(checkpoints)
+        data = "".join(
+            json.dumps({"checkpoint": number, "offset": offset, "entry_hash": entry_hash}, sort_keys=True) + "\n"
+            for number, offset, entry_hash in checkpoints
+        ).encode("utf-8")
+        with open(self.index_path, "ab") as f:
+            f.write(data)
+        self._index_size += len(data)
+
+
+if fcntl is not None:
+    def _lock_file(handle):
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(handle):
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+else:
+    def _lock_file(handle):
+        handle.seek(0)
+        while True:
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK gives up after ~10 seconds; keep waiting for the other writer
+                continue
+
+    def _unlock_file(handle):
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
 
 
 def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
@@ -233,7 +494,8 @@ class ChainOfCustodyReport:
     @staticmethod
     def generate(case: CaseManager, device_info: dict, acquisition_summary: dict, output_path: Path) -> Path:
         output_path = Path(output_path)
-        intact, break_idx = case.evidence_log.verify()
+        # A report vouches for the whole log, so do not trust earlier checkpoints
+        intact, break_idx = case.evidence_log.verify(full=True)
 
         try:
             return ChainOfCustodyReport._generate_pdf(
@@ -0,0 +1,409 @@
+"""
+DROIDCOM - Parallel file transfers over the adb sync protocol.
+
+Pulls and pushes whole trees through the adb server's ``sync:`` service
+instead of spawning one ``adb pull``/``adb push`` process per path:
+
+* A device tree is walked with LIST requests on a single sync session.
+* Files are copied by several workers at once, each on its own pooled
+  sync session.
+* Files whose size and mtime already match on the destination are skipped.
+  Pulled files get the device mtime so the next run can compare them.
+* Pulls are written to a ``.part`` file named after the source size and
+  mtime. An interrupted pull of an unchanged file resumes from the bytes
+  already on disk; the remainder is read through ``exec:tail -c +N``
+  because sync RECV has no offset. The same exec runs ``stat`` first, and
+  a part only counts as finished at the file's real size. SEND cannot
+  append, so an interrupted push sends the file again.
+* Progress from all workers is aggregated into one :class:`TransferStats`.
+
+Sync v1 reports sizes in 32 bits, so sizes of files of 4 GiB or more are
+compared modulo 2**32.
+
+This module has no Qt/UI dependency so it can be unit tested in isolation.
+"""
+
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import posixpath
+import shlex
+import stat as stat_module
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .adb_client import SYNC_DATA_MAX, AdbClient, AdbError, get_adb_client
+from .utils import format_bytes
+
+DEFAULT_STREAMS = 4
+PART_SUFFIX = ".part"
+PROGRESS_INTERVAL = 0.25
+_SIZE_MASK = 0xFFFFFFFF
+
+logger = logging.getLogger(__name__)
+
+
+class TransferCancelled(Exception):
+    """Raised inside a worker when the transfer's cancel event is set."""
+
+
+@dataclass
+class TransferItem:
+    """One file to copy. ``size`` is None when it is not known up front."""
+
+    source: str
+    target: str
+    size: Optional[int]
+    mtime: int
+    mode: int = 0o644
+
+
+@dataclass
+class TransferStats:
+    """Aggregate progress of a transfer, shared by all of its workers."""
+
+    files_total: int = 0
+    files_done: int = 0
+    files_skipped: int = 0
+    bytes_total: int = 0
+    bytes_done: int = 0
+    bytes_resumed: int = 0
+    errors: list = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second actually moved (skipped and resumed bytes excluded)."""
+        elapsed = self.elapsed
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        text = f"{self.files_done}/{self.files_total} files"
+        if self.files_skipped:
+            text += f" ({self.files_skipped} unchanged)"
+        text += f", {format_bytes(self.bytes_done)} at {format_bytes(self.throughput)}/s"
+        if self.errors:
+            text += f", {len(self.errors)} failed"
+        return text
+
+
+class FileTransfer:
+    """Copies files between this computer and one device.
+
+    Args:
+        serial (str): Device serial (None for the only attached device).
+        client (AdbClient): adb server client; the process-wide one by default.
+        streams (int): Files copied in parallel.
+        progress (callable): Called with the :class:`TransferStats` at most
+            every ``PROGRESS_INTERVAL`` seconds and once at the end.
+        cancel (threading.Event): Stops the transfer between chunks when set.
+        skip_unchanged (bool): Skip files whose size and mtime already match.
+    """
+
+    def __init__(self, serial: Optional[str], client: Optional[AdbClient] = None,
+                 streams: int = DEFAULT_STREAMS, progress: Optional[Callable] = None,
+                 cancel: Optional[threading.Event] = None, skip_unchanged: bool = True):
+        self.serial = serial
+        self.client = client or get_adb_client()
+        self.streams = max(1, streams)
+        self.progress = progress
+        self.cancel = cancel or threading.Event()
+        self.skip_unchanged = skip_unchanged
+        self.stats = TransferStats()
+        self._remote_listing = {}
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+
+    # -- pulls ------------------------------------------------------------
+
+    def pull(self, remote: str, local: str) -> TransferStats:
+        """Copy the device file or directory ``remote`` to ``local``.
+
+        Like ``adb pull``, an existing local directory receives the source
+        under its own name.
+        """
+        with self.client.sync(self.serial) as sync:
+            root = self._remote_stat(sync, remote)
+            if not root.exists:
+                raise AdbError(f"remote object '{remote}' does not exist")
+            if os.path.isdir(local):
+                local = os.path.join(local, posixpath.basename(remote.rstrip("/")) or "root")
+            if root.is_dir:
+                items = self._walk_remote(sync, remote, local)
+            else:
+                items = [self._remote_item(remote, local, root)]
+        return self._run(items, self._pull_one, self._local_unchanged)
+
+    def pull_files(self, pairs) -> TransferStats:
+        """Copy individual device files, given as ``(remote, local)`` paths."""
+        items = []
+        with self.client.sync(self.serial) as sync:
+            for remote, local in pairs:
+                st = sync.stat(remote)
+                if st.exists and not st.is_dir:
+                    items.append(self._remote_item(remote, local, st))
+                else:
+                    self.stats.errors.append((remote, "not a file"))
+        return self._run(items, self._pull_one, self._local_unchanged)
+
+    @staticmethod
+    def _remote_stat(sync, path):
+        st = sync.stat(path)
+        if stat_module.S_ISLNK(st.mode):
+            # STAT does not follow links; a trailing slash resolves directory links such as /sdcard
+            target = sync.stat(path.rstrip("/") + "/")
+            if target.exists:
+                return target
+        return st
+
+    @staticmethod
+    def _remote_item(remote, local, st):
+        # A link's own size says nothing about the file it points to
+        size = None if stat_module.S_ISLNK(st.mode) else st.size
+        return TransferItem(remote, local, size, st.mtime, stat_module.S_IMODE(st.mode))
+
+    def _walk_remote(self, sync, remote, local):
+        items = []
+        pending = [(remote.rstrip("/") or "/", local)]
+        while pending:
+            remote_dir, local_dir = pending.pop()
+            os.makedirs(local_dir, exist_ok=True)
+            for entry in sync.list(remote_dir):
+                source = posixpath.join(remote_dir, entry.name)
+                target = os.path.join(local_dir, entry.name)
+                if entry.is_dir:
+                    pending.append((source, target))
+                elif entry.is_file:
+                    items.append(self._remote_item(source, target, entry))
+                elif stat_module.S_ISLNK(entry.mode) and not sync.stat(source + "/").exists:
+                    # Links to files are copied; links to directories are not followed
+                    items.append(self._remote_item(source, target, entry))
+        return items
+
+    @staticmethod
+    def _local_unchanged(item):
+        try:
+            st = os.stat(item.target)
+        except OSError:
+            return False
+        return item.size is not None and st.st_size & _SIZE_MASK == item.size and int(st.st_mtime) == item.mtime
+
+    def _pull_one(self, item):
+        os.makedirs(os.path.dirname(item.target) or ".", exist_ok=True)
+        part = f"{item.target}.{item.size}-{item.mtime}{PART_SUFFIX}"
+        for stale in glob.glob(f"{glob.escape(item.target)}.*-*{PART_SUFFIX}"):
+            if stale != part:
+                os.remove(stale)
+
+        offset = os.path.getsize(part) if item.size is not None and os.path.exists(part) else 0
+        # Even a part whose length matches goes through _resume: sync sizes are
+        # only 32 bits, so only the device's real size can say it is complete
+        if not (offset and self._resume(item, part, offset)):
+            with open(part, "wb") as out, self.client.sync(self.serial) as sync:
+                sync.recv(item.source, self._writer(out.write), progress=self._advance)
+
+        os.replace(part, item.target)
+        os.utime(item.target, (item.mtime, item.mtime))
+
+    def _resume(self, item, part, offset):
+        """Append the rest of ``item`` to ``part``; False if the result is not complete.
+
+        One exec prints the file's real size and then streams everything
+        after ``offset``, so a part is accepted only at exactly that size.
+        """
+        path = shlex.quote(item.source)
+        command = f"stat -c %s {path} 2>/dev/null && tail -c +{offset + 1} {path} 2>/dev/null"
+        real_size = None
+        with open(part, "ab") as out, self.client.open_exec(self.serial, command) as conn:
+            write = self._writer(out.write)
+            header = b""
+            while True:
+                chunk = conn.sock.recv(SYNC_DATA_MAX)
+                if not chunk:
+                    break
+                if real_size is None:
+                    header += chunk
+                    line, newline, chunk = header.partition(b"\n")
+                    if not newline:
+                        continue
+                    if not line.strip().isdigit() or int(line) & _SIZE_MASK != item.size or int(line) < offset:
+                        break
+                    real_size = int(line)
+                if chunk:
+                    write(chunk)
+                    self._advance(len(chunk))
+        if real_size is not None and os.path.getsize(part) == real_size:
+            with self._lock:
+                self.stats.bytes_resumed += offset
+            return True
+        logger.info("Resuming %s failed, pulling it again", item.source)
+        return False
+
+    # -- pushes -----------------------------------------------------------
+
+    def push(self, local: str, remote: str) -> TransferStats:
+        """Copy the local file or directory ``local`` to ``remote`` on the device.
+
+        Like ``adb push``, an existing device directory receives the source
+        under its own name.
+        """
+        if not os.path.exists(local):
+            raise FileNotFoundError(local)
+        with self.client.sync(self.serial) as sync:
+            if self._remote_stat(sync, remote).is_dir:
+                remote = posixpath.join(remote, os.path.basename(os.path.normpath(local)))
+            items = self._walk_local(local, remote)
+            self._remote_listing = self._list_remote_dirs(sync, items) if self.skip_unchanged else {}
+        return self._run(items, self._push_one, self._remote_unchanged)
+
+    @staticmethod
+    def _local_item(source, target):
+        st = os.stat(source)
+        return TransferItem(source, target, st.st_size, int(st.st_mtime), stat_module.S_IMODE(st.st_mode))
+
+    def _walk_local(self, local, remote):
+        if not os.path.isdir(local):
+            return [self._local_item(local, remote)]
+        items = []
+        for dirpath, _, filenames in os.walk(local):
+            relative = os.path.relpath(dirpath, local)
+            remote_dir = remote if relative == "." else posixpath.join(remote, *relative.split(os.sep))
+            for name in filenames:
+                source = os.path.join(dirpath, name)
+                if os.path.isfile(source):
+                    items.append(self._local_item(source, posixpath.join(remote_dir, name)))
+        return items
+
+    @staticmethod
+    def _list_remote_dirs(sync, items):
+        """One LIST per destination directory instead of one STAT per file."""
+        listing = {}
+        for directory in sorted({posixpath.dirname(item.target) for item in items}):
+            try:
+                listing[directory] = {entry.name: entry for entry in sync.list(directory)}
+            except AdbError:
+                listing[directory] = {}
+        return listing
+
+    def _remote_unchanged(self, item):
+        entry = self._remote_listing.get(posixpath.dirname(item.target), {}).get(posixpath.basename(item.target))
+        return entry is not None and entry.is_file and entry.size == item.size & _SIZE_MASK and entry.mtime == item.mtime
+
+    def _push_one(self, item):
+        with open(item.source, "rb") as f, self.client.sync(self.serial) as sync:
+            sync.send(item.target, self._reader(f.read), mode=item.mode, mtime=item.mtime,
+                      progress=self._advance)
+
+    # -- shared machinery -------------------------------------------------
+
+    def _run(self, items, copy, unchanged):
+        stats = self.stats
+        todo = []
+        targets = set()
+        for item in items:
+            stats.files_total += 1
+            # Parallel copies to one target would share (and delete) its .part file
+            key = os.path.normcase(os.path.normpath(item.target))
+            if key in targets:
+                stats.errors.append((item.source, f"duplicate target {item.target}"))
+                continue
+            targets.add(key)
+            if self.skip_unchanged and unchanged(item):
+                stats.files_skipped += 1
+                stats.files_done += 1
+            else:
+                stats.bytes_total += item.size or 0
+                todo.append(item)
+
+        # Largest first so one big file does not start last and run alone
+        todo.sort(key=lambda item: item.size or 0, reverse=True)
+
+        def work(item):
+            if self.cancel.is_set():
+                return
+            try:
+                copy(item)
+            except TransferCancelled:
+                return
+            except (AdbError, OSError) as exc:
+                logger.warning("Transfer of %s failed: %s", item.source, exc)
+                with self._lock:
+                    stats.errors.append((item.source, str(exc)))
+                return
+            with self._lock:
+                stats.files_done += 1
+            self._report()
+
+        if todo:
+            with ThreadPoolExecutor(max_workers=min(self.streams, len(todo))) as pool:
+                list(pool.map(work, todo))
+        stats.finished = time.monotonic()
+        self._report(force=True)
+        return stats
+
+    def _writer(self, write):
+        def checked(chunk):
+            if self.cancel.is_set():
+                raise TransferCancelled()
+            write(chunk)
+        return checked
+
+    def _reader(self, read):
+        def checked(size):
+            if self.cancel.is_set():
+                raise TransferCancelled()
+            return read(size)
+        return checked
+
+    def _advance(self, count):
+        with self._lock:
+            self.stats.bytes_done += count
+        self._report()
+
+    def _report(self, force=False):
+        if not self.progress:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_report < PROGRESS_INTERVAL:
+                return
+            self._last_report = now
+        try:
+            self.progress(self.stats)
+        except Exception:
+            logger.exception("Transfer progress callback failed")
+
+
+def pull(serial, remote, local, **kwargs) -> TransferStats:
+    """Shortcut for ``FileTransfer(serial, **kwargs).pull(remote, local)``."""
+    return FileTransfer(serial, **kwargs).pull(remote, local)
+
+
+def push(serial, local, remote, **kwargs) -> TransferStats:
+    """Shortcut for ``FileTransfer(serial, **kwargs).push(local, remote)``."""
+    return FileTransfer(serial, **kwargs).push(local, remote)
+
+
+__all__ = [
+    "DEFAULT_STREAMS",
+    "FileTransfer",
+    "TransferCancelled",
+    "TransferItem",
+    "TransferStats",
+    "pull",
+    "push",
+]
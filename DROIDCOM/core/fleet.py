@@ -0,0 +1,226 @@
+"""
+DROIDCOM - Fan-out of device operations over many attached devices.
+
+:class:`FleetExecutor` runs an operation against a set of serials at once:
+
+* Each device has its own FIFO queue and runs at most one operation at a
+  time, so two jobs never compete for the same phone's adb transport.
+* A shared thread pool bounds how many devices are worked on concurrently.
+  After each job a device goes to the back of the pool's queue, so a
+  device with a long backlog cannot starve the others.
+* A :class:`FleetRun` aggregates the per-device outcome of one fan-out and
+  reports every state change, which is what the results view renders.
+
+Operations are plain callables taking the serial. They return a message
+(success), an ``(ok, message)`` tuple, or raise.
+
+This module has no Qt/UI dependency so it can be unit tested in isolation.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+DEFAULT_MAX_WORKERS = 8
+
+QUEUED = "Queued"
+RUNNING = "Running"
+SUCCEEDED = "OK"
+FAILED = "Failed"
+CANCELLED = "Cancelled"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeviceResult:
+    """Outcome of one operation on one device."""
+
+    serial: str
+    label: str
+    status: str = QUEUED
+    message: str = ""
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED, CANCELLED)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        return (self.finished or time.monotonic()) - self.started
+
+
+class FleetRun:
+    """One operation fanned out over several devices.
+
+    Args:
+        label (str): Operation name shown in results.
+        on_update (callable): Called with a :class:`DeviceResult` from a
+            worker thread whenever that device's state changes.
+    """
+
+    def __init__(self, label: str, on_update: Optional[Callable] = None):
+        self.label = label
+        self.on_update = on_update
+        self.results = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _update(self, result, status, message=None):
+        with self._lock:
+            result.status = status
+            if message is not None:
+                result.message = message
+            if status == RUNNING:
+                result.started = time.monotonic()
+            elif result.done:
+                result.finished = time.monotonic()
+        if self.on_update:
+            try:
+                self.on_update(result)
+            except Exception:
+                logger.exception("Fleet result callback failed")
+
+    @property
+    def done(self) -> bool:
+        return all(result.done for result in self.results.values())
+
+    def counts(self) -> dict:
+        counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED)}
+        for result in self.results.values():
+            counts[result.status] += 1
+        return counts
+
+    def summary(self) -> str:
+        counts = self.counts()
+        text = f"{counts[SUCCEEDED] + counts[FAILED]}/{len(self.results)} done, {counts[FAILED]} failed"
+        if counts[CANCELLED]:
+            text += f", {counts[CANCELLED]} cancelled"
+        return text
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every device finished; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in list(self._futures.values()):
+            try:
+                future.result(None if deadline is None else max(0, deadline - time.monotonic()))
+            except CancelledError:
+                pass
+            except FutureTimeout:
+                return False
+        return self.done
+
+    def cancel(self):
+        """Drop the devices whose turn has not come yet; running ones finish."""
+        for serial, future in self._futures.items():
+            if future.cancel():
+                self._update(self.results[serial], CANCELLED)
+
+
+class FleetExecutor:
+    """Per-device job queues drained by one bounded thread pool.
+
+    Args:
+        max_workers (int): Devices worked on at the same time.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fleet")
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    def submit(self, serial: str, operation: Callable) -> Future:
+        """Queue ``operation(serial)`` behind the device's earlier jobs."""
+        future = Future()
+        with self._lock:
+            queue = self._queues.get(serial)
+            idle = queue is None
+            if idle:
+                queue = self._queues[serial] = deque()
+            queue.append((future, operation))
+        if idle:
+            self._pool.submit(self._drain, serial)
+        return future
+
+    def _drain(self, serial):
+        with self._lock:
+            future, operation = self._queues[serial].popleft()
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(operation(serial))
+            except BaseException as exc:
+                future.set_exception(exc)
+        with self._lock:
+            if not self._queues[serial]:
+                del self._queues[serial]
+                return
+        # Requeue behind the other devices instead of looping on this one
+        self._pool.submit(self._drain, serial)
+
+    def pending(self, serial: str) -> int:
+        with self._lock:
+            return len(self._queues.get(serial, ()))
+
+    def run(self, serials, operation: Callable, label: str, on_update: Optional[Callable] = None) -> FleetRun:
+        """Apply ``operation`` to every serial and aggregate the results."""
+        fleet_run = FleetRun(label, on_update)
+        for serial in dict.fromkeys(serials):
+            result = fleet_run.results[serial] = DeviceResult(serial, label)
+            fleet_run._futures[serial] = self.submit(
+                serial, lambda device, result=result: self._run_one(fleet_run, result, operation, device)
+            )
+        return fleet_run
+
+    @staticmethod
+    def _run_one(fleet_run, result, operation, serial):
+        fleet_run._update(result, RUNNING)
+        try:
+            outcome = operation(serial)
+        except Exception as exc:
+            logger.info("Fleet operation %s failed on %s: %s", result.label, serial, exc)
+            fleet_run._update(result, FAILED, str(exc) or exc.__class__.__name__)
+            return None
+        ok, message = outcome if isinstance(outcome, tuple) else (True, outcome)
+        fleet_run._update(result, SUCCEEDED if ok else FAILED, "" if message is None else str(message))
+        return outcome
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_fleet_executor() -> FleetExecutor:
+    """Return the process-wide :class:`FleetExecutor`."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = FleetExecutor()
+        return _executor
+
+
+__all__ = [
+    "CANCELLED",
+    "DeviceResult",
+    "FAILED",
+    "FleetExecutor",
+    "FleetRun",
+    "QUEUED",
+    "RUNNING",
+    "SUCCEEDED",
+    "get_fleet_executor",
+]
@@ -0,0 +1,394 @@
+"""
+DROIDCOM - Streaming acquisition images.
+
+Writes an incoming ``tar`` stream to disk while hashing it and indexing its
+members in the same pass, so a finished acquisition needs no second read:
+
+* Every chunk is handed to one hashing thread per algorithm (SHA-256 plus
+  optionally MD5/SHA-1). ``hashlib`` releases the GIL while digesting, so
+  the digests run alongside the next read and write.
+* A tar header parser follows the stream and records where each member's
+  header and data start. The index is stored next to the image, so a
+  single file can later be read with one seek instead of scanning a
+  100 GB archive.
+
+This module has no Qt/UI dependency so it can be unit tested in isolation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+CHUNK_SIZE = 1024 * 1024
+BLOCK_SIZE = 512
+DEFAULT_ALGORITHMS = ("sha256",)
+SUPPORTED_ALGORITHMS = ("sha256", "sha1", "md5")
+INDEX_VERSION = 1
+PROGRESS_INTERVAL = 1.0
+
+# Tar type flags that carry file data
+_DATA_TYPES = {"0", "\0", "7"}
+# GNU long name/link and pax headers describe the member that follows
+_META_TYPES = {"L", "K", "x"}
+
+
+@dataclass
+class TarMember:
+    """One archive member and where it lives inside the image."""
+
+    name: str
+    type: str
+    size: int
+    mode: int
+    mtime: int
+    header_offset: int
+    offset: int
+    linkname: str = ""
+
+    @property
+    def is_file(self) -> bool:
+        return self.type in _DATA_TYPES
+
+
+def _octal(field_bytes: bytes) -> int:
+    """Decode a numeric header field (octal text, or GNU base-256)."""
+    if field_bytes and field_bytes[0] & 0x80:
+        return int.from_bytes(bytes([field_bytes[0] & 0x7F]) + field_bytes[1:], "big")
+    text = field_bytes.split(b"\0", 1)[0].strip()
+    return int(text, 8) if text else 0
+
+
+def _text(field_bytes: bytes) -> str:
+    return field_bytes.split(b"\0", 1)[0].decode("utf-8", errors="surrogateescape")
+
+
+def _parse_pax(data: bytes) -> dict:
+    records = {}
+    pos = 0
+    while pos < len(data):
+        space = data.find(b" ", pos)
+        if space < 0:
+            break
+        try:
+            length = int(data[pos:space])
+        except ValueError:
+            break
+        if length <= 0:
+            break
+        key, _, value = data[space + 1:pos + length - 1].partition(b"=")
+        records[key.decode("utf-8", errors="replace")] = value.decode("utf-8", errors="surrogateescape")
+        pos += length
+    return records
+
+
+class TarIndexer:
+    """Incremental tar header parser fed with consecutive stream chunks.
+
+    Understands ustar, GNU long names and pax path/size overrides. Indexing
+    stops at the end-of-archive block, or at the first malformed header
+    (``error`` is set then; the image itself is unaffected).
+    """
+
+    def __init__(self):
+        self.members = []
+        self.offset = 0
+        self.finished = False
+        self.error = None
+        self._header = bytearray()
+        self._skip = 0
+        self._meta = None
+        self._meta_type = None
+        self._meta_remaining = 0
+        self._long_name = None
+        self._long_link = None
+        self._pax = {}
+
+    @property
+    def complete(self) -> bool:
+        return self.finished and self.error is None
+
+    def feed(self, data: bytes):
+        try:
+            self._feed(data)
+        except (ValueError, UnicodeError) as exc:
+            self.error = f"Unreadable tar header near offset {self.offset}: {exc}"
+            self.finished = True
+
+    def _feed(self, data: bytes):
+        view = memoryview(data)
+        pos = 0
+        end = len(view)
+        while pos < end and not self.finished:
+            if self._skip:
+                count = min(self._skip, end - pos)
+                if self._meta is not None and self._meta_remaining:
+                    take = min(count, self._meta_remaining)
+                    self._meta += view[pos:pos + take]
+                    self._meta_remaining -= take
+                self._skip -= count
+                pos += count
+                self.offset += count
+                if not self._skip and self._meta is not None:
+                    self._finish_meta()
+                continue
+            take = min(BLOCK_SIZE - len(self._header), end - pos)
+            self._header += view[pos:pos + take]
+            pos += take
+            self.offset += take
+            if len(self._header) == BLOCK_SIZE:
+                block = bytes(self._header)
+                self._header.clear()
+                self._parse_header(block)
+
+    def _parse_header(self, block: bytes):
+        if not block.strip(b"\0"):
+            self.finished = True
+            return
+        try:
+            checksum = _octal(block[148:156])
+        except ValueError:
+            checksum = -1
+        if checksum != sum(block[:148]) + 8 * 32 + sum(block[156:]):
+            self.error = f"Bad tar header checksum at offset {self.offset - BLOCK_SIZE}"
+            self.finished = True
+            return
+
+        type_flag = chr(block[156])
+        size = _octal(block[124:136])
+        if type_flag in _META_TYPES:
+            self._meta = bytearray()
+            self._meta_type = type_flag
+            self._meta_remaining = size
+            self._skip = -(-size // BLOCK_SIZE) * BLOCK_SIZE
+            if not self._skip:
+                self._finish_meta()
+            return
+        if type_flag == "g":
+            self._skip = -(-size // BLOCK_SIZE) * BLOCK_SIZE
+            return
+
+        name = _text(block[0:100])
+        # Only POSIX ustar has a name prefix; old GNU headers keep times there
+        if block[257:263] == b"ustar\0" and block[345]:
+            name = f"{_text(block[345:500])}/{name}"
+        name = self._pax.get("path") or self._long_name or name
+        linkname = self._pax.get("linkpath") or self._long_link or _text(block[157:257])
+        if "size" in self._pax:
+            size = int(self._pax["size"])
+        mtime = int(float(self._pax["mtime"])) if "mtime" in self._pax else _octal(block[136:148])
+        self.members.append(TarMember(
+            name=name,
+            type=type_flag,
+            size=size if type_flag in _DATA_TYPES else 0,
+            mode=_octal(block[100:108]),
+            mtime=mtime,
+            header_offset=self.offset - BLOCK_SIZE,
+            offset=self.offset,
+            linkname=linkname,
+        ))
+        self._long_name = self._long_link = None
+        self._pax = {}
+        # Links, devices, directories and FIFOs have no data, whatever their size field says
+        if type_flag not in "123456":
+            self._skip = -(-size // BLOCK_SIZE) * BLOCK_SIZE
+
+    def _finish_meta(self):
+        data = bytes(self._meta)
+        if self._meta_type == "x":
+            self._pax = _parse_pax(data)
+        else:
+            value = data.split(b"\0", 1)[0].decode("utf-8", errors="surrogateescape")
+            if self._meta_type == "L":
+                self._long_name = value
+            else:
+                self._long_link = value
+        self._meta = None
+        self._meta_type = None
+
+
+class _HashPipeline:
+    """One worker thread per algorithm, each digesting the chunks in order."""
+
+    def __init__(self, algorithms):
+        self.digests = {name: hashlib.new(name) for name in algorithms}
+        self._queues = []
+        self._threads = []
+        for digest in self.digests.values():
+            chunks = queue.Queue(maxsize=16)
+            thread = threading.Thread(target=self._run, args=(digest, chunks), daemon=True)
+            thread.start()
+            self._queues.append(chunks)
+            self._threads.append(thread)
+
+    @staticmethod
+    def _run(digest, chunks):
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                return
+            digest.update(chunk)
+
+    def update(self, chunk: bytes):
+        for chunks in self._queues:
+            chunks.put(chunk)
+
+    def close(self) -> dict:
+        for chunks in self._queues:
+            chunks.put(None)
+        for thread in self._threads:
+            thread.join()
+        return {name: digest.hexdigest() for name, digest in self.digests.items()}
+
+
+@dataclass
+class ImageResult:
+    """Outcome of :func:`write_image`."""
+
+    path: Path
+    size: int
+    hashes: dict
+    members: list = field(default_factory=list)
+    index_complete: bool = False
+    index_error: Optional[str] = None
+
+    @property
+    def sha256(self) -> str:
+        return self.hashes.get("sha256", "")
+
+
+def write_image(read: Callable, image_path: Path, algorithms=DEFAULT_ALGORITHMS,
+                progress: Optional[Callable] = None, chunk_size: int = CHUNK_SIZE) -> ImageResult:
+    """Copy ``read(n)`` chunks into ``image_path`` until it returns b"".
+
+    Args:
+        read: Source of the tar stream (e.g. a pipe's ``read``).
+        image_path: Image file to create.
+        algorithms: Hash algorithms to compute while writing.
+        progress: Called as ``progress(bytes_written, members_indexed)`` at
+            most every ``PROGRESS_INTERVAL`` seconds.
+    """
+    image_path = Path(image_path)
+    unknown = set(algorithms) - set(SUPPORTED_ALGORITHMS)
+    if unknown:
+        raise ValueError(f"Unsupported hash algorithm(s): {', '.join(sorted(unknown))}")
+
+    hashes = _HashPipeline(algorithms)
+    indexer = TarIndexer()
+    size = 0
+    last_report = time.monotonic()
+    try:
+        with open(image_path, "wb") as out:
+            while True:
+                chunk = read(chunk_size)
+                if not chunk:
+                    break
+                out.write(chunk)
+                hashes.update(chunk)
+                if not indexer.finished:
+                    indexer.feed(chunk)
+                size += len(chunk)
+                if progress and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.monotonic()
+                    progress(size, len(indexer.members))
+    finally:
+        digests = hashes.close()
+    if progress:
+        progress(size, len(indexer.members))
+    return ImageResult(image_path, size, digests, indexer.members, indexer.complete, indexer.error)
+
+
+def index_path_for(image_path: Path) -> Path:
+    return Path(str(image_path) + ".index.json")
+
+
+def write_index(result: ImageResult, index_path: Optional[Path] = None) -> Path:
+    """Store the member index next to the image (``<image>.index.json``)."""
+    index_path = Path(index_path or index_path_for(result.path))
+    payload = {
+        "version": INDEX_VERSION,
+        "image": result.path.name,
+        "image_size_bytes": result.size,
+        "hashes": result.hashes,
+        "complete": result.index_complete,
+        "error": result.index_error,
+        "members": [asdict(member) for member in result.members],
+    }
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+    tmp_path.replace(index_path)
+    return index_path
+
+
+def load_index(image_path: Path) -> list:
+    """Members recorded for ``image_path``; raises FileNotFoundError without an index."""
+    with open(index_path_for(image_path), "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return [TarMember(**member) for member in payload.get("members", [])]
+
+
+def find_members(members, pattern: str) -> list:
+    """Files whose archive path equals or contains ``pattern``."""
+    pattern = pattern.strip().lstrip("/")
+    exact = [m for m in members if m.is_file and m.name.lstrip("/") == pattern]
+    return exact or [m for m in members if m.is_file and pattern in m.name]
+
+
+def extract_member(image_path: Path, member: TarMember, destination: Path,
+                   chunk_size: int = CHUNK_SIZE) -> str:
+    """Copy one member's data out of the image with a single seek.
+
+    Returns:
+        str: SHA-256 of the extracted data.
+    """
+    digest = hashlib.sha256()
+    remaining = member.size
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with open(image_path, "rb") as src, open(destination, "wb") as out:
+        src.seek(member.offset)
+        while remaining:
+            chunk = src.read(min(chunk_size, remaining))
+            if not chunk:
+                raise ValueError(f"Image ends inside member {member.name}")
+            out.write(chunk)
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def hash_file(path: Path, algorithms=DEFAULT_ALGORITHMS, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Hash a file on disk with several algorithms in one read."""
+    hashes = _HashPipeline(algorithms)
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                hashes.update(chunk)
+    finally:
+        digests = hashes.close()
+    return digests
+
+
+__all__ = [
+    "DEFAULT_ALGORITHMS",
+    "ImageResult",
+    "SUPPORTED_ALGORITHMS",
+    "TarIndexer",
+    "TarMember",
+    "extract_member",
+    "find_members",
+    "hash_file",
+    "index_path_for",
+    "load_index",
+    "write_image",
+    "write_index",
+]
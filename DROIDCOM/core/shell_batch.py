@@ -0,0 +1,297 @@
+"""
+DROIDCOM - Many shell commands in one device-side session.
+
+:class:`ShellBatch` turns a list of commands (typically one ``pm``/``am``
+call per package) into a script and streams it into a single ``adb shell``
+session instead of starting one adb round trip per command:
+
+* The script is written to the stdin of one shell protocol v2 session, so
+  its length is not limited by the service name and the device starts on
+  the first command while the rest is still being sent.
+* After every command the script prints a sentinel carrying a per-batch
+  random token, the command's index and its exit status, on stdout and on
+  stderr. The reader splits both streams at those sentinels and hands out
+  one :class:`CommandResult` per command as soon as it completes.
+* Devices without shell v2 get the script as the command line of legacy
+  ``shell:`` requests, cut into chunks that fit the service name limit,
+  with stderr folded into stdout.
+
+Commands run with stdin from ``/dev/null`` so none of them can read the
+rest of the script. If a command ends the shell, it gets the session's
+exit status; the commands after it, like those left over when a batch is
+cancelled, keep ``exit_code`` None.
+
+This module has no Qt/UI dependency so it can be unit tested in isolation.
+"""
+
+from __future__ import annotations
+
+import logging
+import secrets
+import shlex
+import struct
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .adb_client import AdbError, get_adb_client
+
+# Shell protocol v2 packet ids (stdin and close-stdin go to the device)
+_SHELL_STDIN = 0
+_SHELL_STDOUT = 1
+_SHELL_STDERR = 2
+_SHELL_EXIT = 3
+_SHELL_CLOSE_STDIN = 4
+
+STDIN_CHUNK = 16 * 1024
+# Old adbd rejects service names longer than its 4 KiB payload
+LEGACY_SCRIPT_MAX = 3500
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one command of a batch."""
+
+    command: str
+    key: object = None
+    exit_code: Optional[int] = None
+    stdout: str = ""
+    stderr: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
+    @property
+    def output(self) -> str:
+        """Combined output, trimmed, for logs and result views."""
+        return "\n".join(part for part in (self.stdout.strip(), self.stderr.strip()) if part)
+
+
+class _StreamSplitter:
+    """Cuts one output stream at ``\\n<token> <index>[ <status>]\\n`` sentinels."""
+
+    def __init__(self, token: bytes):
+        self._marker = b"\n" + token + b" "
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes):
+        """Yield ``(index, output, status)`` for every sentinel completed by ``data``."""
+        self._buffer += data
+        while True:
+            start = self._buffer.find(self._marker)
+            if start < 0:
+                return
+            end = self._buffer.find(b"\n", start + len(self._marker))
+            if end < 0:
+                return
+            fields = bytes(self._buffer[start + len(self._marker):end]).split()
+            output = bytes(self._buffer[:start])
+            del self._buffer[:end + 1]
+            try:
+                index = int(fields[0])
+                status = int(fields[1]) if len(fields) > 1 else None
+            except (IndexError, ValueError):
+                continue
+            yield index, output, status
+
+    def rest(self) -> bytes:
+        return bytes(self._buffer)
+
+
+class ShellBatch:
+    """Commands queued with :meth:`add` and run together by :meth:`run`.
+
+    Args:
+        serial (str): Device to run on.
+        client (AdbClient): Defaults to the shared client.
+        timeout (float): Socket timeout while waiting for output.
+    """
+
+    def __init__(self, serial: Optional[str], client=None, timeout: Optional[float] = 60):
+        self.serial = serial
+        self.client = client or get_adb_client()
+        self.timeout = timeout
+        self.results = []
+        self._token = f"__DROIDCOM_{secrets.token_hex(6)}__"
+
+    def __len__(self):
+        return len(self.results)
+
+    def add(self, command: str, key=None) -> CommandResult:
+        """Queue a shell command; ``key`` (e.g. the package name) is kept on its result."""
+        if "\n" in command:
+            raise ValueError("Batch commands must be single lines")
+        result = CommandResult(command, key)
+        self.results.append(result)
+        return result
+
+    def add_args(self, *args, key=None) -> CommandResult:
+        """Queue a command from separate arguments, quoting each for the shell."""
+        return self.add(" ".join(shlex.quote(str(arg)) for arg in args), key)
+
+    def _script_line(self, index: int, legacy: bool = False) -> str:
+        # stdin is the script itself, so commands must not read from it
+        command = f"{{ {self.results[index].command}\n}} </dev/null"
+        # "\n" first so a sentinel is found even after output without a newline
+        status = f"printf '\\n{self._token} {index} %d\\n' $?"
+        if legacy:
+            # The legacy service has no separate stderr stream
+            return f"{command} 2>&1; {status}"
+        return f"{command}\n{status}\nprintf '\\n{self._token} {index}\\n' >&2"
+
+    def run(self, on_result: Optional[Callable] = None,
+            cancel: Optional[threading.Event] = None) -> list:
+        """Run every queued command in order and return their results.
+
+        Args:
+            on_result: Called with each :class:`CommandResult` as soon as
+                that command finishes (from the calling thread).
+            cancel: Stops reading; unfinished commands keep ``exit_code`` None.
+        """
+        if not self.results:
+            return []
+        conn = self.client.transport(self.serial, self.timeout)
+        try:
+            conn.send_request("shell,v2,raw:")
+        except AdbError:
+            conn.close()
+            logger.debug("Shell v2 unavailable on %s, using legacy shell batches", self.serial)
+            self._run_legacy(on_result, cancel)
+            return self.results
+        try:
+            self._run_v2(conn, on_result, cancel)
+        finally:
+            conn.close()
+        return self.results
+
+    def _run_v2(self, conn, on_result, cancel):
+        script = "\n".join(self._script_line(i) for i in range(len(self.results))) + "\nexit\n"
+        payload = script.encode("utf-8")
+        write_error = []
+
+        def write_stdin():
+            try:
+                for pos in range(0, len(payload), STDIN_CHUNK):
+                    chunk = payload[pos:pos + STDIN_CHUNK]
+                    conn.sendall(struct.pack("<BI", _SHELL_STDIN, len(chunk)) + chunk)
+                conn.sendall(struct.pack("<BI", _SHELL_CLOSE_STDIN, 0))
+            except (AdbError, OSError) as exc:
+                write_error.append(exc)
+
+        # Writing from a second thread keeps a long script from filling the
+        # socket while the device waits for its output to be read
+        writer = threading.Thread(target=write_stdin, daemon=True)
+        writer.start()
+
+        token = self._token.encode()
+        streams = {_SHELL_STDOUT: _StreamSplitter(token), _SHELL_STDERR: _StreamSplitter(token)}
+        outputs, errors = {}, {}
+        session_status = None
+
+        def collect(index):
+            if index in outputs and index in errors and 0 <= index < len(self.results):
+                output, status = outputs.pop(index)
+                self._finish(index, status, output, errors.pop(index), on_result)
+
+        while not (cancel and cancel.is_set()):
+            try:
+                packet_id, length = struct.unpack("<BI", conn.read_exact(5))
+                data = conn.read_exact(length)
+            except (AdbError, OSError) as exc:
+                logger.info("Shell batch on %s lost its session: %s", self.serial, exc)
+                break
+            if packet_id == _SHELL_EXIT:
+                session_status = data[0] if data else 0
+                break
+            if packet_id not in streams:
+                continue
+            for index, output, status in streams[packet_id].feed(data):
+                if packet_id == _SHELL_STDOUT:
+                    outputs[index] = (output, status)
+                else:
+                    errors[index] = output
+                collect(index)
+        writer.join(1)
+        if write_error:
+            logger.info("Shell batch on %s stopped early: %s", self.serial, write_error[0])
+
+        # The shell ended early: the output after the last sentinel and the
+        # session's exit status belong to the command it died in
+        pending = [i for i, r in enumerate(self.results) if r.exit_code is None]
+        if pending and session_status is not None:
+            self._finish(pending[0], session_status, streams[_SHELL_STDOUT].rest(),
+                         streams[_SHELL_STDERR].rest(), on_result)
+
+    def _run_legacy(self, on_result, cancel):
+        chunks, current, size = [], [], 0
+        for index in range(len(self.results)):
+            line = self._script_line(index, legacy=True)
+            if current and size + len(line) + 1 > LEGACY_SCRIPT_MAX:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(line)
+            size += len(line) + 1
+        if current:
+            chunks.append(current)
+
+        for lines in chunks:
+            if cancel and cancel.is_set():
+                return
+            splitter = _StreamSplitter(self._token.encode())
+            try:
+                with self.client.open_shell(self.serial, "\n".join(lines), self.timeout) as conn:
+                    while not (cancel and cancel.is_set()):
+                        data = conn.sock.recv(STDIN_CHUNK)
+                        if not data:
+                            break
+                        # Pre-Nougat shells run on a pty and end lines with \r\n
+                        for index, output, status in splitter.feed(data.replace(b"\r\n", b"\n")):
+                            if 0 <= index < len(self.results):
+                                self._finish(index, status, output, b"", on_result)
+            except (AdbError, OSError) as exc:
+                logger.info("Legacy shell batch on %s failed: %s", self.serial, exc)
+                return
+
+    def _finish(self, index, status, stdout, stderr, on_result):
+        result = self.results[index]
+        result.exit_code = 255 if status is None else status
+        result.stdout = stdout.decode("utf-8", errors="replace")
+        result.stderr = stderr.decode("utf-8", errors="replace")
+        if on_result:
+            try:
+                on_result(result)
+            except Exception:
+                logger.exception("Shell batch result callback failed")
+
+
+def run_batch(serial: Optional[str], commands, on_result: Optional[Callable] = None,
+              cancel: Optional[threading.Event] = None, client=None,
+              timeout: Optional[float] = 60) -> list:
+    """Run ``commands`` (strings, or ``(key, command)`` pairs) in one shell session."""
+    batch = ShellBatch(serial, client, timeout)
+    for command in commands:
+        if isinstance(command, tuple):
+            batch.add(command[1], key=command[0])
+        else:
+            batch.add(command)
+    return batch.run(on_result, cancel)
+
+
+def package_batch(serial: Optional[str], args, packages, client=None,
+                  timeout: Optional[float] = 60) -> ShellBatch:
+    """A batch running ``args + [package]`` for each package, keyed by package name."""
+    batch = ShellBatch(serial, client, timeout)
+    for package in packages:
+        batch.add_args(*args, package, key=package)
+    return batch
+
+
+__all__ = [
+    "CommandResult",
+    "ShellBatch",
+    "package_batch",
+    "run_batch",
+]
@@ -7,10 +7,15 @@ import logging
 import os
 import platform
 import shutil
+import socket
 import subprocess
 import threading
 
 from ..app.config import BACKUP_DIR_NAME, DEFAULT_ADB_TIMEOUT, IS_WINDOWS, SCREENSHOT_DIR_NAME
+from .adb_client import AdbError, AdbServerUnavailable, get_adb_client
+
+# adb subcommands the native client answers without spawning an adb process
+NATIVE_ADB_COMMANDS = ('shell', 'exec-out', 'devices')
 
 
 def format_size(size_bytes):
@@ -334,19 +339,61 @@ def check_platform_tools(log_callback=None, dependencies_installed=False):
         return False
 
 
-def run_adb_command(command, device_serial=None, timeout=DEFAULT_ADB_TIMEOUT, adb_path=None):
+def _run_native_adb_command(args, device_serial, timeout):
+    """Answer an adb command through the adb server socket.
+
+    Returns:
+        tuple: (success, stdout, stderr), or None when the server is not
+        running, so the caller can fall back to the adb executable (which
+        starts the server).
+    """
+    client = get_adb_client()
+    try:
+        if args[0] == 'devices':
+            lines = ['List of devices attached']
+            lines += [f"{serial}\t{state} {details}".rstrip() for serial, state, details in client.devices()]
+            return (True, '\n'.join(lines) + '\n', '')
+        if args[0] == 'exec-out':
+            output = client.exec_out(device_serial, ' '.join(args[1:]), timeout)
+            return (True, output.decode('utf-8', errors='replace'), '')
+        result = client.shell(device_serial, ' '.join(args[1:]), timeout)
+        return (result.ok,
+                result.stdout.decode('utf-8', errors='replace'),
+                result.stderr.decode('utf-8', errors='replace'))
+    except AdbServerUnavailable:
+        return None
+    except socket.timeout:
+        return (False, '', f'Command timed out after {timeout} seconds')
+    except (AdbError, OSError) as e:
+        return (False, '', str(e))
+
+
+def run_adb_command(command, device_serial=None, timeout=DEFAULT_ADB_TIMEOUT, adb_path=None, native=True):
     """
     Run an ADB command and return the result.
 
+    ``shell``, ``exec-out`` and ``devices`` are served by the native adb
+    client when an adb server is running; everything else, or any command
+    when no server is up, runs the adb executable.
+
     Args:
         command: The ADB command to run (without 'adb' prefix)
         device_serial: Optional device serial to target specific device
         timeout: Command timeout in seconds
         adb_path: Path to ADB executable (optional, will use 'adb' if not specified)
+        native: Allow the native client to answer the command
 
     Returns:
         tuple: (success: bool, stdout: str, stderr: str)
     """
+    args = command.split() if isinstance(command, str) else list(command)
+
+    # An interactive shell (no command) needs a terminal, so leave it to adb
+    if native and (args == ['devices'] or len(args) > 1 and args[0] in NATIVE_ADB_COMMANDS):
+        result = _run_native_adb_command(args, device_serial, timeout)
+        if result is not None:
+            return result
+
     try:
         # Build the full command
         if adb_path:
@@ -359,10 +406,7 @@ def run_adb_command(command, device_serial=None, timeout=DEFAULT_ADB_TIMEOUT, ad
             cmd.extend(['-s', device_serial])
 
         # Add the command parts
-        if isinstance(command, str):
-            cmd.extend(command.split())
-        else:
-            cmd.extend(command)
+        cmd.extend(args)
 
         # Run the command
         result = subprocess.run(
@@ -381,6 +425,32 @@ def run_adb_command(command, device_serial=None, timeout=DEFAULT_ADB_TIMEOUT, ad
         return (False, '', str(e))
 
 
+def ensure_adb_server(adb_path=None, timeout=DEFAULT_ADB_TIMEOUT):
+    """
+    Make sure an adb server is listening, starting one if needed.
+
+    The native client (and the sync-based file transfers built on it) only
+    talk to a running server; the adb executable is what starts it.
+
+    Returns:
+        bool: True if the server is reachable
+    """
+    client = get_adb_client()
+    if client.is_available():
+        return True
+    try:
+        subprocess.run(
+            [adb_path or 'adb', 'start-server'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=timeout
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logging.warning(f"Could not start the adb server: {e}")
+        return False
+    return client.is_available()
+
+
 def get_connected_devices(adb_path=None):
     """
     Get list of connected Android devices.
@@ -388,6 +458,11 @@ def get_connected_devices(adb_path=None):
     Returns:
         list: List of tuples (serial, status, details)
     """
+    try:
+        return get_adb_client().devices()
+    except (AdbError, OSError):
+        pass
+
     if adb_path is None:
         adb_path = 'adb'
 
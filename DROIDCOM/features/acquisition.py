@@ -7,6 +7,7 @@ chain-of-custody report generation.
 
 import os
 import subprocess
+import threading
 import time
 from pathlib import Path
 
@@ -17,10 +18,29 @@ from ..core.evidence import (
     ChainOfCustodyReport,
     WriteBlocker,
     WriteBlockedError,
-    sha256_file,
 )
+from ..core.imaging import (
+    extract_member,
+    find_members,
+    hash_file,
+    load_index,
+    write_image,
+    write_index,
+)
+from ..core.utils import format_bytes
 from ..utils.qt_dispatcher import emit_ui
 
+# Hash choices offered for an acquisition; SHA-256 is always computed
+ACQUISITION_HASH_CHOICES = {
+    "SHA-256": ("sha256",),
+    "SHA-256 + MD5": ("sha256", "md5"),
+    "SHA-256 + SHA-1": ("sha256", "sha1"),
+    "SHA-256 + MD5 + SHA-1": ("sha256", "md5", "sha1"),
+}
+
+# An acquisition is abandoned when the tar stream delivers nothing for this long
+ACQUISITION_STALL_TIMEOUT = 300
+
 
 class AcquisitionMixin:
     """Mixin providing forensic case management and device acquisition."""
@@ -162,9 +182,17 @@ class AcquisitionMixin:
         if not ok or not source_path.strip():
             return
 
-        self._run_in_thread(lambda: self._acquisition_task(source_path.strip()))
+        choice, ok = QtWidgets.QInputDialog.getItem(
+            self, "Acquisition Hashes", "Hashes to compute while acquiring:",
+            list(ACQUISITION_HASH_CHOICES), 0, False,
+        )
+        if not ok:
+            return
+
+        algorithms = ACQUISITION_HASH_CHOICES[choice]
+        self._run_in_thread(lambda: self._acquisition_task(source_path.strip(), algorithms))
 
-    def _acquisition_task(self, source_path):
+    def _acquisition_task(self, source_path, algorithms=("sha256",)):
         case = self.active_case
         serial = self.device_info.get("serial")
         adb_cmd = self.adb_path if getattr(self, "adb_path", None) else "adb"
@@ -184,37 +212,80 @@ class AcquisitionMixin:
             return
 
         try:
-            with open(image_path, "wb") as out_file:
-                proc = subprocess.Popen(tar_cmd, stdout=out_file, stderr=subprocess.PIPE)
-                _, stderr = proc.communicate(timeout=3600)
+            proc = subprocess.Popen(tar_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            stalled = threading.Event()
+            finished = threading.Event()
+            last_data = [time.monotonic()]
+            stderr_chunks = []
+
+            def read(size):
+                # read1 returns what has arrived, so the watchdog sees every chunk
+                chunk = proc.stdout.read1(size)
+                last_data[0] = time.monotonic()
+                return chunk
+
+            def watchdog():
+                while not finished.wait(5):
+                    if time.monotonic() - last_data[0] > ACQUISITION_STALL_TIMEOUT:
+                        stalled.set()
+                        proc.kill()
+                        return
+
+            def report(size, members):
+                self.update_status(f"Acquiring device image... {format_bytes(size)}, {members} files indexed")
+
+            # Drain stderr on the side so a chatty tar cannot stall the image pipe
+            stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+            stderr_thread.start()
+            threading.Thread(target=watchdog, daemon=True).start()
+            try:
+                result = write_image(read, image_path, algorithms, progress=report)
+            finally:
+                finished.set()
+                proc.wait()
+                stderr_thread.join()
+            stderr = b"".join(stderr_chunks)
+
+            if stalled.is_set():
+                self.log_message("Acquisition timed out")
+                self.update_status("Acquisition timed out")
+                case.evidence_log.record("ACQUISITION_FAILED", {"error": "timeout"})
+                return
 
-            if proc.returncode not in (0, None) and not image_path.exists():
+            if proc.returncode != 0 and not result.size:
                 self.log_message(f"Acquisition failed: {stderr.decode(errors='ignore')[-500:]}")
                 self.update_status("Acquisition failed")
                 case.evidence_log.record("ACQUISITION_FAILED", {"error": stderr.decode(errors="ignore")[-500:]})
                 return
 
-            self.log_message("Computing image hash (sha256)...")
-            image_hash = sha256_file(image_path)
-            image_size = image_path.stat().st_size
-
-            case.evidence_log.record(
-                "ACQUISITION_COMPLETED",
-                {
-                    "source_path": source_path,
-                    "image_path": str(image_path),
-                    "image_sha256": image_hash,
-                    "image_size_bytes": image_size,
-                    "device_serial": serial,
-                    "device_info": self.device_info,
-                },
-            )
-
-            hash_file = image_path.with_suffix(".sha256")
-            hash_file.write_text(f"{image_hash}  {image_name}\n", encoding="utf-8")
-
-            self.log_message(f"Acquisition complete: {image_path} ({image_size} bytes)")
-            self.log_message(f"SHA-256: {image_hash}")
+            image_hash = result.sha256
+            image_size = result.size
+            index_path = write_index(result)
+            if not result.index_complete:
+                self.log_message(f"Member index is partial: {result.index_error or 'archive ended early'}")
+
+            details = {
+                "source_path": source_path,
+                "image_path": str(image_path),
+                "image_sha256": image_hash,
+                "image_size_bytes": image_size,
+                "image_index_path": str(index_path),
+                "indexed_members": len(result.members),
+                "index_complete": result.index_complete,
+                "device_serial": serial,
+                "device_info": self.device_info,
+            }
+            for name, digest in result.hashes.items():
+                details[f"image_{name}"] = digest
+            case.evidence_log.record("ACQUISITION_COMPLETED", details)
+
+            for name, digest in result.hashes.items():
+                hash_file_path = image_path.with_suffix(f".{name}")
+                hash_file_path.write_text(f"{digest}  {image_name}\n", encoding="utf-8")
+
+            self.log_message(f"Acquisition complete: {image_path} ({image_size} bytes, {len(result.members)} members indexed)")
+            for name, digest in result.hashes.items():
+                self.log_message(f"{name.upper()}: {digest}")
             self.update_status("Acquisition completed")
 
             emit_ui(self, lambda: QtWidgets.QMessageBox.information(
@@ -223,10 +294,6 @@ class AcquisitionMixin:
                 "This hash and every step of this acquisition has been recorded "
                 "in the case evidence log.",
             ))
-        except subprocess.TimeoutExpired:
-            self.log_message("Acquisition timed out")
-            self.update_status("Acquisition timed out")
-            case.evidence_log.record("ACQUISITION_FAILED", {"error": "timeout"})
         except Exception as e:
             self.log_message(f"Acquisition error: {str(e)}")
             self.update_status("Acquisition failed")
@@ -249,18 +316,23 @@ class AcquisitionMixin:
     def _verify_image_task(self, image_path):
         case = self.active_case
         self.update_status("Verifying image integrity...")
-        recorded_hash = None
-        for entry in case.evidence_log.entries():
-            if entry["action"] == "ACQUISITION_COMPLETED" and entry["details"].get("image_path") == str(image_path):
-                recorded_hash = entry["details"].get("image_sha256")
-
-        current_hash = sha256_file(image_path)
-        match = recorded_hash is not None and current_hash == recorded_hash
+        recorded = {}
+        entry = case.evidence_log.latest("ACQUISITION_COMPLETED", image_path=str(image_path))
+        if entry:
+            recorded = {name: entry["details"][f"image_{name}"]
+                        for name in ("sha256", "md5", "sha1") if entry["details"].get(f"image_{name}")}
+        recorded_hash = recorded.get("sha256")
+
+        # Every digest recorded at acquisition time is recomputed in the same read
+        current = hash_file(image_path, tuple(recorded) or ("sha256",))
+        current_hash = current["sha256"]
+        match = recorded_hash is not None and current == recorded
 
         case.evidence_log.record(
             "IMAGE_VERIFIED",
             {"image_path": str(image_path), "recorded_sha256": recorded_hash,
-             "current_sha256": current_hash, "match": match},
+             "current_sha256": current_hash, "recorded_hashes": recorded,
+             "current_hashes": current, "match": match},
         )
 
         self.log_message(f"Verification of {image_path.name}: current={current_hash} recorded={recorded_hash} match={match}")
@@ -273,6 +345,71 @@ class AcquisitionMixin:
                "Hashes DO NOT MATCH -- image may have been altered or no recorded hash was found."),
         ))
 
+    def extract_from_acquisition_image(self):
+        """Extract one file from an acquisition image using its member index."""
+        if not getattr(self, "active_case", None):
+            QtWidgets.QMessageBox.information(self, "No Active Case", "Open a forensic case first.")
+            return
+
+        image_file, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Select Acquisition Image", str(self.active_case.images_dir), "Images (*.tar)"
+        )
+        if not image_file:
+            return
+        image_path = Path(image_file)
+
+        try:
+            members = load_index(image_path)
+        except (OSError, ValueError) as e:
+            QtWidgets.QMessageBox.warning(
+                self, "No Index", f"No member index was found for this image:\n{e}"
+            )
+            return
+
+        pattern, ok = QtWidgets.QInputDialog.getText(
+            self, "Extract File", "Path (or part of the path) inside the image:"
+        )
+        if not ok or not pattern.strip():
+            return
+
+        matches = find_members(members, pattern)
+        if not matches:
+            QtWidgets.QMessageBox.information(self, "Not Found", f"No file in the image matches '{pattern}'.")
+            return
+        member = matches[0]
+        if len(matches) > 1:
+            names = [m.name for m in matches[:500]]
+            name, ok = QtWidgets.QInputDialog.getItem(self, "Extract File", "Matching files:", names, 0, False)
+            if not ok:
+                return
+            member = matches[names.index(name)]
+
+        destination, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save Extracted File",
+            str(self.active_case.case_dir / "extracted" / os.path.basename(member.name)),
+        )
+        if not destination:
+            return
+
+        self._run_in_thread(lambda: self._extract_member_task(image_path, member, Path(destination)))
+
+    def _extract_member_task(self, image_path, member, destination):
+        case = self.active_case
+        try:
+            digest = extract_member(image_path, member, destination)
+        except Exception as e:
+            self.log_message(f"Extraction of {member.name} failed: {str(e)}")
+            self.update_status("Extraction failed")
+            return
+
+        case.evidence_log.record(
+            "FILE_EXTRACTED",
+            {"image_path": str(image_path), "member": member.name, "member_offset": member.offset,
+             "size_bytes": member.size, "output_path": str(destination), "sha256": digest},
+        )
+        self.log_message(f"Extracted {member.name} -> {destination} (SHA-256 {digest})")
+        self.update_status("File extracted")
+
     # -- evidence log / chain of custody ----------------------------------
 
     def view_evidence_log(self):
@@ -319,10 +456,8 @@ class AcquisitionMixin:
         case = self.active_case
         output_path = case.reports_dir / f"chain_of_custody_{int(time.time())}.pdf"
 
-        acquisition_summary = {}
-        for entry in case.evidence_log.entries():
-            if entry["action"] == "ACQUISITION_COMPLETED":
-                acquisition_summary = entry["details"]
+        latest = case.evidence_log.latest("ACQUISITION_COMPLETED")
+        acquisition_summary = latest["details"] if latest else {}
 
         report_path = ChainOfCustodyReport.generate(
             case=case,
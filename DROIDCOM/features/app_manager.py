@@ -9,6 +9,9 @@ import os
 import threading
 
 from ..app.config import IS_WINDOWS
+from ..core.adb_client import AdbError
+from ..core.shell_batch import package_batch
+from ..core.utils import ensure_adb_server
 from ..utils.qt_dispatcher import emit_ui
 
 
@@ -715,32 +718,54 @@ class AppManagerMixin:
             return None
         return sel if multi_select else sel[0]
 
+    def _run_package_batch(self, adb_cmd, serial, label, args, packages, require_success=True):
+        """Run ``args + [package]`` for every package in one shell session.
+
+        Returns the per-package results and the failed ones. ``pm`` reports
+        some failures on stdout with a zero exit status, hence ``require_success``.
+        """
+        if not ensure_adb_server(adb_cmd):
+            raise AdbError("The ADB server could not be started")
+        batch = package_batch(serial, args, packages)
+        results = batch.run(
+            on_result=lambda r: self.log_message(f"{label} {r.key}: {r.output or f'rc={r.exit_code}'}")
+        )
+        failed = [r for r in results if not r.ok or (require_success and "Success" not in r.stdout)]
+        return results, failed
+
+    def _report_package_batch(self, results, failed, done_title, done_text, failed_text):
+        """Show the outcome of :meth:`_run_package_batch` (called on the UI thread)."""
+        if not failed:
+            names = ", ".join(r.key for r in results)
+            QtWidgets.QMessageBox.information(self, done_title, f"{names} {done_text}.")
+            return
+        details = "\n".join(f"{r.key}: {r.output or f'rc={r.exit_code}'}" for r in failed)
+        ok_count = len(results) - len(failed)
+        QtWidgets.QMessageBox.critical(
+            self, "Failed", f"{failed_text} for {len(failed)} of {len(results)} app(s)"
+            + (f" ({ok_count} succeeded)" if ok_count else "") + f":\n{details}"
+        )
+
     def _uninstall_app_dialog(self):
         adb_cmd, serial = self._resolve_adb()
         if not adb_cmd:
             return
-        pkg = self._app_picker_dialog("Uninstall App — Select Package", adb_cmd, serial)
-        if not pkg:
+        pkgs = self._app_picker_dialog("Uninstall App — Select Package(s)", adb_cmd, serial, multi_select=True)
+        if not pkgs:
             return
         confirm = QtWidgets.QMessageBox.question(
             self, "Confirm Uninstall",
-            f"Uninstall {pkg}?\n\nThis cannot be undone."
+            f"Uninstall {', '.join(pkgs)}?\n\nThis cannot be undone."
         ) == QtWidgets.QMessageBox.Yes
         if not confirm:
             return
 
         def task():
             try:
-                r = subprocess.run([adb_cmd, "-s", serial, "uninstall", pkg],
-                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=30)
-                msg = r.stdout.strip() or r.stderr.strip()
-                success = r.returncode == 0 and "Success" in r.stdout
-                self.log_message(f"Uninstall {pkg}: {msg}")
-                self.update_status("App uninstalled" if success else "Uninstall failed")
-                if success:
-                    emit_ui(self, lambda: QtWidgets.QMessageBox.information(self, "Uninstalled", f"{pkg} uninstalled."))
-                else:
-                    emit_ui(self, lambda: QtWidgets.QMessageBox.critical(self, "Failed", f"Uninstall failed:\n{msg}"))
+                results, failed = self._run_package_batch(adb_cmd, serial, "Uninstall", ["pm", "uninstall"], pkgs)
+                self.update_status("App uninstalled" if not failed else "Uninstall failed")
+                emit_ui(self, lambda: self._report_package_batch(
+                    results, failed, "Uninstalled", "uninstalled", "Uninstall failed"))
             except Exception as e:
                 emit_ui(self, lambda: QtWidgets.QMessageBox.critical(self, "Error", str(e)))
 
@@ -750,28 +775,22 @@ class AppManagerMixin:
         adb_cmd, serial = self._resolve_adb()
         if not adb_cmd:
             return
-        pkg = self._app_picker_dialog("Clear App Data — Select Package", adb_cmd, serial)
-        if not pkg:
+        pkgs = self._app_picker_dialog("Clear App Data — Select Package(s)", adb_cmd, serial, multi_select=True)
+        if not pkgs:
             return
         confirm = QtWidgets.QMessageBox.question(
             self, "Confirm Clear Data",
-            f"Clear all data for {pkg}?\n\nThis deletes settings, accounts, and cache."
+            f"Clear all data for {', '.join(pkgs)}?\n\nThis deletes settings, accounts, and cache."
         ) == QtWidgets.QMessageBox.Yes
         if not confirm:
             return
 
         def task():
             try:
-                r = subprocess.run([adb_cmd, "-s", serial, "shell", "pm", "clear", pkg],
-                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=30)
-                success = r.returncode == 0 and "Success" in r.stdout
-                msg = r.stdout.strip() or r.stderr.strip()
-                self.log_message(f"Clear data {pkg}: {msg}")
-                self.update_status("Data cleared" if success else "Clear failed")
-                if success:
-                    emit_ui(self, lambda: QtWidgets.QMessageBox.information(self, "Cleared", f"Data for {pkg} cleared."))
-                else:
-                    emit_ui(self, lambda: QtWidgets.QMessageBox.critical(self, "Failed", f"Clear failed:\n{msg}"))
+                results, failed = self._run_package_batch(adb_cmd, serial, "Clear data", ["pm", "clear"], pkgs)
+                self.update_status("Data cleared" if not failed else "Clear failed")
+                emit_ui(self, lambda: self._report_package_batch(
+                    results, failed, "Cleared", "data cleared", "Clear failed"))
             except Exception as e:
                 emit_ui(self, lambda: QtWidgets.QMessageBox.critical(self, "Error", str(e)))
 
@@ -781,20 +800,18 @@ class AppManagerMixin:
         adb_cmd, serial = self._resolve_adb()
         if not adb_cmd:
             return
-        pkg = self._app_picker_dialog("Force Stop App — Select Package", adb_cmd, serial)
-        if not pkg:
+        pkgs = self._app_picker_dialog("Force Stop App — Select Package(s)", adb_cmd, serial, multi_select=True)
+        if not pkgs:
             return
 
         def task():
             try:
-                r = subprocess.run([adb_cmd, "-s", serial, "shell", "am", "force-stop", pkg],
-                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10)
-                self.log_message(f"Force stop {pkg}: rc={r.returncode}")
-                self.update_status("Force stopped" if r.returncode == 0 else "Force stop failed")
-                if r.returncode == 0:
-                    emit_ui(self, lambda: QtWidgets.QMessageBox.information(self, "Done", f"{pkg} force stopped."))
-                else:
-                    emit_ui(self, lambda: QtWidgets.QMessageBox.critical(self, "Failed", r.stderr.strip() or r.stdout.strip()))
+                results, failed = self._run_package_batch(
+                    adb_cmd, serial, "Force stop", ["am", "force-stop"], pkgs, require_success=False
+                )
+                self.update_status("Force stopped" if not failed else "Force stop failed")
+                emit_ui(self, lambda: self._report_package_batch(
+                    results, failed, "Done", "force stopped", "Force stop failed"))
             except Exception as e:
                 emit_ui(self, lambda: QtWidgets.QMessageBox.critical(self, "Error", str(e)))
 
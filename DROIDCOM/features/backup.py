@@ -10,6 +10,9 @@ import json
 import time
 
 from ..app.config import IS_WINDOWS
+from ..core.adb_client import AdbError
+from ..core.file_transfer import FileTransfer
+from ..core.utils import ensure_adb_server
 from ..utils.qt_dispatcher import emit_ui
 
 
@@ -194,51 +197,41 @@ class BackupMixin:
     def _backup_files(self, adb_cmd, serial, backup_folder, options):
         """Backup files from the device"""
         try:
+            sources = []
             if options['media'].isChecked():
                 media_folder = os.path.join(backup_folder, "Media")
-                os.makedirs(os.path.join(media_folder, "Pictures"), exist_ok=True)
-                os.makedirs(os.path.join(media_folder, "Videos"), exist_ok=True)
-                os.makedirs(os.path.join(media_folder, "Music"), exist_ok=True)
-
-                self.log_message("Backing up photos...")
-                self.update_status("Backing up photos...")
-
-                subprocess.run(
-                    [adb_cmd, '-s', serial, 'pull', '/sdcard/DCIM', os.path.join(media_folder, "Pictures")],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-
-                subprocess.run(
-                    [adb_cmd, '-s', serial, 'pull', '/sdcard/Movies', os.path.join(media_folder, "Videos")],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-
-                subprocess.run(
-                    [adb_cmd, '-s', serial, 'pull', '/sdcard/Music', os.path.join(media_folder, "Music")],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
+                sources += [
+                    ("photos", '/sdcard/DCIM', os.path.join(media_folder, "Pictures")),
+                    ("videos", '/sdcard/Movies', os.path.join(media_folder, "Videos")),
+                    ("music", '/sdcard/Music', os.path.join(media_folder, "Music")),
+                ]
 
             if options['documents'].isChecked():
                 docs_folder = os.path.join(backup_folder, "Documents")
-                os.makedirs(docs_folder, exist_ok=True)
-
-                self.log_message("Backing up documents...")
-                self.update_status("Backing up documents...")
+                sources += [
+                    ("documents", '/sdcard/Documents', docs_folder),
+                    ("downloads", '/sdcard/Download', docs_folder),
+                ]
 
-                subprocess.run(
-                    [adb_cmd, '-s', serial, 'pull', '/sdcard/Documents', docs_folder],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
+            if not ensure_adb_server(adb_cmd):
+                self.log_message("Error backing up files: ADB server is not running")
+                return
 
-                subprocess.run(
-                    [adb_cmd, '-s', serial, 'pull', '/sdcard/Download', docs_folder],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
+            for label, remote, local in sources:
+                os.makedirs(local, exist_ok=True)
+                self.log_message(f"Backing up {label}...")
+                self.update_status(f"Backing up {label}...")
+
+                # Files already present from an earlier backup into this folder are skipped
+                try:
+                    stats = FileTransfer(serial).pull(remote, local)
+                except AdbError as e:
+                    self.log_message(f"Skipping {remote}: {e}")
+                    continue
+
+                self.log_message(f"Backed up {label}: {stats.summary()}")
+                for path, message in stats.errors:
+                    self.log_message(f"Failed to back up {path}: {message}")
 
         except Exception as e:
             self.log_message(f"Error backing up files: {str(e)}")
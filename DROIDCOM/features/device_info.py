@@ -12,6 +12,7 @@ import logging
 import threading
 
 from ..app.config import IS_WINDOWS
+from ..core.device_profile import get_profile_cache
 from ..utils.qt_dispatcher import emit_ui
 
 
@@ -21,182 +22,9 @@ class DeviceInfoMixin:
     def _get_device_info(self, serial, adb_cmd):
         """Get device information using ADB"""
         try:
-            device_info = {
-                'serial': serial
-            }
-
-            # Get model
-            model_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'getprop', 'ro.product.model'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if model_cmd.returncode == 0:
-                device_info['model'] = model_cmd.stdout.strip()
-
-            # Get manufacturer
-            manufacturer_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'getprop', 'ro.product.manufacturer'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if manufacturer_cmd.returncode == 0:
-                device_info['manufacturer'] = manufacturer_cmd.stdout.strip()
-
-            # Get Android version
-            version_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'getprop', 'ro.build.version.release'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if version_cmd.returncode == 0:
-                device_info['android_version'] = version_cmd.stdout.strip()
-
-            # Get battery level
-            battery_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'dumpsys', 'battery'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if battery_cmd.returncode == 0 and battery_cmd.stdout.strip():
-                try:
-                    battery_output = battery_cmd.stdout.strip()
-                    level = 'Unknown'
-                    for line in battery_output.split('\n'):
-                        if 'level:' in line or 'level =' in line:
-                            parts = line.split(':' if ':' in line else '=')
-                            if len(parts) > 1:
-                                level_str = parts[1].strip()
-                                if level_str.isdigit():
-                                    level = level_str
-                                    break
-
-                    if level != 'Unknown':
-                        device_info['battery'] = f"{level}%"
-                    else:
-                        # Fallback method
-                        battery_cmd2 = subprocess.run(
-                            [adb_cmd, '-s', serial, 'shell', 'cat', '/sys/class/power_supply/battery/capacity'],
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                            timeout=5
-                        )
-                        if battery_cmd2.returncode == 0:
-                            level = battery_cmd2.stdout.strip()
-                            if level.isdigit():
-                                device_info['battery'] = f"{level}%"
-                except Exception:
-                    device_info['battery'] = 'Unknown'
-
-            # Get storage info
-            storage_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'df', '/storage/emulated/0'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if storage_cmd.returncode == 0:
-                try:
-                    lines = storage_cmd.stdout.strip().split('\n')
-                    if len(lines) >= 2:
-                        parts = lines[1].split()
-                        if len(parts) >= 4:
-                            total = int(parts[1]) / (1024 * 1024)
-                            used = int(parts[2]) / (1024 * 1024)
-                            device_info['storage'] = f"{used:.1f} GB used / {total:.1f} GB total"
-                except Exception:
-                    device_info['storage'] = 'Unknown'
-
-            # Get RAM info
-            ram_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'cat', '/proc/meminfo'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if ram_cmd.returncode == 0:
-                try:
-                    ram_output = ram_cmd.stdout.strip()
-                    for line in ram_output.split('\n'):
-                        if 'MemTotal' in line:
-                            mem_kb = int(line.split(':')[1].strip().split()[0])
-                            total_ram_gb = mem_kb / (1024 * 1024)
-                            device_info['ram'] = f"{total_ram_gb:.1f} GB"
-                            break
-                except Exception:
-                    device_info['ram'] = 'Unknown'
-
-            # Get CPU info
-            cpu_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'getprop', 'ro.product.cpu.abi'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if cpu_cmd.returncode == 0:
-                device_info['cpu'] = cpu_cmd.stdout.strip()
-
-            # Get screen resolution
-            screen_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'wm', 'size'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if screen_cmd.returncode == 0:
-                try:
-                    screen_output = screen_cmd.stdout.strip()
-                    if 'size:' in screen_output:
-                        resolution = screen_output.split('size:')[1].strip()
-                        device_info['resolution'] = resolution
-                except Exception:
-                    device_info['resolution'] = 'Unknown'
-
-            # Get kernel version
-            kernel_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'uname', '-r'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if kernel_cmd.returncode == 0:
-                device_info['kernel'] = kernel_cmd.stdout.strip()
-
-            # Get build number
-            build_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'getprop', 'ro.build.display.id'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if build_cmd.returncode == 0 and build_cmd.stdout.strip():
-                device_info['build_number'] = build_cmd.stdout.strip()
-
-            # Get security patch level
-            patch_cmd = subprocess.run(
-                [adb_cmd, '-s', serial, 'shell', 'getprop', 'ro.build.version.security_patch'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=5
-            )
-            if patch_cmd.returncode == 0 and patch_cmd.stdout.strip():
-                device_info['security_patch'] = patch_cmd.stdout.strip()
+            # One shell round trip for every property, cached per serial
+            profile = get_profile_cache().get(serial, adb_path=adb_cmd)
+            device_info = profile.to_device_info()
 
             # Try to get IMEI
             self._get_device_imei(device_info, serial, adb_cmd)
@@ -562,8 +390,8 @@ class DeviceInfoMixin:
         except Exception as e:
             emit_ui(self, lambda e=e: self.log_message(f"Error getting IMEI: {str(e)}"))
 
-        # Fallback to Android ID
-        if 'imei' not in device_info:
+        # Fallback to Android ID (normally already in the device profile)
+        if 'imei' not in device_info and 'device_id' not in device_info:
             try:
                 android_id_cmd = subprocess.run(
                     [adb_cmd, '-s', serial, 'shell', 'settings', 'get', 'secure', 'android_id'],
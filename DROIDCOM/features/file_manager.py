@@ -5,10 +5,15 @@ Handles file management dialogs in PySide6.
 
 from PySide6 import QtWidgets, QtCore
 import os
+import posixpath
 import subprocess
 import time
 
 from ..app.config import IS_WINDOWS
+from ..core.adb_client import AdbError
+from ..core.file_transfer import FileTransfer
+from ..core.shell_batch import ShellBatch
+from ..core.utils import ensure_adb_server
 from ..utils.qt_dispatcher import emit_ui
 
 
@@ -404,16 +409,10 @@ class FileManagerMixin:
             emit_ui(self, lambda: self._set_file_manager_status(f"Uploading {name}..."))
             self.log_message(f"Uploading {name} to {target_path}...")
 
-            result = subprocess.run(
-                [adb_cmd, "-s", serial, "push", source_path, target_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=300,
-            )
+            stats = self._file_transfer(adb_cmd, serial, f"Uploading {name}").push(source_path, target_path)
 
-            if result.returncode != 0:
-                error = result.stderr.strip()
+            if not stats.ok:
+                error = self._transfer_errors(stats)
                 self.log_message(f"Upload failed: {error}")
                 emit_ui(self, lambda: self._set_file_manager_status("Upload failed"))
                 emit_ui(
@@ -424,8 +423,8 @@ class FileManagerMixin:
                 )
                 return
 
-            self.log_message(f"Upload of {name} completed successfully")
-            emit_ui(self, lambda: self._set_file_manager_status("Upload complete"))
+            self.log_message(f"Upload of {name} completed successfully: {stats.summary()}")
+            emit_ui(self, lambda: self._set_file_manager_status(f"Upload complete: {stats.summary()}"))
             emit_ui(self, lambda: self._refresh_android_files(tree))
 
         except Exception as e:
@@ -485,16 +484,10 @@ class FileManagerMixin:
             emit_ui(self, lambda: self._set_file_manager_status(f"Downloading {name}..."))
             self.log_message(f"Downloading {name} to {target_path}...")
 
-            result = subprocess.run(
-                [adb_cmd, "-s", serial, "pull", source_path, target_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=300,
-            )
+            stats = self._file_transfer(adb_cmd, serial, f"Downloading {name}").pull(source_path, target_path)
 
-            if result.returncode != 0:
-                error = result.stderr.strip()
+            if not stats.ok:
+                error = self._transfer_errors(stats)
                 self.log_message(f"Download failed: {error}")
                 emit_ui(self, lambda: self._set_file_manager_status("Download failed"))
                 emit_ui(
@@ -505,8 +498,8 @@ class FileManagerMixin:
                 )
                 return
 
-            self.log_message(f"Download of {name} completed successfully")
-            emit_ui(self, lambda: self._set_file_manager_status("Download complete"))
+            self.log_message(f"Download of {name} completed successfully: {stats.summary()}")
+            emit_ui(self, lambda: self._set_file_manager_status(f"Download complete: {stats.summary()}"))
             emit_ui(self, lambda: self._refresh_local_files(tree))
 
         except Exception as e:
@@ -569,21 +562,21 @@ class FileManagerMixin:
 
         def pull_task():
             try:
-                cmd = [adb_cmd, "-s", serial, "pull", device_path, local_path]
-                result = subprocess.run(
-                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-                )
-                if result.returncode == 0:
+                stats = self._file_transfer(
+                    adb_cmd, serial, "Pulling files",
+                    on_progress=lambda text: emit_ui(self, lambda t=text: progress.setLabelText(t)),
+                ).pull(device_path, local_path)
+                if stats.ok:
                     emit_ui(
                         self,
                         lambda: QtWidgets.QMessageBox.information(
-                            self, "Success", f"Successfully pulled to {local_path}"
+                            self, "Success", f"Successfully pulled to {local_path}\n{stats.summary()}"
                         ),
                     )
                 else:
                     emit_ui(
                         self,
-                        lambda err=result.stderr: QtWidgets.QMessageBox.critical(
+                        lambda err=self._transfer_errors(stats): QtWidgets.QMessageBox.critical(
                             self, "Error", f"Failed to pull file/folder: {err}"
                         ),
                     )
@@ -634,21 +627,21 @@ class FileManagerMixin:
 
         def push_task():
             try:
-                cmd = [adb_cmd, "-s", serial, "push", local_path, device_path]
-                result = subprocess.run(
-                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-                )
-                if result.returncode == 0:
+                stats = self._file_transfer(
+                    adb_cmd, serial, "Pushing files",
+                    on_progress=lambda text: emit_ui(self, lambda t=text: progress.setLabelText(t)),
+                ).push(local_path, device_path)
+                if stats.ok:
                     emit_ui(
                         self,
                         lambda: QtWidgets.QMessageBox.information(
-                            self, "Success", f"Successfully pushed to {device_path}"
+                            self, "Success", f"Successfully pushed to {device_path}\n{stats.summary()}"
                         ),
                     )
                 else:
                     emit_ui(
                         self,
-                        lambda err=result.stderr: QtWidgets.QMessageBox.critical(
+                        lambda err=self._transfer_errors(stats): QtWidgets.QMessageBox.critical(
                             self, "Error", f"Failed to push file/folder: {err}"
                         ),
                     )
@@ -681,6 +674,29 @@ class FileManagerMixin:
             self.android_path_entry.setText(value)
             self._refresh_android_files(tree)
 
+    def _file_transfer(self, adb_cmd, serial, label, on_progress=None):
+        """A sync-protocol :class:`FileTransfer` that reports progress in the status bar.
+
+        Call from a worker thread; ``on_progress`` also receives the status text.
+        """
+        if not ensure_adb_server(adb_cmd):
+            raise AdbError("ADB server is not running")
+
+        def report(stats):
+            text = f"{label}: {stats.summary()}"
+            emit_ui(self, lambda t=text: self._set_file_manager_status(t))
+            if on_progress:
+                on_progress(text)
+
+        return FileTransfer(serial, progress=report)
+
+    @staticmethod
+    def _transfer_errors(stats):
+        lines = [f"{path}: {message}" for path, message in stats.errors[:5]]
+        if len(stats.errors) > 5:
+            lines.append(f"... and {len(stats.errors) - 5} more")
+        return "\n".join(lines)
+
     def _set_file_manager_status(self, text):
         if hasattr(self, "fm_status_label") and self.fm_status_label:
             self.fm_status_label.setText(text)
@@ -750,22 +766,35 @@ class FileManagerMixin:
                     if l.startswith("package:")
                 ]
                 emit_ui(self, lambda: log.appendPlainText(f"Found {len(packages)} apps. Clearing caches..."))
-                cleared = 0
+                if not ensure_adb_server(adb_cmd):
+                    raise AdbError("The ADB server could not be started")
+                # One shell session for the whole sweep instead of a process per package
+                batch = ShellBatch(serial)
                 for pkg in packages:
-                    r = subprocess.run(
-                        [adb_cmd, "-s", serial, "shell", "pm", "clear", "--cache-only", pkg],
-                        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10,
-                    )
-                    if r.returncode != 0:
-                        # fallback: clear all (requires root or some Android versions)
-                        subprocess.run(
-                            [adb_cmd, "-s", serial, "shell", "pm", "clear", pkg],
-                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10,
-                        )
-                    cleared += 1
-                    if cleared % 5 == 0:
-                        emit_ui(self, lambda n=cleared: log.appendPlainText(f"Cleared {n}/{len(packages)}..."))
-                emit_ui(self, lambda: log.appendPlainText(f"\nDone. Cleared caches for {cleared} apps."))
+                    # No "|| pm clear" fallback: that would wipe the app's data,
+                    # not just its cache, wherever --cache-only is unsupported
+                    batch.add_args("pm", "clear", "--cache-only", pkg, key=pkg)
+
+                done = 0
+
+                def on_result(result):
+                    nonlocal done
+                    done += 1
+                    if not result.ok:
+                        emit_ui(self, lambda r=result: log.appendPlainText(
+                            f"Failed {r.key}: {r.output or f'exit {r.exit_code}'}"))
+                    if done % 25 == 0:
+                        emit_ui(self, lambda n=done: log.appendPlainText(f"Processed {n}/{len(packages)}..."))
+
+                results = batch.run(on_result=on_result)
+                cleared = sum(1 for r in results if r.ok)
+                failed = len(results) - cleared
+                emit_ui(self, lambda: log.appendPlainText(
+                    f"\nDone. Cleared caches for {cleared} apps" + (f", {failed} failed." if failed else ".")))
+                if failed:
+                    emit_ui(self, lambda: log.appendPlainText(
+                        "App data was left untouched for the failed apps; "
+                        "use Clear Data in the App Manager to reset them completely."))
             except Exception as exc:
                 emit_ui(self, lambda e=exc: log.appendPlainText(f"Error: {e}"))
 
@@ -894,15 +923,16 @@ class FileManagerMixin:
                 )
                 db_files = [l.strip() for l in r.stdout.splitlines() if l.strip()]
                 emit_ui(self, lambda n=len(db_files): log.appendPlainText(f"Found {n} database(s). Pulling..."))
+                stats = self._file_transfer(adb_cmd, serial, "Exporting databases").pull_files(
+                    # Keep the device folders: app databases often share a file name
+                    [(db, os.path.join(save_dir, *posixpath.relpath(db, "/sdcard").split("/")))
+                     for db in db_files]
+                )
+                failed = {path for path, _ in stats.errors}
                 for db in db_files:
-                    dest = os.path.join(save_dir, os.path.basename(db))
-                    pull = subprocess.run(
-                        [adb_cmd, "-s", serial, "pull", db, dest],
-                        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=30,
-                    )
-                    msg = f"{'OK' if pull.returncode == 0 else 'FAIL'}: {db}"
+                    msg = f"{'FAIL' if db in failed else 'OK'}: {db}"
                     emit_ui(self, lambda m=msg: log.appendPlainText(m))
-                emit_ui(self, lambda: log.appendPlainText("\nExport complete."))
+                emit_ui(self, lambda: log.appendPlainText(f"\nExport complete: {stats.summary()}"))
             except Exception as exc:
                 emit_ui(self, lambda e=exc: log.appendPlainText(f"Error: {e}"))
 
@@ -0,0 +1,236 @@
+"""
+DROIDCOM - Fleet Operations Feature Module
+Runs one operation on many attached devices at once and collects the
+per-device results in a single view.
+"""
+
+from PySide6 import QtWidgets, QtCore, QtGui
+import os
+import time
+
+from ..app.config import DEFAULT_ADB_TIMEOUT, LONG_ADB_TIMEOUT
+from ..core.adb_client import get_adb_client
+from ..core.file_transfer import FileTransfer
+from ..core.fleet import FAILED, RUNNING, SUCCEEDED, get_fleet_executor
+from ..core.utils import (
+    ensure_adb_server,
+    get_backups_directory,
+    get_connected_devices,
+    get_screenshots_directory,
+    run_adb_command,
+)
+from ..utils.qt_dispatcher import emit_ui
+
+FLEET_STATUS_COLORS = {
+    RUNNING: "#1e88e5",
+    SUCCEEDED: "#43a047",
+    FAILED: "#e53935",
+}
+
+
+class FleetMixin:
+    """Mixin class providing multi-device fan-out of common operations."""
+
+    # Operation name -> prompt for its input ("apk" opens a file picker), or None
+    FLEET_OPERATIONS = {
+        "Screenshot": None,
+        "Install APK": "apk",
+        "Uninstall Package": "Package name:",
+        "Clear App Caches": None,
+        "Backup Photos (DCIM)": None,
+        "Shell Command": "Shell command:",
+        "Reboot": None,
+    }
+
+    def run_fleet_operations(self):
+        """Open the fleet runner: pick devices and an operation, watch the results."""
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle("Fleet Operations")
+        dialog.resize(900, 600)
+        layout = QtWidgets.QVBoxLayout(dialog)
+
+        top = QtWidgets.QHBoxLayout()
+        device_box = QtWidgets.QGroupBox("Devices")
+        device_layout = QtWidgets.QVBoxLayout(device_box)
+        device_list = QtWidgets.QListWidget()
+        device_layout.addWidget(device_list)
+        device_buttons = QtWidgets.QHBoxLayout()
+        refresh_btn = QtWidgets.QPushButton("Refresh")
+        all_btn = QtWidgets.QPushButton("Select All")
+        none_btn = QtWidgets.QPushButton("Select None")
+        for btn in (refresh_btn, all_btn, none_btn):
+            device_buttons.addWidget(btn)
+        device_layout.addLayout(device_buttons)
+        top.addWidget(device_box, 1)
+
+        op_box = QtWidgets.QGroupBox("Operation")
+        op_layout = QtWidgets.QFormLayout(op_box)
+        op_combo = QtWidgets.QComboBox()
+        op_combo.addItems(list(self.FLEET_OPERATIONS))
+        run_btn = QtWidgets.QPushButton("Run on Selected")
+        cancel_btn = QtWidgets.QPushButton("Cancel Pending")
+        summary_label = QtWidgets.QLabel("No operation running")
+        op_layout.addRow("Operation:", op_combo)
+        op_layout.addRow(run_btn)
+        op_layout.addRow(cancel_btn)
+        op_layout.addRow(summary_label)
+        top.addWidget(op_box, 1)
+        layout.addLayout(top)
+
+        results = QtWidgets.QTableWidget(0, 5)
+        results.setHorizontalHeaderLabels(["Device", "Operation", "Status", "Time", "Result"])
+        results.horizontalHeader().setStretchLastSection(True)
+        results.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        layout.addWidget(results, 2)
+
+        close_btn = QtWidgets.QPushButton("Close")
+        close_btn.clicked.connect(dialog.close)
+        layout.addWidget(close_btn)
+
+        runs = []
+
+        def refresh_devices():
+            device_list.clear()
+            for serial, state, details in get_connected_devices(self._fleet_adb_cmd()):
+                item = QtWidgets.QListWidgetItem(f"{serial}  ({state}) {details}".strip())
+                item.setData(QtCore.Qt.UserRole, serial)
+                ready = state == "device"
+                item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+                if not ready:
+                    item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEnabled)
+                item.setCheckState(QtCore.Qt.Checked if ready else QtCore.Qt.Unchecked)
+                device_list.addItem(item)
+
+        def set_all(state):
+            for i in range(device_list.count()):
+                item = device_list.item(i)
+                if item.flags() & QtCore.Qt.ItemIsEnabled:
+                    item.setCheckState(state)
+
+        def selected_serials():
+            return [
+                device_list.item(i).data(QtCore.Qt.UserRole)
+                for i in range(device_list.count())
+                if device_list.item(i).checkState() == QtCore.Qt.Checked
+            ]
+
+        def start():
+            serials = selected_serials()
+            if not serials:
+                QtWidgets.QMessageBox.information(dialog, "No Devices", "Select at least one device.")
+                return
+            name = op_combo.currentText()
+            operation = self._build_fleet_operation(dialog, name)
+            if operation is None:
+                return
+
+            rows = {}
+            for serial in serials:
+                row = results.rowCount()
+                results.insertRow(row)
+                for col, text in enumerate((serial, name, "Queued", "", "")):
+                    results.setItem(row, col, QtWidgets.QTableWidgetItem(text))
+                rows[serial] = row
+
+            def show(serial, status, seconds, message):
+                row = rows[serial]
+                status_item = QtWidgets.QTableWidgetItem(status)
+                if status in FLEET_STATUS_COLORS:
+                    status_item.setForeground(QtGui.QColor(FLEET_STATUS_COLORS[status]))
+                results.setItem(row, 2, status_item)
+                results.setItem(row, 3, QtWidgets.QTableWidgetItem("" if seconds is None else f"{seconds:.1f}s"))
+                results.setItem(row, 4, QtWidgets.QTableWidgetItem(message.strip().splitlines()[-1] if message.strip() else ""))
+                results.item(row, 4).setToolTip(message)
+                summary_label.setText(f"{name}: {fleet_run.summary()}")
+                if fleet_run.done:
+                    self.log_message(f"Fleet {name} finished: {fleet_run.summary()}")
+
+            def on_update(result):
+                snapshot = (result.serial, result.status, result.duration, result.message)
+                emit_ui(self, lambda s=snapshot: show(*s))
+
+            self.log_message(f"Fleet {name} started on {len(serials)} device(s)")
+            fleet_run = get_fleet_executor().run(serials, operation, name, on_update=on_update)
+            runs.append(fleet_run)
+            summary_label.setText(f"{name}: {fleet_run.summary()}")
+
+        def cancel_pending():
+            for fleet_run in runs:
+                fleet_run.cancel()
+
+        refresh_btn.clicked.connect(refresh_devices)
+        all_btn.clicked.connect(lambda: set_all(QtCore.Qt.Checked))
+        none_btn.clicked.connect(lambda: set_all(QtCore.Qt.Unchecked))
+        run_btn.clicked.connect(start)
+        cancel_btn.clicked.connect(cancel_pending)
+
+        refresh_devices()
+        dialog.exec()
+
+    def _fleet_adb_cmd(self):
+        return getattr(self, "adb_path", None) or "adb"
+
+    def _build_fleet_operation(self, parent, name):
+        """Ask for the operation's input and return ``operation(serial)``, or None if cancelled."""
+        prompt = self.FLEET_OPERATIONS[name]
+        adb_cmd = self._fleet_adb_cmd()
+        value = None
+        if prompt == "apk":
+            value, _ = QtWidgets.QFileDialog.getOpenFileName(parent, "Select APK File", "", "APK Files (*.apk)")
+            if not value:
+                return None
+        elif prompt:
+            value, ok = QtWidgets.QInputDialog.getText(parent, name, prompt)
+            if not ok or not value.strip():
+                return None
+            value = value.strip()
+
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        device_args = {
+            "Screenshot": ["exec-out", "screencap", "-p"],
+            "Install APK": ["install", "-r", value],
+            "Uninstall Package": ["shell", "pm", "uninstall", value],
+            "Clear App Caches": ["shell", "pm", "trim-caches", "999G"],
+            "Backup Photos (DCIM)": ["pull", "/sdcard/DCIM"],
+            "Shell Command": ["shell", value],
+            "Reboot": ["reboot"],
+        }[name]
+
+        # One decision (and evidence log line) for the whole fleet
+        if not self._check_write_blocker([adb_cmd, "-s", "<fleet>"] + device_args, f"fleet {name}"):
+            return None
+        if not ensure_adb_server(adb_cmd):
+            QtWidgets.QMessageBox.critical(parent, "ADB Error", "The ADB server could not be started.")
+            return None
+
+        if name == "Screenshot":
+            def operation(serial):
+                data = get_adb_client().exec_out(serial, "screencap -p", timeout=30)
+                if not data.startswith(b"\x89PNG"):
+                    return False, data[:200].decode("utf-8", errors="replace") or "No image data"
+                folder = os.path.join(get_screenshots_directory(), "Fleet")
+                os.makedirs(folder, exist_ok=True)
+                path = os.path.join(folder, f"{serial}_{stamp}.png")
+                with open(path, "wb") as f:
+                    f.write(data)
+                return True, path
+            return operation
+
+        if name == "Backup Photos (DCIM)":
+            def operation(serial):
+                target = os.path.join(get_backups_directory(), f"Fleet_{stamp}", serial)
+                os.makedirs(target, exist_ok=True)
+                stats = FileTransfer(serial).pull("/sdcard/DCIM", target)
+                return stats.ok, stats.summary()
+            return operation
+
+        # pm and adb install report failures on stdout with a zero exit status
+        needs_success = name in ("Install APK", "Uninstall Package")
+        timeout = LONG_ADB_TIMEOUT if name == "Install APK" else DEFAULT_ADB_TIMEOUT
+
+        def operation(serial):
+            ok, out, err = run_adb_command(device_args, serial, timeout, adb_cmd)
+            if needs_success:
+                ok = ok and "Success" in out
+            return ok, (out + err).strip() or "Done"
+        return operation
@@ -14,6 +14,7 @@ import time
 from datetime import datetime
 
 from ..app.config import IS_WINDOWS
+from ..core.device_profile import get_profile_cache
 from ..utils.qt_dispatcher import emit_ui, append_text, clear_text, set_progress, set_text
 
 
@@ -1259,11 +1260,16 @@ class SecurityMixin:
 
         def update_ui():
             try:
-                device_model = self._run_adb_shell("getprop ro.product.model")[1]
-                device_manufacturer = self._run_adb_shell("getprop ro.product.manufacturer")[1]
-                build_version = self._run_adb_shell("getprop ro.build.version.release")[1]
-                build_id = self._run_adb_shell("getprop ro.build.id")[1]
-                patch_level = self._run_adb_shell("getprop ro.build.version.security_patch")[1]
+                profile = get_profile_cache().get(
+                    self._get_device_serial(),
+                    fields=("model", "manufacturer", "android_version", "build_id", "security_patch"),
+                    adb_path=self._get_adb_command(),
+                )
+                device_model = profile.model
+                device_manufacturer = profile.manufacturer
+                build_version = profile.android_version
+                build_id = profile.build_id
+                patch_level = profile.security_patch
 
                 def apply_updates():
                     device_label.setText(f"{device_manufacturer} {device_model}".strip())
@@ -15,6 +15,7 @@ import threading
 from PySide6 import QtCore, QtWidgets
 
 from ..app.config import IS_WINDOWS
+from ..core.device_profile import get_profile_cache
 from ..utils.qt_dispatcher import emit_ui
 
 
@@ -1271,29 +1272,21 @@ class SystemToolsMixin:
     def _refresh_device_info(self, props_widget, sys_widget, hw_widget, serial, adb_cmd):
         def get_device_properties():
             try:
-                cmd = [adb_cmd, "-s", serial, "shell", "getprop"]
-                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                stdout, stderr = process.communicate(timeout=10)
-                if process.returncode != 0:
-                    return f"Error getting device properties: {stderr}"
-                return stdout
+                # Refresh re-reads the properties; the system info below reuses them
+                profile = get_profile_cache().get(serial, fields=("properties",), force=True, adb_path=adb_cmd)
+                return "\n".join(f"[{key}]: [{value}]" for key, value in sorted(profile.properties.items()))
             except Exception as exc:
-                return f"Error: {exc}"
+                return f"Error getting device properties: {exc}"
 
         def get_system_info():
             info = []
             try:
-                cmd = [adb_cmd, "-s", serial, "shell", "getprop", "ro.build.version.release"]
-                android_ver = subprocess.check_output(cmd, text=True).strip()
-                info.append(f"Android Version: {android_ver}")
-
-                cmd = [adb_cmd, "-s", serial, "shell", "getprop", "ro.build.version.security_patch"]
-                security_patch = subprocess.check_output(cmd, text=True).strip()
-                info.append(f"Security Patch: {security_patch}")
-
-                cmd = [adb_cmd, "-s", serial, "shell", "getprop", "ro.build.display.id"]
-                build_num = subprocess.check_output(cmd, text=True).strip()
-                info.append(f"Build Number: {build_num}")
+                profile = get_profile_cache().get(
+                    serial, fields=("android_version", "security_patch", "build_number"), adb_path=adb_cmd
+                )
+                info.append(f"Android Version: {profile.android_version}")
+                info.append(f"Security Patch: {profile.security_patch}")
+                info.append(f"Build Number: {profile.build_number}")
 
                 cmd = [adb_cmd, "-s", serial, "shell", "cat", "/proc/version"]
                 kernel = subprocess.check_output(cmd, text=True).strip()
@@ -0,0 +1,237 @@
+"""A minimal in-process adb server for exercising the native client.
+
+Serves the smart-socket host services, shell (v2 and legacy), exec and a
+sync service backed by a local directory that stands in for the device
+filesystem.
+"""
+
+import os
+import socket
+import stat
+import struct
+import threading
+
+
+class FakeAdbServer:
+    """Listens on an ephemeral localhost port until ``close()``.
+
+    Args:
+        devices: ``{serial: state}`` of attached devices.
+        root: Directory whose contents appear at the device's ``/``.
+        shell: ``shell(serial, command) -> (exit_code, stdout, stderr)``.
+            An interactive v2 shell passes what it read on stdin as ``command``.
+        shell_v2: Whether the shell protocol v2 service is offered.
+    """
+
+    def __init__(self, devices=None, root=None, shell=None, shell_v2=True):
+        self.devices = dict(devices or {"FAKE001": "device"})
+        self.root = root
+        self.shell = shell or (lambda serial, command: (0, b"", b""))
+        self.shell_v2 = shell_v2
+        self.connections = 0
+        self.services = []
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(64)
+        self.port = self._listener.getsockname()[1]
+        self._lock = threading.Lock()
+        self._trackers = []
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        try:
+            # Wakes the accept() call so the port stops answering at once
+            self._listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._listener.close()
+        for conn in list(self._trackers):
+            conn.close()
+
+    def set_devices(self, devices):
+        with self._lock:
+            self.devices = dict(devices)
+            for conn in self._trackers:
+                try:
+                    self._send_string(conn, self._device_list(long=False))
+                except OSError:
+                    pass
+
+    def local_path(self, path):
+        return os.path.join(self.root, path.lstrip("/"))
+
+    # -- protocol plumbing ------------------------------------------------
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    @staticmethod
+    def _read_exact(conn, size):
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                raise EOFError
+            data += chunk
+        return data
+
+    def _read_request(self, conn):
+        length = int(self._read_exact(conn, 4), 16)
+        return self._read_exact(conn, length).decode()
+
+    @staticmethod
+    def _send_string(conn, text):
+        data = text.encode()
+        conn.sendall(b"%04x" % len(data) + data)
+
+    def _fail(self, conn, message):
+        conn.sendall(b"FAIL")
+        self._send_string(conn, message)
+
+    def _device_list(self, long=True):
+        suffix = " product:fake model:Fake_Phone" if long else ""
+        return "".join(f"{serial}\t{state}{suffix}\n" for serial, state in self.devices.items())
+
+    def _serve(self, conn):
+        serial = None
+        try:
+            while True:
+                service = self._read_request(conn)
+                with self._lock:
+                    self.services.append(service)
+                if service == "host:version":
+                    conn.sendall(b"OKAY")
+                    self._send_string(conn, "0029")
+                    return
+                if service == "host:devices-l":
+                    conn.sendall(b"OKAY")
+                    self._send_string(conn, self._device_list())
+                    return
+                if service == "host:track-devices":
+                    conn.sendall(b"OKAY")
+                    with self._lock:
+                        self._trackers.append(conn)
+                        self._send_string(conn, self._device_list(long=False))
+                    return
+                if service.startswith("host:transport"):
+                    serial = service.partition("transport:")[2] or next(iter(self.devices), None)
+                    if serial not in self.devices:
+                        self._fail(conn, f"device '{serial}' not found")
+                        return
+                    conn.sendall(b"OKAY")
+                    continue
+                if service.startswith("shell,v2,raw:"):
+                    if not self.shell_v2:
+                        self._fail(conn, "closed")
+                        return
+                    conn.sendall(b"OKAY")
+                    command = service.partition(":")[2]
+                    if not command:
+                        command = self._read_stdin(conn)
+                    code, out, err = self.shell(serial, command)
+                    for packet_id, data in ((1, out), (2, err)):
+                        if data:
+                            conn.sendall(struct.pack("<BI", packet_id, len(data)) + data)
+                    conn.sendall(struct.pack("<BIB", 3, 1, code))
+                    return
+                if service.startswith("shell:") or service.startswith("exec:"):
+                    conn.sendall(b"OKAY")
+                    command = service.partition(":")[2]
+                    marker = "; echo __DROIDCOM_RC__$?"
+                    if service.startswith("shell:") and command.endswith(marker):
+                        code, out, err = self.shell(serial, command[:-len(marker)])
+                        conn.sendall(out + err + f"__DROIDCOM_RC__{code}\n".encode())
+                    else:
+                        conn.sendall(self.shell(serial, command)[1])
+                    return
+                if service == "sync:":
+                    conn.sendall(b"OKAY")
+                    self._serve_sync(conn)
+                    return
+                self._fail(conn, f"unknown service {service}")
+                return
+        except (EOFError, OSError):
+            pass
+        finally:
+            if conn not in self._trackers:
+                conn.close()
+
+    def _read_stdin(self, conn):
+        """Shell v2 stdin packets up to close-stdin (or EOF), as text."""
+        script = bytearray()
+        while True:
+            try:
+                packet_id, length = struct.unpack("<BI", self._read_exact(conn, 5))
+            except EOFError:
+                break
+            data = self._read_exact(conn, length)
+            if packet_id == 4:  # close-stdin
+                break
+            if packet_id == 0:
+                script += data
+        return script.decode("utf-8")
+
+    def _serve_sync(self, conn):
+        while True:
+            header = self._read_exact(conn, 8)
+            command = header[:4]
+            (length,) = struct.unpack("<I", header[4:])
+            path = self._read_exact(conn, length).decode("utf-8", errors="surrogateescape")
+            if command == b"QUIT":
+                return
+            if command == b"STAT":
+                try:
+                    st = os.stat(self.local_path(path))
+                    conn.sendall(b"STAT" + struct.pack("<III", st.st_mode, st.st_size, int(st.st_mtime)))
+                except OSError:
+                    conn.sendall(b"STAT" + struct.pack("<III", 0, 0, 0))
+            elif command == b"LIST":
+                local = self.local_path(path)
+                try:
+                    names = [".", ".."] + sorted(os.listdir(local))
+                except OSError:
+                    names = []
+                for name in names:
+                    st = os.stat(os.path.join(local, name))
+                    raw = name.encode("utf-8", errors="surrogateescape")
+                    conn.sendall(b"DENT" + struct.pack("<IIII", st.st_mode, st.st_size, int(st.st_mtime), len(raw)) + raw)
+                conn.sendall(b"DONE" + bytes(16))
+            elif command == b"RECV":
+                try:
+                    with open(self.local_path(path), "rb") as f:
+                        while True:
+                            chunk = f.read(64 * 1024)
+                            if not chunk:
+                                break
+                            conn.sendall(b"DATA" + struct.pack("<I", len(chunk)) + chunk)
+                    conn.sendall(b"DONE" + bytes(4))
+                except OSError as exc:
+                    message = str(exc).encode()
+                    conn.sendall(b"FAIL" + struct.pack("<I", len(message)) + message)
+            elif command == b"SEND":
+                target, _, mode = path.rpartition(",")
+                local = self.local_path(target)
+                os.makedirs(os.path.dirname(local), exist_ok=True)
+                with open(local, "wb") as f:
+                    while True:
+                        header = self._read_exact(conn, 8)
+                        (value,) = struct.unpack("<I", header[4:])
+                        if header[:4] == b"DONE":
+                            break
+                        f.write(self._read_exact(conn, value))
+                os.chmod(local, stat.S_IMODE(int(mode)))
+                os.utime(local, (value, value))
+                conn.sendall(b"OKAY" + bytes(4))
+            else:
+                message = b"unknown sync command"
+                conn.sendall(b"FAIL" + struct.pack("<I", len(message)) + message)
+                return
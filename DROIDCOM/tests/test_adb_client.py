@@ -0,0 +1,98 @@
+"""Tests for the native ADB host-protocol client against a fake adb server."""
+
+import io
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from DROIDCOM.core import adb_client, utils
+from DROIDCOM.core.adb_client import AdbClient, AdbError
+from DROIDCOM.tests.fake_adb import FakeAdbServer
+
+
+def _shell(serial, command):
+    if command == "getprop ro.product.model":
+        return 0, b"Pixel 7\n", b""
+    return 1, b"", f"/system/bin/sh: {command.split()[0]}: not found\n".encode()
+
+
+class TestAdbClient(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = FakeAdbServer(root=self.tmp.name, shell=_shell)
+        self.client = AdbClient(port=self.server.port, timeout=5)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+        self.tmp.cleanup()
+
+    def test_host_services(self):
+        self.assertEqual(self.client.server_version(), 0x29)
+        self.assertEqual(self.client.devices(), [("FAKE001", "device", "product:fake model:Fake_Phone")])
+        with self.assertRaises(AdbError):
+            self.client.shell("MISSING", "true")
+
+    def test_shell_v2_and_legacy_fallback(self):
+        result = self.client.shell("FAKE001", "getprop ro.product.model")
+        self.assertTrue(result.ok)
+        self.assertEqual(result.stdout, b"Pixel 7\n")
+        failed = self.client.shell("FAKE001", "frobnicate")
+        self.assertEqual(failed.exit_code, 1)
+        self.assertIn(b"not found", failed.stderr)
+
+        self.server.shell_v2 = False
+        legacy = self.client.shell(None, "getprop ro.product.model")
+        self.assertEqual((legacy.exit_code, legacy.stdout), (0, b"Pixel 7\n"))
+
+    def test_sync_sessions_are_pooled(self):
+        with open(os.path.join(self.tmp.name, "hello.txt"), "wb") as f:
+            f.write(b"x" * 200000)
+        connections = self.server.connections
+        for _ in range(3):
+            with self.client.sync("FAKE001") as sync:
+                self.assertEqual(sync.stat("/hello.txt").size, 200000)
+                self.assertFalse(sync.stat("/missing").exists)
+        self.assertEqual(self.server.connections - connections, 1)
+
+        with self.client.sync("FAKE001") as sync:
+            out = io.BytesIO()
+            self.assertEqual(sync.recv("/hello.txt", out.write), 200000)
+            sync.send("/up/copy.txt", io.BytesIO(b"payload").read, mtime=1700000000)
+            names = [entry.name for entry in sync.list("/")]
+        self.assertEqual(names, ["hello.txt", "up"])
+        self.assertEqual(os.stat(os.path.join(self.tmp.name, "up", "copy.txt")).st_mtime, 1700000000)
+
+    def test_track_devices(self):
+        stop = threading.Event()
+        updates = self.client.track_devices(stop)
+        self.assertEqual(next(updates), [("FAKE001", "device", "")])
+        self.server.set_devices({"FAKE001": "device", "FAKE002": "unauthorized"})
+        self.assertEqual([serial for serial, _, _ in next(updates)], ["FAKE001", "FAKE002"])
+        stop.set()
+
+    def test_run_adb_command_uses_native_backend(self):
+        with mock.patch.object(adb_client, "_client", self.client), \
+                mock.patch.object(utils.subprocess, "run") as run:
+            self.assertEqual(utils.run_adb_command(["shell", "getprop", "ro.product.model"], "FAKE001"),
+                             (True, "Pixel 7\n", ""))
+            ok, _, err = utils.run_adb_command("shell frobnicate", "FAKE001")
+            self.assertFalse(ok)
+            self.assertIn("not found", err)
+            self.assertEqual(utils.get_connected_devices()[0][0], "FAKE001")
+            run.assert_not_called()
+
+    def test_run_adb_command_falls_back_without_server(self):
+        self.server.close()
+        with mock.patch.object(adb_client, "_client", self.client), \
+                mock.patch.object(utils.subprocess, "run") as run:
+            run.return_value = mock.Mock(returncode=0, stdout="ok", stderr="")
+            self.assertEqual(utils.run_adb_command(["shell", "true"], "FAKE001", adb_path="adb"),
+                             (True, "ok", ""))
+            self.assertEqual(run.call_args[0][0], ["adb", "-s", "FAKE001", "shell", "true"])
+
+
+if __name__ == "__main__":
+    unittest.main()
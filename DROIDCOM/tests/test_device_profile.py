@@ -0,0 +1,109 @@
+"""Tests for batched device property snapshots."""
+
+import unittest
+from unittest import mock
+
+from DROIDCOM.core import adb_client
+from DROIDCOM.core.adb_client import AdbClient
+from DROIDCOM.core.device_profile import (
+    DeviceProfileCache,
+    build_snapshot_script,
+    parse_getprop,
+    split_snapshot,
+)
+from DROIDCOM.tests.fake_adb import FakeAdbServer
+
+GETPROP = """[ro.product.model]: [Pixel 7]
+[ro.product.manufacturer]: [Google]
+[ro.build.version.release]: [14]
+[ro.build.version.sdk]: [34]
+[ro.build.display.id]: [UQ1A.240105.004]
+[ro.build.version.security_patch]: [2024-01-05]
+[ro.product.cpu.abi]: [arm64-v8a]
+[ro.boot.flash.locked]: [1]
+[ro.boot.verifiedbootstate]: [green]
+[persist.sys.motd]: [line one
+line two]
+"""
+
+OUTPUTS = {
+    "getprop": GETPROP,
+    "dumpsys battery": "Current Battery Service state:\n  status: 2\n  level: 87\n  temperature: 301\n",
+    "cat /sys/class/power_supply/battery/capacity": "87",
+    "df /storage/emulated/0": (
+        "Filesystem 1K-blocks Used Available Use% Mounted on\n"
+        "/dev/fuse 115343360 57671680 57671680 50% /storage/emulated\n"
+    ),
+    "cat /proc/meminfo": "MemTotal:        7812096 kB\nMemFree:  1 kB\n",
+    "wm size": "Physical size: 1080x2400\nOverride size: 720x1600",
+    "uname -r": "5.10.157-android13-4",
+    "settings get secure android_id": "0123456789abcdef",
+}
+
+
+def _device_shell(serial, script):
+    """Run a snapshot script the way the device shell would."""
+    out = []
+    for command in script.split("; "):
+        if command.startswith("printf "):
+            out.append("\n" + command.rsplit("'", 2)[1] + "\n")
+        else:
+            out.append(OUTPUTS.get(command.replace(" 2>/dev/null", ""), ""))
+    return 0, "".join(out).encode(), b""
+
+
+class TestDeviceProfile(unittest.TestCase):
+    def test_parse_getprop_handles_multiline_values(self):
+        props = parse_getprop(GETPROP)
+        self.assertEqual(props["ro.product.model"], "Pixel 7")
+        self.assertEqual(props["persist.sys.motd"], "line one\nline two")
+
+    def test_snapshot_round_trip(self):
+        script = build_snapshot_script(["kernel", "display"])
+        sections = split_snapshot(_device_shell("X", script)[1].decode())
+        self.assertEqual(sections, {"kernel": OUTPUTS["uname -r"], "display": OUTPUTS["wm size"]})
+
+    def test_cache_fetches_once_and_refreshes_only_expired_sections(self):
+        calls = []
+
+        def runner(serial, script, adb_path=None):
+            calls.append(script)
+            return True, _device_shell(serial, script)[1].decode()
+
+        cache = DeviceProfileCache(runner)
+        profile = cache.get("SER1")
+        self.assertEqual(cache.round_trips, 1)
+        self.assertEqual((profile.model, profile.sdk, profile.battery_level), ("Pixel 7", 34, 87))
+        self.assertEqual(profile.battery_status, "Charging")
+        self.assertEqual(profile.ram_total, 7812096 * 1024)
+
+        info = profile.to_device_info()
+        self.assertEqual(info["battery"], "87%")
+        self.assertEqual(info["storage"], "55.0 GB used / 110.0 GB total")
+        self.assertEqual(info["resolution"], "720x1600")
+        self.assertEqual(info["bootloader_status"], "Locked (green)")
+        self.assertEqual(info["device_id"], "0123456789abcdef")
+
+        cache.get("SER1")
+        self.assertEqual(cache.round_trips, 1)
+
+        # Only the battery section has expired
+        profile.updated["battery_level"] -= 120
+        cache.get("SER1", fields=("model", "battery_level"))
+        self.assertEqual(cache.round_trips, 2)
+        self.assertNotIn("getprop", calls[-1])
+        self.assertIn("dumpsys battery", calls[-1])
+
+    def test_default_runner_uses_one_shell_call(self):
+        server = FakeAdbServer(devices={"SER2": "device"}, shell=_device_shell)
+        try:
+            with mock.patch.object(adb_client, "_client", AdbClient(port=server.port, timeout=5)):
+                profile = DeviceProfileCache().get("SER2")
+            self.assertEqual(profile.manufacturer, "Google")
+            self.assertEqual(sum(s.startswith("shell") for s in server.services), 1)
+        finally:
+            server.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
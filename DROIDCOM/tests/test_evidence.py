@@ -0,0 +1,88 @@
+"""Tests for the hash-chained evidence log and its sidecar index."""
+
+import json
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+
+from DROIDCOM.core.evidence import GENESIS_HASH, EvidenceLog
+
+
+def _append_many(path, worker, count):
+    log = EvidenceLog(path)
+    for i in range(count):
+        log.record("COMMAND_EXECUTED", {"worker": worker, "i": i})
+
+
+class TestEvidenceLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "evidence_log.jsonl"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_appends_chain_across_instances(self):
+        first, second = EvidenceLog(self.path), EvidenceLog(self.path)
+        self.assertEqual(first.last_hash, GENESIS_HASH)
+        a = first.record("CASE_OPENED", {"case_number": "C1"})
+        b = second.record("ACQUISITION_STARTED", {"image_path": "/img/a.tar"})
+        c = first.record("ACQUISITION_COMPLETED", {"image_path": "/img/a.tar", "image_sha256": "ab"})
+        self.assertEqual((b["prev_hash"], c["prev_hash"]), (a["entry_hash"], b["entry_hash"]))
+        self.assertEqual(EvidenceLog(self.path).verify(full=True), (True, None))
+
+        fresh = EvidenceLog(self.path)
+        self.assertEqual(len(fresh), 3)
+        self.assertEqual(fresh.latest("ACQUISITION_COMPLETED", image_path="/img/a.tar")["entry_hash"], c["entry_hash"])
+        self.assertEqual([e["action"] for e in fresh.find(image_path="/img/a.tar")],
+                         ["ACQUISITION_STARTED", "ACQUISITION_COMPLETED"])
+        self.assertIsNone(fresh.latest("ACQUISITION_COMPLETED", image_path="/img/b.tar"))
+
+    def test_verify_resumes_from_checkpoints_and_detects_tampering(self):
+        log = EvidenceLog(self.path)
+        log.CHECKPOINT_INTERVAL = 4
+        for i in range(10):
+            log.record("COMMAND_EXECUTED", {"i": i})
+        self.assertEqual(log.verify(), (True, None))
+        checkpoints = [json.loads(line)["checkpoint"] for line in log.index_path.read_text().splitlines()
+                       if "checkpoint" in line]
+        self.assertEqual(checkpoints, [4, 8, 10])
+
+        # Edit an early entry in place; the log no longer matches the index, which is rebuilt
+        lines = self.path.read_text().splitlines(keepends=True)
+        lines[2] = lines[2].replace('"i": 2', '"i": 22')
+        self.path.write_text("".join(lines))
+        self.assertEqual(log.verify(), (False, 2))
+        self.assertEqual(EvidenceLog(self.path).verify(full=True), (False, 2))
+
+    def test_unindexed_lines_are_picked_up(self):
+        log = EvidenceLog(self.path)
+        log.record("CASE_OPENED", {})
+        # Simulate a writer that died between appending to the log and to the index
+        entry = log.record("ACQUISITION_COMPLETED", {"image_path": "/img/x.tar"})
+        index_lines = log.index_path.read_text().splitlines(keepends=True)
+        log.index_path.write_text("".join(index_lines[:-1]))
+
+        reopened = EvidenceLog(self.path)
+        self.assertEqual(reopened.latest("ACQUISITION_COMPLETED")["entry_hash"], entry["entry_hash"])
+        self.assertEqual(reopened.record("IMAGE_VERIFIED", {})["prev_hash"], entry["entry_hash"])
+        self.assertEqual(reopened.verify(full=True), (True, None))
+
+    def test_concurrent_processes_keep_the_chain_intact(self):
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_append_many, args=(self.path, w, 40)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+            self.assertEqual(worker.exitcode, 0)
+
+        log = EvidenceLog(self.path)
+        self.assertEqual(len(log), 160)
+        self.assertEqual(log.verify(full=True), (True, None))
+        self.assertEqual(len(log.find(action="COMMAND_EXECUTED")), 160)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Tests for sync-protocol file transfers against a fake adb server."""
+
+import os
+import shlex
+import tempfile
+import unittest
+
+from DROIDCOM.core.adb_client import AdbClient
+from DROIDCOM.core.file_transfer import FileTransfer
+from DROIDCOM.tests.fake_adb import FakeAdbServer
+
+
+class TestFileTransfer(unittest.TestCase):
+    def setUp(self):
+        self.device = tempfile.TemporaryDirectory()
+        self.local = tempfile.TemporaryDirectory()
+        self.tails = []
+        self.stat_sizes = {}
+        self.server = FakeAdbServer(root=self.device.name, shell=self._shell)
+        self.client = AdbClient(port=self.server.port, timeout=5)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+        self.device.cleanup()
+        self.local.cleanup()
+
+    def _shell(self, serial, command):
+        stat, _, tail = command.partition(" && ")
+        args = shlex.split(stat)
+        if args[:3] == ["stat", "-c", "%s"] and tail:
+            self.tails.append(command)
+            local = self.server.local_path(args[3])
+            size = self.stat_sizes.get(args[3], os.path.getsize(local))
+            args = shlex.split(tail)
+            with open(local, "rb") as f:
+                f.seek(int(args[2]) - 1)
+                return 0, b"%d\n" % size + f.read(), b""
+        return 127, b"", b"not found"
+
+    def _device_file(self, path, data, mtime=1700000000):
+        local = self.server.local_path(path)
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+        with open(local, "wb") as f:
+            f.write(data)
+        os.utime(local, (mtime, mtime))
+
+    def _read(self, *parts):
+        with open(os.path.join(self.local.name, *parts), "rb") as f:
+            return f.read()
+
+    def test_pull_tree_then_skip_unchanged(self):
+        self._device_file("/DCIM/a.jpg", os.urandom(300000))
+        self._device_file("/DCIM/Camera/b.jpg", os.urandom(70000))
+        self._device_file("/DCIM/Camera/c.txt", b"")
+
+        stats = FileTransfer("FAKE001", client=self.client, streams=3).pull("/DCIM", self.local.name)
+        self.assertTrue(stats.ok, stats.errors)
+        self.assertEqual((stats.files_done, stats.files_total, stats.bytes_done), (3, 3, 370000))
+        with open(self.server.local_path("/DCIM/Camera/b.jpg"), "rb") as f:
+            self.assertEqual(self._read("DCIM", "Camera", "b.jpg"), f.read())
+        self.assertEqual(os.stat(os.path.join(self.local.name, "DCIM", "a.jpg")).st_mtime, 1700000000)
+
+        again = FileTransfer("FAKE001", client=self.client).pull("/DCIM", self.local.name)
+        self.assertEqual((again.files_skipped, again.bytes_done), (3, 0))
+
+        self._device_file("/DCIM/a.jpg", os.urandom(300000), mtime=1700000100)
+        changed = FileTransfer("FAKE001", client=self.client).pull("/DCIM", self.local.name)
+        self.assertEqual((changed.files_skipped, changed.bytes_done), (2, 300000))
+
+    def test_partial_pull_resumes(self):
+        data = os.urandom(250000)
+        self._device_file("/Download/big.bin", data)
+        target = os.path.join(self.local.name, "big.bin")
+        with open(f"{target}.250000-1700000000.part", "wb") as f:
+            f.write(data[:100000])
+        with open(f"{target}.9-1600000000.part", "wb") as f:
+            f.write(b"stale")
+
+        stats = FileTransfer("FAKE001", client=self.client).pull("/Download/big.bin", self.local.name)
+        self.assertTrue(stats.ok, stats.errors)
+        self.assertEqual(self._read("big.bin"), data)
+        self.assertEqual((stats.bytes_resumed, stats.bytes_done), (100000, 150000))
+        self.assertEqual(len(self.tails), 1)
+        self.assertEqual(os.listdir(self.local.name), ["big.bin"])
+
+    def test_part_matching_only_modulo_4gib_is_pulled_again(self):
+        data = os.urandom(1000)
+        self._device_file("/Movies/huge.mp4", data)
+        # The device file "really" is 4 GiB larger than the sync size says
+        self.stat_sizes["/Movies/huge.mp4"] = 2 ** 32 + len(data)
+        target = os.path.join(self.local.name, "huge.mp4")
+        with open(f"{target}.1000-1700000000.part", "wb") as f:
+            f.write(data[:900] + b"x" * 100)
+
+        stats = FileTransfer("FAKE001", client=self.client).pull("/Movies/huge.mp4", self.local.name)
+        self.assertTrue(stats.ok, stats.errors)
+        self.assertEqual(len(self.tails), 1)
+        self.assertEqual(stats.bytes_resumed, 0)
+        self.assertEqual(self._read("huge.mp4"), data)
+
+    def test_duplicate_targets_are_rejected(self):
+        self._device_file("/a/app.db", b"first")
+        self._device_file("/b/app.db", b"second")
+        target = os.path.join(self.local.name, "app.db")
+
+        stats = FileTransfer("FAKE001", client=self.client, streams=2).pull_files(
+            [("/a/app.db", target), ("/b/app.db", target)]
+        )
+        self.assertEqual(stats.errors, [("/b/app.db", f"duplicate target {target}")])
+        self.assertEqual(self._read("app.db"), b"first")
+
+    def test_push_tree_then_skip_unchanged(self):
+        source = os.path.join(self.local.name, "photos")
+        os.makedirs(os.path.join(source, "2024"))
+        for name, size in (("a.jpg", 90000), (os.path.join("2024", "b.jpg"), 120000)):
+            with open(os.path.join(source, name), "wb") as f:
+                f.write(os.urandom(size))
+            os.utime(os.path.join(source, name), (1690000000, 1690000000))
+        os.makedirs(self.server.local_path("/sdcard"))
+
+        stats = FileTransfer("FAKE001", client=self.client).push(source, "/sdcard")
+        self.assertTrue(stats.ok, stats.errors)
+        self.assertEqual((stats.files_done, stats.bytes_done), (2, 210000))
+        pushed = self.server.local_path("/sdcard/photos/2024/b.jpg")
+        self.assertEqual(os.path.getsize(pushed), 120000)
+        self.assertEqual(os.stat(pushed).st_mtime, 1690000000)
+
+        again = FileTransfer("FAKE001", client=self.client).push(source, "/sdcard")
+        self.assertEqual((again.files_skipped, again.bytes_done), (2, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for the multi-device fleet executor."""
+
+import threading
+import time
+import unittest
+
+from DROIDCOM.core.fleet import CANCELLED, FAILED, SUCCEEDED, FleetExecutor
+
+
+class TestFleetExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = FleetExecutor(max_workers=3)
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak_total = 0
+        self.peak_per_device = 0
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def _operation(self, serial):
+        with self.lock:
+            self.active[serial] = self.active.get(serial, 0) + 1
+            self.peak_total = max(self.peak_total, sum(self.active.values()))
+            self.peak_per_device = max(self.peak_per_device, self.active[serial])
+        time.sleep(0.02)
+        with self.lock:
+            self.active[serial] -= 1
+        if serial.endswith("BAD"):
+            raise RuntimeError("device offline")
+        if serial.endswith("NO"):
+            return False, "Failure [INSTALL_FAILED_VERSION_DOWNGRADE]"
+        return f"done on {serial}"
+
+    def test_fan_out_aggregates_per_device_results(self):
+        updates = []
+        serials = [f"D{i}" for i in range(7)] + ["D7BAD", "D8NO"]
+        run = self.executor.run(serials, self._operation, "Install APK", on_update=updates.append)
+        self.assertTrue(run.wait(10))
+
+        self.assertEqual(run.counts()[SUCCEEDED], 7)
+        self.assertEqual(run.results["D7BAD"].status, FAILED)
+        self.assertEqual(run.results["D7BAD"].message, "device offline")
+        self.assertIn("DOWNGRADE", run.results["D8NO"].message)
+        self.assertEqual(run.results["D3"].message, "done on D3")
+        self.assertEqual(run.summary(), "9/9 done, 2 failed")
+        self.assertLessEqual(self.peak_total, 3)
+        self.assertEqual(len(updates), 18)  # running + finished per device
+
+    def test_device_queue_runs_jobs_one_at_a_time_in_order(self):
+        order = []
+        runs = [
+            self.executor.run(["A", "B"], lambda s, n=n: (self._operation(s), order.append((s, n))), f"op{n}")
+            for n in range(4)
+        ]
+        for run in runs:
+            self.assertTrue(run.wait(10))
+        self.assertEqual(self.peak_per_device, 1)
+        self.assertEqual([n for s, n in order if s == "A"], [0, 1, 2, 3])
+
+    def test_cancel_drops_jobs_still_queued(self):
+        gate = threading.Event()
+        blocker = self.executor.run(["A"], lambda s: gate.wait(5), "hold")
+        queued = self.executor.run(["A"], self._operation, "later")
+        queued.cancel()
+        gate.set()
+        self.assertTrue(blocker.wait(5))
+        self.assertTrue(queued.wait(5))
+        self.assertEqual(queued.results["A"].status, CANCELLED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for streaming acquisition images: hashing and tar member indexing."""
+
+import hashlib
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+
+from DROIDCOM.core.imaging import (
+    TarIndexer,
+    extract_member,
+    find_members,
+    hash_file,
+    load_index,
+    write_image,
+    write_index,
+)
+
+
+def _tar(fmt, files):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w", format=fmt) as tar:
+        directory = tarfile.TarInfo("sdcard/DCIM")
+        directory.type = tarfile.DIRTYPE
+        tar.addfile(directory)
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 1700000000
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+class TestImaging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.files = {
+            "sdcard/DCIM/a.jpg": os.urandom(70000),
+            "sdcard/" + "deep/" * 30 + "long.txt": b"long path\n",
+            "sdcard/empty": b"",
+            "sdcard/Download/b.bin": os.urandom(513),
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_image_hashes_and_indexes_in_one_pass(self):
+        for fmt in (tarfile.GNU_FORMAT, tarfile.PAX_FORMAT, tarfile.USTAR_FORMAT):
+            files = dict(self.files)
+            if fmt == tarfile.USTAR_FORMAT:
+                # ustar splits paths of up to 255 bytes into prefix and name
+                files = {k: v for k, v in files.items() if len(k) <= 100}
+                files["sdcard/" + "p" * 120 + "/prefixed.txt"] = b"prefix"
+            data = _tar(fmt, files)
+            stream = io.BytesIO(data)
+            image = Path(self.tmp.name) / f"image{fmt}.tar"
+
+            # Odd chunk sizes make headers straddle chunk boundaries
+            result = write_image(stream.read, image, ("sha256", "md5", "sha1"), chunk_size=700)
+            self.assertEqual(result.size, len(data))
+            self.assertEqual(result.hashes, {
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "md5": hashlib.md5(data).hexdigest(),
+                "sha1": hashlib.sha1(data).hexdigest(),
+            })
+            self.assertTrue(result.index_complete, result.index_error)
+            self.assertEqual({m.name for m in result.members if m.is_file}, set(files))
+
+            self.assertEqual(write_index(result), Path(str(image) + ".index.json"))
+            for member in load_index(image):
+                if member.is_file:
+                    out = Path(self.tmp.name) / "out"
+                    digest = extract_member(image, member, out)
+                    self.assertEqual(out.read_bytes(), files[member.name])
+                    self.assertEqual(digest, hashlib.sha256(files[member.name]).hexdigest())
+
+    def test_find_members_and_hash_file(self):
+        data = _tar(tarfile.GNU_FORMAT, self.files)
+        indexer = TarIndexer()
+        indexer.feed(data)
+        self.assertEqual([m.name for m in find_members(indexer.members, "/sdcard/DCIM/a.jpg")], ["sdcard/DCIM/a.jpg"])
+        self.assertEqual(len(find_members(indexer.members, "sdcard/")), len(self.files))
+
+        path = Path(self.tmp.name) / "raw.tar"
+        path.write_bytes(data)
+        self.assertEqual(hash_file(path, ("sha256", "md5"))["md5"], hashlib.md5(data).hexdigest())
+
+    def test_corrupt_header_stops_indexing_only(self):
+        data = bytearray(_tar(tarfile.GNU_FORMAT, self.files))
+        data[512 + 10] ^= 0xFF  # name field of the header after the directory entry
+        stream = io.BytesIO(bytes(data))
+        result = write_image(stream.read, Path(self.tmp.name) / "bad.tar")
+        self.assertFalse(result.index_complete)
+        self.assertIn("checksum", result.index_error)
+        self.assertEqual(result.sha256, hashlib.sha256(bytes(data)).hexdigest())
+
+
+if __name__ == "__main__":
+    unittest.main()
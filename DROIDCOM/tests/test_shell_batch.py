@@ -0,0 +1,78 @@
+"""Tests for running many shell commands in one adb shell session."""
+
+import shutil
+import subprocess
+import unittest
+
+from DROIDCOM.core.adb_client import AdbClient
+from DROIDCOM.core.shell_batch import ShellBatch, package_batch
+from DROIDCOM.tests.fake_adb import FakeAdbServer
+
+# A stand-in for the device's pm: fails for packages containing "locked"
+_PM = """
+pm() {
+    case "$3" in
+        *locked*) echo "Failure [DELETE_FAILED_USER_RESTRICTED]"; echo "pm: denied" >&2; return 1 ;;
+        *) printf 'Success' ;;
+    esac
+}
+"""
+
+
+def _device_shell(serial, command):
+    proc = subprocess.run(["sh"], input=(_PM + command).encode(), capture_output=True, timeout=30)
+    return proc.returncode, proc.stdout, proc.stderr
+
+
+@unittest.skipUnless(shutil.which("sh"), "needs a POSIX shell to play the device")
+class TestShellBatch(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeAdbServer(shell=_device_shell)
+        self.client = AdbClient(port=self.server.port, timeout=5)
+        self.packages = [f"com.example.app{i}" for i in range(300)] + ["com.example.locked"]
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+
+    def _check_sweep(self, results):
+        self.assertEqual(len(results), 301)
+        self.assertTrue(all(r.ok and r.stdout == "Success" for r in results[:300]))
+        locked = results[-1]
+        self.assertEqual(locked.key, "com.example.locked")
+        self.assertEqual(locked.exit_code, 1)
+        self.assertIn("USER_RESTRICTED", locked.output)
+
+    def test_one_session_reports_each_command(self):
+        seen = []
+        batch = package_batch("FAKE001", ["pm", "clear", "--cache-only"], self.packages,
+                              self.client, timeout=5)
+        results = batch.run(on_result=seen.append)
+
+        self._check_sweep(results)
+        self.assertEqual(results[-1].stderr.strip(), "pm: denied")
+        self.assertEqual(results[0].stderr, "")
+        self.assertEqual([r.key for r in seen], self.packages)
+        self.assertEqual([s for s in self.server.services if s.startswith("shell")], ["shell,v2,raw:"])
+
+    def test_legacy_shell_runs_in_few_sessions(self):
+        self.server.shell_v2 = False
+        batch = package_batch("FAKE001", ["pm", "clear", "--cache-only"], self.packages,
+                              self.client, timeout=5)
+        self._check_sweep(batch.run())
+        legacy_sessions = [s for s in self.server.services if s.startswith("shell:")]
+        self.assertLess(len(legacy_sessions), 20)
+
+    def test_commands_cannot_swallow_the_script(self):
+        batch = ShellBatch("FAKE001", self.client, timeout=5)
+        batch.add("cat; echo after cat")
+        batch.add("exit 3")
+        batch.add("echo never")
+        first, died, never = batch.run()
+        self.assertEqual((first.exit_code, first.stdout.strip()), (0, "after cat"))
+        self.assertEqual(died.exit_code, 3)
+        self.assertIsNone(never.exit_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
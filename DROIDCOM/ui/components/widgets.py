@@ -899,6 +899,7 @@ class WidgetsMixin:
             self._add_tool_button(layout, 1, 2, "Power Button", self._simulate_power_button, "power")
             self._add_tool_button(layout, 2, 2, "Flashlight", self._toggle_flashlight, "flashlight")
             self._add_tool_button(layout, 3, 2, "Blind Setup", self._blind_setup_dialog, "screen")
+            self._add_tool_button(layout, 4, 2, "Fleet Runner", self.run_fleet_operations, "android-robot")
 
         elif category_name == "App Management":
             self._add_tool_button(layout, 0, 0, "Install APK", self.install_apk, "download")
@@ -993,6 +994,7 @@ class WidgetsMixin:
             self._add_tool_button(layout, 1, 0, "Toggle Write Blocker", self.toggle_write_blocker, "lock")
             self._add_tool_button(layout, 2, 0, "Acquire Image", self.run_device_acquisition, "download")
             self._add_tool_button(layout, 3, 0, "Verify Image", self.verify_acquisition_image, "shield")
+            self._add_tool_button(layout, 2, 1, "Extract From Image", self.extract_from_acquisition_image, "folder")
             self._add_tool_button(layout, 0, 1, "Evidence Log", self.view_evidence_log, "clipboard")
             self._add_tool_button(layout, 1, 1, "Custody Report", self.generate_chain_of_custody_report, "file")
 
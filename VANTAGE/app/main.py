@@ -378,19 +378,13 @@ class VantageUI(QMainWindow):
                                 pass
                         thread.quit()
                         thread.wait(3000)
-                for client in getattr(widget, '_remote_clients', {}).values():
-                    try:
-                        client.disconnect()
-                    except Exception:
-                        pass
 
         if ctrl:
             ctrl._remote_timer.stop()
-            for client in ctrl._clients.values():
-                try:
-                    client.disconnect()
-                except Exception:
-                    pass
+
+        # Every remote connection belongs to the shared poller
+        from core.fleet_poller import FleetPoller
+        FleetPoller().shutdown()
 
         event.accept()
         super().closeEvent(event)
@@ -0,0 +1,262 @@
+"""Central poller for every registered remote server.
+
+One poller owns all :class:`~core.remote_client.RemoteClient` connections and
+runs their polls on a bounded thread pool. Hosts that a view is watching get a
+metrics fetch every ``metrics_interval``; all others get a cheap reachability
+ping every ``status_interval``. Poll times carry jitter so hosts don't fire in
+lockstep, failing hosts back off exponentially, and status changes are applied
+to the :class:`~core.server_registry.ServerRegistry` in one batched save and
+signal. Only transitions are saved; a host that stays online or offline does
+not touch ``servers.json``, though its in-memory "last seen" time still moves
+with every successful poll.
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal
+
+from core.remote_client import RemoteClient, RemoteMetrics
+from core.server_registry import ServerRegistry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HostStats:
+    """Poll history and latency of one server (latencies in seconds)."""
+
+    server_id: str
+    polls: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_latency: Optional[float] = None
+    avg_latency: Optional[float] = None   # exponentially weighted
+    min_latency: Optional[float] = None
+    max_latency: Optional[float] = None
+    next_due: float = 0.0
+    last_ping: float = 0.0
+
+    def record(self, ok: bool, latency: Optional[float] = None):
+        """Record one poll; ``latency`` is set when the poll included a ping."""
+        self.polls += 1
+        if not ok:
+            self.failures += 1
+            self.consecutive_failures += 1
+            return
+        self.consecutive_failures = 0
+        if latency is None:
+            return
+        self.last_latency = latency
+        self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+        self.min_latency = latency if self.min_latency is None else min(self.min_latency, latency)
+        self.max_latency = latency if self.max_latency is None else max(self.max_latency, latency)
+
+    def delay(self, interval: float, max_backoff: float, jitter: float = 0.1) -> float:
+        """Seconds until the next poll: ``interval`` doubled per consecutive failure, ± jitter."""
+        base = min(max_backoff, interval * 2 ** min(self.consecutive_failures, 10))
+        return base * random.uniform(1 - jitter, 1 + jitter)
+
+    @property
+    def latency_ms(self) -> Optional[float]:
+        return None if self.avg_latency is None else self.avg_latency * 1000
+
+
+class FleetPoller(QObject):
+    """
+    Singleton QObject that polls all servers in the registry.
+
+    Results are collected from the worker threads and handed to the GUI
+    thread on a timer, so every signal is emitted there.
+    """
+
+    metrics_ready = Signal(str, object)   # server_id, RemoteMetrics or None
+    polled = Signal()                      # some hosts reported since the last tick
+
+    _instance: Optional["FleetPoller"] = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, max_workers: int = 16, status_interval: float = 30.0,
+                 metrics_interval: float = 1.0, max_backoff: float = 300.0,
+                 save_interval: float = 2.0):
+        if getattr(self, "_initialized", False):
+            return
+        super().__init__()
+        self._initialized = True
+        self.max_workers = max_workers
+        self.status_interval = status_interval
+        self.metrics_interval = metrics_interval
+        self.max_backoff = max_backoff
+        self.save_interval = save_interval
+
+        self._registry = ServerRegistry()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vantage-poll")
+        self._clients: dict[str, RemoteClient] = {}
+        self._clients_lock = threading.Lock()
+        self._stats: dict[str, HostStats] = {}
+        self._latest: dict[str, Optional[RemoteMetrics]] = {}
+        self._watchers: dict[str, set[str]] = {}
+        self._in_flight: set[str] = set()
+        self._results: list[tuple[str, bool, bool, Optional[float], Optional[RemoteMetrics]]] = []
+        self._results_lock = threading.Lock()
+        self._pending_status: dict[str, tuple[str, str]] = {}
+        self._last_save = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._tick)
+        self._timer.start(500)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def set_watched(self, owner: str, server_ids: Iterable[str]):
+        """Replace the hosts ``owner`` wants live metrics for; new ones are polled right away."""
+        before = self._watched()
+        self._watchers[owner] = {sid for sid in server_ids if sid != "local"}
+        for server_id in self._watched() - before:
+            self.poll_now(server_id)
+
+    def poll_now(self, server_id: str):
+        """Poll ``server_id`` on the next tick instead of waiting for its schedule."""
+        self._stats.setdefault(server_id, HostStats(server_id)).next_due = 0.0
+
+    def forget(self, server_id: str):
+        """Drop a server's connection and stats (e.g. after it was removed)."""
+        with self._clients_lock:
+            client = self._clients.pop(server_id, None)
+        if client:
+            client.disconnect()
+        self._stats.pop(server_id, None)
+        self._latest.pop(server_id, None)
+        self._pending_status.pop(server_id, None)
+
+    def stats(self, server_id: str) -> Optional[HostStats]:
+        return self._stats.get(server_id)
+
+    def latest(self, server_id: str) -> Optional[RemoteMetrics]:
+        return self._latest.get(server_id)
+
+    def shutdown(self):
+        self._timer.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._clients_lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.disconnect()
+
+    # ------------------------------------------------------------------
+    # Scheduling (GUI thread)
+    # ------------------------------------------------------------------
+
+    def _watched(self) -> set[str]:
+        return set().union(*self._watchers.values())
+
+    def _tick(self):
+        now = time.monotonic()
+        self._apply_results(now)
+
+        known = {entry.server_id for entry in self._registry.all_servers()}
+        for server_id in set(self._stats) - known:
+            self.forget(server_id)
+        watched = self._watched()
+        for server_id in known:
+            if server_id in self._in_flight or len(self._in_flight) >= self.max_workers:
+                continue
+            stats = self._stats.get(server_id)
+            if stats is None:
+                # Spread the first round of polls over the first seconds
+                stats = self._stats[server_id] = HostStats(server_id, next_due=now + random.uniform(0, 2.0))
+            if now < stats.next_due:
+                continue
+            # Watched hosts still get a real round-trip measurement now and then
+            fetch = server_id in watched
+            ping = not fetch or now - stats.last_ping >= self.status_interval
+            if ping:
+                stats.last_ping = now
+            self._in_flight.add(server_id)
+            self._pool.submit(self._poll, server_id, fetch, ping)
+
+        if self._pending_status and now - self._last_save >= self.save_interval:
+            updates, self._pending_status = self._pending_status, {}
+            self._last_save = now
+            self._registry.update_statuses(updates)
+
+    def _apply_results(self, now: float):
+        with self._results_lock:
+            results, self._results = self._results, []
+        if not results:
+            return
+        watched = self._watched()
+        for server_id, ok, fetched, latency, metrics in results:
+            self._in_flight.discard(server_id)
+            stats = self._stats.get(server_id)
+            if stats is None:   # forgotten while in flight
+                continue
+            stats.record(ok, latency)
+            interval = self.metrics_interval if server_id in watched else self.status_interval
+            stats.next_due = now + stats.delay(interval, self.max_backoff)
+            if ok:
+                self._registry.touch(server_id, datetime.now().strftime("%H:%M:%S"))
+            self._queue_status(server_id, "online" if ok else "offline")
+            if fetched:
+                self._latest[server_id] = metrics
+                self.metrics_ready.emit(server_id, metrics)
+        self.polled.emit()
+
+    def _queue_status(self, server_id: str, status: str):
+        """Queue a registry update only when the host's status actually changed."""
+        entry = self._registry.get(server_id)
+        if entry is not None and entry.status == status:
+            # Flipped back before the batched save: nothing to write
+            self._pending_status.pop(server_id, None)
+        elif self._pending_status.get(server_id, (None, ""))[0] != status:
+            last_seen = datetime.now().strftime("%H:%M:%S") if status == "online" else ""
+            self._pending_status[server_id] = (status, last_seen)
+
+    # ------------------------------------------------------------------
+    # Polling (worker threads)
+    # ------------------------------------------------------------------
+
+    def _client(self, server_id: str) -> Optional[RemoteClient]:
+        with self._clients_lock:
+            client = self._clients.get(server_id)
+            if client is None:
+                entry = self._registry.get(server_id)
+                if entry is None:
+                    return None
+                client = self._clients[server_id] = RemoteClient(
+                    host=entry.host, port=entry.port, username=entry.username,
+                    password=entry.password or None,
+                    key_path=entry.key_path or None,
+                    interval=self.metrics_interval,
+                )
+            return client
+
+    def _poll(self, server_id: str, fetch: bool, ping: bool):
+        ok, latency, metrics = False, None, None
+        try:
+            client = self._client(server_id)
+            if client is not None:
+                if ping:
+                    latency = client.ping()
+                    ok = latency is not None
+                if fetch and (ok or not ping):
+                    metrics = client.fetch_metrics()
+                    ok = metrics is not None
+        except Exception as exc:
+            logger.warning("Poll of %s failed: %s", server_id, exc)
+        with self._results_lock:
+            self._results.append((server_id, ok, fetch, latency, metrics))
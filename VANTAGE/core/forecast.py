@@ -0,0 +1,81 @@
+"""Vectorised short-horizon forecasts for chart history windows.
+
+All functions take a chronological (oldest first) NumPy window, typically a
+zero-copy view of a :class:`~core.ring_buffer.RingBuffer`.
+"""
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+
+@lru_cache(maxsize=32)
+def _holt_weights(alpha: float, beta: float, updates: int) -> tuple:
+    """Linear-operator form of ``updates`` Holt steps.
+
+    One step maps ``s = (level, trend)`` to ``A @ s + b * v``, so after ``m``
+    observations ``s_m = A^m @ s_0 + sum(A^(m-k) @ b * v_k)``. Returning
+    ``A^m`` and the stacked ``A^(m-k) @ b`` lets the whole smoothing pass run
+    as a single matrix-vector product.
+    """
+    a = np.array([[1 - alpha, 1 - alpha], [-alpha * beta, 1 - alpha * beta]])
+    b = np.array([alpha, alpha * beta])
+    powers = [np.eye(2)]
+    for _ in range(updates):
+        powers.append(a @ powers[-1])
+    weights = np.array([powers[updates - k] @ b for k in range(1, updates + 1)]).reshape(updates, 2)
+    return powers[updates], weights
+
+
+def holt_smooth(window: np.ndarray, alpha: float, beta: float) -> tuple[float, float]:
+    """Final ``(level, trend)`` of Holt's linear smoothing over ``window``."""
+    window = np.asarray(window, dtype=np.float64)
+    start = np.array([window[0], window[1] - window[0]])
+    final, weights = _holt_weights(alpha, beta, len(window) - 1)
+    level, trend = final @ start + weights.T @ window[1:]
+    return float(level), float(trend)
+
+
+def holt_forecast(window: np.ndarray, steps: int, *, alpha: float, beta: float, phi: float,
+                  max_step_range: tuple, clamp: Optional[tuple] = None) -> tuple:
+    """Holt's damped linear trend forecast with a widening confidence band.
+
+    Returns ``(forecast, lower, upper)`` arrays of ``steps + 1`` points; index 0
+    is the newest observation, the rest are the forecast steps.
+    """
+    window = np.asarray(window, dtype=np.float64)
+    level, trend = holt_smooth(window, alpha, beta)
+
+    deltas = np.abs(np.diff(window))
+    avg_d = deltas.mean() if deltas.size else 0.0
+    max_step = max(max_step_range[0], min(max_step_range[1], avg_d * 1.5))
+    sigma = deltas.std() if deltas.size > 1 else avg_d
+
+    i = np.arange(1, steps + 1, dtype=np.float64)
+    if phi == 1:
+        raw = level + trend * i
+    else:
+        raw = level + trend * (1 - phi ** i) / (1 - phi)
+    low_limit, high_limit = clamp if clamp else (0.0, np.inf)
+
+    # Each step may move at most max_step from the previous (clamped) point
+    forecast = np.empty(steps + 1)
+    forecast[0] = last = window[-1]
+    for step, value in enumerate(raw, 1):
+        last = min(high_limit, max(low_limit, min(last + max_step, max(last - max_step, value))))
+        forecast[step] = last
+
+    half_band = np.concatenate(([0.0], sigma * np.sqrt(i) * 1.2))
+    lower = np.maximum(forecast - half_band, low_limit)
+    upper = np.minimum(forecast + half_band, high_limit)
+    lower[0] = upper[0] = forecast[0]
+    return forecast, lower, upper
+
+
+def median_forecast(window: np.ndarray) -> tuple[float, float, float]:
+    """Rolling-median level with a ``1.5 × MAD`` band: ``(median, lower, upper)``."""
+    window = np.asarray(window, dtype=np.float64)
+    median = float(np.median(window))
+    mad = float(np.median(np.abs(window - median)))
+    return median, max(0.0, median - 1.5 * mad), median + 1.5 * mad
+
@@ -0,0 +1,240 @@
+"""Persistent time-series store for host metrics.
+
+Samples are appended to an SQLite database in WAL mode (``~/.vantage/metrics.db``)
+and periodically rolled up into 1-minute and 1-hour buckets (avg/min/max/count).
+Each resolution has its own retention, so raw seconds are kept for a day while
+hourly history is kept for a year without the file growing unbounded.
+"""
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_STORE_FILE = os.path.join(os.path.expanduser("~"), ".vantage", "metrics.db")
+
+RAW = 0
+MINUTE = 60
+HOUR = 3600
+
+# Seconds of history kept at each resolution.
+DEFAULT_RETENTION = {
+    RAW: 24 * 3600,
+    MINUTE: 14 * 24 * 3600,
+    HOUR: 365 * 24 * 3600,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    id     INTEGER PRIMARY KEY,
+    host   TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    UNIQUE (host, metric)
+);
+CREATE TABLE IF NOT EXISTS samples (
+    series INTEGER NOT NULL,
+    ts     REAL NOT NULL,
+    value  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_series_ts ON samples (series, ts);
+CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution INTEGER NOT NULL,
+    series     INTEGER NOT NULL,
+    ts         INTEGER NOT NULL,
+    avg        REAL NOT NULL,
+    min        REAL NOT NULL,
+    max        REAL NOT NULL,
+    count      INTEGER NOT NULL,
+    PRIMARY KEY (resolution, series, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS state (
+    key   TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+
+class MetricsStore:
+    """Append-only metric history with automatic rollups and retention.
+
+    The store is safe to share between the collector threads that append and
+    the UI thread that queries; every operation runs under one lock on a
+    single connection.
+    """
+
+    def __init__(self, path: str = _STORE_FILE, retention: Optional[dict] = None):
+        self.path = path
+        self.retention = dict(DEFAULT_RETENTION)
+        self.retention.update(retention or {})
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str], int] = {}
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _series_id(self, host: str, metric: str) -> int:
+        key = (host, metric)
+        series_id = self._series.get(key)
+        if series_id is None:
+            self._conn.execute("INSERT OR IGNORE INTO series (host, metric) VALUES (?, ?)", key)
+            series_id = self._conn.execute(
+                "SELECT id FROM series WHERE host = ? AND metric = ?", key).fetchone()[0]
+            self._series[key] = series_id
+        return series_id
+
+    def append(self, host: str, metrics: dict, timestamp: Optional[float] = None):
+        """Append one sample per numeric entry of ``metrics`` (others are skipped)."""
+        ts = time.time() if timestamp is None else timestamp
+        with self._lock, self._conn:
+            rows = [
+                (self._series_id(host, name), ts, float(value))
+                for name, value in metrics.items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+                and math.isfinite(value)
+            ]
+            self._conn.executemany("INSERT INTO samples (series, ts, value) VALUES (?, ?, ?)", rows)
+
+    # ------------------------------------------------------------------
+    # Rollups and retention
+    # ------------------------------------------------------------------
+
+    def _watermark(self, resolution: int) -> Optional[float]:
+        row = self._conn.execute("SELECT value FROM state WHERE key = ?", (f"rollup_{resolution}",)).fetchone()
+        return row[0] if row else None
+
+    def _set_watermark(self, resolution: int, value: float):
+        self._conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                           (f"rollup_{resolution}", value))
+
+    def rollup(self, now: Optional[float] = None):
+        """Aggregate every closed minute of raw samples and every closed hour of minutes."""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            minute_end = int(now // MINUTE) * MINUTE
+            start = self._watermark(MINUTE)
+            if start is None:
+                start = self._conn.execute("SELECT MIN(ts) FROM samples").fetchone()[0] or minute_end
+            if start < minute_end:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rollups "
+                    "SELECT ?, series, CAST(ts / ? AS INTEGER) * ?, AVG(value), MIN(value), MAX(value), COUNT(*) "
+                    "FROM samples WHERE ts >= ? AND ts < ? GROUP BY series, CAST(ts / ? AS INTEGER)",
+                    (MINUTE, MINUTE, MINUTE, start, minute_end, MINUTE))
+            self._set_watermark(MINUTE, minute_end)
+
+            hour_end = int(now // HOUR) * HOUR
+            start = self._watermark(HOUR)
+            if start is None:
+                start = self._conn.execute(
+                    "SELECT MIN(ts) FROM rollups WHERE resolution = ?", (MINUTE,)).fetchone()[0] or hour_end
+            if start < hour_end:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rollups "
+                    "SELECT ?, series, (ts / ?) * ?, SUM(avg * count) / SUM(count), MIN(min), MAX(max), SUM(count) "
+                    "FROM rollups WHERE resolution = ? AND ts >= ? AND ts < ? GROUP BY series, ts / ?",
+                    (HOUR, HOUR, HOUR, MINUTE, start, hour_end, HOUR))
+            self._set_watermark(HOUR, hour_end)
+
+    def prune(self, now: Optional[float] = None):
+        """Drop history older than each resolution's retention."""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM samples WHERE ts < ?", (now - self.retention[RAW],))
+            for resolution in (MINUTE, HOUR):
+                self._conn.execute("DELETE FROM rollups WHERE resolution = ? AND ts < ?",
+                                   (resolution, now - self.retention[resolution]))
+
+    def maintain(self, now: Optional[float] = None):
+        """Roll up and prune; call periodically from a background thread."""
+        self.rollup(now)
+        self.prune(now)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def pick_resolution(self, start: float, end: float, max_points: int = 600,
+                        now: Optional[float] = None) -> int:
+        """Finest resolution that still holds ``start`` and fits in ``max_points``."""
+        now = time.time() if now is None else now
+        for resolution in (RAW, MINUTE, HOUR):
+            if start < now - self.retention[resolution]:
+                continue
+            step = resolution or 1
+            if (end - start) / step <= max_points:
+                return resolution
+        return HOUR
+
+    def query(self, host: str, metric: str, start: float, end: Optional[float] = None,
+              resolution: Optional[int] = None, max_points: int = 600) -> list[tuple[float, float]]:
+        """Return ``(timestamp, value)`` pairs for ``metric`` on ``host`` in ``[start, end)``.
+
+        Without an explicit ``resolution`` the finest one that covers the range
+        in at most ``max_points`` points is used; rollups return bucket averages.
+        """
+        end = time.time() if end is None else end
+        if resolution is None:
+            resolution = self.pick_resolution(start, end, max_points)
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM series WHERE host = ? AND metric = ?",
+                                     (host, metric)).fetchone()
+            if row is None:
+                return []
+            if resolution == RAW:
+                cursor = self._conn.execute(
+                    "SELECT ts, value FROM samples WHERE series = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                    (row[0], start, end))
+            else:
+                cursor = self._conn.execute(
+                    "SELECT ts, avg FROM rollups WHERE resolution = ? AND series = ? AND ts >= ? AND ts < ? "
+                    "ORDER BY ts", (resolution, row[0], start - resolution, end))
+            return cursor.fetchall()
+
+    def hosts(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT host FROM series ORDER BY host")]
+
+    def metrics(self, host: str) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT metric FROM series WHERE host = ? ORDER BY metric", (host,))]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared: Optional[MetricsStore] = None
+_shared_failed = False
+_shared_lock = threading.Lock()
+
+
+def shared_store() -> Optional[MetricsStore]:
+    """Return the process-wide store, or None if the database cannot be opened."""
+    global _shared, _shared_failed
+    with _shared_lock:
+        if _shared is None and not _shared_failed:
+            try:
+                _shared = MetricsStore()
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("Metric history disabled, cannot open %s: %s", _STORE_FILE, exc)
+                _shared_failed = True
+        return _shared
+
+
+def numeric_metrics(metrics: dict, names: Iterable[str]) -> dict:
+    """Pick ``names`` out of a metrics dict, skipping missing or non-numeric values."""
+    return {name: metrics[name] for name in names
+            if isinstance(metrics.get(name), (int, float)) and not isinstance(metrics.get(name), bool)}
@@ -1,6 +1,7 @@
 """SSH-based remote metrics client."""
 import json
 import logging
+import shlex
 import threading
 import time
 from dataclasses import dataclass, field
@@ -8,103 +9,170 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-# Sent via stdin to `python3` on the remote host.
-# Tries psutil first, falls back to /proc parsing for bare Linux servers.
-_METRICS_SCRIPT = """\
-import json, time, sys
+# Long-lived agent started once per connection as `python3 -u -c <script> <interval>`.
+# It prints a hello line with the interval it settled on, then one JSON frame
+# per sample. Keyframes ("k") carry every field; the frames in between only
+# carry gauges that changed ("c") and counter increments ("d"). Control lines
+# such as {"interval": 2.0} may be written to its stdin; EOF on stdin (the SSH
+# channel closing) ends it. Tries psutil first, falls back to /proc parsing
+# for bare Linux servers.
+_AGENT_SCRIPT = """\
+import json, os, select, sys, time
 
-def _proc_metrics():
-    import os
-    # CPU: two /proc/stat samples 100ms apart
+MIN_INTERVAL = 0.2
+KEYFRAME_EVERY = 60
+COUNTERS = ('net_bytes_sent', 'net_bytes_recv')
+
+def _clamp(value):
+    try:
+        return max(MIN_INTERVAL, float(value))
+    except (TypeError, ValueError):
+        return 1.0
+
+def _thermal_zone():
+    try:
+        with open('/sys/class/thermal/thermal_zone0/temp') as f:
+            return int(f.read().strip()) / 1000.0
+    except Exception:
+        return None
+
+def _proc_sampler():
     def _stat():
         with open('/proc/stat') as f:
             parts = f.readline().split()
         vals = [int(x) for x in parts[1:]]
         return sum(vals), vals[3]
-    t1, i1 = _stat()
+    prev = [_stat()]
     time.sleep(0.1)
-    t2, i2 = _stat()
-    cpu = 100.0 * (1 - (i2-i1) / (t2-t1)) if t2 != t1 else 0.0
-    # Memory
-    mem = {}
-    with open('/proc/meminfo') as f:
-        for line in f:
-            k, v = line.split(':')
-            mem[k.strip()] = int(v.split()[0]) * 1024
-    mem_total = mem.get('MemTotal', 0)
-    mem_avail = mem.get('MemAvailable', mem.get('MemFree', 0))
-    mem_used  = mem_total - mem_avail
-    mem_pct   = 100.0 * mem_used / mem_total if mem_total else 0.0
-    # Disk
-    st = os.statvfs('/')
-    disk_total = st.f_blocks * st.f_frsize
-    disk_free  = st.f_bfree  * st.f_frsize
-    disk_used  = disk_total - disk_free
-    disk_pct   = 100.0 * disk_used / disk_total if disk_total else 0.0
-    # Network
-    net_sent = net_recv = 0
-    with open('/proc/net/dev') as f:
-        for line in f:
-            if ':' in line:
-                fields = line.split(':')[1].split()
-                net_recv += int(fields[0])
-                net_sent += int(fields[8])
-    # Uptime
-    with open('/proc/uptime') as f:
-        uptime_seconds = float(f.read().split()[0])
-    # Temperature (Raspberry Pi and other ARM boards)
-    cpu_temp = None
-    try:
-        with open('/sys/class/thermal/thermal_zone0/temp') as f:
-            cpu_temp = int(f.read().strip()) / 1000.0
-    except Exception:
-        pass
-    return dict(cpu_percent=cpu, memory_percent=mem_pct, memory_used=mem_used,
-                memory_total=mem_total, disk_percent=disk_pct, disk_used=disk_used,
-                disk_total=disk_total, net_bytes_sent=net_sent, net_bytes_recv=net_recv,
-                uptime_seconds=uptime_seconds, cpu_temp=cpu_temp,
-                timestamp=time.time(), ok=True, source='proc')
+    def sample():
+        # CPU: delta against the previous sample, no sleeping
+        t1, i1 = prev[0]
+        t2, i2 = prev[0] = _stat()
+        cpu = 100.0 * (1 - (i2-i1) / (t2-t1)) if t2 != t1 else 0.0
+        mem = {}
+        with open('/proc/meminfo') as f:
+            for line in f:
+                k, v = line.split(':')
+                mem[k.strip()] = int(v.split()[0]) * 1024
+        mem_total = mem.get('MemTotal', 0)
+        mem_avail = mem.get('MemAvailable', mem.get('MemFree', 0))
+        mem_used  = mem_total - mem_avail
+        st = os.statvfs('/')
+        disk_total = st.f_blocks * st.f_frsize
+        disk_used  = disk_total - st.f_bfree * st.f_frsize
+        net_sent = net_recv = 0
+        with open('/proc/net/dev') as f:
+            for line in f:
+                if ':' in line:
+                    fields = line.split(':')[1].split()
+                    net_recv += int(fields[0])
+                    net_sent += int(fields[8])
+        with open('/proc/uptime') as f:
+            uptime_seconds = float(f.read().split()[0])
+        return dict(cpu_percent=cpu, memory_percent=100.0 * mem_used / mem_total if mem_total else 0.0,
+                    memory_used=mem_used, memory_total=mem_total,
+                    disk_percent=100.0 * disk_used / disk_total if disk_total else 0.0,
+                    disk_used=disk_used, disk_total=disk_total,
+                    net_bytes_sent=net_sent, net_bytes_recv=net_recv,
+                    uptime_seconds=uptime_seconds, cpu_temp=_thermal_zone())
+    return 'proc', sample
 
-try:
+def _psutil_sampler():
     import psutil
-    cpu  = psutil.cpu_percent(interval=0.1)
-    mem  = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
-    net  = psutil.net_io_counters()
-    uptime_seconds = time.time() - psutil.boot_time()
-    # Temperature
-    cpu_temp = None
-    try:
-        temps = psutil.sensors_temperatures()
-        vals = [e.current for n, es in temps.items()
-                if any(k in n.lower() for k in ('core','cpu','k10temp','coretemp','cpu_thermal'))
-                for e in es if e.current and e.current > 0]
-        if vals:
-            cpu_temp = sum(vals) / len(vals)
-    except Exception:
-        pass
-    # Fallback to thermal_zone0 for boards where psutil can't read sensors
-    if cpu_temp is None:
+    psutil.cpu_percent(interval=0.1)
+    boot = psutil.boot_time()
+    def sample():
+        mem  = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        net  = psutil.net_io_counters()
+        cpu_temp = None
         try:
-            with open('/sys/class/thermal/thermal_zone0/temp') as f:
-                cpu_temp = int(f.read().strip()) / 1000.0
+            temps = psutil.sensors_temperatures()
+            vals = [e.current for n, es in temps.items()
+                    if any(k in n.lower() for k in ('core','cpu','k10temp','coretemp','cpu_thermal'))
+                    for e in es if e.current and e.current > 0]
+            if vals:
+                cpu_temp = sum(vals) / len(vals)
         except Exception:
             pass
-    print(json.dumps(dict(
-        cpu_percent=cpu, memory_percent=mem.percent,
-        memory_used=mem.used, memory_total=mem.total,
-        disk_percent=disk.percent, disk_used=disk.used, disk_total=disk.total,
-        net_bytes_sent=net.bytes_sent, net_bytes_recv=net.bytes_recv,
-        uptime_seconds=uptime_seconds, cpu_temp=cpu_temp,
-        timestamp=time.time(), ok=True, source='psutil'
-    )))
-except Exception:
+        if cpu_temp is None:
+            cpu_temp = _thermal_zone()
+        return dict(cpu_percent=psutil.cpu_percent(interval=None), memory_percent=mem.percent,
+                    memory_used=mem.used, memory_total=mem.total,
+                    disk_percent=disk.percent, disk_used=disk.used, disk_total=disk.total,
+                    net_bytes_sent=net.bytes_sent, net_bytes_recv=net.bytes_recv,
+                    uptime_seconds=time.time() - boot, cpu_temp=cpu_temp)
+    return 'psutil', sample
+
+def _emit(obj):
+    sys.stdout.write(json.dumps(obj, separators=(',', ':')) + '\\n')
+    sys.stdout.flush()
+
+def main():
+    interval = _clamp(sys.argv[1] if len(sys.argv) > 1 else 1.0)
     try:
-        print(json.dumps(_proc_metrics()))
-    except Exception as e:
-        print(json.dumps({'ok': False, 'error': str(e)}))
-"""
+        source, sample = _psutil_sampler()
+    except Exception:
+        source, sample = _proc_sampler()
+    _emit({'hello': 1, 'interval': interval, 'source': source, 'counters': COUNTERS})
+    prev, count, pending = None, 0, b''
+    next_tick = time.monotonic()
+    while True:
+        try:
+            cur = sample()
+        except Exception as e:
+            _emit({'error': str(e), 't': time.time()})
+            cur = None
+        if cur is not None:
+            for k in ('cpu_percent', 'memory_percent', 'disk_percent'):
+                cur[k] = round(cur[k], 1)
+            if cur['cpu_temp'] is not None:
+                cur['cpu_temp'] = round(cur['cpu_temp'], 1)
+            cur['uptime_seconds'] = int(cur['uptime_seconds'])
+            if prev is None or count % KEYFRAME_EVERY == 0:
+                frame = {'k': cur}
+            else:
+                frame = {}
+                changed = {k: v for k, v in cur.items() if k not in COUNTERS and prev.get(k) != v}
+                deltas = {k: cur[k] - prev[k] for k in COUNTERS if cur[k] != prev[k]}
+                if changed:
+                    frame['c'] = changed
+                if deltas:
+                    frame['d'] = deltas
+            frame['t'] = round(time.time(), 3)
+            _emit(frame)
+            prev, count = cur, count + 1
+        # Sleep until the next tick while listening for control lines
+        next_tick += interval
+        while True:
+            wait = next_tick - time.monotonic()
+            if wait <= 0:
+                break
+            ready, _, _ = select.select([0], [], [], wait)
+            if not ready:
+                continue
+            data = os.read(0, 4096)
+            if not data:
+                return
+            pending += data
+            while b'\\n' in pending:
+                line, pending = pending.split(b'\\n', 1)
+                try:
+                    command = json.loads(line)
+                except ValueError:
+                    continue
+                if 'interval' in command:
+                    interval = _clamp(command['interval'])
+                    next_tick = time.monotonic() + interval
+                    _emit({'interval': interval})
+        if next_tick < time.monotonic() - interval:
+            next_tick = time.monotonic()
 
+try:
+    main()
+except (BrokenPipeError, KeyboardInterrupt):
+    pass
+"""
 
 @dataclass
 class RemoteMetrics:
@@ -122,17 +190,146 @@ class RemoteMetrics:
     timestamp: float = field(default_factory=time.time)
 
 
+def _metrics_from_dict(data: dict) -> RemoteMetrics:
+    return RemoteMetrics(
+        cpu_percent=float(data['cpu_percent']),
+        memory_percent=float(data['memory_percent']),
+        memory_used=int(data['memory_used']),
+        memory_total=int(data['memory_total']),
+        disk_percent=float(data['disk_percent']),
+        disk_used=int(data['disk_used']),
+        disk_total=int(data['disk_total']),
+        net_bytes_sent=int(data['net_bytes_sent']),
+        net_bytes_recv=int(data['net_bytes_recv']),
+        uptime_seconds=float(data.get('uptime_seconds', 0)),
+        cpu_temp=float(data['cpu_temp']) if data.get('cpu_temp') is not None else None,
+        timestamp=float(data['timestamp']),
+    )
+
+
+class FrameDecoder:
+    """Rebuilds full metric snapshots from the agent's delta-encoded frames."""
+
+    def __init__(self):
+        self.interval: Optional[float] = None
+        self.source = ""
+        self.counters: tuple = ()
+        self._state: Optional[dict] = None
+
+    def feed(self, line: str) -> Optional[RemoteMetrics]:
+        """Apply one frame; return the resulting snapshot for sample frames."""
+        frame = json.loads(line)
+        if 'hello' in frame:
+            self.interval = float(frame['interval'])
+            self.source = frame.get('source', "")
+            self.counters = tuple(frame.get('counters', ()))
+            return None
+        if 'error' in frame:
+            raise RuntimeError(frame['error'])
+        if 'k' in frame:
+            self._state = dict(frame['k'])
+        elif 't' in frame and self._state is not None:
+            self._state.update(frame.get('c', {}))
+            for name, delta in frame.get('d', {}).items():
+                self._state[name] += delta
+        else:
+            if 'interval' in frame:
+                self.interval = float(frame['interval'])
+            return None
+        self._state['timestamp'] = frame['t']
+        return _metrics_from_dict(self._state)
+
+
+class MetricsStream:
+    """One long-lived agent process on the remote host, read by a background thread."""
+
+    def __init__(self, client, host: str, interval: float = 1.0):
+        self.host = host
+        self.decoder = FrameDecoder()
+        self._latest: Optional[RemoteMetrics] = None
+        self._received = 0.0     # monotonic time of the last frame
+        self._frame = threading.Event()
+        self._closed = False
+        command = f"python3 -u -c {shlex.quote(_AGENT_SCRIPT)} {float(interval)}"
+        self._stdin, self._stdout, _ = client.exec_command(command)
+        self._thread = threading.Thread(target=self._read, name=f"vantage-agent-{host}", daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and self._thread.is_alive()
+
+    @property
+    def interval(self) -> float:
+        return self.decoder.interval or 1.0
+
+    def _read(self):
+        try:
+            for line in self._stdout:
+                try:
+                    metrics = self.decoder.feed(line)
+                except RuntimeError as exc:
+                    logger.warning("Remote agent error on %s: %s", self.host, exc)
+                    continue
+                except ValueError:
+                    logger.debug("Ignoring malformed agent frame from %s: %r", self.host, line)
+                    continue
+                if metrics is not None:
+                    self._latest = metrics
+                    self._received = time.monotonic()
+                    self._frame.set()
+        except Exception as exc:
+            if not self._closed:
+                logger.warning("Agent stream from %s ended: %s", self.host, exc)
+        finally:
+            self._closed = True
+            self._frame.set()
+
+    def latest(self, timeout: float = 8.0) -> Optional[RemoteMetrics]:
+        """Newest snapshot, waiting up to ``timeout`` for the first one.
+
+        Returns None once the stream has gone quiet for several intervals.
+        """
+        if self._latest is None:
+            self._frame.wait(timeout)
+        if self._latest is None:
+            return None
+        if time.monotonic() - self._received > max(3 * self.interval, 5.0):
+            return None
+        return self._latest
+
+    def set_interval(self, interval: float):
+        """Ask the agent for a new sample interval (it confirms with a frame)."""
+        self._stdin.write(json.dumps({'interval': interval}) + "\n")
+        self._stdin.flush()
+
+    def close(self):
+        self._closed = True
+        try:
+            self._stdin.channel.close()
+        except Exception:
+            pass
+
+
 class RemoteClient:
-    """Manages one SSH connection to a remote server and fetches metrics."""
+    """Manages one SSH connection to a remote server and fetches metrics.
+
+    Metrics come from a single agent process per connection that streams a
+    frame every ``interval`` seconds; :meth:`fetch_metrics` returns the newest
+    one instead of starting an interpreter per sample.
+    """
 
     def __init__(self, host: str, port: int = 22, username: str = "",
-                 password: Optional[str] = None, key_path: Optional[str] = None):
+                 password: Optional[str] = None, key_path: Optional[str] = None,
+                 interval: float = 1.0):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.key_path = key_path
+        self.interval = interval
         self._client = None
+        self._stream: Optional[MetricsStream] = None
         self._lock = threading.Lock()
         self._connected = False
 
@@ -159,6 +356,7 @@ class RemoteClient:
                     kwargs['password'] = self.password
                     kwargs['look_for_keys'] = False
                 client.connect(**kwargs)
+                self._close_stream()
                 if self._client:
                     self._client.close()
                 self._client = client
@@ -172,6 +370,7 @@ class RemoteClient:
 
     def disconnect(self):
         with self._lock:
+            self._close_stream()
             if self._client:
                 try:
                     self._client.close()
@@ -188,41 +387,68 @@ class RemoteClient:
     # Metrics
     # ------------------------------------------------------------------
 
+    def _close_stream(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
     def fetch_metrics(self) -> Optional[RemoteMetrics]:
-        """Run the metrics script on the remote host and return parsed results."""
+        """Return the newest sample streamed by the remote agent, starting it if needed."""
         if not self.is_connected:
             if not self.connect():
                 return None
 
         with self._lock:
             try:
-                stdin, stdout, _ = self._client.exec_command("python3", timeout=8)
-                stdin.write(_METRICS_SCRIPT)
-                stdin.channel.shutdown_write()
-                raw = stdout.read().decode().strip()
-                data = json.loads(raw)
-                if not data.get('ok'):
-                    logger.warning("Remote script error on %s: %s", self.host, data.get('error'))
-                    return None
-                return RemoteMetrics(
-                    cpu_percent=float(data['cpu_percent']),
-                    memory_percent=float(data['memory_percent']),
-                    memory_used=int(data['memory_used']),
-                    memory_total=int(data['memory_total']),
-                    disk_percent=float(data['disk_percent']),
-                    disk_used=int(data['disk_used']),
-                    disk_total=int(data['disk_total']),
-                    net_bytes_sent=int(data['net_bytes_sent']),
-                    net_bytes_recv=int(data['net_bytes_recv']),
-                    uptime_seconds=float(data.get('uptime_seconds', 0)),
-                    cpu_temp=float(data['cpu_temp']) if data.get('cpu_temp') is not None else None,
-                    timestamp=float(data['timestamp']),
-                )
+                if self._stream is None or not self._stream.alive:
+                    self._close_stream()
+                    self._stream = MetricsStream(self._client, self.host, self.interval)
+                metrics = self._stream.latest(timeout=8)
+                if metrics is None:
+                    raise TimeoutError("no metric frames received")
+                return metrics
             except Exception as exc:
                 logger.warning("Metrics fetch failed for %s: %s", self.host, exc)
+                self._close_stream()
                 self._connected = False
                 return None
 
+    def ping(self, timeout: float = 5.0) -> Optional[float]:
+        """Round-trip time of opening an SSH channel, in seconds, or None if unreachable.
+
+        Connects first when needed. Opening a session channel costs one
+        request/confirm exchange and starts no remote process.
+        """
+        if not self.is_connected:
+            if not self.connect():
+                return None
+
+        with self._lock:
+            try:
+                transport = self._client.get_transport()
+                if transport is None or not transport.is_active():
+                    raise ConnectionError("transport closed")
+                start = time.monotonic()
+                channel = transport.open_session(timeout=timeout)
+                latency = time.monotonic() - start
+                channel.close()
+                return latency
+            except Exception as exc:
+                logger.warning("Ping failed for %s: %s", self.host, exc)
+                self._close_stream()
+                self._connected = False
+                return None
+
+    def set_interval(self, interval: float):
+        """Change the sample interval of the running agent (and of future ones)."""
+        self.interval = interval
+        with self._lock:
+            if self._stream is not None and self._stream.alive:
+                try:
+                    self._stream.set_interval(interval)
+                except Exception as exc:
+                    logger.warning("Cannot change agent interval on %s: %s", self.host, exc)
+
     def test_connection(self) -> tuple[bool, str]:
         """Return (success, message). Disconnects after a successful test."""
         ok = self.connect()
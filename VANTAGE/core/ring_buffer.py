@@ -0,0 +1,62 @@
+"""Fixed-capacity NumPy ring buffers for chart history."""
+from typing import Optional
+
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity ring buffer with O(1) append and zero-copy window views.
+
+    Every value is written twice, at ``i`` and ``i + capacity``, so the most
+    recent ``capacity`` values always form one contiguous slice of the backing
+    array and :meth:`view` never copies. With ``width`` set, each entry is a
+    row of ``width`` values (e.g. one column per CPU core).
+    """
+
+    def __init__(self, capacity: int, width: Optional[int] = None,
+                 fill: Optional[float] = None, dtype=np.float64):
+        self.capacity = max(1, int(capacity))
+        self.width = width
+        shape = (2 * self.capacity,) if width is None else (2 * self.capacity, width)
+        self._data = np.zeros(shape, dtype=dtype)
+        self._pos = 0    # next write index, always in [0, capacity)
+        self._size = 0
+        self.version = 0  # bumped on every change so consumers can skip redundant redraws
+        if fill is not None:
+            self._data[:] = fill
+            self._size = self.capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value):
+        """Append one value (or one row when ``width`` is set)."""
+        self._data[self._pos] = value
+        self._data[self._pos + self.capacity] = value
+        self._pos = (self._pos + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        self.version += 1
+
+    def view(self) -> np.ndarray:
+        """Read-only view of the stored values, oldest first."""
+        end = self._pos + self.capacity
+        window = self._data[end - self._size:end]
+        window.flags.writeable = False
+        return window
+
+    def latest(self, count: int) -> np.ndarray:
+        """Read-only view of the newest ``count`` values, oldest first."""
+        return self.view()[-count:] if count > 0 else self.view()[:0]
+
+    @property
+    def last(self):
+        """Most recently appended value, or None when empty."""
+        if not self._size:
+            return None
+        return self._data[self._pos - 1 + self.capacity]
+
+    def clear(self):
+        self._pos = 0
+        self._size = 0
+        self.version += 1
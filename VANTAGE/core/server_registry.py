@@ -94,6 +94,28 @@ class ServerRegistry(QObject):
             self._save()
             self.servers_changed.emit()
 
+    def touch(self, server_id: str, last_seen: str):
+        """Refresh ``last_seen`` in memory only; it is written with the next save."""
+        entry = self._servers.get(server_id)
+        if entry is not None:
+            entry.last_seen = last_seen
+
+    def update_statuses(self, updates: dict[str, tuple[str, str]]):
+        """Apply many ``server_id -> (status, last_seen)`` updates with one save and one signal."""
+        changed = False
+        for server_id, (status, last_seen) in updates.items():
+            entry = self._servers.get(server_id)
+            if entry is None:
+                continue
+            if entry.status != status or (last_seen and entry.last_seen != last_seen):
+                entry.status = status
+                if last_seen:
+                    entry.last_seen = last_seen
+                changed = True
+        if changed:
+            self._save()
+            self.servers_changed.emit()
+
     # ------------------------------------------------------------------
     # Queries
     # ------------------------------------------------------------------
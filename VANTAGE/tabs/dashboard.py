@@ -4,6 +4,7 @@ import threading
 import time
 import logging
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+import numpy as np
 import psutil
 from datetime import datetime, timedelta
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
@@ -19,7 +20,25 @@ from PySide6.QtCharts import (QChart, QChartView, QLineSeries, QValueAxis,
                             QBarCategoryAxis, QBarLegendMarker, QSplineSeries)
 
 from core.server_registry import ServerRegistry
-from core.remote_client import RemoteClient, RemoteMetrics
+from core.fleet_poller import FleetPoller
+from core.remote_client import RemoteMetrics
+from core.metrics_store import numeric_metrics, shared_store
+from core.ring_buffer import RingBuffer
+
+# Metrics persisted to the history store by the dashboard collectors.
+HISTORY_METRICS = (
+    'cpu_percent', 'memory_percent', 'disk_percent', 'iowait', 'cpu_temp',
+    'net_bytes_sent', 'net_bytes_recv',
+)
+
+# Chart ranges offered in the dashboard: label -> seconds (None = live view).
+CHART_RANGES = (
+    ("Live (2 min)", None),
+    ("Last hour", 3600),
+    ("Last 24 hours", 24 * 3600),
+    ("Last 7 days", 7 * 24 * 3600),
+    ("Last 30 days", 30 * 24 * 3600),
+)
 
 logger = logging.getLogger(__name__)
 
@@ -293,9 +312,14 @@ class MetricsCollector(QObject):
     metrics_ready = Signal(dict)
     stop_requested = Signal()
 
+    # Roll up and prune the history store every this many samples
+    MAINTAIN_EVERY = 60
+
     def __init__(self):
         super().__init__()
         self._timer = None
+        self._store = shared_store()
+        self._ticks = 0
         self._last_temp = None
         self._temp_executor = ThreadPoolExecutor(max_workers=1)
         self._pending_temp = None
@@ -353,9 +377,19 @@ class MetricsCollector(QObject):
             m['cpu_temp']  = self._last_temp
             m['timestamp'] = time.time()
             self.metrics_ready.emit(m)
+            self._record(m)
         except Exception as exc:
             logger.exception("MetricsCollector error: %s", exc)
 
+    def _record(self, m: dict):
+        """Persist the sample and periodically roll up history (runs on this thread)."""
+        if self._store is None:
+            return
+        self._store.append("local", numeric_metrics(m, HISTORY_METRICS), m['timestamp'])
+        self._ticks += 1
+        if self._ticks % self.MAINTAIN_EVERY == 0:
+            self._store.maintain()
+
     @staticmethod
     def _read_temp():
         try:
@@ -382,28 +416,38 @@ class DashboardTab(QWidget):
         super().__init__(parent)
         self.main_window = main_window
         self.tab_widget = tab_widget
-        self.chart_data_points = []  # Store time-series data
         self.max_data_points = 120   # 2 minutes of data at 1Hz
-        self.health_history = []     # Store health scores for trend calculation
+        self.chart_data_points = RingBuffer(self.max_data_points, width=2)  # (cpu, memory) rows
+        self._chart_x = np.arange(self.max_data_points, dtype=np.float64)
+        self._chart_drawn_version = None
+        self.health_history = RingBuffer(64, width=2)  # (timestamp, score) rows for trend calculation
         self.max_health_history = 6  # Keep last 6 scores for trend (30s history at 5s updates)
         self.health_window_seconds = 15  # Time window for health score calculation (seconds)
         self._latest_metrics: dict = {}
         self._last_cpu_temp = None
 
         # Performance score tracking
-        self.performance_history = []  # Store (timestamp, score) tuples
+        self.performance_history = RingBuffer(64, width=2)  # (timestamp, score) rows
         self.performance_window_seconds = 3  # 3-second window for performance average
         self._last_performance_score = None
 
         # Remote server support
         self._registry = ServerRegistry()
-        self._remote_clients: dict[str, RemoteClient] = {}
+        self._poller = FleetPoller()
+        self._poller.metrics_ready.connect(self._on_remote_metrics)
         self._remote_metrics: dict[str, RemoteMetrics | None] = {}
         self._remote_prev_net: dict[str, dict] = {}  # per-server net delta state
         self.current_device_id = "local"
 
+        # Persistent metric history; None when the store cannot be opened
+        self._store = shared_store()
+        self.chart_range_seconds = None  # None = live view
+
+        self._history_loaded_at = 0.0
+
         self.setup_ui()
         self.setup_data_refresh()
+        self._load_chart_history()
     
     def setup_ui(self):
         """Set up the modern dashboard UI with enhanced styling."""
@@ -596,6 +640,16 @@ class DashboardTab(QWidget):
         
         # Add device dropdown to layout
         title_layout.addWidget(self.device_dropdown)
+
+        # Chart range — anything but the live view is read from the history store
+        self.range_dropdown = QComboBox()
+        self.range_dropdown.setFixedWidth(300)
+        self.range_dropdown.setStyleSheet(self.device_dropdown.styleSheet())
+        for label, seconds in CHART_RANGES:
+            self.range_dropdown.addItem(label, seconds)
+        self.range_dropdown.setEnabled(self._store is not None)
+        self.range_dropdown.currentIndexChanged.connect(self.on_chart_range_changed)
+        title_layout.addWidget(self.range_dropdown)
         
         # Add title container to header
         header.addWidget(title_container)
@@ -739,11 +793,6 @@ class DashboardTab(QWidget):
         self.chart_animation_timer.timeout.connect(self.animate_chart_update)
         self.chart_animation_timer.start(16)  # ~60 FPS for smooth animation
 
-        # Fetch remote metrics every 3 seconds (SSH calls are slow)
-        self._remote_fetch_timer = QTimer(self)
-        self._remote_fetch_timer.timeout.connect(self._fetch_remote_metrics_async)
-        self._remote_fetch_timer.start(3000)
-
         # Background metrics collector — keeps all psutil calls off the UI thread
         self._metrics_thread = QThread()
         self._collector = MetricsCollector()
@@ -762,8 +811,7 @@ class DashboardTab(QWidget):
         self._collector.stop()
         self._metrics_thread.quit()
         self._metrics_thread.wait(2000)
-        for client in self._remote_clients.values():
-            client.disconnect()
+        self._poller.set_watched("dashboard", ())
         super().closeEvent(event)
 
     # ------------------------------------------------------------------
@@ -796,38 +844,15 @@ class DashboardTab(QWidget):
 
         self.device_dropdown.blockSignals(False)
 
-    def _get_or_create_client(self, server_id: str) -> RemoteClient | None:
-        """Return an existing RemoteClient or create one from the registry."""
-        if server_id in self._remote_clients:
-            return self._remote_clients[server_id]
-        entry = self._registry.get(server_id)
-        if entry is None:
-            return None
-        client = RemoteClient(
-            host=entry.host, port=entry.port, username=entry.username,
-            password=entry.password or None,
-            key_path=entry.key_path or None,
-        )
-        self._remote_clients[server_id] = client
-        return client
-
-    def _fetch_remote_metrics_async(self):
-        """Background-thread fetch for the currently selected remote server."""
-        if self.current_device_id == "local":
+    @Slot(str, object)
+    def _on_remote_metrics(self, server_id: str, metrics):
+        """Cache a sample delivered by the fleet poller and add it to the history store."""
+        if server_id != self.current_device_id:
             return
-        server_id = self.current_device_id
-
-        def _fetch():
-            client = self._get_or_create_client(server_id)
-            if client is None:
-                return
-            metrics = client.fetch_metrics()
-            self._remote_metrics[server_id] = metrics
-            status = "online" if metrics else "offline"
-            self._registry.update_status(server_id, status,
-                                         datetime.now().strftime("%H:%M:%S") if metrics else "")
-
-        threading.Thread(target=_fetch, daemon=True).start()
+        self._remote_metrics[server_id] = metrics
+        if metrics is not None and self._store is not None:
+            self._store.append(server_id, numeric_metrics(vars(metrics), HISTORY_METRICS),
+                               metrics.timestamp)
 
     def _calculate_remote_health(self, m: RemoteMetrics) -> float:
         """Simplified health score from remote metrics (no temperature or I/O wait)."""
@@ -854,27 +879,23 @@ class DashboardTab(QWidget):
         self.memory_gauge.set_value(m.memory_percent)
 
         # Chart data
-        self.chart_data_points.append(
-            {'timestamp': m.timestamp, 'cpu': m.cpu_percent, 'memory': m.memory_percent}
-        )
-        if len(self.chart_data_points) > self.max_data_points:
-            self.chart_data_points = self.chart_data_points[-self.max_data_points:]
+        if self.chart_range_seconds is None:
+            self.chart_data_points.append((m.cpu_percent, m.memory_percent))
+        elif time.time() - self._history_loaded_at >= 60:
+            self._load_chart_history()
 
         # Health
         health = self._calculate_remote_health(m)
         self.health_history.append((m.timestamp, health))
-        cutoff = m.timestamp - self.health_window_seconds
-        self.health_history = [(t, s) for t, s in self.health_history if t >= cutoff]
-        avg_health = sum(s for _, s in self.health_history) / len(self.health_history)
-        self.health_card.value_label.setText(f"{int(avg_health)}")
+        recent = self._recent(self.health_history, m.timestamp - self.health_window_seconds)
+        self.health_card.value_label.setText(f"{int(recent[:, 1].mean())}")
 
         # Performance
         perf = self.calculate_performance_score(m.cpu_percent, m.memory_percent)
         if perf is not None:
             self.performance_history.append((m.timestamp, perf))
-            cutoff_p = m.timestamp - self.performance_window_seconds
-            self.performance_history = [p for p in self.performance_history if p[0] >= cutoff_p]
-            avg_perf = max(0, min(100, sum(p[1] for p in self.performance_history) / len(self.performance_history)))
+            recent = self._recent(self.performance_history, m.timestamp - self.performance_window_seconds)
+            avg_perf = max(0, min(100, recent[:, 1].mean()))
             self.performance_card.value_label.setText(f"{int(avg_perf)}")
 
         # Alerts (no temperature available remotely)
@@ -1126,10 +1147,7 @@ class DashboardTab(QWidget):
 
             now = time.time()
             self.health_history.append((now, current))
-            cutoff = now - self.health_window_seconds
-            self.health_history = [(t, s) for t, s in self.health_history if t >= cutoff]
-
-            return sum(s for _, s in self.health_history) / len(self.health_history)
+            return float(self._recent(self.health_history, now - self.health_window_seconds)[:, 1].mean())
 
         except Exception as exc:
             logger.exception("Error calculating system health: %s", exc)
@@ -1154,18 +1172,18 @@ class DashboardTab(QWidget):
         # Calculate and update system health
         health_score = self.calculate_system_health()
         
-        # Store new data point for chart
-        self.chart_data_points.append({
-            'timestamp': time.time(),
-            'cpu': cpu_usage,
-            'memory': memory_usage
-        })
+        # Store new data point for chart (history ranges are re-read once a minute)
+        if self.chart_range_seconds is None:
+            self.chart_data_points.append((cpu_usage, memory_usage))
+        elif time.time() - self._history_loaded_at >= 60:
+            self._load_chart_history()
         
         # Calculate trend based on the 15s moving average window
-        if len(self.health_history) >= 2:
+        health_window = self._recent(self.health_history, time.time() - self.health_window_seconds)
+        if len(health_window) >= 2:
             # Get oldest and newest scores in the window
-            oldest_time, oldest_score = self.health_history[0]
-            newest_time, newest_score = self.health_history[-1]
+            oldest_time, oldest_score = health_window[0]
+            newest_time, newest_score = health_window[-1]
             
             # Calculate trend (1.5 if improving, -0.5 if declining, 0.5 if stable)
             time_diff = newest_time - oldest_time
@@ -1186,8 +1204,8 @@ class DashboardTab(QWidget):
             self.set_metric_unavailable(self.health_card, "%")
         else:
             # Update health card with moving average if we have data
-            if self.health_history:
-                avg_health = sum(s for _, s in self.health_history) / len(self.health_history)
+            if len(health_window):
+                avg_health = health_window[:, 1].mean()
                 self.health_card.value_label.setText(f"{int(avg_health)}")
                 
                 # Update trend indicator if it exists
@@ -1198,10 +1216,6 @@ class DashboardTab(QWidget):
                 # Fallback to current health score if no history yet
                 self.health_card.value_label.setText(f"{int(health_score)}")
         
-        # Keep only recent data points
-        if len(self.chart_data_points) > self.max_data_points:
-            self.chart_data_points = self.chart_data_points[-self.max_data_points:]
-        
         # Update other metrics
         self.update_system_metrics()
         self.update_uptime()
@@ -1220,14 +1234,12 @@ class DashboardTab(QWidget):
             # Add current score to history with timestamp
             self.performance_history.append((current_time, current_score))
             
-            # Remove scores older than our window
-            cutoff_time = current_time - self.performance_window_seconds
-            self.performance_history = [score for score in self.performance_history 
-                                     if score[0] >= cutoff_time]
+            # Only scores inside our window count
+            recent = self._recent(self.performance_history, current_time - self.performance_window_seconds)
             
             # Calculate moving average if we have data
-            if self.performance_history:
-                avg_score = sum(score[1] for score in self.performance_history) / len(self.performance_history)
+            if len(recent):
+                avg_score = float(recent[:, 1].mean())
                 # Ensure score is within 0-100 range
                 avg_score = max(0, min(100, avg_score))
                 
@@ -1254,31 +1266,35 @@ class DashboardTab(QWidget):
             logger.exception("Error updating performance score: %s", e)
             self.set_metric_unavailable(self.performance_card, "%")
     
+    @staticmethod
+    def _recent(history: RingBuffer, since: float) -> np.ndarray:
+        """Rows of a ``(timestamp, value)`` ring buffer recorded at or after ``since``.
+
+        Filters on every timestamp rather than bisecting, so rows appended
+        out of order (e.g. after a clock adjustment) are not dropped.
+        """
+        rows = history.view()
+        return rows[rows[:, 0] >= since]
+
     def animate_chart_update(self):
         """Smoothly animate chart updates with data flowing right to left."""
-        if not self.chart_data_points:
+        # Nothing new since the last redraw — skip rebuilding the series
+        if not len(self.chart_data_points) or self.chart_data_points.version == self._chart_drawn_version:
             return
             
         try:
-            # Clear existing points
-            self.cpu_series.clear()
-            self.memory_series.clear()
-            self.cpu_glow.clear()
-            self.memory_glow.clear()
+            # Newest point sits at the right edge; older points trail to the left
+            rows = self.chart_data_points.view()
+            x = self._chart_x[-len(rows):]
+            cpu = np.ascontiguousarray(rows[:, 0])
+            memory = np.ascontiguousarray(rows[:, 1])
             
-            # Add points from right to left (newest to oldest)
-            num_points = len(self.chart_data_points)
-            for i, data_point in enumerate(self.chart_data_points):
-                # Calculate x position from right to left
-                x_pos = self.max_data_points - (num_points - i)
-                
-                # Add main series points
-                self.cpu_series.append(x_pos, data_point['cpu'])
-                self.memory_series.append(x_pos, data_point['memory'])
-                
-                # Add glow effect points (slightly offset)
-                self.cpu_glow.append(x_pos, data_point['cpu'])
-                self.memory_glow.append(x_pos, data_point['memory'])
+            # Main series and their glow copies share the same points
+            self.cpu_series.replaceNp(x, cpu)
+            self.memory_series.replaceNp(x, memory)
+            self.cpu_glow.replaceNp(x, cpu)
+            self.memory_glow.replaceNp(x, memory)
+            self._chart_drawn_version = self.chart_data_points.version
             
             # Update x-axis range to show data flowing from right to left
             if hasattr(self, 'line_chart'):
@@ -1415,10 +1431,49 @@ class DashboardTab(QWidget):
         self.cpu_glow.clear()
         self.memory_glow.clear()
 
+        # Pick up where this device's stored history left off
+        self._load_chart_history()
+
         if server_id != "local":
             # Clear stale cache so the UI shows "Connecting…" immediately
             self._remote_metrics.pop(server_id, None)
-            self._fetch_remote_metrics_async()
+        # The poller streams live metrics only for the device on screen
+        self._poller.set_watched("dashboard", (server_id,))
+
+    def on_chart_range_changed(self, index):
+        """Switch the chart between the live view and a stored history range."""
+        if index < 0:
+            return
+        self.chart_range_seconds = self.range_dropdown.itemData(index)
+        if hasattr(self, 'line_chart') and self.line_chart.chart():
+            self.line_chart.chart().setTitle(
+                "Real-time System Performance" if self.chart_range_seconds is None
+                else f"System Performance — {self.range_dropdown.itemText(index)}")
+        self._load_chart_history()
+
+    def _load_chart_history(self):
+        """Fill the chart from the history store for the selected range and device.
+
+        The live view is seeded with the most recent samples so it survives a
+        restart; longer ranges come from the 1-minute or 1-hour rollups.
+        """
+        if self._store is None:
+            return
+        end = time.time()
+        start = end - (self.chart_range_seconds or self.max_data_points)
+        try:
+            cpu = self._store.query(self.current_device_id, 'cpu_percent', start, end,
+                                    max_points=self.max_data_points)
+            memory = dict(self._store.query(self.current_device_id, 'memory_percent', start, end,
+                                            max_points=self.max_data_points))
+        except Exception as exc:
+            logger.warning("Could not read metric history: %s", exc)
+            return
+        stride = max(1, -(-len(cpu) // self.max_data_points))
+        self.chart_data_points.clear()
+        for ts, value in cpu[::stride]:
+            self.chart_data_points.append((value, memory.get(ts, 0.0)))
+        self._history_loaded_at = end
     
     def update_device_count(self):
         """Update the active devices count from the server registry."""
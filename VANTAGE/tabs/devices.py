@@ -1,7 +1,6 @@
 """Devices tab — add/remove/monitor remote servers."""
 import logging
 import threading
-from datetime import datetime
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
@@ -9,9 +8,10 @@ from PySide6.QtWidgets import (
     QFormLayout, QLineEdit, QComboBox, QSpinBox, QMessageBox,
     QFileDialog,
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor
 
+from core.fleet_poller import FleetPoller
 from core.server_registry import ServerRegistry, ServerEntry
 from core.remote_client import RemoteClient
 
@@ -163,25 +163,23 @@ class AddServerDialog(QDialog):
 class DevicesTab(QWidget):
     """Manage remote servers and see their live status."""
 
-    COL_NAME   = 0
-    COL_HOST   = 1
-    COL_STATUS = 2
-    COL_LAST   = 3
-    COL_REMOVE = 4
+    COL_NAME    = 0
+    COL_HOST    = 1
+    COL_STATUS  = 2
+    COL_LATENCY = 3
+    COL_LAST    = 4
+    COL_REMOVE  = 5
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("DevicesTab")
         self._registry = ServerRegistry()
-        self._clients: dict[str, RemoteClient] = {}
+        # Status checks are scheduled by the shared fleet poller
+        self._poller = FleetPoller()
         self._setup_ui()
         self._registry.servers_changed.connect(self._refresh_table)
+        self._poller.polled.connect(self._refresh_latency)
         self._refresh_table()
-        # Ping all servers every 30 seconds
-        self._ping_timer = QTimer(self)
-        self._ping_timer.timeout.connect(self._check_all_statuses)
-        self._ping_timer.start(30_000)
-        QTimer.singleShot(0, self._check_all_statuses)
 
     # ------------------------------------------------------------------
     # UI setup
@@ -202,16 +200,17 @@ class DevicesTab(QWidget):
         layout.addLayout(header)
 
         self.devices_table = QTableWidget()
-        self.devices_table.setColumnCount(5)
+        self.devices_table.setColumnCount(6)
         self.devices_table.setHorizontalHeaderLabels(
-            ["Name", "Host", "Status", "Last Seen", ""]
+            ["Name", "Host", "Status", "Latency", "Last Seen", ""]
         )
         hdr = self.devices_table.horizontalHeader()
-        hdr.setSectionResizeMode(self.COL_NAME,   QHeaderView.Stretch)
-        hdr.setSectionResizeMode(self.COL_HOST,   QHeaderView.ResizeToContents)
-        hdr.setSectionResizeMode(self.COL_STATUS, QHeaderView.ResizeToContents)
-        hdr.setSectionResizeMode(self.COL_LAST,   QHeaderView.ResizeToContents)
-        hdr.setSectionResizeMode(self.COL_REMOVE, QHeaderView.Fixed)
+        hdr.setSectionResizeMode(self.COL_NAME,    QHeaderView.Stretch)
+        hdr.setSectionResizeMode(self.COL_HOST,    QHeaderView.ResizeToContents)
+        hdr.setSectionResizeMode(self.COL_STATUS,  QHeaderView.ResizeToContents)
+        hdr.setSectionResizeMode(self.COL_LATENCY, QHeaderView.ResizeToContents)
+        hdr.setSectionResizeMode(self.COL_LAST,    QHeaderView.ResizeToContents)
+        hdr.setSectionResizeMode(self.COL_REMOVE,  QHeaderView.Fixed)
         self.devices_table.setColumnWidth(self.COL_REMOVE, 80)
         self.devices_table.verticalHeader().setVisible(False)
         self.devices_table.setEditTriggers(QTableWidget.NoEditTriggers)
@@ -234,6 +233,7 @@ class DevicesTab(QWidget):
             color = {"online": "#00d4aa", "offline": "#ff6b6b"}.get(entry.status, "#b0b0b0")
             status_item.setForeground(QColor(color))
             self.devices_table.setItem(row, self.COL_STATUS, status_item)
+            self.devices_table.setItem(row, self.COL_LATENCY, QTableWidgetItem(self._latency_text(entry.server_id)))
             self.devices_table.setItem(row, self.COL_LAST, QTableWidgetItem(entry.last_seen))
 
             remove_btn = QPushButton("Remove")
@@ -241,6 +241,28 @@ class DevicesTab(QWidget):
             remove_btn.clicked.connect(self._on_remove_clicked)
             self.devices_table.setCellWidget(row, self.COL_REMOVE, remove_btn)
 
+    def _latency_text(self, server_id: str) -> str:
+        stats = self._poller.stats(server_id)
+        if stats is None or stats.latency_ms is None:
+            return "—"
+        return f"{stats.latency_ms:.0f} ms"
+
+    def _refresh_latency(self):
+        """Update only the latency and last-seen cells; cheaper than rebuilding the table."""
+        for row in range(self.devices_table.rowCount()):
+            status_item = self.devices_table.item(row, self.COL_STATUS)
+            latency_item = self.devices_table.item(row, self.COL_LATENCY)
+            last_item = self.devices_table.item(row, self.COL_LAST)
+            if status_item is None or latency_item is None or last_item is None:
+                continue
+            server_id = status_item.data(Qt.UserRole)
+            text = self._latency_text(server_id)
+            if latency_item.text() != text:
+                latency_item.setText(text)
+            entry = self._registry.get(server_id)
+            if entry is not None and last_item.text() != entry.last_seen:
+                last_item.setText(entry.last_seen)
+
     # ------------------------------------------------------------------
     # Actions
     # ------------------------------------------------------------------
@@ -258,39 +280,11 @@ class DevicesTab(QWidget):
                                     f"{entry.server_id} is already in the list.")
             return
         self._registry.add_server(entry)
-        # Kick off an immediate status check for the new server
-        threading.Thread(target=self._ping_server, args=(entry.server_id,), daemon=True).start()
+        # Check the new server right away instead of on its first scheduled poll
+        self._poller.poll_now(entry.server_id)
 
     def _on_remove_clicked(self):
         server_id = self.sender().property("server_id")
         if server_id:
-            client = self._clients.pop(server_id, None)
-            if client:
-                client.disconnect()
+            self._poller.forget(server_id)
             self._registry.remove_server(server_id)
-
-    # ------------------------------------------------------------------
-    # Status polling
-    # ------------------------------------------------------------------
-
-    def _check_all_statuses(self):
-        for entry in self._registry.all_servers():
-            threading.Thread(
-                target=self._ping_server, args=(entry.server_id,), daemon=True
-            ).start()
-
-    def _ping_server(self, server_id: str):
-        entry = self._registry.get(server_id)
-        if entry is None:
-            return
-        if server_id not in self._clients:
-            self._clients[server_id] = RemoteClient(
-                host=entry.host, port=entry.port, username=entry.username,
-                password=entry.password or None,
-                key_path=entry.key_path or None,
-            )
-        client = self._clients[server_id]
-        ok = client.connect() if not client.is_connected else True
-        status = "online" if ok else "offline"
-        last_seen = datetime.now().strftime("%H:%M:%S") if ok else entry.last_seen
-        self._registry.update_status(server_id, status, last_seen)
@@ -3,10 +3,21 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTabWidget,
 from PySide6.QtCharts import QChart, QChartView, QLineSeries, QSplineSeries, QValueAxis, QAreaSeries
 from PySide6.QtCore import Qt, QTimer, QMargins, QObject, QThread, Signal, Slot
 from PySide6.QtGui import QPainter, QColor, QPen
+import numpy as np
 import psutil
 import platform
 from datetime import datetime
 
+from core.forecast import holt_forecast, median_forecast
+from core.metrics_store import numeric_metrics, shared_store
+from core.ring_buffer import RingBuffer
+
+# Metrics persisted to the history store (the dashboard records CPU/memory totals).
+HISTORY_METRICS = (
+    'swap_percent', 'disk_read_kbps', 'disk_write_kbps',
+    'net_sent_kbps', 'net_recv_kbps', 'net_connections',
+)
+
 logger = __import__('logging').getLogger(__name__)
 
 
@@ -25,6 +36,7 @@ class PerfMetricsCollector(QObject):
         self._last_disk_io = None
         self._last_net_io  = None
         self._last_io_time = None
+        self._store = shared_store()
         self.stop_requested.connect(self._do_stop)
 
     @Slot()
@@ -113,9 +125,20 @@ class PerfMetricsCollector(QObject):
                 m['net_connections'] = None
 
             self.metrics_ready.emit(m)
+            self._record(m)
         except Exception as exc:
             logger.exception("PerfMetricsCollector error: %s", exc)
 
+    def _record(self, m: dict):
+        """Persist this sample to the shared history store (runs on this thread)."""
+        if self._store is None:
+            return
+        sample = numeric_metrics(m, HISTORY_METRICS)
+        sample['load_avg_1'] = m['load_avg'][0]
+        for core, value in enumerate(m['cpu_per_core']):
+            sample[f'cpu_core_{core}'] = value
+        self._store.append("local", sample)
+
 
 # ---------------------------------------------------------------------------
 # Tab
@@ -131,6 +154,11 @@ class PerformanceAnalyticsTab(QWidget):
         self.prediction_steps  = 30
         self.prediction_window = 20   # wider history → smoother, less reactive forecasts
         self._latest: dict = {}
+        # X positions shared by every history series: oldest sample at the far right,
+        # newest at 0, matching the oldest-first order of RingBuffer views.
+        ti = (self.time_range * 60) / (self.data_points - 1)
+        self._x_history = np.arange(self.data_points - 1, -1, -1, dtype=np.float64) * ti
+        self._x_forecast = -np.arange(self.prediction_steps + 1, dtype=np.float64) * (30.0 / self.prediction_steps)
         self.setup_ui()
         self._start_collector()
 
@@ -262,6 +290,10 @@ class PerformanceAnalyticsTab(QWidget):
         series.attachAxis(ax)
         series.attachAxis(ay)
 
+    def _plot_history(self, series, values):
+        """Replace a series' points with a ring buffer window in one call."""
+        series.replaceNp(self._x_history[-len(values):], np.ascontiguousarray(values, dtype=np.float64))
+
     def _make_band(self, chart, ax, ay, color: QColor) -> tuple:
         """Create an QAreaSeries confidence band. Returns (area, upper, lower)."""
         upper = QLineSeries()
@@ -343,10 +375,10 @@ class PerformanceAnalyticsTab(QWidget):
         layout.addWidget(top, 1)
         layout.addWidget(metrics, 1)
 
-        # Data buffers — index 0 = newest
+        # Data buffers — oldest first, one column per core
         self._cpu_count = psutil.cpu_count() or 1
-        self.cpu_data     = [[0.0] * self.data_points for _ in range(self._cpu_count)]
-        self.avg_cpu_data = [0.0] * self.data_points
+        self.cpu_data     = RingBuffer(self.data_points, width=self._cpu_count, fill=0.0)
+        self.avg_cpu_data = RingBuffer(self.data_points, fill=0.0)
         self.cpu_series   = []  # per-core series, created on first update
 
         # Color palette (golden-ratio hue spread)
@@ -364,9 +396,8 @@ class PerformanceAnalyticsTab(QWidget):
         for s in self.cpu_series:
             self.cpu_chart.removeSeries(s)
         self.cpu_series = []
-        # Expand data buffers if needed
-        while len(self.cpu_data) < cpu_count:
-            self.cpu_data.append([0.0] * self.data_points)
+        if self.cpu_data.width != cpu_count:
+            self.cpu_data = RingBuffer(self.data_points, width=cpu_count, fill=0.0)
         for core in range(cpu_count):
             s = QSplineSeries()
             s.setName(f"Core {core + 1}")
@@ -393,26 +424,17 @@ class PerformanceAnalyticsTab(QWidget):
             self.cpu_freq_label.setText(f"{freq.current/1000:.2f} GHz  (max {freq.max/1000:.2f} GHz)")
         self.cpu_load_label.setText(f"{load[0]:.1f}% / {load[1]:.1f}% / {load[2]:.1f}%")
 
-        ti = (self.time_range * 60) / (self.data_points - 1)
-
-        # Shift and insert newest at 0
-        self.avg_cpu_data.pop()
-        self.avg_cpu_data.insert(0, avg)
-
-        self.avg_series.clear()
-        for i, v in enumerate(self.avg_cpu_data):
-            self.avg_series.append(i * ti, v)
+        self.avg_cpu_data.append(avg)
+        self._plot_history(self.avg_series, self.avg_cpu_data.view())
 
+        self.cpu_data.append(cpu_percent)
+        per_core = self.cpu_data.view()
         for core in range(cpu_count):
-            self.cpu_data[core].pop()
-            self.cpu_data[core].insert(0, cpu_percent[core])
-            self.cpu_series[core].clear()
-            for i, v in enumerate(self.cpu_data[core]):
-                self.cpu_series[core].append(i * ti, v)
+            self._plot_history(self.cpu_series[core], per_core[:, core])
 
         if self.prediction_window <= len(self.avg_cpu_data):
             self._update_holt_prediction(
-                self.avg_cpu_data, self.cpu_pred_series,
+                self.avg_cpu_data.latest(self.prediction_window), self.cpu_pred_series,
                 self.cpu_band_upper, self.cpu_band_lower,
                 alpha=0.4, beta=0.2, phi=0.85, max_step_range=(1.5, 8.0), clamp=(0, 100))
 
@@ -484,12 +506,12 @@ class PerformanceAnalyticsTab(QWidget):
         layout.addWidget(top, 1)
         layout.addWidget(metrics, 1)
 
-        # Data buffers — index 0 = newest
-        self.mem_data            = [0.0] * self.data_points
-        self.mem_available_data  = [0.0] * self.data_points
-        self.mem_used_data       = [0.0] * self.data_points
-        self.swap_used_data      = [0.0] * self.data_points
-        self.swap_percent_data   = [0.0] * self.data_points
+        # Data buffers — oldest first
+        self.mem_data            = RingBuffer(self.data_points, fill=0.0)
+        self.mem_available_data  = RingBuffer(self.data_points, fill=0.0)
+        self.mem_used_data       = RingBuffer(self.data_points, fill=0.0)
+        self.swap_used_data      = RingBuffer(self.data_points, fill=0.0)
+        self.swap_percent_data   = RingBuffer(self.data_points, fill=0.0)
 
     def _update_memory(self, m: dict):
         mem_pct  = m.get('mem_percent',   0)
@@ -525,9 +547,8 @@ class PerformanceAnalyticsTab(QWidget):
             (self.swap_used_data,     swap_used_pct),
             (self.swap_percent_data,  sw_pct),
         ]:
-            buf.pop(); buf.insert(0, val)
+            buf.append(val)
 
-        ti = (self.time_range * 60) / (self.data_points - 1)
         for series, buf in [
             (self.mem_series,           self.mem_data),
             (self.mem_available_series, self.mem_available_data),
@@ -535,13 +556,11 @@ class PerformanceAnalyticsTab(QWidget):
             (self.swap_used_series,     self.swap_used_data),
             (self.swap_percent_series,  self.swap_percent_data),
         ]:
-            series.clear()
-            for i, v in enumerate(buf):
-                series.append(i * ti, v)
+            self._plot_history(series, buf.view())
 
         if self.prediction_window <= len(self.mem_data):
             self._update_holt_prediction(
-                self.mem_data, self.mem_pred_series,
+                self.mem_data.latest(self.prediction_window), self.mem_pred_series,
                 self.mem_band_upper, self.mem_band_lower,
                 alpha=0.3, beta=0.1, phi=0.7, max_step_range=(0.5, 4.0), clamp=(0, 100))
 
@@ -613,9 +632,9 @@ class PerformanceAnalyticsTab(QWidget):
         tab_layout.setContentsMargins(5, 5, 5, 5)
         tab_layout.addWidget(splitter)
 
-        # Data buffers — index 0 = newest
-        self.disk_read_data  = [0.0] * self.data_points
-        self.disk_write_data = [0.0] * self.data_points
+        # Data buffers — oldest first
+        self.disk_read_data  = RingBuffer(self.data_points, fill=0.0)
+        self.disk_write_data = RingBuffer(self.data_points, fill=0.0)
 
     def _update_disk(self, m: dict):
         def _fmt(b):
@@ -634,28 +653,25 @@ class PerformanceAnalyticsTab(QWidget):
         self.disk_read_label.setText(f"{r:.1f} KB/s")
         self.disk_write_label.setText(f"{w:.1f} KB/s")
 
-        self.disk_read_data.pop();  self.disk_read_data.insert(0, r)
-        self.disk_write_data.pop(); self.disk_write_data.insert(0, w)
+        self.disk_read_data.append(r)
+        self.disk_write_data.append(w)
+        read_view, write_view = self.disk_read_data.view(), self.disk_write_data.view()
 
-        max_io = max(max(self.disk_read_data + self.disk_write_data) * 1.1, 10)
+        max_io = max(max(read_view.max(), write_view.max()) * 1.1, 10)
         self.disk_ay.setRange(0, max_io)
         self.disk_divider.clear()
         self.disk_divider.append(0, 0)
         self.disk_divider.append(0, max_io)
 
-        ti = (self.time_range * 60) / (self.data_points - 1)
-        self.disk_read_series.clear()
-        self.disk_write_series.clear()
-        for i in range(self.data_points):
-            self.disk_read_series.append(i * ti, self.disk_read_data[i])
-            self.disk_write_series.append(i * ti, self.disk_write_data[i])
+        self._plot_history(self.disk_read_series, read_view)
+        self._plot_history(self.disk_write_series, write_view)
 
         if len(self.disk_read_data) >= 2:
             self._update_median_prediction(
-                self.disk_read_data,  self.disk_read_pred,
+                read_view,  self.disk_read_pred,
                 self.disk_read_band_upper,  self.disk_read_band_lower)
             self._update_median_prediction(
-                self.disk_write_data, self.disk_write_pred,
+                write_view, self.disk_write_pred,
                 self.disk_write_band_upper, self.disk_write_band_lower)
 
     # ------------------------------------------------------------------
@@ -718,9 +734,9 @@ class PerformanceAnalyticsTab(QWidget):
         tab_layout.setContentsMargins(5, 5, 5, 5)
         tab_layout.addWidget(splitter)
 
-        # Data buffers — index 0 = newest
-        self.net_sent_data = [0.0] * self.data_points
-        self.net_recv_data = [0.0] * self.data_points
+        # Data buffers — oldest first
+        self.net_sent_data = RingBuffer(self.data_points, fill=0.0)
+        self.net_recv_data = RingBuffer(self.data_points, fill=0.0)
 
     def _update_network(self, m: dict):
         def _fmt(b):
@@ -740,106 +756,51 @@ class PerformanceAnalyticsTab(QWidget):
         conns = m.get('net_connections')
         self.net_connections_label.setText(f"{conns} established" if conns is not None else "N/A")
 
-        self.net_sent_data.pop(); self.net_sent_data.insert(0, s)
-        self.net_recv_data.pop(); self.net_recv_data.insert(0, r)
+        self.net_sent_data.append(s)
+        self.net_recv_data.append(r)
+        sent_view, recv_view = self.net_sent_data.view(), self.net_recv_data.view()
 
-        max_net = max(max(self.net_sent_data + self.net_recv_data) * 1.1, 10)
+        max_net = max(max(sent_view.max(), recv_view.max()) * 1.1, 10)
         self.net_ay.setRange(0, max_net)
         self.net_divider.clear()
         self.net_divider.append(0, 0)
         self.net_divider.append(0, max_net)
 
-        ti = (self.time_range * 60) / (self.data_points - 1)
-        self.net_sent_series.clear()
-        self.net_recv_series.clear()
-        for i in range(self.data_points):
-            self.net_sent_series.append(i * ti, self.net_sent_data[i])
-            self.net_recv_series.append(i * ti, self.net_recv_data[i])
+        self._plot_history(self.net_sent_series, sent_view)
+        self._plot_history(self.net_recv_series, recv_view)
 
         if len(self.net_sent_data) >= 2:
             self._update_median_prediction(
-                self.net_sent_data, self.net_sent_pred,
+                sent_view, self.net_sent_pred,
                 self.net_sent_band_upper, self.net_sent_band_lower)
             self._update_median_prediction(
-                self.net_recv_data, self.net_recv_pred,
+                recv_view, self.net_recv_pred,
                 self.net_recv_band_upper, self.net_recv_band_lower)
 
     # ------------------------------------------------------------------
     # Prediction engines
     # ------------------------------------------------------------------
 
-    def _update_holt_prediction(self, data: list, series: QSplineSeries,
+    def _update_holt_prediction(self, window: np.ndarray, series: QSplineSeries,
                                  band_upper: QLineSeries, band_lower: QLineSeries, *,
                                  alpha: float, beta: float, phi: float,
                                  max_step_range: tuple,
                                  clamp: tuple | None = None):
         """
         Holt's damped linear trend for slowly-varying signals (CPU, Memory).
-        Confidence band widens proportionally to sqrt(step) × recent σ.
+        ``window`` is oldest first. Confidence band widens proportionally to
+        sqrt(step) × recent σ.
         """
-        window = data[:self.prediction_window]
         if len(window) < 2:
             return
-
-        chronological = list(reversed(window))
-        level = chronological[0]
-        trend = chronological[1] - chronological[0]
-        for v in chronological[1:]:
-            prev  = level
-            level = alpha * v + (1 - alpha) * (level + trend)
-            trend = beta * (level - prev) + (1 - beta) * trend
-
-        deltas   = [abs(b - a) for a, b in zip(chronological[:-1], chronological[1:])]
-        avg_d    = sum(deltas) / len(deltas) if deltas else 0
-        max_step = max(max_step_range[0], min(max_step_range[1], avg_d * 1.5))
-        # σ for the band: std-dev of recent deltas
-        if len(deltas) > 1:
-            mean_d = avg_d
-            sigma  = (sum((d - mean_d) ** 2 for d in deltas) / len(deltas)) ** 0.5
-        else:
-            sigma = avg_d
-
-        series.clear()
-        band_upper.clear()
-        band_lower.clear()
-
-        # Anchor at "now"
-        series.append(0, data[0])
-        band_upper.append(0, data[0])
-        band_lower.append(0, data[0])
-
-        last_y = data[0]
-        for i in range(1, self.prediction_steps + 1):
-            if phi == 1:
-                forecast = level + trend * i
-            else:
-                forecast = level + trend * (1 - phi ** i) / (1 - phi)
-
-            delta = forecast - last_y
-            if abs(delta) > max_step:
-                forecast = last_y + max_step * (1 if delta > 0 else -1)
-
-            if clamp:
-                forecast = max(clamp[0], min(clamp[1], forecast))
-            else:
-                forecast = max(0.0, forecast)
-
-            half_band = sigma * (i ** 0.5) * 1.2
-            lo = forecast - half_band
-            hi = forecast + half_band
-            if clamp:
-                lo = max(clamp[0], lo)
-                hi = min(clamp[1], hi)
-            else:
-                lo = max(0.0, lo)
-
-            tp = -i * (30.0 / self.prediction_steps)
-            series.append(tp, forecast)
-            band_upper.append(tp, hi)
-            band_lower.append(tp, lo)
-            last_y = forecast
-
-    def _update_median_prediction(self, data: list, series: QSplineSeries,
+        forecast, lower, upper = holt_forecast(
+            window, self.prediction_steps, alpha=alpha, beta=beta, phi=phi,
+            max_step_range=max_step_range, clamp=clamp)
+        series.replaceNp(self._x_forecast, forecast)
+        band_upper.replaceNp(self._x_forecast, upper)
+        band_lower.replaceNp(self._x_forecast, lower)
+
+    def _update_median_prediction(self, data: np.ndarray, series: QSplineSeries,
                                    band_upper: QLineSeries, band_lower: QLineSeries,
                                    window: int = 15):
         """
@@ -847,29 +808,16 @@ class PerformanceAnalyticsTab(QWidget):
         Predicts 'activity stays similar to recent median' — honest flat line.
         Confidence band = median ± 1.5 × MAD (median absolute deviation).
         """
-        recent = sorted(data[:window])
-        if not recent:
+        if not len(data):
             return
-        n = len(recent)
-        median = (recent[n // 2] if n % 2 else (recent[n // 2 - 1] + recent[n // 2]) / 2)
-        abs_devs = sorted(abs(v - median) for v in recent)
-        mad = (abs_devs[n // 2] if n % 2 else (abs_devs[n // 2 - 1] + abs_devs[n // 2]) / 2)
-        hi = median + 1.5 * mad
-        lo = max(0.0, median - 1.5 * mad)
-
-        series.clear()
-        band_upper.clear()
-        band_lower.clear()
+        median, lo, hi = median_forecast(data[-window:])
 
         # Anchor at now, then flat line at median
-        for src, y in [(series, data[0]), (band_upper, data[0]), (band_lower, data[0])]:
-            src.append(0, y)
-
-        for i in range(1, self.prediction_steps + 1):
-            tp = -i * (30.0 / self.prediction_steps)
-            series.append(tp, median)
-            band_upper.append(tp, hi)
-            band_lower.append(tp, lo)
+        points = self.prediction_steps + 1
+        for target, level in ((series, median), (band_upper, hi), (band_lower, lo)):
+            ys = np.full(points, level)
+            ys[0] = data[-1]
+            target.replaceNp(self._x_forecast, ys)
 
     # ------------------------------------------------------------------
     # Main refresh (called by UI timer every second)
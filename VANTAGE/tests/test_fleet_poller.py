@@ -0,0 +1,77 @@
+"""
+Tests for the fleet poller's per-host scheduling state.
+"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from core.fleet_poller import FleetPoller, HostStats  # noqa: E402
+
+
+def test_failures_back_off_and_success_resets():
+    """Each consecutive failure doubles the delay up to the cap; a success resets it."""
+    stats = HostStats("web:22")
+    assert 27 <= stats.delay(30, 300) <= 33
+    for _ in range(3):
+        stats.record(False)
+    assert 216 <= stats.delay(30, 300) <= 264
+    for _ in range(5):
+        stats.record(False)
+    assert stats.delay(30, 300) <= 330
+    stats.record(True, 0.05)
+    assert stats.consecutive_failures == 0
+    assert stats.failures == 8
+    assert stats.latency_ms == pytest.approx(50)
+
+
+def test_latency_is_smoothed():
+    """Average latency moves towards new samples; min and max are tracked."""
+    stats = HostStats("db:22")
+    stats.record(True, 0.1)
+    stats.record(True, 0.2)
+    stats.record(True)   # metrics-only poll, no ping
+    assert stats.avg_latency == pytest.approx(0.12)
+    assert (stats.min_latency, stats.max_latency) == (0.1, 0.2)
+    assert stats.polls == 3
+
+
+def test_only_status_changes_are_queued():
+    """Steady hosts queue no registry writes; a flip back before the save cancels the update."""
+    entries = {"web:22": SimpleNamespace(status="online")}
+    poller = SimpleNamespace(_registry=SimpleNamespace(get=entries.get), _pending_status={})
+
+    FleetPoller._queue_status(poller, "web:22", "online")
+    assert poller._pending_status == {}
+
+    FleetPoller._queue_status(poller, "web:22", "offline")
+    FleetPoller._queue_status(poller, "web:22", "offline")
+    assert poller._pending_status == {"web:22": ("offline", "")}
+
+    FleetPoller._queue_status(poller, "web:22", "online")
+    assert poller._pending_status == {}
+
+
+def test_successful_polls_refresh_last_seen_without_saving():
+    """A host that stays online keeps moving its last-seen time in memory only."""
+    entry = SimpleNamespace(status="online", last_seen="00:00:00")
+    touched = []
+    registry = SimpleNamespace(
+        get={"web:22": entry}.get,
+        touch=lambda server_id, last_seen: touched.append((server_id, last_seen)),
+    )
+    poller = SimpleNamespace(
+        _registry=registry, _pending_status={}, _results_lock=threading.Lock(),
+        _results=[("web:22", True, False, 0.01, None)], _in_flight={"web:22"},
+        _stats={"web:22": HostStats("web:22")}, _watched=set,
+        metrics_interval=2.0, status_interval=30.0, max_backoff=300.0,
+        polled=SimpleNamespace(emit=lambda: None),
+    )
+    poller._queue_status = lambda *args: FleetPoller._queue_status(poller, *args)
+
+    FleetPoller._apply_results(poller, 0.0)
+
+    assert [server_id for server_id, _ in touched] == ["web:22"]
+    assert poller._pending_status == {}
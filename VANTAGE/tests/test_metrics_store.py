@@ -0,0 +1,39 @@
+"""
+Tests for the persistent metric history store.
+"""
+from core.metrics_store import HOUR, MINUTE, RAW, MetricsStore
+
+START = 1_700_000_000 - 1_700_000_000 % HOUR
+
+
+def _filled_store(seconds):
+    store = MetricsStore(":memory:")
+    for i in range(seconds):
+        store.append("local", {"cpu_percent": i % 60, "cpu_temp": None}, START + i)
+    return store
+
+
+def test_rollups_aggregate_closed_buckets():
+    """Minute and hour rollups average the raw samples they cover."""
+    store = _filled_store(2 * HOUR)
+    store.rollup(now=START + 2 * HOUR)
+
+    minutes = store.query("local", "cpu_percent", START, START + 2 * HOUR, resolution=MINUTE)
+    hours = store.query("local", "cpu_percent", START, START + 2 * HOUR, resolution=HOUR)
+    assert len(minutes) == 120
+    assert minutes[0] == (START, 29.5)
+    assert hours == [(START, 29.5), (START + HOUR, 29.5)]
+    assert store.metrics("local") == ["cpu_percent"]
+
+
+def test_retention_and_resolution_choice():
+    """Raw samples expire first and queries fall back to rollups."""
+    store = MetricsStore(":memory:", retention={RAW: HOUR})
+    for i in range(3 * HOUR):
+        store.append("local", {"cpu_percent": 50}, START + i)
+    now = START + 3 * HOUR
+    store.maintain(now=now)
+
+    assert store.query("local", "cpu_percent", START, now, resolution=RAW)[0][0] >= now - HOUR
+    assert store.pick_resolution(START, now, now=now) == MINUTE
+    assert store.pick_resolution(now - 120, now, now=now) == RAW
@@ -0,0 +1,52 @@
+"""
+Tests for the streaming remote metrics agent and its frame decoder.
+"""
+import json
+import subprocess
+import sys
+
+import pytest
+
+from core.remote_client import _AGENT_SCRIPT, FrameDecoder
+
+
+def test_decoder_applies_changes_and_counter_deltas():
+    """Delta frames update the last keyframe instead of replacing it."""
+    decoder = FrameDecoder()
+    key = dict(cpu_percent=5.0, memory_percent=40.0, memory_used=4, memory_total=10,
+               disk_percent=50.0, disk_used=5, disk_total=10, net_bytes_sent=100,
+               net_bytes_recv=200, uptime_seconds=60, cpu_temp=None)
+    assert decoder.feed(json.dumps({'hello': 1, 'interval': 0.5, 'source': 'proc'})) is None
+    assert decoder.interval == 0.5
+    decoder.feed(json.dumps({'k': key, 't': 1.0}))
+    metrics = decoder.feed(json.dumps({'c': {'cpu_percent': 7.5}, 'd': {'net_bytes_sent': 25}, 't': 2.0}))
+    assert metrics.cpu_percent == 7.5
+    assert metrics.net_bytes_sent == 125
+    assert metrics.net_bytes_recv == 200
+    assert metrics.timestamp == 2.0
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="agent falls back to /proc")
+def test_agent_streams_frames_until_stdin_closes():
+    """The agent negotiates its interval, streams frames and exits on EOF."""
+    agent = subprocess.Popen([sys.executable, "-u", "-c", _AGENT_SCRIPT, "0.05"],
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        decoder = FrameDecoder()
+        snapshots = []
+        while len(snapshots) < 3:
+            metrics = decoder.feed(agent.stdout.readline())
+            if metrics is not None:
+                snapshots.append(metrics)
+        assert decoder.interval == 0.2  # clamped to the agent's minimum
+        assert snapshots[0].memory_total > 0
+        assert snapshots[-1].timestamp > snapshots[0].timestamp
+
+        agent.stdin.write(json.dumps({'interval': 0.3}) + "\n")
+        agent.stdin.flush()
+        while decoder.interval != 0.3:
+            decoder.feed(agent.stdout.readline())
+        agent.stdin.close()
+        assert agent.wait(timeout=5) == 0
+    finally:
+        agent.kill()
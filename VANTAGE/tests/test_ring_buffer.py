@@ -0,0 +1,49 @@
+"""
+Tests for the chart ring buffer and the vectorised forecasts.
+"""
+import numpy as np
+import pytest
+
+from core.forecast import holt_smooth
+from core.ring_buffer import RingBuffer
+
+
+def test_ring_buffer_keeps_newest_values_oldest_first():
+    """After wrapping, the view holds the last ``capacity`` values in order."""
+    ring = RingBuffer(4)
+    for value in range(10):
+        ring.append(value)
+    assert ring.view().tolist() == [6, 7, 8, 9]
+    assert ring.latest(2).tolist() == [8, 9]
+    assert ring.last == 9
+
+    rows = RingBuffer(3, width=2, fill=0.0)
+    rows.append((1, 2))
+    assert rows.view().tolist() == [[0, 0], [0, 0], [1, 2]]
+    rows.clear()
+    assert len(rows) == 0
+
+
+def test_holt_smooth_matches_recursive_definition():
+    """The matrix form of Holt smoothing equals the step-by-step recursion."""
+    window = np.array([12.0, 15.0, 14.0, 20.0, 18.0, 25.0, 24.0, 30.0])
+    alpha, beta = 0.4, 0.2
+    level, trend = window[0], window[1] - window[0]
+    for value in window[1:]:
+        previous = level
+        level = alpha * value + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous) + (1 - beta) * trend
+    assert np.allclose(holt_smooth(window, alpha, beta), (level, trend))
+
+
+def test_recent_window_keeps_out_of_order_samples():
+    """A sample older than its successor (clock stepped back) does not hide newer ones."""
+    pytest.importorskip("PySide6")
+    from tabs.dashboard import DashboardTab
+
+    history = RingBuffer(8, width=2)
+    for timestamp, value in [(100.0, 1), (200.0, 2), (150.0, 3), (210.0, 4)]:
+        history.append((timestamp, value))
+
+    recent = DashboardTab._recent(history, 160.0)
+    assert recent[:, 1].tolist() == [2, 4]
@@ -2,12 +2,12 @@
 
 Each consumer (tray, desktop widget) has its own independently chosen source
 (local machine or any SSH server).  The controller maintains a per-source
-metrics cache and fetches remote metrics in background threads.
+metrics cache; remote metrics come from the shared fleet poller.
 """
+import dataclasses
 import logging
 import os
 import subprocess
-import threading
 from typing import Optional
 
 from PySide6.QtCore import Qt, QTimer, Signal, Slot, QObject
@@ -442,14 +442,9 @@ class DesktopIntegrationController(QObject):
     """
     Owns the tray applet and desktop widget.  Maintains a per-source metrics
     cache; local metrics arrive via on_local_metrics(); remote metrics are
-    fetched in background threads on a timer.
+    delivered by the shared fleet poller for the sources currently shown.
     """
 
-    # Signal used to marshal remote fetch results back to the main thread.
-    # Qt signals are thread-safe; QTimer.singleShot is not when called from
-    # a plain threading.Thread.
-    _remote_ready = Signal(str, object)   # source_id, metrics dict
-
     def __init__(self, registry=None, parent=None):
         super().__init__(parent)
         self._registry = registry
@@ -460,17 +455,15 @@ class DesktopIntegrationController(QObject):
 
         # source_id → latest metrics dict
         self._cache: dict[str, dict] = {"local": {}}
-        # source_id → RemoteClient (lazy)
-        self._clients: dict = {}
-        self._client_lock = threading.Lock()
 
+        # The poller emits on the main thread; tell it which remotes we show
+        from core.fleet_poller import FleetPoller
+        self._poller = FleetPoller()
+        self._poller.metrics_ready.connect(self._on_remote_ready)
         self._remote_timer = QTimer(self)
-        self._remote_timer.timeout.connect(self._fetch_remotes)
+        self._remote_timer.timeout.connect(self._update_watched)
         self._remote_timer.start(3000)
 
-        # Thread-safe bridge: background thread emits this, main thread updates cache
-        self._remote_ready.connect(self._on_remote_ready)
-
     # ------------------------------------------------------------------
     # Enable / disable
     # ------------------------------------------------------------------
@@ -567,53 +560,27 @@ class DesktopIntegrationController(QObject):
         return sources
 
     @Slot()
-    def _fetch_remotes(self):
-        for source_id in self._needed_sources():
-            threading.Thread(target=self._fetch_one, args=(source_id,),
-                             daemon=True).start()
-
-    def _fetch_one(self, source_id: str):
-        client = self._get_client(source_id)
-        if not client:
-            return
-        result = client.fetch_metrics()
-        if result:
-            import dataclasses
-            # Emit signal instead of QTimer.singleShot — signals are thread-safe,
-            # QTimer is not when called from a plain threading.Thread.
-            self._remote_ready.emit(source_id, dataclasses.asdict(result))
+    def _update_watched(self):
+        self._poller.set_watched("desktop", self._needed_sources())
 
     @Slot(str, object)
-    def _on_remote_ready(self, source_id: str, data: dict):
-        self._cache[source_id] = data
+    def _on_remote_ready(self, source_id: str, metrics):
+        if metrics is None or source_id not in self._needed_sources():
+            return
+        self._cache[source_id] = dataclasses.asdict(metrics)
         self._push_to_consumers()
 
-    def _get_client(self, source_id: str):
-        with self._client_lock:
-            if source_id in self._clients:
-                return self._clients[source_id]
-            if not self._registry:
-                return None
-            srv = self._registry.get(source_id)
-            if not srv:
-                return None
-            from core.remote_client import RemoteClient
-            client = RemoteClient(
-                host=srv.host, port=srv.port, username=srv.username,
-                password=srv.password, key_path=srv.key_path,
-            )
-            self._clients[source_id] = client
-            return client
-
     # ------------------------------------------------------------------
     # Source change callbacks
     # ------------------------------------------------------------------
 
     def _on_tray_source_changed(self, source_id: str):
         # Immediately push whatever is in cache (may be empty until next fetch)
+        self._update_watched()
         self._push_to_consumers()
 
     def _on_widget_source_changed(self, source_id: str):
+        self._update_watched()
         self._push_to_consumers()
 
     # ------------------------------------------------------------------